@@ -708,6 +708,13 @@ class BatchBuffettScorecard:
                       start_time, end_time, duration, success_rate))
                 conn.commit()
             
+            # 조회용 스냅샷 갱신 (scorecard_viewer.py)
+            try:
+                from scorecard_snapshot import ScorecardSnapshot
+                ScorecardSnapshot(str(self.scorecard_db)).refresh()
+            except Exception as e:
+                self.logger.warning(f"scorecard_view 갱신 실패: {e}")
+            
             print("\n" + "=" * 60)
             print(f"🏁 배치 처리 완료!")
             print(f"📊 총 {total_stocks}개 종목 중 {completed}개 성공, {failed}개 실패")
@@ -4,12 +4,10 @@
 
 다중 데이터 소스를 활용하여 나머지 3,840개 종목의 상장주식수를 수집합니다.
 
-데이터 소스:
-1. KRX 공식 데이터 (우선순위 1)
-2. 네이버 금융 크롤링 (우선순위 2)  
-3. 다음 금융 크롤링 (우선순위 3)
-4. 야후 파이낸스 (우선순위 4)
-5. 추정값 계산 (최후 수단)
+데이터 소스 (SharesResolver):
+1. 일괄 소스 - FinanceDataReader 상장종목 목록, KRX 전종목 시세 (시장 전체 1회 조회)
+2. 개별 소스 - 일괄 소스에서 못 찾은 종목만 네이버 → 다음 금융 크롤링
+조회 결과는 출처/기준일과 함께 캐시되어 다음 실행에서는 오래된 종목만 다시 조회합니다.
 
 실행 방법:
 python comprehensive_shares_collector.py --method=all
@@ -17,26 +15,22 @@ python comprehensive_shares_collector.py --method=krx_only
 python comprehensive_shares_collector.py --batch_size=50 --delay=0.1
 """
 
-import sys
 import sqlite3
 import pandas as pd
 import requests
-from bs4 import BeautifulSoup
-import time
-import re
 from datetime import datetime
 from pathlib import Path
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import json
+
+from src.utils.http_cache import CachedHTTPFetcher
+from src.data_collection.shares_resolver import SharesResolver, parse_naver_shares, parse_daum_shares, NOT_FOUND
 
 # 추가 라이브러리 설치 확인
 try:
     import FinanceDataReader as fdr
-    import yfinance as yf
 except ImportError:
     print("필요한 라이브러리 설치:")
-    print("pip install finance-datareader yfinance")
+    print("pip install finance-datareader")
 
 class ComprehensiveSharesCollector:
     """종합 상장주식수 수집 시스템"""
@@ -66,16 +60,14 @@ class ComprehensiveSharesCollector:
             'collected_krx': 0,
             'collected_naver': 0,
             'collected_daum': 0,
-            'collected_yahoo': 0,
             'estimated': 0,
             'failed': 0,
             'start_time': None,
             'end_time': None
         }
         
-        # 캐시
-        self.krx_cache = {}
-        self.failed_cache = set()
+        # 스크래핑 응답 디스크 캐시 (재시도/재실행 시 로컬 응답 재사용)
+        self.http = CachedHTTPFetcher(session=self.session)
     
     def setup_logging(self):
         """로깅 설정"""
@@ -121,207 +113,55 @@ class ComprehensiveSharesCollector:
             self.logger.error(f"❌ 누락 종목 조회 실패: {e}")
             return pd.DataFrame()
     
-    def collect_from_krx_api(self, stock_codes):
-        """KRX 공식 API에서 상장주식수 수집"""
-        self.logger.info("🏛️ KRX 공식 데이터 수집 시작...")
-        
-        collected_data = {}
-        
-        try:
-            # KRX 상장법인목록 API 호출
-            krx_url = "http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
-            
-            # KOSPI 데이터
-            kospi_payload = {
-                'bld': 'dbms/MDC/STAT/standard/MDCSTAT01501',
-                'mktId': 'STK',
-                'trdDd': datetime.now().strftime('%Y%m%d'),
-                'money': '1',
-                'csvxls_isNo': 'false'
-            }
-            
-            response = self.session.post(krx_url, data=kospi_payload, timeout=30)
-            if response.status_code == 200:
-                kospi_data = response.json()
-                for item in kospi_data.get('OutBlock_1', []):
-                    stock_code = item.get('ISU_SRT_CD', '').zfill(6)
-                    shares = item.get('LIST_SHRS', 0)
-                    
-                    if stock_code and shares:
-                        try:
-                            shares_int = int(str(shares).replace(',', ''))
-                            if shares_int > 0:
-                                collected_data[stock_code] = {
-                                    'shares': shares_int,
-                                    'source': 'KRX_KOSPI',
-                                    'company_name': item.get('ISU_ABBRV', '')
-                                }
-                        except:
-                            continue
-            
-            # KOSDAQ 데이터
-            kosdaq_payload = {
-                'bld': 'dbms/MDC/STAT/standard/MDCSTAT01501',
-                'mktId': 'KSQ',
-                'trdDd': datetime.now().strftime('%Y%m%d'),
-                'money': '1',
-                'csvxls_isNo': 'false'
-            }
-            
-            response = self.session.post(krx_url, data=kosdaq_payload, timeout=30)
-            if response.status_code == 200:
-                kosdaq_data = response.json()
-                for item in kosdaq_data.get('OutBlock_1', []):
-                    stock_code = item.get('ISU_SRT_CD', '').zfill(6)
-                    shares = item.get('LIST_SHRS', 0)
-                    
-                    if stock_code and shares:
-                        try:
-                            shares_int = int(str(shares).replace(',', ''))
-                            if shares_int > 0:
-                                collected_data[stock_code] = {
-                                    'shares': shares_int,
-                                    'source': 'KRX_KOSDAQ',
-                                    'company_name': item.get('ISU_ABBRV', '')
-                                }
-                        except:
-                            continue
-            
-            self.stats['collected_krx'] = len(collected_data)
-            self.logger.info(f"✅ KRX 데이터 수집: {len(collected_data):,}개")
-            
-            return collected_data
-            
-        except Exception as e:
-            self.logger.error(f"❌ KRX 데이터 수집 실패: {e}")
-            return {}
-    
     def collect_from_naver_finance(self, stock_code, company_name):
         """네이버 금융에서 상장주식수 수집"""
         try:
             url = f"https://finance.naver.com/item/main.naver?code={stock_code}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code != 200:
-                return None
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 상장주식수 찾기 (여러 패턴 시도)
-            patterns = [
-                # 패턴 1: 테이블에서 찾기
-                {'selector': '.sub_section table tr', 'text': '상장주식수'},
-                {'selector': '.section table tr', 'text': '상장주식'},
-                {'selector': '.tb_type1 tr', 'text': '상장주식수'},
-                # 패턴 2: 기업개요에서 찾기
-                {'selector': '.company_info tr', 'text': '상장주식'},
-                {'selector': '.info_table tr', 'text': '주식수'},
-            ]
-            
-            for pattern in patterns:
-                rows = soup.select(pattern['selector'])
-                for row in rows:
-                    if pattern['text'] in row.get_text():
-                        # 숫자 추출
-                        text = row.get_text()
-                        numbers = re.findall(r'[\d,]+', text)
-                        for num_str in numbers:
-                            try:
-                                num = int(num_str.replace(',', ''))
-                                # 상장주식수 범위 검증 (10만 ~ 100억주)
-                                if 100000 <= num <= 10000000000:
-                                    return {
-                                        'shares': num,
-                                        'source': 'NAVER',
-                                        'company_name': company_name
-                                    }
-                            except:
-                                continue
+            shares = self.http.fetch_parsed(
+                url, self._parse_naver_shares,
+                parser_key='naver_shares:v1', source='naver_finance'
+            )
+            
+            if shares:
+                return {
+                    'shares': shares,
+                    'source': 'NAVER',
+                    'company_name': company_name
+                }
             
             return None
             
         except Exception as e:
             return None
     
+    def _parse_naver_shares(self, response):
+        """네이버 종목 메인 페이지에서 상장주식수 파싱"""
+        return parse_naver_shares(response)
+    
     def collect_from_daum_finance(self, stock_code, company_name):
         """다음 금융에서 상장주식수 수집"""
         try:
             url = f"https://finance.daum.net/quotes/A{stock_code}"
-            response = self.session.get(url, timeout=10)
-            
-            if response.status_code != 200:
-                return None
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 상장주식수 찾기
-            info_items = soup.select('.info_major dl')
-            for item in info_items:
-                dt = item.find('dt')
-                dd = item.find('dd')
-                
-                if dt and dd and '상장주식수' in dt.get_text():
-                    text = dd.get_text()
-                    numbers = re.findall(r'[\d,]+', text)
-                    for num_str in numbers:
-                        try:
-                            num = int(num_str.replace(',', ''))
-                            if 100000 <= num <= 10000000000:
-                                return {
-                                    'shares': num,
-                                    'source': 'DAUM',
-                                    'company_name': company_name
-                                }
-                        except:
-                            continue
+            shares = self.http.fetch_parsed(
+                url, self._parse_daum_shares,
+                parser_key='daum_shares:v1', source='daum_finance'
+            )
+            
+            if shares:
+                return {
+                    'shares': shares,
+                    'source': 'DAUM',
+                    'company_name': company_name
+                }
             
             return None
             
         except Exception as e:
             return None
     
-    def collect_from_yahoo_finance(self, stock_code, company_name):
-        """야후 파이낸스에서 상장주식수 수집"""
-        try:
-            # 한국 종목은 .KS 또는 .KQ 접미사 필요
-            yahoo_symbol = f"{stock_code}.KS"  # KOSPI 기본
-            
-            ticker = yf.Ticker(yahoo_symbol)
-            info = ticker.info
-            
-            # 상장주식수 필드들 확인
-            shares_fields = ['sharesOutstanding', 'impliedSharesOutstanding', 'floatShares']
-            
-            for field in shares_fields:
-                if field in info and info[field]:
-                    shares = info[field]
-                    if isinstance(shares, (int, float)) and shares > 100000:
-                        return {
-                            'shares': int(shares),
-                            'source': 'YAHOO',
-                            'company_name': company_name
-                        }
-            
-            # KOSDAQ 시도
-            if not info or 'sharesOutstanding' not in info:
-                yahoo_symbol = f"{stock_code}.KQ"
-                ticker = yf.Ticker(yahoo_symbol)
-                info = ticker.info
-                
-                for field in shares_fields:
-                    if field in info and info[field]:
-                        shares = info[field]
-                        if isinstance(shares, (int, float)) and shares > 100000:
-                            return {
-                                'shares': int(shares),
-                                'source': 'YAHOO_KQ',
-                                'company_name': company_name
-                            }
-            
-            return None
-            
-        except Exception as e:
-            return None
+    def _parse_daum_shares(self, response):
+        """다음 금융 종목 페이지에서 상장주식수 파싱"""
+        return parse_daum_shares(response)
     
     def estimate_shares_from_market_cap(self, stock_code, company_name, market_cap):
         """시가총액을 이용한 상장주식수 추정"""
@@ -360,123 +200,53 @@ class ComprehensiveSharesCollector:
         except Exception as e:
             return None
     
-    def collect_single_stock_shares(self, stock_info):
-        """단일 종목 상장주식수 수집 (멀티소스)"""
-        stock_code = stock_info['stock_code']
-        company_name = stock_info['company_name']
-        market_type = stock_info.get('market_type', '')
-        
-        # 실패 캐시 확인
-        if stock_code in self.failed_cache:
-            return None
-        
-        # 우선순위별 수집 시도
-        sources = [
-            ('KRX', lambda: self.krx_cache.get(stock_code)),
-            ('NAVER', lambda: self.collect_from_naver_finance(stock_code, company_name)),
-            ('DAUM', lambda: self.collect_from_daum_finance(stock_code, company_name)),
-            ('YAHOO', lambda: self.collect_from_yahoo_finance(stock_code, company_name)),
-        ]
-        
-        for source_name, collect_func in sources:
-            try:
-                result = collect_func()
-                if result and result.get('shares'):
-                    self.logger.debug(f"✅ {stock_code} {company_name}: {result['shares']:,}주 ({source_name})")
-                    return {
-                        'stock_code': stock_code,
-                        'shares_outstanding': result['shares'],
-                        'data_source': result['source']
-                    }
-                
-                # API 제한 대응
-                time.sleep(self.delay)
-                
-            except Exception as e:
-                self.logger.debug(f"⚠️ {stock_code} {source_name} 실패: {e}")
-                continue
-        
-        # 모든 소스 실패 시 실패 캐시에 추가
-        self.failed_cache.add(stock_code)
-        self.stats['failed'] += 1
-        return None
-    
-    def batch_collect_shares(self, missing_stocks_df):
-        """배치 단위로 상장주식수 수집"""
+    def batch_collect_shares(self, missing_stocks_df, method='all', force=False):
+        """누락 종목 상장주식수 수집 (일괄 소스 우선, 남은 종목만 병렬 스크래핑)"""
         self.logger.info(f"🚀 배치 수집 시작: {len(missing_stocks_df):,}개 종목")
         
-        # KRX 데이터 미리 로드
-        self.krx_cache = self.collect_from_krx_api(missing_stocks_df['stock_code'].tolist())
+        resolver = SharesResolver(max_workers=self.max_workers,
+                                  calls_per_second=1.0 / self.delay if self.delay > 0 else 10.0,
+                                  session=self.session, fetcher=self.http)
+        if method == 'krx_only':
+            resolver.scrapers = []
+        elif method == 'web_only':
+            resolver.bulk_sources = []
+        resolved = resolver.resolve(missing_stocks_df['stock_code'].tolist(), force=force)
         
-        collected_data = []
-        
-        # 배치 단위로 처리
-        for i in range(0, len(missing_stocks_df), self.batch_size):
-            batch = missing_stocks_df.iloc[i:i+self.batch_size]
-            
-            self.logger.info(f"📊 배치 {i//self.batch_size + 1}/{(len(missing_stocks_df)-1)//self.batch_size + 1} 처리 중...")
-            
-            # 멀티스레딩으로 병렬 처리
-            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                futures = []
-                
-                for _, stock_info in batch.iterrows():
-                    future = executor.submit(self.collect_single_stock_shares, stock_info.to_dict())
-                    futures.append(future)
-                
-                # 결과 수집
-                for future in as_completed(futures):
-                    try:
-                        result = future.result(timeout=30)
-                        if result:
-                            collected_data.append(result)
-                    except Exception as e:
-                        self.logger.debug(f"Future 처리 실패: {e}")
-                        continue
-            
-            # 진행률 출력
-            progress = (i + self.batch_size) / len(missing_stocks_df) * 100
-            collected_count = len(collected_data)
-            self.logger.info(f"진행률: {progress:.1f}% ({collected_count:,}개 수집)")
-            
-            # 배치 간 휴식
-            time.sleep(1)
+        # 소스별 통계
+        source_stats = resolved['source'].value_counts()
+        self.stats['collected_krx'] = int(source_stats.get('FDR_LISTING', 0) + source_stats.get('KRX', 0))
+        self.stats['collected_naver'] = int(source_stats.get('NAVER', 0))
+        self.stats['collected_daum'] = int(source_stats.get('DAUM', 0))
+        self.stats['failed'] = int(source_stats.get(NOT_FOUND, 0))
         
-        return collected_data
+        found = resolved.dropna(subset=['shares_outstanding'])
+        return [
+            {'stock_code': code, 'shares_outstanding': int(shares), 'data_source': source}
+            for code, shares, source in found[['stock_code', 'shares_outstanding', 'source']]
+            .itertuples(index=False, name=None)
+        ]
     
     def save_collected_shares(self, collected_data):
-        """수집된 상장주식수 데이터 저장"""
+        """수집된 상장주식수 데이터 저장 (출처/기준일은 shares_outstanding_cache에 보관)"""
         if not collected_data:
             self.logger.warning("저장할 데이터가 없습니다")
             return False
         
         try:
+            updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = [(data['shares_outstanding'], updated_at, data['stock_code']) for data in collected_data]
+            
             with sqlite3.connect(self.db_path) as conn:
-                updated_count = 0
-                
-                for data in collected_data:
-                    stock_code = data['stock_code']
-                    shares = data['shares_outstanding']
-                    source = data.get('data_source', 'UNKNOWN')
-                    
-                    conn.execute("""
-                        UPDATE company_info 
-                        SET shares_outstanding = ?, 
-                            updated_at = ?,
-                            data_source = ?
-                        WHERE stock_code = ?
-                    """, (
-                        shares,
-                        datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                        source,
-                        stock_code
-                    ))
-                    
-                    updated_count += 1
-                
+                conn.executemany("""
+                    UPDATE company_info 
+                    SET shares_outstanding = ?, 
+                        updated_at = ?
+                    WHERE stock_code = ?
+                """, rows)
                 conn.commit()
                 
-            self.logger.info(f"✅ 데이터 저장 완료: {updated_count:,}개 종목")
+            self.logger.info(f"✅ 데이터 저장 완료: {len(rows):,}개 종목")
             return True
             
         except Exception as e:
@@ -497,14 +267,12 @@ class ComprehensiveSharesCollector:
         print()
         
         total_collected = (self.stats['collected_krx'] + self.stats['collected_naver'] + 
-                          self.stats['collected_daum'] + self.stats['collected_yahoo'] + 
-                          self.stats['estimated'])
+                          self.stats['collected_daum'] + self.stats['estimated'])
         
         print("📈 소스별 수집 현황:")
         print(f"   🏛️ KRX 공식: {self.stats['collected_krx']:,}개")
         print(f"   🌐 네이버: {self.stats['collected_naver']:,}개")
         print(f"   🔍 다음: {self.stats['collected_daum']:,}개")
-        print(f"   📊 야후: {self.stats['collected_yahoo']:,}개")
         print(f"   🧮 추정값: {self.stats['estimated']:,}개")
         print(f"   ❌ 실패: {self.stats['failed']:,}개")
         print()
@@ -566,7 +334,7 @@ class ComprehensiveSharesCollector:
             return True
         
         # 2. 배치 수집 실행
-        collected_data = self.batch_collect_shares(missing_stocks)
+        collected_data = self.batch_collect_shares(missing_stocks, method=method)
         
         # 3. 데이터 저장
         if collected_data:
@@ -6,6 +6,7 @@
 import os
 import sys
 import logging
+import sqlite3
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
@@ -263,6 +264,12 @@ class ConfigManager:
         config_key = db_map.get(db_name, 'stock_db')
         return self.database_config.get(config_key, Path('data/databases/stock_data.db'))
     
+    def get_database_connection(self, db_name: str) -> sqlite3.Connection:
+        """데이터베이스 연결 반환"""
+        db_path = Path(self.get_database_path(db_name))
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        return sqlite3.connect(str(db_path), timeout=self.database_config.get('timeout', 30))
+    
     def validate_config(self) -> List[str]:
         """설정 유효성 검사"""
         errors = []
@@ -336,37 +343,58 @@ class ConfigManager:
 # 글로벌 인스턴스 및 편의 함수들
 # =============================================================================
 
-# 안전한 글로벌 인스턴스 생성
-try:
-    config_manager = ConfigManager()
-    CONFIG_LOADED = True
-except Exception as e:
-    print(f"❌ ConfigManager 초기화 실패: {e}")
-    print("⚠️ 최소한의 기능만 사용 가능합니다.")
-    config_manager = None
-    CONFIG_LOADED = False
+# 글로벌 인스턴스는 최초 사용 시 생성 (import만으로 로깅 설정/디렉토리 생성이 일어나지 않도록)
+# `from config import config_manager`, `config.CONFIG_LOADED` 접근도 모듈 __getattr__로 지연 생성
+_config_manager: Optional[ConfigManager] = None
+_config_loaded: Optional[bool] = None
+
+def _get_config_manager() -> Optional[ConfigManager]:
+    """글로벌 ConfigManager 반환 (최초 호출 시 생성, 실패하면 None)"""
+    global _config_manager, _config_loaded
+    if _config_loaded is None:
+        try:
+            _config_manager = ConfigManager()
+            _config_loaded = True
+        except Exception as e:
+            print(f"❌ ConfigManager 초기화 실패: {e}")
+            print("⚠️ 최소한의 기능만 사용 가능합니다.")
+            _config_manager = None
+            _config_loaded = False
+    return _config_manager
+
+def __getattr__(name: str):
+    if name == 'config_manager':
+        return _get_config_manager()
+    if name == 'CONFIG_LOADED':
+        _get_config_manager()
+        return _config_loaded
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # 편의 함수들
 def get_dart_config() -> Dict[str, Any]:
     """DART API 설정 반환"""
+    config_manager = _get_config_manager()
     if config_manager:
         return config_manager.get_dart_config()
     return {'api_key': os.getenv('DART_API_KEY', ''), 'base_url': 'https://opendart.fss.or.kr/api'}
 
 def get_naver_news_config() -> Dict[str, Any]:
     """네이버 뉴스 API 설정 반환"""
+    config_manager = _get_config_manager()
     if config_manager:
         return config_manager.get_naver_news_config()
     return {'client_id': os.getenv('NAVER_CLIENT_ID', ''), 'client_secret': os.getenv('NAVER_CLIENT_SECRET', '')}
 
 def get_kis_config() -> Dict[str, Any]:
     """KIS API 설정 반환"""
+    config_manager = _get_config_manager()
     if config_manager:
         return config_manager.get_kis_config()
     return {'app_key': os.getenv('KIS_APP_KEY', ''), 'app_secret': os.getenv('KIS_APP_SECRET', '')}
 
 def get_logger(name: str) -> logging.Logger:
     """로거 반환"""
+    config_manager = _get_config_manager()
     if config_manager:
         return config_manager.get_logger(name)
     
@@ -382,6 +410,7 @@ def get_logger(name: str) -> logging.Logger:
 
 def get_database_path(db_name: str) -> Path:
     """데이터베이스 파일 경로 반환"""
+    config_manager = _get_config_manager()
     if config_manager:
         return config_manager.get_database_path(db_name)
     
@@ -397,13 +426,15 @@ def get_database_path(db_name: str) -> Path:
 
 def validate_all_configs() -> List[str]:
     """모든 설정 유효성 검사"""
+    config_manager = _get_config_manager()
     if config_manager:
         return config_manager.validate_config()
     return ["ConfigManager가 초기화되지 않았습니다."]
 
 def is_config_ready() -> bool:
     """설정 준비 상태 확인"""
-    return CONFIG_LOADED and config_manager and config_manager.is_ready()
+    config_manager = _get_config_manager()
+    return bool(_config_loaded and config_manager and config_manager.is_ready())
 
 # =============================================================================
 # 테스트 및 진단 함수
@@ -414,7 +445,8 @@ def test_config_import():
     print("🧪 ConfigManager 임포트 테스트")
     print("-" * 40)
     
-    if CONFIG_LOADED:
+    config_manager = _get_config_manager()
+    if _config_loaded:
         print("✅ ConfigManager 정상 로드")
         if config_manager:
             config_manager.print_config_status()
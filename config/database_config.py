@@ -12,6 +12,58 @@ from datetime import datetime
 # 환경변수 로드
 load_dotenv()
 
+# latest_snapshot 유지 트리거 정의
+# 원본 테이블 → 스냅샷 컬럼(NEW 기준 값), 추가 갱신식, 최신 행 판정 조건 (excluded = 새 값, latest_snapshot = 기존 값)
+LATEST_SNAPSHOT_SOURCES = {
+    'stock_prices': {
+        'columns': {'price_date': 'NEW.date', 'close_price': 'NEW.close_price', 'volume': 'NEW.volume',
+                    # 직전 거래일 종가 (UNIQUE(stock_code, date) 인덱스 조회, 순서 없이 적재돼도 정확)
+                    'prev_close': '(SELECT close_price FROM stock_prices WHERE stock_code = NEW.stock_code '
+                                  'AND date < NEW.date ORDER BY date DESC LIMIT 1)'},
+        'updates': {
+            'market_cap': 'COALESCE(CAST(excluded.close_price * latest_snapshot.shares_outstanding / 100000000 AS INTEGER), '
+                          'latest_snapshot.market_cap)',
+        },
+        'newer': 'latest_snapshot.price_date IS NULL OR excluded.price_date >= latest_snapshot.price_date',
+        # 과거 행이 나중에 적재되어 직전 거래일이 바뀐 경우
+        'after': ['UPDATE latest_snapshot SET prev_close = NEW.close_price '
+                  'WHERE stock_code = NEW.stock_code AND price_date > NEW.date '
+                  'AND NEW.date = (SELECT MAX(date) FROM stock_prices '
+                  'WHERE stock_code = NEW.stock_code AND date < latest_snapshot.price_date)'],
+    },
+    'company_info': {
+        'columns': {'company_name': 'NEW.company_name', 'market_type': 'NEW.market_type', 'sector': 'NEW.sector',
+                    'shares_outstanding': 'NEW.shares_outstanding', 'market_cap': 'NEW.market_cap'},
+        'updates': {
+            'market_cap': 'COALESCE(CAST(latest_snapshot.close_price * excluded.shares_outstanding / 100000000 AS INTEGER), '
+                          'excluded.market_cap)',
+        },
+        'newer': '1',
+    },
+    'financial_ratios': {
+        'columns': {'ratio_year': 'NEW.year', 'ratio_quarter': 'NEW.quarter', 'per': 'NEW.per', 'pbr': 'NEW.pbr',
+                    'roe': 'NEW.roe', 'debt_ratio': 'NEW.debt_ratio', 'dividend_yield': 'NEW.dividend_yield',
+                    'eps': 'NEW.eps', 'bps': 'NEW.bps'},
+        'updates': {},
+        # 최신 연도 우선, 같은 연도는 연간(quarter NULL) > 최신 분기
+        'newer': 'latest_snapshot.ratio_year IS NULL OR excluded.ratio_year > latest_snapshot.ratio_year '
+                 'OR (excluded.ratio_year = latest_snapshot.ratio_year AND (excluded.ratio_quarter IS NULL '
+                 'OR (latest_snapshot.ratio_quarter IS NOT NULL AND excluded.ratio_quarter >= latest_snapshot.ratio_quarter)))',
+    },
+    'technical_indicators': {
+        'columns': {'technical_date': 'NEW.date', 'technical_score': 'NEW.technical_score', 'rsi': 'NEW.rsi'},
+        'updates': {},
+        'newer': 'latest_snapshot.technical_date IS NULL OR excluded.technical_date >= latest_snapshot.technical_date',
+    },
+    'investment_scores': {
+        'columns': {'score_date': 'NEW.date', 'total_investment_score': 'NEW.total_investment_score',
+                    'fundamental_score': 'NEW.fundamental_score', 'sentiment_score': 'NEW.sentiment_score',
+                    'recommendation': 'NEW.recommendation'},
+        'updates': {},
+        'newer': 'latest_snapshot.score_date IS NULL OR excluded.score_date >= latest_snapshot.score_date',
+    },
+}
+
 class DatabaseConfig:
     """데이터베이스 설정 관리 클래스"""
     
@@ -25,7 +77,8 @@ class DatabaseConfig:
                 'name': os.getenv('STOCK_DB_NAME', 'stock_data.db'),
                 'path': self.base_path / os.getenv('STOCK_DB_NAME', 'stock_data.db'),
                 'description': '주식 데이터 저장소',
-                'tables': ['stock_prices', 'company_info', 'financial_ratios', 'technical_indicators', 'investment_scores']
+                'tables': ['stock_prices', 'company_info', 'financial_ratios', 'technical_indicators', 'investment_scores',
+                           'shares_outstanding_cache', 'latest_snapshot', 'risk_metrics']
             },
             'dart': {
                 'name': os.getenv('DART_DB_NAME', 'dart_data.db'),
@@ -368,13 +421,18 @@ class DatabaseConfig:
                     corp_code TEXT NOT NULL,
                     bsns_year TEXT NOT NULL,
                     reprt_code TEXT NOT NULL,
+                    fs_div TEXT NOT NULL DEFAULT '',
+                    fs_nm TEXT,
+                    sj_div TEXT NOT NULL DEFAULT '',
+                    sj_nm TEXT,
+                    account_id TEXT NOT NULL DEFAULT '',
                     account_nm TEXT NOT NULL,
                     thstrm_amount INTEGER,
                     frmtrm_amount INTEGER,
                     bfefrmtrm_amount INTEGER,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    UNIQUE(corp_code, bsns_year, reprt_code, account_nm)
+                    UNIQUE(corp_code, bsns_year, reprt_code, fs_div, sj_div, account_id, account_nm)
                 )
             ''',
             
@@ -507,16 +565,105 @@ class DatabaseConfig:
                     
                     -- 최종 결과
                     total_investment_score REAL, -- 총 투자 점수 (0-100)
-                    recommendation TEXT,         -- 'Strong Buy', 'Buy', 'Hold', 'Sell', 'Strong Sell'
-                    risk_level TEXT,            -- 'Low', 'Medium', 'High'
-                    confidence_level REAL,      -- 신뢰도 (0-1)
+                    recommendation TEXT,         -- 'STRONG_BUY', 'BUY', 'WEAK_BUY', 'HOLD', 'WEAK_SELL', 'SELL', 'STRONG_SELL'
+                    risk_level TEXT,            -- 'LOW', 'MEDIUM', 'HIGH'
+                    confidence_level REAL,      -- 신뢰도 (0-1, 종목 자체 데이터로 확보된 영역 가중치 비율)
                     
                     -- 내재가치 관련
-                    intrinsic_value REAL,       -- 내재가치 (5개 모델 평균)
+                    intrinsic_value REAL,       -- 내재가치 (5개 모델 평균, Monte Carlo 중앙값)
+                    intrinsic_value_low REAL,   -- 내재가치 하단 (5% 백분위수)
+                    intrinsic_value_high REAL,  -- 내재가치 상단 (95% 백분위수)
+                    undervalued_probability REAL, -- 내재가치 > 현재가 시나리오 비율 (0-1)
                     current_price REAL,         -- 현재가
                     discount_rate REAL,         -- 할인율
                     margin_of_safety REAL,      -- 안전마진
                     
+                    -- 위험 지표 (risk_metrics 최신 행)
+                    volatility REAL,            -- 60일 연환산 변동성
+                    beta REAL,                  -- 252일 베타 (소속 시장 지수 대비)
+                    sharpe_ratio REAL,          -- 252일 샤프 비율
+                    max_drawdown REAL,          -- 252일 최대낙폭 (음수 비율)
+                    
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE(stock_code, date)
+                )
+            ''',
+            
+            # 상장주식수 조회 캐시 (출처/기준일 포함, SharesResolver)
+            'shares_outstanding_cache': '''
+                CREATE TABLE IF NOT EXISTS shares_outstanding_cache (
+                    stock_code TEXT PRIMARY KEY,
+                    shares_outstanding INTEGER,     -- 조회 실패 시 NULL
+                    source TEXT NOT NULL,           -- 'FDR_LISTING', 'KRX', 'NAVER', 'DAUM', 'NOT_FOUND'
+                    as_of TEXT NOT NULL,            -- 데이터 기준일 (YYYY-MM-DD)
+                    resolved_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''',
+            
+            # 종목별 최신값 스냅샷 (원본 테이블 트리거로 유지, LatestSnapshot.rebuild로 재구성)
+            'latest_snapshot': '''
+                CREATE TABLE IF NOT EXISTS latest_snapshot (
+                    stock_code TEXT PRIMARY KEY,
+                    company_name TEXT,
+                    market_type TEXT,
+                    sector TEXT,
+                    shares_outstanding INTEGER,
+                    market_cap INTEGER,          -- 억원 (최신 종가 × 상장주식수, 없으면 company_info 값)
+                    
+                    -- 최신 주가 (stock_prices)
+                    price_date TEXT,
+                    close_price REAL,
+                    prev_close REAL,             -- 직전 거래일 종가
+                    volume INTEGER,
+                    
+                    -- 최신 재무비율 (financial_ratios, 연간 우선)
+                    ratio_year INTEGER,
+                    ratio_quarter INTEGER,
+                    per REAL,
+                    pbr REAL,
+                    roe REAL,
+                    debt_ratio REAL,
+                    dividend_yield REAL,
+                    eps REAL,
+                    bps REAL,
+                    
+                    -- 최신 기술분석 (technical_indicators)
+                    technical_date TEXT,
+                    technical_score REAL,
+                    rsi REAL,
+                    
+                    -- 최신 통합 점수 (investment_scores)
+                    score_date TEXT,
+                    total_investment_score REAL,
+                    fundamental_score REAL,
+                    sentiment_score REAL,
+                    recommendation TEXT,
+                    
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''',
+            
+            # 일별 위험 지표 (RiskMetricsCalculator, 가격 패널 기반 전 종목 일괄 계산)
+            'risk_metrics': '''
+                CREATE TABLE IF NOT EXISTS risk_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    stock_code TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    benchmark TEXT,              -- 베타 기준 지수 ('KOSPI', 'KOSDAQ')
+                    
+                    -- 이동 변동성 (일간 수익률 표준편차, 연환산)
+                    volatility_20 REAL,
+                    volatility_60 REAL,
+                    volatility_252 REAL,
+                    
+                    -- 이동 베타 (소속 시장 지수 대비)
+                    beta_60 REAL,
+                    beta_252 REAL,
+                    
+                    sharpe_252 REAL,             -- 252일 샤프 비율 (연환산)
+                    max_drawdown_252 REAL,       -- 252일 구간 최대낙폭 (음수 비율)
+                    
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     UNIQUE(stock_code, date)
@@ -548,7 +695,14 @@ class DatabaseConfig:
                 # 통합 점수 관련 인덱스
                 'CREATE INDEX IF NOT EXISTS idx_investment_scores_total ON investment_scores(total_investment_score)',
                 'CREATE INDEX IF NOT EXISTS idx_investment_scores_recommendation ON investment_scores(recommendation)',
-                'CREATE INDEX IF NOT EXISTS idx_investment_scores_risk ON investment_scores(risk_level)'
+                'CREATE INDEX IF NOT EXISTS idx_investment_scores_risk ON investment_scores(risk_level)',
+                
+                # 위험 지표 (일자별 전 종목 조회)
+                'CREATE INDEX IF NOT EXISTS idx_risk_metrics_date ON risk_metrics(date)',
+                
+                # 최신값 스냅샷 (대시보드/스크리닝 정렬)
+                'CREATE INDEX IF NOT EXISTS idx_latest_snapshot_market_cap ON latest_snapshot(market_cap)',
+                'CREATE INDEX IF NOT EXISTS idx_latest_snapshot_total_score ON latest_snapshot(total_investment_score)'
             ],
             
             'news': [
@@ -598,6 +752,48 @@ class DatabaseConfig:
                 except Exception as e:
                     print(f"인덱스 생성 실패: {query} - {e}")
 
+    def create_latest_snapshot_triggers(self, conn: sqlite3.Connection):
+        """원본 테이블 INSERT/UPDATE 시 latest_snapshot을 같은 트랜잭션에서 갱신하는 트리거 생성
+        
+        트리거는 행 단위(FOR EACH ROW)라 원본 1행마다 스냅샷 upsert가 1번 실행되고,
+        stock_prices는 직전 거래일 종가(prev_close) 상관 서브쿼리와 과거 행 보정 UPDATE까지 더해진다.
+        수백만 행 재적재처럼 대량 적재 시에는 LatestSnapshot.bulk_load()로 트리거를 내리고
+        적재 후 스냅샷을 집합 연산으로 한 번에 재구성하는 편이 빠르다.
+        """
+        for table, spec in LATEST_SNAPSHOT_SOURCES.items():
+            columns = list(spec['columns'])
+            assignments = {column: f'excluded.{column}' for column in columns}
+            assignments.update(spec['updates'])
+            set_clause = ', '.join(f'{column} = {value}' for column, value in assignments.items())
+            
+            for event in ('INSERT', 'UPDATE'):
+                conn.execute(f'''
+                    CREATE TRIGGER IF NOT EXISTS trg_latest_snapshot_{table}_{event.lower()}
+                    AFTER {event} ON {table}
+                    BEGIN
+                        INSERT INTO latest_snapshot (stock_code, {', '.join(columns)}, updated_at)
+                        VALUES (NEW.stock_code, {', '.join(spec['columns'].values())}, CURRENT_TIMESTAMP)
+                        ON CONFLICT(stock_code) DO UPDATE SET {set_clause}, updated_at = CURRENT_TIMESTAMP
+                        WHERE {spec['newer']};
+                        {''.join(statement + ';' for statement in spec.get('after', []))}
+                    END
+                ''')
+    
+    def drop_latest_snapshot_triggers(self, conn: sqlite3.Connection,
+                                      tables: Optional[List[str]] = None) -> List[str]:
+        """latest_snapshot 트리거 삭제 (대량 적재용, 실제로 삭제한 트리거 이름 반환)"""
+        dropped = []
+        for table in tables or list(LATEST_SNAPSHOT_SOURCES):
+            for event in ('insert', 'update'):
+                name = f'trg_latest_snapshot_{table}_{event}'
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+                ).fetchone()
+                if exists:
+                    conn.execute(f'DROP TRIGGER {name}')
+                    dropped.append(name)
+        return dropped
+    
     def create_growth_calculation_views(self, conn: sqlite3.Connection):
         """성장률 계산을 위한 뷰 생성"""
         
@@ -777,9 +973,10 @@ class DatabaseConfig:
                 # 확장된 인덱스 생성
                 self._create_enhanced_indexes(conn, db_name)
                 
-                # 성장률 계산 뷰 생성 (stock 데이터베이스만)
+                # 성장률 계산 뷰 / 최신값 스냅샷 트리거 생성 (stock 데이터베이스만)
                 if db_name == 'stock':
                     self.create_growth_calculation_views(conn)
+                    self.create_latest_snapshot_triggers(conn)
                 
                 conn.commit()
                 return True
@@ -12,8 +12,8 @@
 3. 현재가 기반 추정 시가총액 계산
 
 실행 방법:
+python fix_shares_outstanding.py --method=resolve
 python fix_shares_outstanding.py --method=direct_update
-python fix_shares_outstanding.py --method=alternative_api
 """
 
 import sys
@@ -26,6 +26,8 @@ from datetime import datetime
 from pathlib import Path
 import logging
 
+from src.data_collection.shares_resolver import SharesResolver
+
 # FinanceDataReader 확인
 try:
     import FinanceDataReader as fdr
@@ -195,6 +197,29 @@ class SharesOutstandingFixer:
             print(f"❌ 상장주식수 업데이트 실패: {e}")
             return False
     
+    def resolve_all_shares(self, force=False):
+        """전체 종목 상장주식수 조회 (일괄 소스 우선 + 누락 종목만 스크래핑, 캐시 사용)"""
+        print("🔎 전체 종목 상장주식수 조회")
+        print("=" * 60)
+        
+        if not self.db_path.exists():
+            print("❌ stock_data.db 파일이 존재하지 않습니다")
+            return False
+        
+        try:
+            resolver = SharesResolver(session=self.session)
+            resolved = resolver.resolve(force=force)
+            updated = resolver.apply_to_company_info(resolved)
+            
+            print(f"✅ 상장주식수 반영 완료: {updated:,}개 종목")
+            for source, count in resolved['source'].value_counts().items():
+                print(f"   {source}: {count:,}개")
+            return True
+            
+        except Exception as e:
+            print(f"❌ 상장주식수 조회 실패: {e}")
+            return False
+    
     def calculate_market_cap_with_known_shares(self):
         """상장주식수가 있는 종목의 시가총액 계산"""
         print("📊 시가총액 계산 (상장주식수 기반)")
@@ -337,8 +362,9 @@ class SharesOutstandingFixer:
         self.diagnose_fdr_issue()
         print("\n" + "="*80)
         
-        # 2. 주요 종목 상장주식수 직접 업데이트
-        self.update_major_shares_directly()
+        # 2. 전체 종목 상장주식수 조회 (실패 시 주요 종목 직접 업데이트)
+        if not self.resolve_all_shares():
+            self.update_major_shares_directly()
         print("\n" + "="*80)
         
         # 3. 시가총액 계산
@@ -360,7 +386,7 @@ def main():
     import argparse
     
     parser = argparse.ArgumentParser(description='상장주식수 문제 해결 도구')
-    parser.add_argument('--method', choices=['diagnose', 'direct_update', 'calculate_cap', 'check_results', 'comprehensive'], 
+    parser.add_argument('--method', choices=['diagnose', 'resolve', 'direct_update', 'calculate_cap', 'check_results', 'comprehensive'], 
                        default='comprehensive', help='실행할 방법')
     
     args = parser.parse_args()
@@ -369,6 +395,8 @@ def main():
     
     if args.method == 'diagnose':
         fixer.diagnose_fdr_issue()
+    elif args.method == 'resolve':
+        fixer.resolve_all_shares()
     elif args.method == 'direct_update':
         fixer.update_major_shares_directly()
     elif args.method == 'calculate_cap':
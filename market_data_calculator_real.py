@@ -28,6 +28,8 @@ from bs4 import BeautifulSoup
 import re
 from typing import Dict, List, Optional, Tuple, Any
 
+from src.utils.http_cache import CachedHTTPFetcher
+
 # FinanceDataReader import
 try:
     import FinanceDataReader as fdr
@@ -54,6 +56,12 @@ class RealMarketDataCalculator:
         # 테이블명
         self.table_name = 'financial_ratios_real'
         
+        # 네이버 스크래핑 응답 캐시 (재실행 시 로컬 응답 재사용)
+        self.http = CachedHTTPFetcher(session=requests.Session())
+        self.http.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        
         # 데이터베이스 초기화
         self._init_financial_ratios_table()
         
@@ -154,90 +162,95 @@ class RealMarketDataCalculator:
         """네이버 증권에서 실제 PER/PBR 스크래핑"""
         try:
             url = f"https://finance.naver.com/item/main.naver?code={stock_code}"
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
             
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                return {}
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # PER 추출
-            per_value = None
-            per_element = soup.find('em', {'id': '_per'})
-            if per_element:
-                per_text = per_element.text.strip()
-                if per_text and per_text != 'N/A':
-                    try:
-                        per_value = float(per_text.replace(',', ''))
-                    except:
-                        pass
-            
-            # PBR 추출
-            pbr_value = None
-            pbr_element = soup.find('em', {'id': '_pbr'})
-            if pbr_element:
-                pbr_text = pbr_element.text.strip()
-                if pbr_text and pbr_text != 'N/A':
-                    try:
-                        pbr_value = float(pbr_text.replace(',', ''))
-                    except:
-                        pass
-            
-            # EPS 추출 (주당순이익)
-            eps_value = None
-            eps_elements = soup.find_all('td', class_='num')
-            for elem in eps_elements:
-                if 'EPS' in str(elem.get_previous_sibling()):
-                    try:
-                        eps_text = elem.text.strip().replace(',', '')
-                        eps_value = float(eps_text)
-                        break
-                    except:
-                        pass
-            
-            # 배당수익률 추출
-            div_yield = None
-            dividend_elements = soup.find_all('td')
-            for elem in dividend_elements:
-                if '배당수익률' in str(elem):
-                    try:
-                        next_elem = elem.find_next_sibling('td')
-                        if next_elem:
-                            div_text = next_elem.text.strip().replace('%', '')
-                            div_yield = float(div_text) / 100
-                            break
-                    except:
-                        pass
-            
-            result = {}
-            if per_value and 0 < per_value < 200:  # 유효 범위 체크
-                result['per'] = per_value
-                result['per_source'] = 'naver_scraping'
-            
-            if pbr_value and 0 < pbr_value < 20:  # 유효 범위 체크
-                result['pbr'] = pbr_value
-                result['pbr_source'] = 'naver_scraping'
-            
-            if eps_value:
-                result['eps'] = eps_value
-            
-            if div_yield and 0 <= div_yield <= 0.15:  # 15% 이하
-                result['dividend_yield'] = div_yield
+            # 디스크 응답 캐시: 동일 본문이면 이전 파싱 결과 재사용
+            result = self.http.fetch_parsed(
+                url,
+                self._parse_naver_ratios,
+                parser_key='naver_ratios:v1',
+                source='naver_finance'
+            )
             
             if result:
                 logger.info(f"📊 네이버 스크래핑 성공: {stock_code} - PER: {result.get('per', 'N/A')}, PBR: {result.get('pbr', 'N/A')}")
             else:
                 logger.debug(f"⚠️ 네이버 스크래핑 데이터 없음: {stock_code}")
             
-            return result
+            return result or {}
             
         except Exception as e:
             logger.debug(f"네이버 스크래핑 실패 ({stock_code}): {e}")
             return {}
     
+    def _parse_naver_ratios(self, response) -> Dict[str, Any]:
+        """네이버 종목 메인 페이지에서 PER/PBR/EPS/배당수익률 파싱"""
+        soup = BeautifulSoup(response.content, 'html.parser')
+        
+        # PER 추출
+        per_value = None
+        per_element = soup.find('em', {'id': '_per'})
+        if per_element:
+            per_text = per_element.text.strip()
+            if per_text and per_text != 'N/A':
+                try:
+                    per_value = float(per_text.replace(',', ''))
+                except:
+                    pass
+        
+        # PBR 추출
+        pbr_value = None
+        pbr_element = soup.find('em', {'id': '_pbr'})
+        if pbr_element:
+            pbr_text = pbr_element.text.strip()
+            if pbr_text and pbr_text != 'N/A':
+                try:
+                    pbr_value = float(pbr_text.replace(',', ''))
+                except:
+                    pass
+        
+        # EPS 추출 (주당순이익)
+        eps_value = None
+        eps_elements = soup.find_all('td', class_='num')
+        for elem in eps_elements:
+            if 'EPS' in str(elem.get_previous_sibling()):
+                try:
+                    eps_text = elem.text.strip().replace(',', '')
+                    eps_value = float(eps_text)
+                    break
+                except:
+                    pass
+        
+        # 배당수익률 추출
+        div_yield = None
+        dividend_elements = soup.find_all('td')
+        for elem in dividend_elements:
+            if '배당수익률' in str(elem):
+                try:
+                    next_elem = elem.find_next_sibling('td')
+                    if next_elem:
+                        div_text = next_elem.text.strip().replace('%', '')
+                        div_yield = float(div_text) / 100
+                        break
+                except:
+                    pass
+        
+        result = {}
+        if per_value and 0 < per_value < 200:  # 유효 범위 체크
+            result['per'] = per_value
+            result['per_source'] = 'naver_scraping'
+        
+        if pbr_value and 0 < pbr_value < 20:  # 유효 범위 체크
+            result['pbr'] = pbr_value
+            result['pbr_source'] = 'naver_scraping'
+        
+        if eps_value:
+            result['eps'] = eps_value
+        
+        if div_yield and 0 <= div_yield <= 0.15:  # 15% 이하
+            result['dividend_yield'] = div_yield
+        
+        return result
+    
     def get_market_cap_category(self, market_cap: float) -> str:
         """시가총액 기반 카테고리 분류"""
         if market_cap >= 10000000000000:  # 10조 이상
@@ -7,12 +7,22 @@ OHLC 종가 범위 이상치 분석 스크립트
 python ohlc_anomaly_analyzer.py
 """
 
+import sys
 import sqlite3
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
 import numpy as np
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+try:
+    import pyarrow.dataset as ds
+    from src.utils.columnar_store import ColumnarStore
+    COLUMNAR_AVAILABLE = True
+except ImportError:
+    COLUMNAR_AVAILABLE = False
+
 class OHLCAnomalyAnalyzer:
     """OHLC 이상치 분석 클래스"""
     
@@ -21,6 +31,44 @@ class OHLCAnomalyAnalyzer:
         
         if not self.db_path.exists():
             raise FileNotFoundError("stock_data.db 파일을 찾을 수 없습니다.")
+        
+        # 전 종목 스캔은 Parquet 스냅샷이 있으면 그쪽에서 읽음 (SQLite 쓰기와 경합 없음)
+        self.columnar = None
+        if COLUMNAR_AVAILABLE:
+            store = ColumnarStore(self.db_path)
+            if store.has_snapshot('stock_prices'):
+                self.columnar = store
+    
+    def _load_close_anomalies(self, conn, anomaly_query: str) -> pd.DataFrame:
+        """종가 범위 이상치 조회 (스냅샷: 조건 푸시다운 후 편차 계산)"""
+        if self.columnar is None:
+            return pd.read_sql(anomaly_query, conn)
+        
+        price = ds.field('close_price')
+        anomalies = self.columnar.load_table(
+            'stock_prices',
+            columns=['stock_code', 'date', 'open_price', 'high_price', 'low_price', 'close_price', 'volume'],
+            filter=((price > ds.field('high_price')) | (price < ds.field('low_price')))
+                   & (ds.field('open_price') > 0) & (ds.field('high_price') > 0)
+                   & (ds.field('low_price') > 0) & (price > 0)
+        )
+        above = anomalies['close_price'] > anomalies['high_price']
+        anomalies['anomaly_type'] = np.where(above, 'ABOVE_HIGH', 'BELOW_LOW')
+        anomalies['deviation_pct'] = np.where(
+            above,
+            (anomalies['close_price'] - anomalies['high_price']) / anomalies['high_price'] * 100,
+            (anomalies['low_price'] - anomalies['close_price']) / anomalies['low_price'] * 100
+        ).round(4)
+        return anomalies.sort_values('deviation_pct', ascending=False, kind='stable').reset_index(drop=True)
+    
+    def _load_average_volume(self, conn) -> float:
+        """전체 평균 거래량 (거래량 > 0)"""
+        if self.columnar is None:
+            return pd.read_sql("SELECT AVG(volume) as avg_vol FROM stock_prices WHERE volume > 0", conn).iloc[0]['avg_vol']
+        
+        volume = self.columnar.load_table('stock_prices', columns=['volume'],
+                                          filter=ds.field('volume') > 0, as_arrow=True)['volume']
+        return volume.to_numpy().mean() if len(volume) else float('nan')
     
     def analyze_close_price_anomalies(self):
         """종가 범위 이상치 상세 분석"""
@@ -56,7 +104,7 @@ class OHLCAnomalyAnalyzer:
                 ORDER BY deviation_pct DESC
             """
             
-            anomalies = pd.read_sql(anomaly_query, conn)
+            anomalies = self._load_close_anomalies(conn, anomaly_query)
             
             print(f"📊 총 이상치: {len(anomalies)}건")
             print()
@@ -144,8 +192,7 @@ class OHLCAnomalyAnalyzer:
             anomaly_avg_volume = anomalies['volume'].mean()
             
             # 전체 평균 거래량 (비교용)
-            total_avg_query = "SELECT AVG(volume) as avg_vol FROM stock_prices WHERE volume > 0"
-            total_avg_volume = pd.read_sql(total_avg_query, conn).iloc[0]['avg_vol']
+            total_avg_volume = self._load_average_volume(conn)
             
             print(f"   이상치 발생일 평균 거래량: {anomaly_avg_volume:,.0f}주")
             print(f"   전체 평균 거래량: {total_avg_volume:,.0f}주")
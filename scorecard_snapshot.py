@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+워런 버핏 스코어카드 조회용 스냅샷 테이블
+buffett_scorecard + company_info(한글 회사명/섹터) + 한글 등급/섹터명을 미리 조인해
+scorecard_view 테이블에 저장하고, 원본이 바뀔 때만 다시 만든다.
+
+- data_version: 원본 테이블 시그니처 해시 (바뀌지 않았으면 재생성 없음)
+- 조회: 필터 / 정렬 / 페이지네이션 / 집계를 모두 SQL로 처리
+
+실행 방법:
+python scorecard_snapshot.py            # 변경 시에만 갱신
+python scorecard_snapshot.py --force    # 강제 재생성
+"""
+
+import sqlite3
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 투자등급 한글 매핑 (유연한 매핑)
+INVESTMENT_GRADE_KOR = {
+    'Strong Buy': '적극매수',
+    'Buy': '매수',
+    'Hold': '보유',
+    'Weak Hold': '약보유',
+    'Avoid': '투자회피',
+    # 추가 가능한 값들
+    'STRONG_BUY': '적극매수',
+    'BUY': '매수',
+    'HOLD': '보유',
+    'WEAK_HOLD': '약보유',
+    'AVOID': '투자회피',
+    'strong_buy': '적극매수',
+    'buy': '매수',
+    'hold': '보유',
+    'weak_hold': '약보유',
+    'avoid': '투자회피'
+}
+
+# 섹터 코드를 한글명으로 매핑
+SECTOR_CODE_MAPPING = {
+    # GICS 섹터 코드 매핑
+    '10': '에너지',
+    '15': '소재',
+    '20': '산업재',
+    '25': '필수소비재',
+    '30': '임의소비재',
+    '35': '건강관리',
+    '40': '금융',
+    '45': '정보기술',
+    '50': '통신서비스',
+    '55': '유틸리티',
+    '60': '부동산',
+
+    # 한국 산업분류 코드 (일부)
+    '28112': 'IT 하드웨어',
+    '581': '통신업',
+    '28520': '화학',
+    '7011': '건설업',
+    '2511': '철강',
+    '31201': '전자부품',
+    '35300': '자동차',
+    '12000': '음식료품',
+    '969': '금융업',
+    '55103': '전기·가스업',
+    '202': '섬유',
+    '64992': '서비스업',
+    '303': '화학',
+    '212': '종이·목재',
+    '66121': '유통업',
+    '108': '비철금속',
+    '20423': '기계',
+    '204': '석유화학',
+    '467': '운송업',
+    '201': '음식료',
+    '649': '기타서비스',
+    '592': '방송통신',
+    '715': '소프트웨어',
+    '2419': '기타제조업',
+
+    # 기본값
+    'default': '기타'
+}
+
+VIEW_COLUMNS = [
+    'stock_code', 'company_name', 'sector', 'sector_name', 'investment_grade', 'grade_kor',
+    'total_score', 'valuation_score', 'profitability_score', 'growth_score', 'financial_health_score',
+    'forward_pe', 'pbr', 'roe', 'current_price', 'target_price', 'upside_potential',
+    'calculation_date',
+]
+
+# 정렬 허용 컬럼 (SQL 식별자 화이트리스트)
+SORTABLE_COLUMNS = ['total_score', 'upside_potential', 'roe', 'pbr', 'forward_pe',
+                    'valuation_score', 'profitability_score', 'growth_score', 'financial_health_score',
+                    'company_name', 'stock_code']
+
+
+def sector_label(sector: Any) -> str:
+    """섹터 코드 → 한글 섹터명 (매핑 없으면 '기타(코드)')"""
+    if sector is None or pd.isna(sector) or str(sector).strip() == '':
+        return SECTOR_CODE_MAPPING['default']
+    return SECTOR_CODE_MAPPING.get(str(sector), f'기타({sector})')
+
+
+def grade_label(grade: Any) -> Optional[str]:
+    """투자등급 → 한글 등급 (매핑 없으면 원본 값)"""
+    if grade is None or pd.isna(grade):
+        return None
+    return INVESTMENT_GRADE_KOR.get(grade, grade)
+
+
+class ScorecardSnapshot:
+    """scorecard_view 스냅샷 생성 및 조회"""
+
+    def __init__(self, db_path: str = 'data/databases/buffett_scorecard.db',
+                 stock_db_path: str = 'data/databases/stock_data.db'):
+        self.db_path = Path(db_path)
+        self.stock_db_path = Path(stock_db_path)
+
+    def exists(self) -> bool:
+        return self.db_path.exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.execute("PRAGMA journal_mode = WAL")
+        return conn
+
+    def _ensure_tables(self, conn: sqlite3.Connection):
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS scorecard_view (
+                stock_code TEXT PRIMARY KEY,
+                company_name TEXT,
+                sector TEXT,
+                sector_name TEXT,
+                investment_grade TEXT,
+                grade_kor TEXT,
+                total_score REAL,
+                valuation_score REAL,
+                profitability_score REAL,
+                growth_score REAL,
+                financial_health_score REAL,
+                forward_pe REAL,
+                pbr REAL,
+                roe REAL,
+                current_price REAL,
+                target_price REAL,
+                upside_potential REAL,
+                calculation_date TEXT,
+                data_version TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_scorecard_view_score ON scorecard_view(total_score DESC);
+            CREATE INDEX IF NOT EXISTS idx_scorecard_view_grade ON scorecard_view(grade_kor, total_score);
+            CREATE INDEX IF NOT EXISTS idx_scorecard_view_sector ON scorecard_view(sector_name, total_score);
+            CREATE TABLE IF NOT EXISTS scorecard_view_meta (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                data_version TEXT NOT NULL,
+                row_count INTEGER,
+                built_at TEXT
+            );
+        """)
+
+    def _attach_stock(self, conn: sqlite3.Connection) -> bool:
+        if not self.stock_db_path.exists():
+            return False
+        conn.execute("ATTACH DATABASE ? AS stock", (f"file:{self.stock_db_path}?mode=ro",))
+        return True
+
+    def _source_version(self, conn: sqlite3.Connection, has_stock: bool) -> str:
+        """원본 시그니처 (행 수 / 최대 id / 최종 수정시각)"""
+        parts = conn.execute(
+            "SELECT COUNT(*), MAX(id), MAX(last_updated) FROM buffett_scorecard"
+        ).fetchone()
+        if has_stock:
+            parts += conn.execute(
+                "SELECT COUNT(*), MAX(id), MAX(updated_at) FROM stock.company_info"
+            ).fetchone()
+        return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+    def current_version(self) -> Optional[str]:
+        """저장된 스냅샷 버전 (없으면 None)"""
+        if not self.exists():
+            return None
+        with self._connect() as conn:
+            self._ensure_tables(conn)
+            row = conn.execute("SELECT data_version FROM scorecard_view_meta WHERE id = 1").fetchone()
+        return row[0] if row else None
+
+    def refresh(self, force: bool = False) -> Optional[str]:
+        """원본이 바뀌었으면 스냅샷 재생성 후 버전 반환"""
+        if not self.exists():
+            return None
+
+        conn = sqlite3.connect(f"file:{self.db_path}", uri=True, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+            self._ensure_tables(conn)
+            has_stock = self._attach_stock(conn)
+            version = self._source_version(conn, has_stock)
+
+            row = conn.execute("SELECT data_version FROM scorecard_view_meta WHERE id = 1").fetchone()
+            if row and row[0] == version and not force:
+                return version
+
+            name_expr = "COALESCE(c.company_name, b.company_name)" if has_stock else "b.company_name"
+            sector_expr = "COALESCE(c.sector, b.sector)" if has_stock else "b.sector"
+            join = "LEFT JOIN stock.company_info c ON c.stock_code = b.stock_code" if has_stock else ""
+
+            df = pd.read_sql_query(f"""
+                SELECT b.stock_code, {name_expr} AS company_name, {sector_expr} AS sector,
+                       b.investment_grade, b.total_score,
+                       b.valuation_score, b.profitability_score, b.growth_score, b.financial_health_score,
+                       b.forward_pe, b.pbr, b.roe, b.current_price, b.target_price, b.upside_potential,
+                       b.calculation_date
+                FROM buffett_scorecard b
+                {join}
+                WHERE b.total_score > 0
+            """, conn)
+
+            df['sector_name'] = [sector_label(s) for s in df['sector']]
+            df['grade_kor'] = [grade_label(g) for g in df['investment_grade']]
+            df['data_version'] = version
+            columns = VIEW_COLUMNS + ['data_version']
+            rows = list(df[columns].astype(object).where(df[columns].notna(), None).itertuples(index=False, name=None))
+
+            # 한 트랜잭션에서 교체 → 조회 측은 이전 또는 새 버전 전체만 봄
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM scorecard_view")
+            conn.executemany(
+                f"INSERT INTO scorecard_view ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                rows
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO scorecard_view_meta (id, data_version, row_count, built_at) VALUES (1, ?, ?, ?)",
+                (version, len(rows), datetime.now().isoformat(timespec='seconds'))
+            )
+            conn.commit()
+            logger.info(f"📋 scorecard_view 재생성: {len(rows):,}개 종목 (version={version})")
+            return version
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------ 조회
+
+    @staticmethod
+    def _where(grades: Sequence[str] = (), sectors: Sequence[str] = (),
+               min_score: float = 0, search: str = '') -> Tuple[str, List]:
+        conditions, params = ["total_score >= ?"], [min_score]
+        if grades:
+            conditions.append(f"grade_kor IN ({', '.join('?' * len(grades))})")
+            params.extend(grades)
+        if sectors:
+            conditions.append(f"sector_name IN ({', '.join('?' * len(sectors))})")
+            params.extend(sectors)
+        if search:
+            conditions.append("(company_name LIKE ? OR stock_code LIKE ?)")
+            params.extend([f'%{search}%', f'%{search}%'])
+        return "WHERE " + " AND ".join(conditions), params
+
+    def filter_options(self) -> Dict[str, Any]:
+        """필터 선택지 (등급 / 섹터 목록)와 전체 통계"""
+        with self._connect() as conn:
+            grades = [r[0] for r in conn.execute(
+                "SELECT grade_kor FROM scorecard_view WHERE grade_kor IS NOT NULL "
+                "GROUP BY grade_kor ORDER BY MAX(total_score) DESC"
+            )]
+            sectors = [r[0] for r in conn.execute(
+                "SELECT DISTINCT sector_name FROM scorecard_view WHERE sector_name IS NOT NULL ORDER BY sector_name"
+            )]
+            total, avg_score = conn.execute("SELECT COUNT(*), AVG(total_score) FROM scorecard_view").fetchone()
+        return {'grades': grades, 'sectors': sectors, 'total': total, 'avg_score': avg_score}
+
+    def query(self, grades: Sequence[str] = (), sectors: Sequence[str] = (), min_score: float = 0,
+              search: str = '', sort_by: str = 'total_score', ascending: bool = False,
+              limit: int = 20, offset: int = 0) -> pd.DataFrame:
+        """필터 + 정렬 + 페이지 조회"""
+        if sort_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"정렬할 수 없는 컬럼: {sort_by}")
+        where, params = self._where(grades, sectors, min_score, search)
+        direction = 'ASC' if ascending else 'DESC'
+        with self._connect() as conn:
+            return pd.read_sql_query(f"""
+                SELECT {', '.join(VIEW_COLUMNS)} FROM scorecard_view
+                {where}
+                ORDER BY {sort_by} IS NULL, {sort_by} {direction}, stock_code
+                LIMIT ? OFFSET ?
+            """, conn, params=params + [limit, offset])
+
+    def summary(self, grades: Sequence[str] = (), sectors: Sequence[str] = (),
+                min_score: float = 0) -> Dict[str, Any]:
+        """필터 결과 요약 (종목 수 / 평균 점수 / 적극매수 수 / 평균 상승여력)"""
+        where, params = self._where(grades, sectors, min_score)
+        with self._connect() as conn:
+            count, avg_score, strong_buy, avg_upside = conn.execute(f"""
+                SELECT COUNT(*), AVG(total_score),
+                       SUM(CASE WHEN grade_kor = '적극매수' THEN 1 ELSE 0 END),
+                       AVG(upside_potential)
+                FROM scorecard_view {where}
+            """, params).fetchone()
+        return {'count': count, 'avg_score': avg_score, 'strong_buy': strong_buy or 0, 'avg_upside': avg_upside}
+
+    def sector_summary(self, grades: Sequence[str] = (), sectors: Sequence[str] = (),
+                       min_score: float = 0) -> pd.DataFrame:
+        """섹터별 평균 점수 / 종목 수 / 평균 상승여력"""
+        where, params = self._where(grades, sectors, min_score)
+        with self._connect() as conn:
+            df = pd.read_sql_query(f"""
+                SELECT sector_name AS 섹터명,
+                       ROUND(AVG(total_score), 1) AS 평균점수,
+                       COUNT(*) AS 종목수,
+                       ROUND(AVG(upside_potential), 1) AS 평균상승여력
+                FROM scorecard_view {where}
+                GROUP BY sector_name
+                ORDER BY 평균점수 DESC
+            """, conn, params=params)
+        return df.set_index('섹터명')
+
+    def metric_columns(self, columns: Sequence[str], grades: Sequence[str] = (),
+                       sectors: Sequence[str] = (), min_score: float = 0) -> pd.DataFrame:
+        """상관분석/산점도용 수치 컬럼만 조회"""
+        invalid = [c for c in columns if c not in VIEW_COLUMNS]
+        if invalid:
+            raise ValueError(f"조회할 수 없는 컬럼: {invalid}")
+        where, params = self._where(grades, sectors, min_score)
+        with self._connect() as conn:
+            return pd.read_sql_query(f"SELECT {', '.join(columns)} FROM scorecard_view {where}", conn, params=params)
+
+    def column_coverage(self, columns: Sequence[str]) -> Dict[str, int]:
+        """컬럼별 유효값(NULL/0 제외) 개수"""
+        invalid = [c for c in columns if c not in VIEW_COLUMNS]
+        if invalid:
+            raise ValueError(f"조회할 수 없는 컬럼: {invalid}")
+        with self._connect() as conn:
+            row = conn.execute("SELECT " + ", ".join(
+                f"SUM(CASE WHEN {c} IS NOT NULL AND {c} != 0 THEN 1 ELSE 0 END)" for c in columns
+            ) + " FROM scorecard_view").fetchone()
+        return {c: (v or 0) for c, v in zip(columns, row)}
+
+    def pbr_stats(self) -> Dict[str, Any]:
+        """유효 PBR 통계"""
+        with self._connect() as conn:
+            count, low, high, avg = conn.execute(
+                "SELECT COUNT(*), MIN(pbr), MAX(pbr), AVG(pbr) FROM scorecard_view WHERE pbr > 0"
+            ).fetchone()
+        return {'count': count, 'min': low, 'max': high, 'avg': avg}
+
+
+def main():
+    """스냅샷 갱신"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='워런 버핏 스코어카드 조회용 스냅샷 갱신')
+    parser.add_argument('--force', action='store_true', help='변경 여부와 관계없이 재생성')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    snapshot = ScorecardSnapshot()
+    if not snapshot.exists():
+        print("❌ 스코어카드 데이터베이스가 없습니다. 먼저 배치 처리를 실행하세요.")
+        return
+
+    version = snapshot.refresh(force=args.force)
+    print(f"✅ scorecard_view 최신 (version={version})")
+
+
+if __name__ == "__main__":
+    main()
@@ -33,6 +33,8 @@ import pandas as pd
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.database.latest_snapshot import LatestSnapshot
+
 class EnhancedBuffettScorecard:
     """Forward 데이터 통합 워런 버핏 스코어카드"""
     
@@ -44,6 +46,7 @@ class EnhancedBuffettScorecard:
         self.stock_db = Path('data/databases/stock_data.db')
         self.yahoo_db = Path('data/databases/yahoo_finance_data.db')
         self.forecast_db = Path('data/databases/forecast_data.db')
+        self._snapshot_ready = False
         
         # 점수 배점 (100점 만점)
         self.score_weights = {
@@ -106,6 +109,32 @@ class EnhancedBuffettScorecard:
         try:
             if not self.dart_db.exists():
                 return {}
+            
+            with sqlite3.connect(self.dart_db) as conn:
+                # 최신 연간 재무 데이터 (실제 컴럼명 사용)
+                cursor = conn.execute('''
+                    SELECT * FROM financial_statements 
+                    WHERE stock_code = ? AND reprt_code = '11011'
+                    ORDER BY bsns_year DESC, created_at DESC 
+                    LIMIT 10
+                ''', (stock_code,))
+                
+                rows = cursor.fetchall()
+                if rows:
+                    columns = [desc[0] for desc in cursor.description]
+                    
+                    # 최신 데이터를 파싱됨
+                    latest_data = dict(zip(columns, rows[0]))
+                    
+                    # 기본 재무 비율 계산
+                    parsed_data = self._parse_dart_financial_statements(rows, columns)
+                    
+                    return parsed_data
+                
+        except Exception as e:
+            self.logger.error(f"DART 데이터 조회 실패 ({stock_code}): {e}")
+        
+        return {}
     
     def _parse_dart_financial_statements(self, rows: List, columns: List) -> Dict[str, Any]:
         """실제 DART 재무제표 데이터 파싱"""
@@ -181,32 +210,6 @@ class EnhancedBuffettScorecard:
         except Exception as e:
             self.logger.error(f"DART 데이터 파싱 실패: {e}")
             return {}
-            
-            with sqlite3.connect(self.dart_db) as conn:
-                # 최신 연간 재무 데이터 (실제 컴럼명 사용)
-                cursor = conn.execute('''
-                    SELECT * FROM financial_statements 
-                    WHERE stock_code = ? AND reprt_code = '11011'
-                    ORDER BY bsns_year DESC, created_at DESC 
-                    LIMIT 10
-                ''', (stock_code,))
-                
-                rows = cursor.fetchall()
-                if rows:
-                    columns = [desc[0] for desc in cursor.description]
-                    
-                    # 최신 데이터를 파싱됨
-                    latest_data = dict(zip(columns, rows[0]))
-                    
-                    # 기본 재무 비율 계산
-                    parsed_data = self._parse_dart_financial_statements(rows, columns)
-                    
-                    return parsed_data
-                
-        except Exception as e:
-            self.logger.error(f"DART 데이터 조회 실패 ({stock_code}): {e}")
-        
-        return {}
     
     def _get_yahoo_financial_data(self, stock_code: str) -> Dict[str, Any]:
         """Yahoo Finance 데이터 조회"""
@@ -265,32 +268,28 @@ class EnhancedBuffettScorecard:
                 return {}
             
             with sqlite3.connect(self.stock_db) as conn:
-                # 최신 주가 정보 (stock_prices 테이블 사용)
+                if not self._snapshot_ready:
+                    LatestSnapshot().ensure(conn)
+                    self._snapshot_ready = True
+                
+                # 최신 주가 + 회사 정보 (latest_snapshot 1행 → stock_prices (stock_code, date) 키 조회)
                 cursor = conn.execute('''
-                    SELECT sp.*, ci.company_name, ci.market_cap, ci.sector
-                    FROM stock_prices sp
-                    LEFT JOIN company_info ci ON sp.stock_code = ci.stock_code
-                    WHERE sp.stock_code = ? 
-                    ORDER BY sp.date DESC 
-                    LIMIT 1
+                    SELECT sp.*, ls.company_name, ls.market_cap, ls.sector
+                    FROM latest_snapshot ls
+                    LEFT JOIN stock_prices sp
+                      ON sp.stock_code = ls.stock_code AND sp.date = ls.price_date
+                    WHERE ls.stock_code = ?
                 ''', (stock_code,))
                 
                 row = cursor.fetchone()
                 if row:
                     columns = [desc[0] for desc in cursor.description]
-                    return dict(zip(columns, row))
-                else:
-                    # stock_prices에 데이터가 없다면 company_info만 조회
-                    cursor = conn.execute('''
-                        SELECT stock_code, company_name, market_cap, sector 
-                        FROM company_info 
-                        WHERE stock_code = ?
-                    ''', (stock_code,))
-                    
-                    row = cursor.fetchone()
-                    if row:
-                        columns = [desc[0] for desc in cursor.description]
-                        return dict(zip(columns, row))
+                    data = dict(zip(columns, row))
+                    if data['stock_code'] is None:
+                        # stock_prices에 데이터가 없다면 company_info 항목만
+                        return {'stock_code': stock_code, 'company_name': data['company_name'],
+                                'market_cap': data['market_cap'], 'sector': data['sector']}
+                    return data
                 
         except Exception as e:
             self.logger.error(f"주가 데이터 조회 실패 ({stock_code}): {e}")
@@ -5,6 +5,7 @@
 
 실행 방법:
 python scripts/analysis/run_integrated_analysis.py --stock_code=005930
+python scripts/analysis/run_integrated_analysis.py --all_stocks --save_to_db
 python scripts/analysis/run_integrated_analysis.py --all_stocks --top=30
 python scripts/analysis/run_integrated_analysis.py --stock_code=005930 --save_to_db
 """
@@ -15,6 +16,7 @@ import argparse
 import json
 import pandas as pd
 from pathlib import Path
+from typing import Optional
 import logging
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
@@ -22,7 +24,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config.database_config import DatabaseConfig
 from config.logging_config import setup_logging
-from src.analysis.integrated.integrated_analyzer import IntegratedAnalyzer
+from src.analysis.integration import IntegratedAnalyzer, ScoreIntegrator, score_row_to_result
 
 def analyze_single_stock(stock_code: str, save_to_db: bool = False, 
                         technical_days: int = 252, sentiment_days: int = 30) -> dict:
@@ -206,61 +208,45 @@ def analyze_single_stock(stock_code: str, save_to_db: bool = False,
     
     return result
 
-def analyze_multiple_stocks(limit: int = 30, save_to_db: bool = False, 
+def analyze_multiple_stocks(limit: Optional[int] = None, save_to_db: bool = False, 
                            technical_days: int = 252, sentiment_days: int = 30) -> list:
-    """다중 종목 통합 분석"""
+    """다중 종목 통합 분석 (전체 종목 일괄 계산, limit 지정 시 시가총액 상위만)"""
     db_config = DatabaseConfig()
     
     try:
-        # 분석할 종목 리스트 조회 (시가총액 상위)
-        with db_config.get_connection('stock') as conn:
-            query = """
-            SELECT stock_code, company_name, market_cap
-            FROM company_info 
-            WHERE market_cap IS NOT NULL AND market_cap > 0
-            ORDER BY market_cap DESC 
-            LIMIT ?
-            """
+        stock_codes = None
+        if limit:
+            # 분석할 종목 리스트 조회 (시가총액 상위)
+            with db_config.get_connection('stock') as conn:
+                query = """
+                SELECT stock_code
+                FROM company_info 
+                WHERE market_cap IS NOT NULL AND market_cap > 0
+                ORDER BY market_cap DESC 
+                LIMIT ?
+                """
+                stock_codes = pd.read_sql(query, conn, params=(limit,))['stock_code'].tolist()
             
-            stocks_df = pd.read_sql(query, conn, params=(limit,))
+            if not stock_codes:
+                print("❌ 분석할 종목을 찾을 수 없습니다.")
+                return []
         
-        if stocks_df.empty:
-            print("❌ 분석할 종목을 찾을 수 없습니다.")
-            return []
-        
-        print(f"\n🔬 다중 종목 통합 분석 (상위 {len(stocks_df)}개 종목)")
+        target = f"상위 {len(stock_codes)}개 종목" if stock_codes else "전체 종목"
+        print(f"\n🔬 다중 종목 통합 분석 ({target})")
         print("=" * 80)
         
-        analyzer = IntegratedAnalyzer()
-        results = []
+        integrator = ScoreIntegrator()
+        scores = integrator.run(stock_codes=stock_codes, save=save_to_db,
+                                technical_days=technical_days, sentiment_days=sentiment_days)
+        scores = scores[scores['total_investment_score'].notna()] if not scores.empty else scores
         
-        for idx, row in stocks_df.iterrows():
-            stock_code = row['stock_code']
-            company_name = row['company_name']
-            
-            print(f"\n진행률: {idx+1}/{len(stocks_df)} - {company_name}({stock_code})")
-            
-            try:
-                result = analyzer.analyze_stock(stock_code, technical_days, sentiment_days)
-                
-                if 'error' not in result:
-                    # 간단한 결과 출력
-                    score = result['total_score']
-                    grade = result['final_grade']
-                    recommendation = result['investment_recommendation']
-                    print(f"  점수: {score:.1f}점 ({grade}) - {recommendation}")
-                    
-                    # 데이터베이스 저장
-                    if save_to_db:
-                        analyzer.save_to_database(result)
-                    
-                    results.append(result)
-                else:
-                    print(f"  ❌ 분석 실패: {result['error']}")
-                
-            except Exception as e:
-                print(f"  ❌ 오류 발생: {e}")
-                continue
+        if scores.empty:
+            print("❌ 통합 점수를 계산할 데이터가 없습니다.")
+            return []
+        
+        results = [score_row_to_result(row, integrator.weights) for _, row in scores.iterrows()]
+        if save_to_db:
+            print(f"✅ investment_scores 저장 완료: {len(results)}개 종목")
         
         # 결과 요약
         if results:
@@ -418,7 +404,7 @@ def main():
     parser = argparse.ArgumentParser(description='통합 분석 실행')
     parser.add_argument('--stock_code', type=str, help='분석할 종목코드 (예: 005930)')
     parser.add_argument('--all_stocks', action='store_true', help='전체 종목 분석')
-    parser.add_argument('--top', type=int, default=30, help='분석할 상위 종목 수 (기본값: 30)')
+    parser.add_argument('--top', type=int, help='시가총액 상위 N개 종목만 분석 (기본값: 전체 종목)')
     parser.add_argument('--technical_days', type=int, default=252, help='기술분석 기간 (일수, 기본값: 252)')
     parser.add_argument('--sentiment_days', type=int, default=30, help='감정분석 기간 (일수, 기본값: 30)')
     parser.add_argument('--save_to_db', action='store_true', help='결과를 데이터베이스에 저장')
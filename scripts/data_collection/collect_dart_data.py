@@ -6,6 +6,7 @@ DART Open API를 활용한 기업 재무제표 및 공시정보 수집
 실행 방법:
 python scripts/data_collection/collect_dart_data.py --year=2023 --quarter=4
 python scripts/data_collection/collect_dart_data.py --corp_code=00126380 --all_years
+python scripts/data_collection/collect_dart_data.py --disclosures --incremental
 """
 
 import sys
@@ -16,16 +17,18 @@ import pandas as pd
 import requests
 import xml.etree.ElementTree as ET
 import zipfile
-import io
+import tempfile
 from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 import time
+import re
 
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config import ConfigManager
+from src.utils.http_cache import CachedHTTPFetcher
 
 class DartDataCollector:
     """DART 데이터 수집 클래스"""
@@ -43,75 +46,223 @@ class DartDataCollector:
         if not self.api_key:
             raise ValueError("DART API 키가 설정되지 않았습니다. .env 파일을 확인하세요.")
         
+        # 재무제표 응답 디스크 캐시 (부분 실패 후 재실행 시 로컬 응답 재사용)
+        self.http = CachedHTTPFetcher()
+        
+        # 신규 공시 → 종목별 후속 처리 핸들러 [(조건, 핸들러)]
+        self.disclosure_handlers = []
+        self.register_disclosure_handler(self._is_periodic_report, self._handle_periodic_report)
+        
         self.logger.info("DART 데이터 수집기 초기화 완료")
     
+    # corp_codes 스키마 (config/database_config.py와 동일) + 증분 upsert용 유니크 인덱스
+    CORP_CODES_SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS corp_codes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            corp_code TEXT UNIQUE NOT NULL,
+            corp_name TEXT NOT NULL,
+            stock_code TEXT,
+            modify_date TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    '''
+    
+    # 자연키 기반 UPSERT 대상 테이블 정의
+    # - account_id는 비표준 계정에서 '-표준계정코드 미사용-'로 중복되므로 account_nm까지 키에 포함
+    DART_UPSERT_TABLES = {
+        'financial_statements': {
+            'schema': '''
+                CREATE TABLE IF NOT EXISTS financial_statements (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    corp_code TEXT NOT NULL,
+                    bsns_year TEXT NOT NULL,
+                    reprt_code TEXT NOT NULL,
+                    fs_div TEXT NOT NULL DEFAULT '',
+                    fs_nm TEXT,
+                    sj_div TEXT NOT NULL DEFAULT '',
+                    sj_nm TEXT,
+                    account_id TEXT NOT NULL DEFAULT '',
+                    account_nm TEXT NOT NULL DEFAULT '',
+                    thstrm_amount REAL,
+                    frmtrm_amount REAL,
+                    bfefrmtrm_amount REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''',
+            'key': ['corp_code', 'bsns_year', 'reprt_code', 'fs_div', 'sj_div', 'account_id', 'account_nm'],
+            'columns': ['corp_code', 'bsns_year', 'reprt_code', 'fs_div', 'fs_nm', 'sj_div', 'sj_nm',
+                        'account_id', 'account_nm', 'thstrm_amount', 'frmtrm_amount', 'bfefrmtrm_amount'],
+        },
+        'disclosures': {
+            'schema': '''
+                CREATE TABLE IF NOT EXISTS disclosures (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    corp_code TEXT NOT NULL,
+                    corp_name TEXT,
+                    stock_code TEXT,
+                    rcept_no TEXT NOT NULL,
+                    report_nm TEXT,
+                    rcept_dt TEXT,
+                    flr_nm TEXT,
+                    rm TEXT,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''',
+            'key': ['rcept_no'],
+            'columns': ['corp_code', 'corp_name', 'stock_code', 'rcept_no', 'report_nm',
+                        'rcept_dt', 'flr_nm', 'rm'],
+        },
+    }
+    
+    def _download_corp_code_archive(self):
+        """기업코드 ZIP 파일을 임시 파일로 스트리밍 다운로드 (실패 시 None)"""
+        url = f"{self.base_url}/corpCode.xml"
+        params = {'crtfc_key': self.api_key}
+        
+        self.logger.info("기업코드 파일 다운로드 중...")
+        response = requests.get(url, params=params, timeout=30, stream=True)
+        response.raise_for_status()
+        
+        # 응답이 JSON 에러인지 확인
+        if response.headers.get('content-type', '').startswith('application/json'):
+            try:
+                error_data = response.json()
+                self.logger.error(f"DART API 오류: {error_data.get('message', 'Unknown API error')}")
+            except ValueError:
+                self.logger.error("DART API 오류: 알 수 없는 JSON 응답")
+            return None
+        
+        # 8MB까지는 메모리, 넘으면 디스크로 넘김
+        archive = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        size = 0
+        for chunk in response.iter_content(chunk_size=256 * 1024):
+            archive.write(chunk)
+            size += len(chunk)
+        self.logger.debug(f"응답 크기: {size} bytes")
+        
+        # ZIP 파일 여부 확인
+        archive.seek(0)
+        if archive.read(2) != b'PK':
+            archive.seek(0)
+            self.logger.error("응답이 ZIP 파일이 아닙니다.")
+            self.logger.debug(f"응답 시작 부분: {archive.read(100)}")
+            archive.close()
+            return None
+        
+        archive.seek(0)
+        return archive
+    
+    def iter_corp_codes(self, archive):
+        """ZIP 내부 CORPCODE.xml을 iterparse로 스트리밍 파싱 (상장/비상장 전체)"""
+        with zipfile.ZipFile(archive) as zip_file:
+            with zip_file.open('CORPCODE.xml') as xml_stream:
+                root = None
+                for event, elem in ET.iterparse(xml_stream, events=('start', 'end')):
+                    if root is None:
+                        root = elem
+                        continue
+                    if event != 'end' or elem.tag != 'list':
+                        continue
+                    
+                    # 자식 요소를 한 번만 순회
+                    fields = {child.tag: (child.text or '').strip() for child in elem}
+                    yield {
+                        'corp_code': fields.get('corp_code', ''),
+                        'corp_name': fields.get('corp_name', ''),
+                        'stock_code': fields.get('stock_code', ''),
+                        'modify_date': fields.get('modify_date', '')
+                    }
+                    
+                    # 처리한 요소 해제 (메모리 일정 유지)
+                    root.clear()
+    
     def download_corp_codes(self):
-        """기업 고유번호 다운로드 및 파싱"""
+        """기업코드 다운로드 및 파싱 (상장기업 DataFrame)"""
         try:
-            # DART 기업코드 ZIP 파일 다운로드
-            url = f"{self.base_url}/corpCode.xml"
-            params = {'crtfc_key': self.api_key}
-            
-            self.logger.info("기업코드 파일 다운로드 중...")
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            
-            # 응답 내용 확인
-            self.logger.debug(f"응답 크기: {len(response.content)} bytes")
-            self.logger.debug(f"Content-Type: {response.headers.get('content-type', 'unknown')}")
-            
-            # 응답이 JSON 에러인지 확인
-            try:
-                if response.headers.get('content-type', '').startswith('application/json'):
-                    error_data = response.json()
-                    if error_data.get('status') != '000':
-                        error_msg = error_data.get('message', 'Unknown API error')
-                        self.logger.error(f"DART API 오류: {error_msg}")
-                        return pd.DataFrame()
-            except:
-                pass  # JSON이 아닌 경우 무시
-            
-            # ZIP 파일 여부 확인
-            if not response.content.startswith(b'PK'):
-                self.logger.error("응답이 ZIP 파일이 아닙니다.")
-                self.logger.debug(f"응답 시작 부분: {response.content[:100]}")
-                return pd.DataFrame()
-            
-            # ZIP 파일 압축 해제
-            try:
-                with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
-                    xml_content = zip_file.read('CORPCODE.xml')
-            except zipfile.BadZipFile as e:
-                self.logger.error(f"ZIP 파일 해제 실패: {e}")
-                self.logger.debug(f"응답 내용: {response.content[:200]}")
+            archive = self._download_corp_code_archive()
+            if archive is None:
                 return pd.DataFrame()
             
-            # XML 파싱
-            root = ET.fromstring(xml_content)
-            
-            corp_data = []
-            for corp in root.findall('list'):
-                corp_info = {
-                    'corp_code': corp.find('corp_code').text if corp.find('corp_code') is not None else '',
-                    'corp_name': corp.find('corp_name').text if corp.find('corp_name') is not None else '',
-                    'stock_code': corp.find('stock_code').text if corp.find('stock_code') is not None else '',
-                    'modify_date': corp.find('modify_date').text if corp.find('modify_date') is not None else '',
-                    'created_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                    'updated_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                }
-                
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            with archive:
                 # 주식코드가 있는 상장기업만 수집
-                if corp_info['stock_code']:
-                    corp_data.append(corp_info)
+                corp_data = [
+                    dict(corp, created_at=now, updated_at=now)
+                    for corp in self.iter_corp_codes(archive) if corp['stock_code']
+                ]
             
             self.logger.info(f"기업코드 파싱 완료: {len(corp_data)}개 상장기업")
             return pd.DataFrame(corp_data)
             
+        except zipfile.BadZipFile as e:
+            self.logger.error(f"ZIP 파일 해제 실패: {e}")
+            return pd.DataFrame()
         except Exception as e:
             self.logger.error(f"기업코드 다운로드 실패: {e}")
             return pd.DataFrame()
     
-    def get_financial_statements(self, corp_code, bsns_year, reprt_code='11011'):
+    def sync_corp_codes(self):
+        """기업코드 증분 동기화 - modify_date가 바뀐 행만 upsert
+        
+        테이블을 교체하지 않으므로 corp_codes 인덱스가 유지된다.
+        Returns: {'total': 파싱 건수, 'changed': upsert 건수} 또는 실패 시 None
+        """
+        try:
+            archive = self._download_corp_code_archive()
+            if archive is None:
+                return None
+            
+            conn = self.config_manager.get_database_connection('dart')
+            try:
+                conn.execute(self.CORP_CODES_SCHEMA)
+                conn.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_corp_codes_code ON corp_codes(corp_code)')
+                conn.execute('CREATE INDEX IF NOT EXISTS idx_corp_codes_stock ON corp_codes(stock_code)')
+                
+                existing = dict(conn.execute('SELECT corp_code, modify_date FROM corp_codes'))
+                now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                
+                total = 0
+                changed = []
+                with archive:
+                    for corp in self.iter_corp_codes(archive):
+                        total += 1
+                        corp_code = corp['corp_code']
+                        if corp_code in existing:
+                            if existing[corp_code] == corp['modify_date']:
+                                continue
+                        elif not corp['stock_code']:
+                            # 신규 비상장 기업은 저장하지 않음
+                            continue
+                        changed.append((corp_code, corp['corp_name'], corp['stock_code'],
+                                        corp['modify_date'], now, now))
+                
+                conn.executemany('''
+                    INSERT INTO corp_codes (corp_code, corp_name, stock_code, modify_date, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(corp_code) DO UPDATE SET
+                        corp_name = excluded.corp_name,
+                        stock_code = excluded.stock_code,
+                        modify_date = excluded.modify_date,
+                        updated_at = excluded.updated_at
+                ''', changed)
+                conn.commit()
+            finally:
+                conn.close()
+            
+            self.logger.info(f"기업코드 동기화 완료: 전체 {total:,}건 중 변경 {len(changed):,}건 반영")
+            return {'total': total, 'changed': len(changed)}
+            
+        except zipfile.BadZipFile as e:
+            self.logger.error(f"ZIP 파일 해제 실패: {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"기업코드 동기화 실패: {e}")
+            return None
+    
+    def get_financial_statements(self, corp_code, bsns_year, reprt_code='11011', force=False):
         """재무제표 데이터 수집"""
         try:
             url = f"{self.base_url}/fnlttSinglAcntAll.json"
@@ -123,7 +274,7 @@ class DartDataCollector:
                 'fs_div': 'OFS'  # OFS: 개별재무제표, CFS: 연결재무제표
             }
             
-            response = requests.get(url, params=params, timeout=30)
+            response = self.http.fetch(url, params=params, source='dart', timeout=30, force=force)
             response.raise_for_status()
             data = response.json()
             
@@ -140,6 +291,9 @@ class DartDataCollector:
                     'reprt_code': reprt_code,
                     'fs_div': item.get('fs_div', ''),
                     'fs_nm': item.get('fs_nm', ''),
+                    'sj_div': item.get('sj_div', ''),
+                    'sj_nm': item.get('sj_nm', ''),
+                    'account_id': item.get('account_id', ''),
                     'account_nm': item.get('account_nm', ''),
                     'thstrm_amount': self._parse_amount(item.get('thstrm_amount', '')),  # 당기금액
                     'frmtrm_amount': self._parse_amount(item.get('frmtrm_amount', '')),   # 전기금액
@@ -199,6 +353,210 @@ class DartDataCollector:
             self.logger.error(f"공시정보 수집 실패 ({corp_code}): {e}")
             return pd.DataFrame()
     
+    # =========================================================================
+    # 시장 전체 증분 공시 피드 (일자별 list.json, corp_code 필터 없음)
+    # =========================================================================
+    
+    # 정기보고서 보고서명 → 보고서 코드
+    PERIODIC_REPORT_PATTERN = re.compile(r'(사업보고서|반기보고서|분기보고서)\s*\((\d{4})\.(\d{2})\)')
+    
+    def register_disclosure_handler(self, predicate, handler):
+        """신규 공시 핸들러 등록 (predicate(disclosure) 가 참이면 handler(disclosure) 호출)"""
+        self.disclosure_handlers.append((predicate, handler))
+    
+    def _get_feed_watermark(self, conn):
+        """마지막으로 처리한 (rcept_dt, rcept_no) 조회"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS sync_watermarks (
+                name TEXT PRIMARY KEY,
+                rcept_dt TEXT,
+                rcept_no TEXT,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        row = conn.execute(
+            "SELECT rcept_dt, rcept_no FROM sync_watermarks WHERE name = 'disclosure_feed'"
+        ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+    
+    def _set_feed_watermark(self, conn, rcept_dt, rcept_no):
+        """워터마크 갱신"""
+        conn.execute('''
+            INSERT INTO sync_watermarks (name, rcept_dt, rcept_no, updated_at)
+            VALUES ('disclosure_feed', ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                rcept_dt = excluded.rcept_dt,
+                rcept_no = excluded.rcept_no,
+                updated_at = excluded.updated_at
+        ''', (rcept_dt, rcept_no, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    
+    def _get_stored_rcept_nos(self, conn, day):
+        """해당 일자에 이미 저장된 공시의 rcept_no 집합"""
+        exists = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'disclosures'"
+        ).fetchone()
+        if not exists:
+            return set()
+        # rcept_no 앞 8자리가 접수일자 (DART 자체 00xxxx, KRX 80xxxx 모두 동일)
+        rows = conn.execute(
+            "SELECT rcept_no FROM disclosures WHERE rcept_dt = ? OR rcept_no LIKE ?",
+            (day, f"{day}%")
+        ).fetchall()
+        return {row[0] for row in rows}
+    
+    def get_market_disclosures(self, date_str):
+        """특정 일자의 시장 전체 공시 목록 (상장사만, 전체 페이지)"""
+        url = f"{self.base_url}/list.json"
+        day = date_str.replace('-', '')
+        rows = []
+        page_no = 1
+        
+        while True:
+            params = {
+                'crtfc_key': self.api_key,
+                'bgn_de': day,
+                'end_de': day,
+                'page_no': page_no,
+                'page_count': 100  # DART 최대값
+            }
+            response = requests.get(url, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            
+            if data.get('status') == '013':  # 조회된 데이터 없음
+                break
+            if data.get('status') != '000':
+                raise RuntimeError(f"공시 목록 조회 실패 ({day}): {data.get('message', 'Unknown error')}")
+            
+            now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            for item in data.get('list', []):
+                if not item.get('stock_code', '').strip():
+                    continue
+                rows.append({
+                    'corp_code': item.get('corp_code', ''),
+                    'corp_name': item.get('corp_name', ''),
+                    'stock_code': item.get('stock_code', '').strip(),
+                    'report_nm': item.get('report_nm', '').strip(),
+                    'rcept_no': item.get('rcept_no', ''),
+                    'flr_nm': item.get('flr_nm', ''),
+                    'rcept_dt': item.get('rcept_dt', ''),
+                    'rm': item.get('rm', ''),
+                    'created_at': now
+                })
+            
+            if page_no >= int(data.get('total_page', 1) or 1):
+                break
+            page_no += 1
+            time.sleep(0.15)
+        
+        return pd.DataFrame(rows)
+    
+    def sync_disclosure_feed(self, days=7, dispatch=True):
+        """시장 전체 공시 증분 동기화
+        
+        워터마크(rcept_dt) 일자부터 오늘까지 일자별로 한 번씩 조회한다.
+        워터마크가 없으면 최근 days일을 조회한다. 같은 날에도 DART 접수분
+        (YYYYMMDD00xxxx)과 거래소 접수분(YYYYMMDD80xxxx)이 섞여 들어오므로
+        rcept_no 대소 비교 대신 해당 일자에 이미 저장된 rcept_no를 제외한
+        공시만 신규로 보고 등록된 핸들러에 전달한다.
+        """
+        try:
+            conn = self.config_manager.get_database_connection('dart')
+            try:
+                last_dt, last_no = self._get_feed_watermark(conn)
+            finally:
+                conn.close()
+            
+            end_date = datetime.now().date()
+            if last_dt:
+                start_date = datetime.strptime(last_dt, '%Y%m%d').date()
+            else:
+                start_date = end_date - timedelta(days=days)
+            
+            self.logger.info(f"📅 공시 피드 동기화: {start_date} ~ {end_date} (워터마크: {last_no or '없음'})")
+            
+            total_new = 0
+            handled = 0
+            current = start_date
+            while current <= end_date:
+                day = current.strftime('%Y%m%d')
+                disclosures = self.get_market_disclosures(day)
+                new_count = 0
+                
+                if not disclosures.empty:
+                    conn = self.config_manager.get_database_connection('dart')
+                    try:
+                        stored = self._get_stored_rcept_nos(conn, day)
+                    finally:
+                        conn.close()
+                    
+                    new_rows = disclosures[~disclosures['rcept_no'].isin(stored)]
+                    new_rows = new_rows.drop_duplicates('rcept_no', keep='last').sort_values('rcept_no')
+                    
+                    if not new_rows.empty:
+                        if not self.save_to_database(disclosure_data=new_rows):
+                            raise RuntimeError(f"공시 저장 실패 ({day})")
+                        new_count = len(new_rows)
+                        total_new += new_count
+                        
+                        if dispatch:
+                            for disclosure in new_rows.to_dict('records'):
+                                handled += self._dispatch_disclosure(disclosure)
+                        
+                        last_no = max(last_no or '', new_rows['rcept_no'].iloc[-1])
+                
+                # 일자 단위로 워터마크 커밋 (중간 실패 시 해당 일자부터 재개)
+                conn = self.config_manager.get_database_connection('dart')
+                try:
+                    self._set_feed_watermark(conn, day, last_no or '')
+                    conn.commit()
+                finally:
+                    conn.close()
+                
+                self.logger.info(f"  {day}: 상장사 공시 {len(disclosures):,}건 (신규 {new_count:,}건)")
+                current += timedelta(days=1)
+            
+            self.logger.info(f"✅ 공시 피드 동기화 완료: 신규 {total_new:,}건, 후속 처리 {handled:,}건")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"공시 피드 동기화 실패: {e}")
+            return False
+    
+    def _dispatch_disclosure(self, disclosure):
+        """등록된 핸들러에 신규 공시 전달 (처리한 핸들러 수 반환)"""
+        handled = 0
+        for predicate, handler in self.disclosure_handlers:
+            try:
+                if predicate(disclosure):
+                    handler(disclosure)
+                    handled += 1
+            except Exception as e:
+                self.logger.warning(f"⚠️ 공시 핸들러 실패 ({disclosure.get('rcept_no')}): {e}")
+        return handled
+    
+    def _is_periodic_report(self, disclosure):
+        """정기보고서(사업/반기/분기) 여부"""
+        return bool(self.PERIODIC_REPORT_PATTERN.search(disclosure.get('report_nm', '')))
+    
+    def _handle_periodic_report(self, disclosure):
+        """정기보고서 접수 시 해당 기간 재무제표 재수집"""
+        match = self.PERIODIC_REPORT_PATTERN.search(disclosure.get('report_nm', ''))
+        report_type, year, month = match.group(1), match.group(2), match.group(3)
+        
+        if report_type == '사업보고서':
+            reprt_code = '11011'
+        elif report_type == '반기보고서':
+            reprt_code = '11012'
+        else:
+            reprt_code = '11013' if month in ('01', '02', '03', '04') else '11014'
+        
+        # 정정공시 반영을 위해 캐시를 거치지 않고 새로 조회
+        financial_data = self.get_financial_statements(disclosure['corp_code'], year, reprt_code, force=True)
+        if not financial_data.empty:
+            self.save_to_database(financial_data=financial_data)
+            self.logger.info(f"📑 {disclosure.get('corp_name')} {report_type}({year}.{month}) 재무제표 갱신")
+    
     def _parse_amount(self, amount_str):
         """금액 문자열을 숫자로 변환"""
         if not amount_str or amount_str == '-':
@@ -211,28 +569,239 @@ class DartDataCollector:
         except:
             return None
     
+    def _natural_key_index(self, table):
+        """자연키 유니크 인덱스 이름"""
+        return f"uq_{table}_natural_key"
+    
+    def _ensure_upsert_table(self, conn, table):
+        """UPSERT 대상 테이블 준비 (필요 시 1회성 중복 제거 마이그레이션)"""
+        conn.execute(self.DART_UPSERT_TABLES[table]['schema'])
+        if self._has_natural_key_index(conn, table):
+            return
+        
+        self._migrate_upsert_table(conn, table)
+    
+    def _unique_indexes(self, conn, table):
+        """유니크 인덱스 {이름: (생성 경로 c/u/pk, 컬럼 집합)}"""
+        return {
+            row[1]: (row[3], frozenset(c[2] for c in conn.execute(f"PRAGMA index_info('{row[1]}')")))
+            for row in conn.execute(f"PRAGMA index_list({table})")
+            if row[2]
+        }
+    
+    def _has_natural_key_index(self, conn, table):
+        """자연키 컬럼 집합과 정확히 같은 유니크 인덱스(제약) 존재 여부 - ON CONFLICT 대상"""
+        key_set = frozenset(self.DART_UPSERT_TABLES[table]['key'])
+        return any(cols == key_set for _, cols in self._unique_indexes(conn, table).values())
+    
+    @staticmethod
+    def _split_table_definitions(create_sql):
+        """CREATE TABLE 문 → (머리, 컬럼/제약 정의 목록) - 괄호·따옴표 안의 쉼표는 무시"""
+        start = create_sql.index('(')
+        end = create_sql.rindex(')')
+        body = create_sql[start + 1:end]
+        
+        definitions, depth, quote, current = [], 0, None, ''
+        for char in body:
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '\'"`[':
+                quote = ']' if char == '[' else char
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth -= 1
+            elif char == ',' and depth == 0:
+                definitions.append(current.strip())
+                current = ''
+                continue
+            current += char
+        if current.strip():
+            definitions.append(current.strip())
+        return create_sql[:start], definitions
+    
+    def _dedup_table_sql(self, create_sql, table, key_cols):
+        """원본 DDL에서 자연키와 다른 UNIQUE 제약만 빼고 자연키 UNIQUE를 더한 재생성용 DDL
+        
+        NOT NULL / DEFAULT / CHECK 등 나머지 정의는 원본 그대로 유지한다.
+        """
+        _, definitions = self._split_table_definitions(create_sql)
+        def unquote(name):
+            return name.strip().strip('"`[]\'')
+        
+        key_set = frozenset(key_cols)
+        
+        kept, has_key = [], False
+        for definition in definitions:
+            table_unique = re.match(r'(?is)^(CONSTRAINT\s+\S+\s+)?UNIQUE\s*\((.*)\)', definition)
+            if table_unique:
+                cols = frozenset(unquote(col.split()[0]) for col in table_unique.group(2).split(','))
+                if cols != key_set:
+                    continue
+                has_key = True
+            elif not re.match(r'(?i)^(CONSTRAINT|PRIMARY|CHECK|FOREIGN)\b', definition):
+                # 컬럼 단위 UNIQUE (단일 컬럼 자연키가 아니면 제거)
+                column = unquote(definition.split()[0])
+                if re.search(r'(?i)\bUNIQUE\b', definition):
+                    if {column} == key_set:
+                        has_key = True
+                    else:
+                        definition = re.sub(r'(?i)\s+UNIQUE\b(\s+ON\s+CONFLICT\s+\w+)?', '', definition)
+            kept.append(definition)
+        
+        if not has_key:
+            kept.append(f"UNIQUE ({', '.join(key_cols)})")
+        return f"CREATE TABLE {table}_dedup (\n    " + ',\n    '.join(kept) + "\n)"
+    
+    def _migrate_upsert_table(self, conn, table):
+        """기존 테이블 중복 제거 + 자연키 유니크 인덱스 생성 (1회성)
+        
+        to_sql(append)로 쌓인 중복 행은 자연키별 가장 최근 행(rowid 최대)만 남긴다.
+        다른 컬럼 조합의 UNIQUE 제약이 있는 구버전 테이블은 원본 DDL(sqlite_master.sql)에서
+        그 제약만 자연키 UNIQUE로 바꿔 재생성하고, 기존 보조 인덱스·트리거도 다시 만든다.
+        """
+        spec = self.DART_UPSERT_TABLES[table]
+        key_cols = spec['key']
+        key_set = frozenset(key_cols)
+        index_name = self._natural_key_index(table)
+        
+        # 누락 컬럼 추가 (to_sql로 만들어진 테이블 대응)
+        existing_cols = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+        for col in spec['columns'] + ['created_at', 'updated_at']:
+            if col not in existing_cols:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {col} TEXT")
+                existing_cols.append(col)
+        
+        # 유니크 인덱스는 NULL을 서로 다른 값으로 보므로 키 컬럼 NULL을 ''로 정규화
+        for col in key_cols:
+            conn.execute(f"UPDATE {table} SET {col} = '' WHERE {col} IS NULL")
+        
+        before = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        key_list = ', '.join(key_cols)
+        
+        # 자연키와 다른 UNIQUE 제약(예: corp_code, bsns_year, reprt_code, account_nm)
+        # - CREATE UNIQUE INDEX로 만든 것은 인덱스만 삭제, 테이블 정의에 있는 것은 재생성
+        unique_indexes = self._unique_indexes(conn, table)
+        conflicting = {name: origin for name, (origin, cols) in unique_indexes.items()
+                       if origin != 'pk' and cols != key_set}
+        for name, origin in conflicting.items():
+            if origin == 'c':
+                conn.execute(f'DROP INDEX "{name}"')
+        
+        if any(origin == 'u' for origin in conflicting.values()):
+            create_sql = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()[0]
+            # 원본 보조 인덱스·트리거 (자동 인덱스는 sql이 NULL, DROP TABLE 시 함께 삭제됨)
+            dependents = conn.execute(
+                "SELECT type, name, sql FROM sqlite_master "
+                "WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+                (table,)
+            ).fetchall()
+            col_list = ', '.join(existing_cols)
+            
+            conn.execute(f"DROP TABLE IF EXISTS {table}_dedup")
+            conn.execute(self._dedup_table_sql(create_sql, table, key_cols))
+            conn.execute(f'''
+                INSERT INTO {table}_dedup ({col_list})
+                SELECT {col_list} FROM {table}
+                WHERE rowid IN (SELECT MAX(rowid) FROM {table} GROUP BY {key_list})
+            ''')
+            conn.execute(f"DROP TABLE {table}")
+            conn.execute(f"ALTER TABLE {table}_dedup RENAME TO {table}")
+            
+            for kind, name, sql in dependents:
+                # 새 DDL의 자연키 UNIQUE와 겹치는 자연키 인덱스는 다시 만들지 않음
+                if kind == 'index' and name == index_name:
+                    continue
+                conn.execute(sql)
+        else:
+            conn.execute(f'''
+                DELETE FROM {table}
+                WHERE rowid NOT IN (SELECT MAX(rowid) FROM {table} GROUP BY {key_list})
+            ''')
+        
+        if not self._has_natural_key_index(conn, table):
+            conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {index_name} ON {table}({key_list})")
+        after = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.commit()
+        
+        self.logger.info(f"🧹 {table} 중복 제거 마이그레이션 완료: {before:,}건 → {after:,}건")
+    
+    def migrate_dart_tables(self):
+        """financial_statements / disclosures 중복 제거 마이그레이션 실행"""
+        try:
+            conn = self.config_manager.get_database_connection('dart')
+            try:
+                for table in self.DART_UPSERT_TABLES:
+                    conn.execute(self.DART_UPSERT_TABLES[table]['schema'])
+                    self._migrate_upsert_table(conn, table)
+            finally:
+                conn.close()
+            return True
+        except Exception as e:
+            self.logger.error(f"DART 테이블 마이그레이션 실패: {e}")
+            return False
+    
+    def _upsert_dataframe(self, conn, table, df):
+        """임시 테이블에 적재 후 단일 INSERT ... ON CONFLICT DO UPDATE로 병합"""
+        spec = self.DART_UPSERT_TABLES[table]
+        self._ensure_upsert_table(conn, table)
+        
+        columns = spec['columns']
+        key_cols = spec['key']
+        staging = f"staging_{table}"
+        
+        frame = df.reindex(columns=columns)
+        for col in key_cols:
+            frame[col] = frame[col].fillna('').astype(str)
+        
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        conn.execute(f"DROP TABLE IF EXISTS temp.{staging}")
+        conn.execute(f"CREATE TEMP TABLE {staging} ({', '.join(columns)})")
+        conn.executemany(
+            f"INSERT INTO temp.{staging} VALUES ({', '.join('?' * len(columns))})",
+            frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None)
+        )
+        
+        col_list = ', '.join(columns)
+        update_list = ', '.join(f"{col} = excluded.{col}" for col in columns if col not in key_cols)
+        # 스테이징 내부 중복은 마지막 행 우선 (rowid 최대)
+        conn.execute(f'''
+            INSERT INTO {table} ({col_list}, created_at, updated_at)
+            SELECT {col_list}, ?, ? FROM temp.{staging}
+            WHERE rowid IN (SELECT MAX(rowid) FROM temp.{staging} GROUP BY {', '.join(key_cols)})
+            ON CONFLICT({', '.join(key_cols)}) DO UPDATE SET
+                {update_list},
+                updated_at = excluded.updated_at
+        ''', (now, now))
+        conn.execute(f"DROP TABLE temp.{staging}")
+    
     def save_to_database(self, corp_data=None, financial_data=None, disclosure_data=None):
-        """데이터베이스에 저장"""
+        """데이터베이스에 저장 (재실행해도 중복 행이 생기지 않도록 자연키 UPSERT)"""
         try:
             conn = self.config_manager.get_database_connection('dart')
             
-            # 기업코드 저장
-            if corp_data is not None and not corp_data.empty:
-                corp_data.to_sql('corp_codes', conn, if_exists='replace', index=False)
-                self.logger.info(f"기업코드 저장 완료: {len(corp_data)}건")
-            
-            # 재무제표 저장
-            if financial_data is not None and not financial_data.empty:
-                financial_data.to_sql('financial_statements', conn, if_exists='append', index=False)
-                self.logger.info(f"재무제표 저장 완료: {len(financial_data)}건")
-            
-            # 공시정보 저장
-            if disclosure_data is not None and not disclosure_data.empty:
-                disclosure_data.to_sql('disclosures', conn, if_exists='append', index=False)
-                self.logger.info(f"공시정보 저장 완료: {len(disclosure_data)}건")
-            
-            conn.commit()
-            conn.close()
+            try:
+                # 기업코드 저장
+                if corp_data is not None and not corp_data.empty:
+                    corp_data.to_sql('corp_codes', conn, if_exists='replace', index=False)
+                    self.logger.info(f"기업코드 저장 완료: {len(corp_data)}건")
+                
+                # 재무제표 저장
+                if financial_data is not None and not financial_data.empty:
+                    self._upsert_dataframe(conn, 'financial_statements', financial_data)
+                    self.logger.info(f"재무제표 저장 완료: {len(financial_data)}건")
+                
+                # 공시정보 저장
+                if disclosure_data is not None and not disclosure_data.empty:
+                    self._upsert_dataframe(conn, 'disclosures', disclosure_data)
+                    self.logger.info(f"공시정보 저장 완료: {len(disclosure_data)}건")
+                
+                conn.commit()
+            finally:
+                conn.close()
             return True
             
         except Exception as e:
@@ -243,12 +812,10 @@ class DartDataCollector:
         """기업코드 수집 및 저장"""
         self.logger.info("기업코드 수집 시작")
         
-        corp_data = self.download_corp_codes()
-        if not corp_data.empty:
-            success = self.save_to_database(corp_data=corp_data)
-            if success:
-                self.logger.info("✅ 기업코드 수집 완료")
-                return True
+        result = self.sync_corp_codes()
+        if result is not None:
+            self.logger.info("✅ 기업코드 수집 완료")
+            return True
         
         return False
     
@@ -293,13 +860,15 @@ class DartDataCollector:
                         self.logger.info(f"진행률: {current_count}/{total_count} - {corp_name}({corp_code}) {year}년 {quarter}분기")
                         
                         # 재무제표 수집
+                        network_before = self.http.get_stats()['network']
                         financial_data = self.get_financial_statements(corp_code, year, reprt_code)
                         
                         if not financial_data.empty:
                             self.save_to_database(financial_data=financial_data)
                         
-                        # API 호출 제한 대응 (초당 10회 제한)
-                        time.sleep(0.1)
+                        # API 호출 제한 대응 (초당 10회 제한) - 캐시 응답이면 생략
+                        if self.http.get_stats()['network'] > network_before:
+                            time.sleep(0.1)
             
             self.logger.info("✅ 재무데이터 수집 완료")
             return True
@@ -410,6 +979,9 @@ def main():
     parser.add_argument('--quarter', type=int, choices=[1, 2, 3, 4], help='수집 분기')
     parser.add_argument('--days', type=int, default=90, help='공시정보 수집 기간 (일수, 기본값: 90일 = 3개월)')
     parser.add_argument('--all', action='store_true', help='전체 데이터 수집 (기업코드+재무+공시)')
+    parser.add_argument('--migrate', action='store_true', help='재무제표/공시 중복 제거 마이그레이션 (1회성)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='공시정보를 시장 전체 일자별 피드로 증분 수집 (--disclosures와 함께 사용)')
     parser.add_argument('--log_level', type=str, default='INFO',
                        choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
                        help='로그 레벨')
@@ -452,6 +1024,14 @@ def main():
             
             logger.info("✅ 전체 DART 데이터 수집 완료")
             
+        elif args.migrate:
+            # 중복 제거 마이그레이션
+            if collector.migrate_dart_tables():
+                logger.info("✅ 중복 제거 마이그레이션 완료")
+            else:
+                logger.error("❌ 중복 제거 마이그레이션 실패")
+                sys.exit(1)
+                
         elif args.corp_codes:
             # 기업코드만 수집
             if collector.collect_corp_codes():
@@ -468,6 +1048,14 @@ def main():
                 logger.error("❌ 재무데이터 수집 실패")
                 sys.exit(1)
                 
+        elif args.disclosures and args.incremental:
+            # 시장 전체 증분 공시 피드
+            if collector.sync_disclosure_feed(days=args.days):
+                logger.info("✅ 공시 피드 동기화 성공")
+            else:
+                logger.error("❌ 공시 피드 동기화 실패")
+                sys.exit(1)
+                
         elif args.disclosures:
             # 공시정보만 수집
             if collector.collect_disclosure_data(args.corp_code, args.days):
@@ -29,6 +29,8 @@ import sqlite3
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.utils.http_cache import CachedHTTPFetcher
+
 class ForecastDataCollector:
     """추정 실적 데이터 수집 클래스"""
     
@@ -39,6 +41,8 @@ class ForecastDataCollector:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        # 디스크 응답 캐시 (재실행/재시도 시 로컬 응답 재사용)
+        self.http = CachedHTTPFetcher(session=self.session)
         
         # 데이터베이스 초기화
         self._init_database()
@@ -100,25 +104,16 @@ class ForecastDataCollector:
             # 네이버 금융 추정실적 페이지
             url = f"https://finance.naver.com/item/fchart.naver?code={stock_code}"
             
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 회사명 추출
-            company_name = self._extract_company_name(soup)
-            
-            # 추정 실적 테이블 찾기
-            forecast_table = soup.select_one('#contentarea_left')
-            if not forecast_table:
-                self.logger.warning(f"추정 실적 데이터를 찾을 수 없습니다: {stock_code}")
-                return None
-            
-            # 추정 실적 데이터 파싱
-            forecast_data = self._parse_forecast_table(forecast_table, stock_code, company_name)
+            # 본문이 바뀌지 않았으면 저장된 파싱 결과 재사용
+            forecast_data = self.http.fetch_parsed(
+                url,
+                lambda response: self._parse_forecast_page(response, stock_code),
+                parser_key=f"naver_forecast:{datetime.now().year}",
+                source='naver_forecast'
+            )
             
             if forecast_data:
-                self.logger.info(f"✅ 추정 실적 수집 완료: {stock_code} ({company_name})")
+                self.logger.info(f"✅ 추정 실적 수집 완료: {stock_code} ({forecast_data.get('company_name')})")
                 return forecast_data
             
             return None
@@ -127,22 +122,34 @@ class ForecastDataCollector:
             self.logger.error(f"❌ 네이버 금융 데이터 수집 실패 ({stock_code}): {e}")
             return None
     
+    def _parse_forecast_page(self, response, stock_code: str) -> Optional[Dict]:
+        """추정실적 페이지 파싱"""
+        soup = BeautifulSoup(response.text, 'html.parser')
+        
+        # 회사명 추출
+        company_name = self._extract_company_name(soup)
+        
+        # 추정 실적 테이블 찾기
+        forecast_table = soup.select_one('#contentarea_left')
+        if not forecast_table:
+            self.logger.warning(f"추정 실적 데이터를 찾을 수 없습니다: {stock_code}")
+            return None
+        
+        # 추정 실적 데이터 파싱
+        return self._parse_forecast_table(forecast_table, stock_code, company_name)
+    
     def collect_analyst_opinions(self, stock_code: str) -> Optional[Dict]:
         """네이버 금융에서 애널리스트 투자의견 수집"""
         try:
             # 네이버 금융 투자의견 페이지
             url = f"https://finance.naver.com/item/point.naver?code={stock_code}"
             
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # 회사명 추출
-            company_name = self._extract_company_name(soup)
-            
-            # 투자의견 데이터 파싱
-            opinion_data = self._parse_analyst_opinions(soup, stock_code, company_name)
+            opinion_data = self.http.fetch_parsed(
+                url,
+                lambda response: self._parse_opinion_page(response, stock_code),
+                parser_key='naver_opinions:v1',
+                source='naver_forecast'
+            )
             
             if opinion_data:
                 self.logger.info(f"✅ 투자의견 수집 완료: {stock_code} - 목표가 {opinion_data.get('target_price', 'N/A')}원")
@@ -154,6 +161,16 @@ class ForecastDataCollector:
             self.logger.error(f"❌ 투자의견 수집 실패 ({stock_code}): {e}")
             return None
     
+    def _parse_opinion_page(self, response, stock_code: str) -> Optional[Dict]:
+        """투자의견 페이지 파싱"""
+        soup = BeautifulSoup(response.text, 'html.parser')
+        
+        # 회사명 추출
+        company_name = self._extract_company_name(soup)
+        
+        # 투자의견 데이터 파싱
+        return self._parse_analyst_opinions(soup, stock_code, company_name)
+    
     def _extract_company_name(self, soup) -> str:
         """회사명 추출"""
         try:
@@ -305,6 +322,7 @@ class ForecastDataCollector:
             self.logger.info(f"📊 추정 데이터 수집 시작: {stock_code}")
             
             success_count = 0
+            network_before = self.http.get_stats()['network']
             
             # 1. 추정 실적 수집
             forecast_data = self.collect_naver_forecast_data(stock_code)
@@ -316,8 +334,9 @@ class ForecastDataCollector:
             if opinion_data and self.save_analyst_opinions(opinion_data):
                 success_count += 1
             
-            # 요청 간격 (서버 부하 방지)
-            time.sleep(1)
+            # 요청 간격 (서버 부하 방지) - 모두 캐시에서 응답한 경우 생략
+            if self.http.get_stats()['network'] > network_before:
+                time.sleep(1)
             
             if success_count > 0:
                 self.logger.info(f"✅ 추정 데이터 수집 완료: {stock_code} ({success_count}/2)")
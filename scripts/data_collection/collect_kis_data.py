@@ -28,6 +28,8 @@ load_dotenv()
 # 프로젝트 루트 디렉토리를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from src.database.latest_snapshot import LatestSnapshot
+
 try:
     from config import ConfigManager
 except ImportError:
@@ -365,13 +367,16 @@ class KisDataCollector:
                 return False
                 
             with sqlite3.connect(stock_db_path) as conn:
-                cursor = conn.execute(f"""
+                LatestSnapshot().ensure(conn)
+                
+                # 최신 종가 기준 시가총액 (latest_snapshot market_cap 인덱스 사용)
+                cursor = conn.execute("""
                     SELECT stock_code, company_name
-                    FROM company_info 
-                    WHERE market_cap IS NOT NULL AND market_cap > 0
+                    FROM latest_snapshot 
+                    WHERE market_cap > 0
                     ORDER BY market_cap DESC 
-                    LIMIT {limit}
-                """)
+                    LIMIT ?
+                """, (int(limit),))
                 stock_list = cursor.fetchall()
             
             if not stock_list:
@@ -13,7 +13,6 @@ import os
 import argparse
 import sqlite3
 import pandas as pd
-import FinanceDataReader as fdr
 from datetime import datetime, timedelta
 from pathlib import Path
 import logging
@@ -37,6 +36,8 @@ class StockDataCollector:
     def get_kospi_kosdaq_list(self):
         """KOSPI, KOSDAQ 전 종목 리스트 조회"""
         try:
+            import FinanceDataReader as fdr  # 수집 시에만 로드 (--help 등 기동 비용 절감)
+
             # KOSPI 종목 리스트
             kospi_list = fdr.StockListing('KOSPI')
             kospi_list['Market'] = 'KOSPI'
@@ -58,6 +59,8 @@ class StockDataCollector:
     def collect_stock_prices(self, stock_code, start_date, end_date):
         """개별 종목 주가 데이터 수집"""
         try:
+            import FinanceDataReader as fdr
+
             # FinanceDataReader로 주가 데이터 수집
             df = fdr.DataReader(stock_code, start_date, end_date)
             
@@ -95,6 +98,8 @@ class StockDataCollector:
     def collect_company_info(self, stock_list_df):
         """기업 기본정보 수집"""
         try:
+            import FinanceDataReader as fdr
+
             company_data = []
             
             for _, row in stock_list_df.iterrows():
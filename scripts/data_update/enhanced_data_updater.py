@@ -2,8 +2,8 @@
 """
 워런 버핏 스코어카드 시스템을 위한 향상된 데이터 업데이트 시스템
 - 일일 증분 업데이트
-- 특정 기간 누락 데이터 보완
-- 자동화된 스케줄링
+- 특정 기간 누락 데이터 보완 (종목 × 거래일 결측 행렬 → 최소 수집 구간 → 동시 수집)
+- 자동화된 스케줄링 (입력 테이블 워터마크 기반 DAG 파이프라인)
 - 데이터 품질 검증
 """
 
@@ -16,15 +16,22 @@ import sqlite3
 import time as time_module
 import logging
 import schedule
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Tuple
 import argparse
+import subprocess
 
 # 프로젝트 루트 경로 추가
 project_root = Path(__file__).parent.parent.parent
 sys.path.insert(0, str(project_root))
 
-from config import get_db_connection
-import FinanceDataReader as fdr
+from config.database_config import get_db_connection
+from src.utils.krx_calendar import get_krx_calendar
+from src.utils.api_utils import RateLimiter
+from src.database.db_manager import DatabaseManager
 
 # 로깅 설정
 logging.basicConfig(
@@ -37,33 +44,109 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+@dataclass
+class RepairRange:
+    """종목별 재수집 구간 (원격 호출 1회)"""
+    stock_code: str
+    start_date: str
+    end_date: str
+    missing_sessions: int
+
+
 class DataQualityChecker:
     """데이터 품질 검증 클래스"""
     
     def __init__(self):
-        pass
+        self.calendar = get_krx_calendar()
+    
+    def build_missing_matrix(self, start_date: str, end_date: str,
+                             stock_codes: List[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(종목 × 거래일) 결측 행렬을 쿼리 1회로 계산
+        
+        Returns:
+            (종목코드 배열, 거래일 배열 'YYYY-MM-DD', 결측 여부 bool 행렬)
+            상장일 이전 거래일은 결측으로 보지 않는다.
+        """
+        sessions = np.array([str(d) for d in self.calendar.sessions_in_range(start_date, end_date)], dtype=str)
+        
+        stock_filter = ""
+        params = [sessions[0] if len(sessions) else start_date, sessions[-1] if len(sessions) else end_date]
+        if stock_codes:
+            stock_filter = f"WHERE c.stock_code IN ({','.join(['?'] * len(stock_codes))})"
+            params.extend(stock_codes)
+        
+        with get_db_connection('stock') as conn:
+            rows = pd.read_sql(f"""
+                SELECT c.stock_code, c.listing_date, p.date
+                FROM company_info c
+                LEFT JOIN stock_prices p
+                  ON p.stock_code = c.stock_code AND p.date BETWEEN ? AND ?
+                {stock_filter}
+            """, conn, params=params)
+        
+        codes, row_index = np.unique(rows['stock_code'].values, return_inverse=True)
+        present = np.zeros((len(codes), len(sessions)), dtype=bool)
+        
+        if len(sessions) and len(rows):
+            has_date = rows['date'].notna().values
+            col_index = np.searchsorted(sessions, rows['date'].values[has_date].astype(str))
+            in_range = col_index < len(sessions)
+            r, c = row_index[has_date][in_range], col_index[in_range]
+            matched = sessions[c] == rows['date'].values[has_date][in_range]
+            present[r[matched], c[matched]] = True
+        
+        missing = ~present
+        
+        # 상장일 이전은 결측 아님
+        if len(rows):
+            # 'YYYY-MM-DD' / 'YYYYMMDD' / 'YYYY-MM-DD HH:MM:SS' 혼재 → 숫자 8자리로 정규화
+            listing_raw = rows.groupby('stock_code')['listing_date'].first().reindex(codes)
+            listing = pd.to_datetime(listing_raw.astype(str).str.replace(r'\D', '', regex=True).str[:8],
+                                     format='%Y%m%d', errors='coerce')
+            listing_str = listing.dt.strftime('%Y-%m-%d').fillna('').to_numpy(dtype=str)
+            missing &= sessions[None, :] >= listing_str[:, None]
+        
+        return codes, sessions, missing
+    
+    def plan_repair_ranges(self, start_date: str, end_date: str, stock_codes: List[str] = None,
+                           max_bridge: Optional[int] = None) -> List[RepairRange]:
+        """결측 거래일을 종목별 최소 연속 구간으로 병합
+        
+        원격 호출 1회가 기간 전체를 돌려주므로 기본값(max_bridge=None)은 종목당 1구간
+        (첫 결측일 ~ 마지막 결측일)이다. max_bridge를 주면 결측 사이에 존재하는 거래일이
+        그보다 많을 때만 구간을 나눈다.
+        """
+        codes, sessions, missing = self.build_missing_matrix(start_date, end_date, stock_codes)
+        rows, cols = np.nonzero(missing)  # 행 우선 정렬
+        if len(rows) == 0:
+            return []
+        
+        # 종목이 바뀌거나 결측 사이 간격이 max_bridge를 넘으면 새 구간 시작
+        new_range = np.ones(len(rows), dtype=bool)
+        new_range[1:] = rows[1:] != rows[:-1]
+        if max_bridge is not None:
+            new_range[1:] |= (cols[1:] - cols[:-1] - 1) > max_bridge
+        
+        starts = np.flatnonzero(new_range)
+        ends = np.append(starts[1:], len(rows)) - 1
+        
+        return [
+            RepairRange(
+                stock_code=str(codes[rows[s]]),
+                start_date=str(sessions[cols[s]]),
+                end_date=str(sessions[cols[e]]),
+                missing_sessions=int(e - s + 1)
+            )
+            for s, e in zip(starts, ends)
+        ]
     
     def find_missing_dates(self, stock_code: str, start_date: str, end_date: str) -> List[str]:
-        """누락된 날짜 찾기"""
+        """누락된 날짜 찾기 (KRX 거래일 기준)"""
         try:
-            with get_db_connection('stock') as conn:
-                query = """
-                    SELECT DISTINCT date 
-                    FROM stock_prices 
-                    WHERE stock_code = ? AND date BETWEEN ? AND ?
-                    ORDER BY date
-                """
-                existing_dates = pd.read_sql(query, conn, params=(stock_code, start_date, end_date))
-            
-            # 전체 영업일 생성 (주말 제외)
-            date_range = pd.date_range(start=start_date, end=end_date, freq='B')  # B = 영업일
-            all_dates = [d.strftime('%Y-%m-%d') for d in date_range]
-            
-            # 기존 날짜와 비교하여 누락된 날짜 찾기
-            existing_date_list = existing_dates['date'].tolist() if not existing_dates.empty else []
-            missing_dates = [d for d in all_dates if d not in existing_date_list]
-            
-            return missing_dates
+            codes, sessions, missing = self.build_missing_matrix(start_date, end_date, [stock_code])
+            if len(codes) == 0:
+                return list(sessions)
+            return sessions[missing[0]].tolist()
             
         except Exception as e:
             logger.error(f"누락 날짜 검색 실패 ({stock_code}): {e}")
@@ -72,21 +155,10 @@ class DataQualityChecker:
     def find_missing_stocks_for_date(self, target_date: str) -> List[str]:
         """특정 날짜에 누락된 종목 찾기"""
         try:
-            with get_db_connection('stock') as conn:
-                # 전체 종목 목록
-                all_stocks = pd.read_sql("SELECT stock_code FROM company_info", conn)
-                
-                # 해당 날짜에 데이터가 있는 종목
-                existing_stocks = pd.read_sql(
-                    "SELECT DISTINCT stock_code FROM stock_prices WHERE date = ?", 
-                    conn, params=(target_date,)
-                )
-            
-            all_stock_list = all_stocks['stock_code'].tolist()
-            existing_stock_list = existing_stocks['stock_code'].tolist() if not existing_stocks.empty else []
-            
-            missing_stocks = [s for s in all_stock_list if s not in existing_stock_list]
-            return missing_stocks
+            codes, sessions, missing = self.build_missing_matrix(target_date, target_date)
+            if len(sessions) == 0:
+                return []  # 휴장일
+            return codes[missing[:, 0]].tolist()
             
         except Exception as e:
             logger.error(f"누락 종목 검색 실패 ({target_date}): {e}")
@@ -125,8 +197,11 @@ class DataQualityChecker:
 class SmartDataUpdater:
     """스마트 데이터 업데이트 클래스"""
     
-    def __init__(self):
+    def __init__(self, max_workers: int = 4, calls_per_second: float = 5.0):
         self.quality_checker = DataQualityChecker()
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(calls_per_second=calls_per_second, burst_size=max(1, int(calls_per_second)))
+        self.db = DatabaseManager()
     
     def update_daily_stock_prices(self, target_date: str = None) -> bool:
         """일일 주가 데이터 업데이트"""
@@ -136,113 +211,135 @@ class SmartDataUpdater:
             
             logger.info(f"=== 일일 주가 업데이트 시작: {target_date} ===")
             
-            # 누락된 종목 찾기
-            missing_stocks = self.quality_checker.find_missing_stocks_for_date(target_date)
+            if not self.quality_checker.calendar.is_session(target_date):
+                logger.info(f"{target_date}는 KRX 휴장일입니다.")
+                return True
             
-            if not missing_stocks:
+            plan = self.quality_checker.plan_repair_ranges(target_date, target_date)
+            
+            if not plan:
                 logger.info(f"{target_date} 모든 종목 데이터가 최신 상태입니다.")
                 return True
             
-            logger.info(f"업데이트 대상: {len(missing_stocks)}개 종목")
+            logger.info(f"업데이트 대상: {len(plan)}개 종목")
+            result = self.execute_repair_plan(plan)
             
-            success_count = 0
-            for i, stock_code in enumerate(missing_stocks):
-                logger.info(f"진행: {i+1}/{len(missing_stocks)} - {stock_code}")
-                
-                if self._update_single_stock_price(stock_code, target_date, target_date):
-                    success_count += 1
-                
-                time_module.sleep(0.1)  # API 호출 제한
-            
-            logger.info(f"일일 주가 업데이트 완료: {success_count}/{len(missing_stocks)}")
-            return success_count > 0
+            logger.info(f"일일 주가 업데이트 완료: {result['succeeded']}/{len(plan)}")
+            return result['succeeded'] > 0
             
         except Exception as e:
             logger.error(f"일일 주가 업데이트 실패: {e}")
             return False
     
-    def update_period_stock_prices(self, start_date: str, end_date: str, stock_codes: List[str] = None) -> bool:
-        """특정 기간 주가 데이터 업데이트"""
+    def update_period_stock_prices(self, start_date: str, end_date: str, stock_codes: List[str] = None,
+                                   max_bridge: Optional[int] = None) -> bool:
+        """특정 기간 주가 데이터 업데이트 (결측 구간만 재수집)"""
         try:
             logger.info(f"=== 기간 주가 업데이트: {start_date} ~ {end_date} ===")
             
-            # 종목 목록 가져오기
-            if stock_codes is None:
-                with get_db_connection('stock') as conn:
-                    stock_df = pd.read_sql("SELECT stock_code FROM company_info", conn)
-                    stock_codes = stock_df['stock_code'].tolist()
+            plan = self.quality_checker.plan_repair_ranges(start_date, end_date, stock_codes, max_bridge)
             
-            total_count = len(stock_codes)
-            success_count = 0
+            if not plan:
+                logger.info("누락된 주가 데이터가 없습니다.")
+                return True
             
-            for i, stock_code in enumerate(stock_codes):
-                logger.info(f"진행: {i+1}/{total_count} - {stock_code}")
-                
-                # 누락된 날짜 찾기
-                missing_dates = self.quality_checker.find_missing_dates(stock_code, start_date, end_date)
-                
-                if missing_dates:
-                    logger.info(f"{stock_code}: {len(missing_dates)}개 날짜 누락")
-                    
-                    if self._update_single_stock_price(stock_code, start_date, end_date):
-                        success_count += 1
-                else:
-                    logger.debug(f"{stock_code}: 데이터 완료")
-                    success_count += 1
-                
-                time_module.sleep(0.1)
+            total_missing = sum(r.missing_sessions for r in plan)
+            logger.info(f"결측 {total_missing:,}건 → 수집 구간 {len(plan):,}개 "
+                        f"({len({r.stock_code for r in plan}):,}개 종목)")
             
-            logger.info(f"기간 주가 업데이트 완료: {success_count}/{total_count}")
-            return success_count > 0
+            result = self.execute_repair_plan(plan)
+            
+            logger.info(f"기간 주가 업데이트 완료: {result['succeeded']}/{len(plan)}")
+            return result['succeeded'] > 0
             
         except Exception as e:
             logger.error(f"기간 주가 업데이트 실패: {e}")
             return False
     
+    def execute_repair_plan(self, plan: List[RepairRange]) -> Dict[str, int]:
+        """수집 구간을 동시 실행 (원격 호출은 RateLimiter로 제한, DB 저장은 메인 스레드에서 순차)
+        
+        여러 구간을 연달아 적재하므로 latest_snapshot 트리거를 끄고 끝난 뒤 대상 종목만 재구성한다.
+        """
+        result = {'succeeded': 0, 'failed': 0, 'empty': 0, 'rows': 0}
+        
+        def fetch(repair: RepairRange) -> pd.DataFrame:
+            self.rate_limiter.acquire()
+            return self._fetch_stock_prices(repair.stock_code, repair.start_date, repair.end_date)
+        
+        with self.db.bulk_load(stock_codes=sorted({r.stock_code for r in plan})), \
+                ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(fetch, repair): repair for repair in plan}
+            
+            for i, future in enumerate(as_completed(futures), 1):
+                repair = futures[future]
+                try:
+                    df = future.result()
+                    if df.empty:
+                        logger.warning(f"주가 데이터 없음: {repair.stock_code} ({repair.start_date} ~ {repair.end_date})")
+                        result['empty'] += 1
+                        continue
+                    
+                    self._save_stock_prices(df)
+                    result['succeeded'] += 1
+                    result['rows'] += len(df)
+                    logger.debug(f"진행: {i}/{len(plan)} - {repair.stock_code} {len(df)}개 레코드")
+                    
+                except Exception as e:
+                    logger.error(f"주가 업데이트 실패 ({repair.stock_code}): {e}")
+                    result['failed'] += 1
+        
+        return result
+    
+    def _fetch_stock_prices(self, stock_code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """단일 종목 주가 조회 (원격 호출 1회)"""
+        import FinanceDataReader as fdr  # 재수집 시에만 로드 (상태 조회/스케줄러 기동 비용 절감)
+
+        df = fdr.DataReader(stock_code, start_date, end_date)
+        
+        if df.empty:
+            return df
+        
+        # 데이터 정리
+        df = df.reset_index()
+        df['stock_code'] = stock_code
+        df = df.rename(columns={
+            'Date': 'date',
+            'Open': 'open_price',
+            'High': 'high_price',
+            'Low': 'low_price',
+            'Close': 'close_price',
+            'Volume': 'volume'
+        })
+        
+        # 필요한 컬럼만 선택
+        required_columns = [
+            'stock_code', 'date', 'open_price', 'high_price', 
+            'low_price', 'close_price', 'volume'
+        ]
+        df = df[required_columns]
+        
+        # 추가 계산
+        df['adjusted_close'] = df['close_price']
+        df['amount'] = df['volume'] * df['close_price']
+        df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+        return df
+    
+    def _save_stock_prices(self, df: pd.DataFrame):
+        """주가 저장 (받아온 날짜만 (stock_code, date) upsert, 구간 내 기존 행은 유지)"""
+        self.db.save_prices(df)
+    
     def _update_single_stock_price(self, stock_code: str, start_date: str, end_date: str) -> bool:
         """단일 종목 주가 데이터 업데이트"""
         try:
-            # 주가 데이터 수집
-            df = fdr.DataReader(stock_code, start_date, end_date)
+            self.rate_limiter.acquire()
+            df = self._fetch_stock_prices(stock_code, start_date, end_date)
             
             if df.empty:
                 logger.warning(f"주가 데이터 없음: {stock_code}")
                 return False
             
-            # 데이터 정리
-            df = df.reset_index()
-            df['stock_code'] = stock_code
-            df = df.rename(columns={
-                'Date': 'date',
-                'Open': 'open_price',
-                'High': 'high_price',
-                'Low': 'low_price',
-                'Close': 'close_price',
-                'Volume': 'volume'
-            })
-            
-            # 필요한 컬럼만 선택
-            required_columns = [
-                'stock_code', 'date', 'open_price', 'high_price', 
-                'low_price', 'close_price', 'volume'
-            ]
-            df = df[required_columns]
-            
-            # 추가 계산
-            df['adjusted_close'] = df['close_price']
-            df['amount'] = df['volume'] * df['close_price']
-            df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
-            
-            # 데이터베이스 저장
-            with get_db_connection('stock') as conn:
-                # 기존 데이터 삭제 (중복 방지)
-                conn.execute(
-                    "DELETE FROM stock_prices WHERE stock_code = ? AND date BETWEEN ? AND ?", 
-                    (stock_code, start_date, end_date)
-                )
-                
-                # 새 데이터 삽입
-                df.to_sql('stock_prices', conn, if_exists='append', index=False)
+            self._save_stock_prices(df)
             
             logger.debug(f"저장 완료: {stock_code} - {len(df)}개 레코드")
             return True
@@ -306,7 +403,8 @@ class SmartDataUpdater:
         try:
             logger.info(f"=== 누락 데이터 보수 시작 (최근 {days_back}일) ===")
             
-            end_date = datetime.now().strftime('%Y-%m-%d')
+            calendar = self.quality_checker.calendar
+            end_date = str(calendar.latest_completed_session())
             start_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
             
             results = {}
@@ -326,42 +424,336 @@ class SmartDataUpdater:
             logger.error(f"누락 데이터 보수 실패: {e}")
             return {'error': True}
 
+@dataclass
+class PipelineStage:
+    """파이프라인 단계 - 입력 테이블에 새 데이터가 생겼을 때만 실행
+    
+    inputs/outputs는 'db.table' 형식이며, 행을 제자리 UPDATE하는 테이블은
+    'db.table@updated_at'처럼 워터마크 컬럼을 지정한다 (기본은 MAX(rowid)).
+    입력이 없는 단계는 수집기(source)로, 호출 시 항상 실행된다.
+    """
+    name: str
+    command: List[str]
+    inputs: List[str] = field(default_factory=list)
+    outputs: List[str] = field(default_factory=list)
+    timeout: int = 3 * 3600
+    
+    @property
+    def is_source(self) -> bool:
+        return not self.inputs
+
+
+# 워런 버핏 배치 스코어카드 저장소 (stock/dart/news/kis 외 DB는 프로젝트 루트 기준 경로)
+SCORECARD_DB = 'data/databases/buffett_scorecard.db'
+
+DAILY_PIPELINE = [
+    # 주가 → 기술지표
+    PipelineStage('prices', ['scripts/data_update/enhanced_data_updater.py', '--mode', 'daily'],
+                  outputs=['stock.stock_prices']),
+    PipelineStage('technical', ['scripts/analysis/run_technical_analysis.py', '--all_stocks'],
+                  inputs=['stock.stock_prices'], outputs=['stock.technical_indicators']),
+    # DART 재무제표 → 재무비율 → 스코어카드
+    PipelineStage('dart', ['scripts/data_collection/collect_dart_data.py', '--disclosures', '--incremental'],
+                  outputs=['dart.disclosures', 'dart.financial_statements']),
+    PipelineStage('ratios', ['market_data_calculator.py', '--mode', 'all'],
+                  inputs=['dart.financial_statements'], outputs=['stock.financial_ratios@updated_at']),
+    PipelineStage('scorecard', ['src/analysis/fundamental/buffett_batch_processor.py', '--data-dir', 'data/databases'],
+                  inputs=['stock.financial_ratios@updated_at'], outputs=[f'{SCORECARD_DB}.buffett_analysis_110']),
+    # 뉴스 → 감정분석 → 통합 점수
+    PipelineStage('news', ['scripts/data_collection/collect_news_data.py', '--all_stocks', '--days', '1'],
+                  outputs=['news.news_articles']),
+    PipelineStage('sentiment', ['scripts/analysis/run_sentiment_analysis.py', '--all_stocks'],
+                  inputs=['news.news_articles'], outputs=['news.sentiment_scores']),
+    # 가격 패널 증분 갱신 → 전 종목 일별 위험 지표 (통합 점수 위험도 입력)
+    # 패널 파일을 같은 단계에서 갱신해 병렬 브랜치가 동시에 패널을 고쳐 쓰지 않도록 함
+    PipelineStage('risk', ['src/analysis/risk/risk_metrics.py'],
+                  inputs=['stock.stock_prices', 'stock.stock_prices@updated_at'], outputs=['stock.risk_metrics']),
+    PipelineStage('integrated', ['scripts/analysis/run_integrated_analysis.py', '--all_stocks', '--save_to_db'],
+                  inputs=[f'{SCORECARD_DB}.buffett_analysis_110', 'stock.technical_indicators',
+                          'news.sentiment_scores', 'stock.risk_metrics'],
+                  outputs=['stock.investment_scores']),
+    # 분석용 Parquet 스냅샷 (증분)
+    PipelineStage('columnar', ['src/utils/columnar_store.py'],
+                  inputs=['stock.stock_prices', 'stock.stock_prices@updated_at',
+                          'stock.technical_indicators', 'stock.technical_indicators@updated_at',
+                          'stock.financial_ratios@updated_at']),
+]
+
+
+class PipelineDAG:
+    """입력/출력 테이블로 연결된 단계들을 의존 순서대로 실행하는 스케줄러
+    
+    - 상위 단계가 모두 끝난 단계만 실행 대상이 되고, 독립 브랜치는 병렬 실행
+    - 실행 직전 입력 테이블 워터마크를 읽어 마지막 성공 시점과 같으면 건너뜀
+    - 단계별 실행 결과/소요 시간은 stock DB의 pipeline_runs 테이블에 기록
+    """
+    
+    NAMED_DATABASES = ('stock', 'dart', 'news', 'kis')
+    
+    def __init__(self, stages: List[PipelineStage] = None, max_workers: int = 3):
+        self.stages = {stage.name: stage for stage in (stages or DAILY_PIPELINE)}
+        if len(self.stages) != len(stages or DAILY_PIPELINE):
+            raise ValueError("파이프라인 단계 이름이 중복되었습니다.")
+        self.max_workers = max_workers
+        
+        producers = {}
+        for stage in self.stages.values():
+            for ref in stage.outputs:
+                producers[ref] = stage.name
+        self.upstream = {
+            name: {producers[ref] for ref in stage.inputs if ref in producers} - {name}
+            for name, stage in self.stages.items()
+        }
+        self.order = self._topological_order()
+        self._ensure_state_tables()
+    
+    def _topological_order(self) -> List[str]:
+        """위상 정렬 (순환 의존 시 ValueError)"""
+        remaining = {name: set(deps) for name, deps in self.upstream.items()}
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"파이프라인에 순환 의존이 있습니다: {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+    
+    @staticmethod
+    def _split_ref(ref: str) -> Tuple[str, str, Optional[str]]:
+        """'db.table@column' → (db, table, column)"""
+        ref, _, column = ref.partition('@')
+        db_name, _, table = ref.rpartition('.')
+        return db_name, table, column or None
+    
+    @contextmanager
+    def _connect(self, db_name: str):
+        if db_name in self.NAMED_DATABASES:
+            with get_db_connection(db_name) as conn:
+                yield conn
+            return
+        
+        path = project_root / db_name
+        if not path.exists():
+            yield None
+            return
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+        try:
+            yield conn
+        finally:
+            conn.close()
+    
+    def table_watermark(self, ref: str) -> Optional[str]:
+        """테이블 워터마크 (MAX(rowid) 또는 지정 컬럼 최댓값, 테이블이 없으면 None)"""
+        db_name, table, column = self._split_ref(ref)
+        try:
+            with self._connect(db_name) as conn:
+                if conn is None:
+                    return None
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+                ).fetchone()
+                if not exists:
+                    return None
+                value = conn.execute(f"SELECT MAX({column or 'rowid'}) FROM {table}").fetchone()[0]
+                return None if value is None else str(value)
+        except Exception as e:
+            logger.warning(f"워터마크 조회 실패 ({ref}): {e}")
+            return None
+    
+    def _ensure_state_tables(self):
+        with get_db_connection('stock') as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS pipeline_state (
+                    stage TEXT NOT NULL,
+                    input_ref TEXT NOT NULL,
+                    watermark TEXT,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (stage, input_ref)
+                );
+                CREATE TABLE IF NOT EXISTS pipeline_runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    run_id TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    duration_sec REAL,
+                    trigger TEXT,
+                    message TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_pipeline_runs_stage ON pipeline_runs(stage, started_at);
+            """)
+    
+    def _changed_inputs(self, stage: PipelineStage) -> Tuple[Dict[str, Optional[str]], List[str]]:
+        """현재 입력 워터마크와 마지막 성공 이후 바뀐 입력 목록"""
+        current = {ref: self.table_watermark(ref) for ref in stage.inputs}
+        with get_db_connection('stock') as conn:
+            consumed = dict(conn.execute(
+                "SELECT input_ref, watermark FROM pipeline_state WHERE stage = ?", (stage.name,)
+            ).fetchall())
+        changed = [ref for ref, mark in current.items()
+                   if mark is not None and mark != consumed.get(ref)]
+        return current, changed
+    
+    def _commit_watermarks(self, stage: PipelineStage, watermarks: Dict[str, Optional[str]]):
+        with get_db_connection('stock') as conn:
+            conn.executemany("""
+                INSERT OR REPLACE INTO pipeline_state (stage, input_ref, watermark, updated_at)
+                VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+            """, [(stage.name, ref, mark) for ref, mark in watermarks.items() if mark is not None])
+    
+    def _record_run(self, run_id: str, name: str, status: str, started_at: datetime,
+                    duration: Optional[float], trigger: List[str], message: str = ''):
+        with get_db_connection('stock') as conn:
+            conn.execute("""
+                INSERT INTO pipeline_runs (run_id, stage, status, started_at, duration_sec, trigger, message)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (run_id, name, status, started_at.isoformat(timespec='seconds'), duration,
+                  ','.join(trigger), message[-2000:]))
+    
+    def _execute(self, stage: PipelineStage) -> Tuple[int, float, str]:
+        """단계 명령 실행 (반환: 종료 코드, 소요 시간, 출력 끝부분)"""
+        started = time_module.perf_counter()
+        try:
+            completed = subprocess.run(
+                [sys.executable] + stage.command, cwd=str(project_root),
+                capture_output=True, text=True, timeout=stage.timeout
+            )
+            returncode, output = completed.returncode, (completed.stderr or completed.stdout or '')
+        except subprocess.TimeoutExpired:
+            returncode, output = -1, f"시간 초과 ({stage.timeout}초)"
+        except Exception as e:
+            returncode, output = -1, str(e)
+        return returncode, time_module.perf_counter() - started, output.strip()[-2000:]
+    
+    def run(self, sources: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """파이프라인 1회 실행
+        
+        Args:
+            sources: 실행할 수집 단계 (None이면 전체, []이면 수집 없이 하위 단계만 전파)
+        
+        Returns:
+            단계별 {'status': 'success'|'failed'|'skipped', 'duration': 초, 'trigger': [...]}
+        """
+        run_id = datetime.now().strftime('%Y%m%d%H%M%S')
+        results = {}
+        pending = list(self.order)
+        finished = set()
+        running = {}
+        
+        logger.info(f"🚀 파이프라인 실행 시작 (run_id={run_id}, 단계 {len(pending)}개)")
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                # 상위 단계가 끝난 단계를 순서대로 판정 (건너뛴 단계는 즉시 완료 처리)
+                ready = [n for n in pending if self.upstream[n] <= finished]
+                while ready:
+                    name = ready.pop(0)
+                    pending.remove(name)
+                    stage = self.stages[name]
+                    started_at = datetime.now()
+                    
+                    if stage.is_source:
+                        if sources is not None and name not in sources:
+                            reason, watermarks, trigger = 'not scheduled', {}, []
+                        else:
+                            reason, watermarks, trigger = None, {}, ['source']
+                    else:
+                        watermarks, trigger = self._changed_inputs(stage)
+                        reason = None if trigger else 'inputs unchanged'
+                    
+                    if reason:
+                        results[name] = {'status': 'skipped', 'duration': 0.0, 'trigger': []}
+                        self._record_run(run_id, name, 'skipped', started_at, None, [], reason)
+                        finished.add(name)
+                        logger.info(f"⏭️ {name}: 건너뜀 ({reason})")
+                        ready = [n for n in pending if self.upstream[n] <= finished]
+                        continue
+                    
+                    logger.info(f"▶️ {name}: 실행 (트리거: {', '.join(trigger)})")
+                    future = executor.submit(self._execute, stage)
+                    running[future] = (stage, watermarks, trigger, started_at)
+                
+                if not running:
+                    continue
+                
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, watermarks, trigger, started_at = running.pop(future)
+                    returncode, duration, output = future.result()
+                    status = 'success' if returncode == 0 else 'failed'
+                    
+                    if status == 'success':
+                        # 실행 전에 읽은 워터마크를 기록 (실행 중 들어온 데이터는 다음 실행에서 처리)
+                        self._commit_watermarks(stage, watermarks)
+                        logger.info(f"✅ {stage.name}: 완료 ({duration:.1f}초)")
+                    else:
+                        logger.error(f"❌ {stage.name}: 실패 (code={returncode}, {duration:.1f}초) {output[-300:]}")
+                    
+                    self._record_run(run_id, stage.name, status, started_at, duration, trigger,
+                                     '' if status == 'success' else output)
+                    results[stage.name] = {'status': status, 'duration': round(duration, 2), 'trigger': trigger}
+                    finished.add(stage.name)
+        
+        ran = sum(1 for r in results.values() if r['status'] != 'skipped')
+        logger.info(f"🏁 파이프라인 실행 완료: 실행 {ran}개 / 건너뜀 {len(results) - ran}개")
+        return results
+    
+    def get_stage_durations(self, days: int = 30) -> pd.DataFrame:
+        """단계별 실행 횟수 / 평균·최대 소요 시간 (성공 실행 기준)"""
+        since = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+        with get_db_connection('stock') as conn:
+            return pd.read_sql("""
+                SELECT stage,
+                       COUNT(*) AS runs,
+                       ROUND(AVG(duration_sec), 1) AS avg_sec,
+                       ROUND(MAX(duration_sec), 1) AS max_sec,
+                       MAX(started_at) AS last_run
+                FROM pipeline_runs
+                WHERE status = 'success' AND started_at >= ?
+                GROUP BY stage
+                ORDER BY avg_sec DESC
+            """, conn, params=[since])
+
 class DataUpdateScheduler:
     """데이터 업데이트 스케줄러"""
     
     def __init__(self):
         self.updater = SmartDataUpdater()
+        self.pipeline = PipelineDAG()
     
     def setup_daily_schedule(self):
-        """일일 스케줄 설정"""
-        # 매일 오후 6시 주가 데이터 업데이트 (장 마감 후)
-        schedule.every().day.at("18:00").do(self._daily_stock_update)
+        """일일 스케줄 설정 (수집 시점만 고정, 분석 단계는 입력 변경 시에만 실행)"""
+        # 매일 오후 6시 전체 수집 + 하위 단계 (장 마감 후)
+        schedule.every().day.at("18:00").do(self._daily_pipeline)
         
-        # 매일 오전 9시 뉴스 데이터 업데이트
+        # 매일 오전 9시 뉴스 수집 → 감정분석 → 통합 점수
         schedule.every().day.at("09:00").do(self._daily_news_update)
         
-        # 매주 월요일 오전 10시 DART 데이터 업데이트
-        schedule.every().monday.at("10:00").do(self._weekly_dart_update)
+        # 매시간 다른 경로로 들어온 데이터를 하위 단계로 전파
+        schedule.every().hour.do(self._propagate_changes)
         
         # 매주 일요일 오후 8시 누락 데이터 보수
         schedule.every().sunday.at("20:00").do(self._weekly_repair)
         
         logger.info("데이터 업데이트 스케줄 설정 완료")
     
-    def _daily_stock_update(self):
-        """일일 주가 업데이트 작업"""
-        logger.info("⏰ 스케줄된 일일 주가 업데이트 시작")
-        self.updater.update_daily_stock_prices()
+    def _daily_pipeline(self):
+        """일일 파이프라인 작업"""
+        logger.info("⏰ 스케줄된 일일 파이프라인 시작")
+        self.pipeline.run()
     
     def _daily_news_update(self):
         """일일 뉴스 업데이트 작업"""
         logger.info("⏰ 스케줄된 일일 뉴스 업데이트 시작")
-        self.updater.update_daily_news()
+        self.pipeline.run(sources=['news'])
     
-    def _weekly_dart_update(self):
-        """주간 DART 업데이트 작업"""
-        logger.info("⏰ 스케줄된 주간 DART 업데이트 시작")
-        self.updater.update_weekly_dart_data()
+    def _propagate_changes(self):
+        """입력이 바뀐 분석 단계만 실행"""
+        self.pipeline.run(sources=[])
     
     def _weekly_repair(self):
         """주간 누락 데이터 보수"""
@@ -379,17 +771,21 @@ class DataUpdateScheduler:
 def main():
     """메인 실행 함수"""
     parser = argparse.ArgumentParser(description='워런 버핏 시스템 데이터 업데이트')
-    parser.add_argument('--mode', choices=['daily', 'period', 'repair', 'schedule'], 
+    parser.add_argument('--mode', choices=['daily', 'period', 'repair', 'schedule', 'pipeline', 'pipeline-status'], 
                        default='daily', help='업데이트 모드')
     parser.add_argument('--start-date', help='시작 날짜 (YYYY-MM-DD)')
     parser.add_argument('--end-date', help='종료 날짜 (YYYY-MM-DD)')
     parser.add_argument('--target-date', help='대상 날짜 (YYYY-MM-DD)')
     parser.add_argument('--stock-codes', nargs='+', help='특정 종목 코드들')
     parser.add_argument('--days-back', type=int, default=30, help='보수할 일수')
+    parser.add_argument('--max-workers', type=int, default=4, help='동시 수집 스레드 수')
+    parser.add_argument('--calls-per-second', type=float, default=5.0, help='초당 최대 원격 호출 수')
+    parser.add_argument('--sources', nargs='*', help='pipeline 모드에서 실행할 수집 단계 (생략 시 전체, 빈 값이면 전파만)')
+    parser.add_argument('--max-bridge', type=int, help='결측 사이 거래일이 이보다 많으면 수집 구간 분리 (기본: 종목당 1구간)')
     
     args = parser.parse_args()
     
-    updater = SmartDataUpdater()
+    updater = SmartDataUpdater(max_workers=args.max_workers, calls_per_second=args.calls_per_second)
     
     try:
         if args.mode == 'daily':
@@ -408,7 +804,7 @@ def main():
             
             print(f"📊 기간 데이터 업데이트: {args.start_date} ~ {args.end_date}")
             success = updater.update_period_stock_prices(
-                args.start_date, args.end_date, args.stock_codes
+                args.start_date, args.end_date, args.stock_codes, args.max_bridge
             )
             
             if success:
@@ -426,6 +822,25 @@ def main():
             else:
                 print("❌ 데이터 보수 실패!")
         
+        elif args.mode == 'pipeline':
+            print("🔗 데이터 파이프라인을 실행합니다...")
+            results = PipelineDAG().run(sources=args.sources)
+            
+            for name, result in results.items():
+                print(f"  {name:<12} {result['status']:<8} {result['duration']:>8.1f}초")
+            
+            if any(r['status'] == 'failed' for r in results.values()):
+                print("❌ 일부 단계 실패!")
+                return False
+            print("✅ 파이프라인 완료!")
+        
+        elif args.mode == 'pipeline-status':
+            durations = PipelineDAG().get_stage_durations()
+            if durations.empty:
+                print("기록된 파이프라인 실행이 없습니다.")
+            else:
+                print(durations.to_string(index=False))
+        
         elif args.mode == 'schedule':
             print("⏰ 자동 스케줄러를 시작합니다...")
             scheduler = DataUpdateScheduler()
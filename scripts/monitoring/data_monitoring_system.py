@@ -4,7 +4,7 @@
 scripts/monitoring/data_monitoring_system.py
 
 - 실시간 데이터 상태 모니터링
-- 자동 백업 및 복구 시스템
+- 자동 백업 및 복구 시스템 (SQLite 온라인 백업 + 페이지 청크 중복 제거)
 - 시스템 헬스 체크
 - 이메일 알림 시스템
 - 데이터 품질 검증
@@ -21,10 +21,13 @@ import json
 import logging
 import smtplib
 import gzip
+import zlib
+import hashlib
+import tempfile
 from typing import Dict, List, Optional, Tuple, Any
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
-from email.mime.base import MimeBase
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from email.mime.base import MIMEBase
 from email import encoders
 import argparse
 
@@ -45,6 +48,8 @@ except ImportError:
     def get_database_path(db_name):
         return Path(f'data/databases/{db_name}_data.db')
 
+from src.utils.krx_calendar import get_krx_calendar
+
 # 로깅 설정
 log_dir = project_root / 'logs'
 log_dir.mkdir(exist_ok=True)
@@ -70,91 +75,300 @@ class DataMonitor:
             'news': ['news_articles', 'sentiment_scores', 'market_sentiment'],
             'kis': ['realtime_quotes', 'account_balance', 'order_history', 'market_indicators']
         }
+        self.stats_cache_path = project_root / 'data' / 'cache' / 'health_stats.json'
     
-    def check_data_freshness(self) -> Dict[str, Dict]:
-        """데이터 최신성 체크 - 워런 버핏 시스템 특화"""
-        logger.info("🔍 데이터 최신성 체크 시작...")
-        results = {}
+    # =========================================================================
+    # 단일 패스 통계 수집
+    # DB마다 읽기 트랜잭션 하나(스냅샷)를 열고, 테이블마다 그룹 집계 한 번으로
+    # 최신성/커버리지/중복/NULL 통계를 모두 구한다. 전체 테이블 스캔이 필요한
+    # 통계(총 건수, 이상치, 중복, NULL)는 rowid 워터마크 이후 신규 행만 집계해 누적한다.
+    # =========================================================================
+    
+    # 테이블별 누적 통계 정의
+    INCREMENTAL_TABLE_SPECS = {
+        ('stock', 'stock_prices'): {
+            'dup_key': ['stock_code', 'date'],
+            'invalid': """
+                open_price <= 0 OR high_price <= 0 OR low_price <= 0 OR close_price <= 0
+                OR high_price < low_price
+                OR open_price NOT BETWEEN low_price AND high_price
+                OR close_price NOT BETWEEN low_price AND high_price
+            """,
+            'null_columns': ['open_price', 'high_price', 'low_price', 'close_price', 'volume']
+        },
+        ('news', 'news_articles'): {
+            'dup_key': ['title', 'pubDate'],
+            'invalid': None,
+            'null_columns': ['stock_code', 'description', 'sentiment_score']
+        }
+    }
+    
+    # 삭제/교체된 행을 반영하기 위해 누적 통계를 버리고 전체 재집계하는 주기
+    FULL_REFRESH_DAYS = 7
+    
+    def _load_stats_cache(self) -> Dict:
+        """누적 통계 캐시 로드"""
+        try:
+            if self.stats_cache_path.exists():
+                with open(self.stats_cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ 헬스 통계 캐시 로드 실패, 전체 재집계: {e}")
+        return {}
+    
+    def _save_stats_cache(self, cache: Dict):
+        """누적 통계 캐시 저장"""
+        try:
+            self.stats_cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.stats_cache_path.with_suffix('.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.stats_cache_path)
+        except Exception as e:
+            logger.warning(f"⚠️ 헬스 통계 캐시 저장 실패: {e}")
+    
+    @staticmethod
+    def _query_row(conn: sqlite3.Connection, query: str, default: Dict) -> Dict:
+        """단일 행 집계 쿼리 (테이블이 없으면 기본값)"""
+        try:
+            cursor = conn.execute(query)
+            row = cursor.fetchone()
+            columns = [c[0] for c in cursor.description]
+            return dict(zip(columns, row)) if row else dict(default)
+        except sqlite3.Error:
+            return dict(default)
+    
+    def _scan_table_increment(self, conn: sqlite3.Connection, table: str, spec: Dict, cached: Optional[Dict]) -> Dict:
+        """워터마크 이후 신규 행만 한 번 집계해 누적 통계 갱신"""
+        null_columns = spec['null_columns']
+        
+        stats = dict(cached or {})
+        refreshed_at = stats.get('full_refresh_at')
+        if refreshed_at and datetime.fromisoformat(refreshed_at) < datetime.now() - timedelta(days=self.FULL_REFRESH_DAYS):
+            stats = {}
+        
+        max_rowid = conn.execute(f"SELECT MAX(rowid) FROM {table}").fetchone()[0] or 0
+        watermark = stats.get('watermark', 0)
+        if max_rowid < watermark:
+            # 테이블 재생성 등으로 rowid가 줄었으면 처음부터 다시 집계
+            stats, watermark = {}, 0
+        
+        if not stats:
+            stats = {
+                'watermark': 0,
+                'total_records': 0,
+                'invalid_records': 0,
+                'duplicate_groups': 0,
+                'null_counts': {column: 0 for column in null_columns},
+                'full_refresh_at': datetime.now().isoformat()
+            }
+        
+        if max_rowid > watermark:
+            invalid_expr = f"SUM(CASE WHEN {spec['invalid']} THEN 1 ELSE 0 END)" if spec['invalid'] else "0"
+            null_exprs = ", ".join(f"SUM(CASE WHEN {column} IS NULL THEN 1 ELSE 0 END)" for column in null_columns)
+            row = conn.execute(f"""
+                SELECT COUNT(*), {invalid_expr}, {null_exprs}
+                FROM {table}
+                WHERE rowid > ?
+            """, (watermark,)).fetchone()
+            
+            stats['total_records'] += row[0] or 0
+            stats['invalid_records'] += row[1] or 0
+            for column, null_count in zip(null_columns, row[2:]):
+                stats['null_counts'][column] = stats['null_counts'].get(column, 0) + (null_count or 0)
+            
+            # 신규 행의 키 중 이번에 처음 중복이 된 그룹만 추가
+            key = ", ".join(spec['dup_key'])
+            join_on = " AND ".join(f"t.{column} = n.{column}" for column in spec['dup_key'])
+            new_dup_groups = conn.execute(f"""
+                SELECT COUNT(*) FROM (
+                    SELECT COUNT(*) AS total, SUM(CASE WHEN t.rowid <= ? THEN 1 ELSE 0 END) AS existing
+                    FROM {table} t
+                    JOIN (SELECT DISTINCT {key} FROM {table} WHERE rowid > ?) n ON {join_on}
+                    GROUP BY {", ".join(f"t.{column}" for column in spec['dup_key'])}
+                )
+                WHERE total > 1 AND existing <= 1
+            """, (watermark, watermark)).fetchone()[0]
+            stats['duplicate_groups'] += new_dup_groups or 0
+            stats['watermark'] = max_rowid
+        
+        return stats
+    
+    def collect_snapshot_stats(self) -> Dict[str, Dict]:
+        """DB별 읽기 스냅샷 하나로 헬스 체크에 필요한 통계 전부 수집"""
+        cache = self._load_stats_cache()
+        snapshot = {}
         
         for db_name in self.databases:
             try:
-                results[db_name] = self._check_database_freshness(db_name)
-                logger.debug(f"{db_name} 데이터베이스 체크 완료")
+                conn = get_db_connection(db_name)
+                try:
+                    # 첫 SELECT 시점의 스냅샷을 트랜잭션 끝까지 유지
+                    conn.execute("BEGIN")
+                    snapshot[db_name] = self._collect_database_stats(db_name, conn, cache)
+                finally:
+                    conn.rollback()
+                    conn.close()
+                logger.debug(f"{db_name} 데이터베이스 통계 수집 완료")
             except Exception as e:
-                logger.error(f"{db_name} 데이터베이스 체크 실패: {e}")
-                results[db_name] = {'error': str(e)}
+                logger.error(f"{db_name} 데이터베이스 통계 수집 실패: {e}")
+                snapshot[db_name] = {'error': str(e)}
         
-        return results
+        self._save_stats_cache(cache)
+        return snapshot
     
-    def _check_database_freshness(self, db_name: str) -> Dict:
-        """개별 데이터베이스 최신성 체크"""
-        try:
-            with get_db_connection(db_name) as conn:
-                if db_name == 'stock':
-                    return self._check_stock_freshness(conn)
-                elif db_name == 'news':
-                    return self._check_news_freshness(conn)
-                elif db_name == 'dart':
-                    return self._check_dart_freshness(conn)
-                elif db_name == 'kis':
-                    return self._check_kis_freshness(conn)
-                else:
-                    return {'status': 'not_implemented'}
-                    
-        except Exception as e:
-            logger.error(f"데이터베이스 체크 실패 ({db_name}): {e}")
-            return {'error': str(e)}
-    
-    def _check_stock_freshness(self, conn: sqlite3.Connection) -> Dict:
-        """주가 데이터 최신성 체크 (기술분석 30% + 기본분석 45%)"""
-        try:
-            # 1. 주가 데이터 최신성 (기술분석 30% 비중)
-            stock_query = """
-                SELECT 
-                    MAX(date) as latest_date, 
-                    COUNT(DISTINCT stock_code) as stock_count,
-                    COUNT(*) as total_records
+    def _collect_database_stats(self, db_name: str, conn: sqlite3.Connection, cache: Dict) -> Dict:
+        """개별 데이터베이스 통계 (테이블당 집계 1회)"""
+        stats = {}
+        
+        for (spec_db, table), spec in self.INCREMENTAL_TABLE_SPECS.items():
+            if spec_db == db_name:
+                cache_key = f"{db_name}.{table}"
+                cache[cache_key] = self._scan_table_increment(conn, table, spec, cache.get(cache_key))
+                stats[table] = {'cumulative': cache[cache_key]}
+        
+        if db_name == 'stock':
+            # 최근 14일 (종목, 일자) 목록 한 번으로 최신성/커버리지/누락일 계산
+            recent = pd.read_sql("""
+                SELECT stock_code, date
                 FROM stock_prices
-                WHERE date >= date('now', '-7 days')
-            """
-            stock_result = pd.read_sql(stock_query, conn).iloc[0]
+                WHERE date >= date('now', '-14 days')
+            """, conn)
+            stats['stock_prices']['recent'] = recent
             
-            # 2. 워런 버핏 스코어카드 최신성 (기본분석 45% 비중)
-            buffett_query = """
+            stats['financial_ratios'] = self._query_row(conn, """
                 SELECT 
-                    COUNT(*) as scored_companies,
-                    AVG(total_buffett_score) as avg_score,
-                    MAX(updated_at) as latest_update
+                    COUNT(CASE WHEN total_buffett_score IS NOT NULL THEN 1 END) as scored_all,
+                    AVG(total_buffett_score) as avg_score_all,
+                    MAX(updated_at) as latest_update,
+                    COUNT(CASE WHEN quarter IS NULL THEN 1 END) as total_companies,
+                    COUNT(CASE WHEN quarter IS NULL AND total_buffett_score IS NOT NULL THEN 1 END) as scored_companies,
+                    AVG(CASE WHEN quarter IS NULL THEN total_buffett_score END) as avg_total_score,
+                    AVG(CASE WHEN quarter IS NULL THEN profitability_score END) as avg_profitability,
+                    AVG(CASE WHEN quarter IS NULL THEN growth_score END) as avg_growth,
+                    AVG(CASE WHEN quarter IS NULL THEN stability_score END) as avg_stability,
+                    AVG(CASE WHEN quarter IS NULL THEN efficiency_score END) as avg_efficiency,
+                    AVG(CASE WHEN quarter IS NULL THEN valuation_score END) as avg_valuation,
+                    MIN(CASE WHEN quarter IS NULL THEN total_buffett_score END) as min_score,
+                    MAX(CASE WHEN quarter IS NULL THEN total_buffett_score END) as max_score,
+                    COUNT(CASE WHEN quarter IS NULL AND total_buffett_score >= 90 THEN 1 END) as excellent,
+                    COUNT(CASE WHEN quarter IS NULL AND total_buffett_score >= 80 AND total_buffett_score < 90 THEN 1 END) as very_good,
+                    COUNT(CASE WHEN quarter IS NULL AND total_buffett_score >= 70 AND total_buffett_score < 80 THEN 1 END) as good,
+                    COUNT(CASE WHEN quarter IS NULL AND total_buffett_score >= 60 AND total_buffett_score < 70 THEN 1 END) as fair,
+                    COUNT(CASE WHEN quarter IS NULL AND total_buffett_score < 60 THEN 1 END) as poor
                 FROM financial_ratios
-                WHERE total_buffett_score IS NOT NULL
-            """
+            """, {'scored_all': 0, 'avg_score_all': 0, 'latest_update': None,
+                  'total_companies': 0, 'scored_companies': 0})
             
-            try:
-                buffett_result = pd.read_sql(buffett_query, conn).iloc[0]
-            except:
-                buffett_result = {'scored_companies': 0, 'avg_score': 0, 'latest_update': None}
-            
-            # 3. 기술적 지표 최신성
-            technical_query = """
+            stats['technical_indicators'] = self._query_row(conn, """
                 SELECT 
                     MAX(date) as latest_tech_date,
                     COUNT(DISTINCT stock_code) as tech_stock_count,
                     AVG(technical_score) as avg_tech_score
                 FROM technical_indicators
                 WHERE date >= date('now', '-7 days')
-            """
+            """, {'latest_tech_date': None, 'tech_stock_count': 0, 'avg_tech_score': 0})
+        
+        elif db_name == 'news':
+            stats['news_articles']['recent'] = self._query_row(conn, """
+                SELECT 
+                    DATE(MAX(created_at)) as latest_date, 
+                    COUNT(*) as news_count,
+                    COUNT(DISTINCT stock_code) as covered_stocks,
+                    AVG(sentiment_score) as avg_sentiment
+                FROM news_articles
+                WHERE created_at >= datetime('now', '-1 day')
+            """, {'latest_date': None, 'news_count': 0, 'covered_stocks': 0, 'avg_sentiment': 0})
             
-            try:
-                tech_result = pd.read_sql(technical_query, conn).iloc[0]
-            except:
-                tech_result = {'latest_tech_date': None, 'tech_stock_count': 0, 'avg_tech_score': 0}
-            
-            # 영업일 계산
-            today = datetime.now()
-            if today.weekday() >= 5:  # 주말
-                expected_date = today - timedelta(days=today.weekday()-4)
+            stats['sentiment_scores'] = self._query_row(conn, """
+                SELECT 
+                    COUNT(*) as analyzed_stocks,
+                    AVG(sentiment_final_score) as avg_final_score,
+                    MAX(updated_at) as latest_analysis
+                FROM sentiment_scores
+                WHERE date >= date('now', '-1 day')
+            """, {'analyzed_stocks': 0, 'avg_final_score': 0, 'latest_analysis': None})
+        
+        elif db_name == 'dart':
+            stats['disclosures'] = self._query_row(conn, """
+                SELECT 
+                    DATE(MAX(created_at)) as latest_date, 
+                    COUNT(*) as disclosure_count,
+                    COUNT(DISTINCT corp_code) as corp_count
+                FROM disclosures
+                WHERE created_at >= datetime('now', '-7 days')
+            """, {'latest_date': None, 'disclosure_count': 0, 'corp_count': 0})
+            
+            stats['financial_statements'] = self._query_row(conn, """
+                SELECT 
+                    COUNT(DISTINCT corp_code) as financial_corps,
+                    MAX(created_at) as latest_financial
+                FROM financial_statements
+                WHERE created_at >= datetime('now', '-30 days')
+            """, {'financial_corps': 0, 'latest_financial': None})
+        
+        elif db_name == 'kis':
+            stats['realtime_quotes'] = self._query_row(conn, """
+                SELECT 
+                    MAX(timestamp) as latest_timestamp,
+                    COUNT(DISTINCT stock_code) as stock_count,
+                    COUNT(*) as quote_count
+                FROM realtime_quotes
+                WHERE timestamp >= datetime('now', '-1 hour')
+            """, {'latest_timestamp': None, 'stock_count': 0, 'quote_count': 0})
+        
+        return stats
+    
+    def check_data_freshness(self, snapshot: Optional[Dict] = None) -> Dict[str, Dict]:
+        """데이터 최신성 체크 - 워런 버핏 시스템 특화"""
+        logger.info("🔍 데이터 최신성 체크 시작...")
+        snapshot = snapshot if snapshot is not None else self.collect_snapshot_stats()
+        results = {}
+        
+        for db_name in self.databases:
+            stats = snapshot.get(db_name, {'error': 'not_collected'})
+            if 'error' in stats:
+                results[db_name] = {'error': stats['error']}
+                continue
+            
+            if db_name == 'stock':
+                results[db_name] = self._check_stock_freshness(stats)
+            elif db_name == 'news':
+                results[db_name] = self._check_news_freshness(stats)
+            elif db_name == 'dart':
+                results[db_name] = self._check_dart_freshness(stats)
+            elif db_name == 'kis':
+                results[db_name] = self._check_kis_freshness(stats)
             else:
-                expected_date = today - timedelta(days=1) if today.hour >= 18 else today - timedelta(days=2)
+                results[db_name] = {'status': 'not_implemented'}
+        
+        return results
+    
+    def _check_stock_freshness(self, stats: Dict) -> Dict:
+        """주가 데이터 최신성 체크 (기술분석 30% + 기본분석 45%)"""
+        try:
+            # 1. 주가 데이터 최신성 (기술분석 30% 비중)
+            recent = stats['stock_prices']['recent']
+            last_week = recent[recent['date'] >= (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')]
+            stock_result = {
+                'latest_date': last_week['date'].max() if not last_week.empty else None,
+                'stock_count': int(last_week['stock_code'].nunique()),
+                'total_records': int(len(last_week))
+            }
+            
+            # 2. 워런 버핏 스코어카드 최신성 (기본분석 45% 비중)
+            ratios = stats['financial_ratios']
+            buffett_result = {
+                'scored_companies': ratios['scored_all'] or 0,
+                'avg_score': ratios['avg_score_all'] or 0,
+                'latest_update': ratios['latest_update']
+            }
+            
+            # 3. 기술적 지표 최신성
+            tech_result = stats['technical_indicators']
+            
+            # KRX 거래일 기준 수집 완료되어 있어야 할 최근 거래일
+            expected_date = get_krx_calendar().latest_completed_session()
             
             latest_date = stock_result['latest_date']
             is_fresh = latest_date == expected_date.strftime('%Y-%m-%d')
@@ -188,35 +402,11 @@ class DataMonitor:
             logger.error(f"주가 데이터 체크 실패: {e}")
             return {'error': str(e)}
     
-    def _check_news_freshness(self, conn: sqlite3.Connection) -> Dict:
+    def _check_news_freshness(self, stats: Dict) -> Dict:
         """뉴스 데이터 최신성 체크 (감정분석 25% 비중)"""
         try:
-            # 뉴스 데이터 최신성
-            news_query = """
-                SELECT 
-                    DATE(MAX(created_at)) as latest_date, 
-                    COUNT(*) as news_count,
-                    COUNT(DISTINCT stock_code) as covered_stocks,
-                    AVG(sentiment_score) as avg_sentiment
-                FROM news_articles
-                WHERE created_at >= datetime('now', '-1 day')
-            """
-            news_result = pd.read_sql(news_query, conn).iloc[0]
-            
-            # 감정분석 점수 최신성
-            sentiment_query = """
-                SELECT 
-                    COUNT(*) as analyzed_stocks,
-                    AVG(sentiment_final_score) as avg_final_score,
-                    MAX(updated_at) as latest_analysis
-                FROM sentiment_scores
-                WHERE date >= date('now', '-1 day')
-            """
-            
-            try:
-                sentiment_result = pd.read_sql(sentiment_query, conn).iloc[0]
-            except:
-                sentiment_result = {'analyzed_stocks': 0, 'avg_final_score': 0, 'latest_analysis': None}
+            news_result = stats['news_articles']['recent']
+            sentiment_result = stats['sentiment_scores']
             
             return {
                 'type': 'sentiment_analysis',
@@ -237,31 +427,11 @@ class DataMonitor:
             logger.error(f"뉴스 데이터 체크 실패: {e}")
             return {'error': str(e)}
     
-    def _check_dart_freshness(self, conn: sqlite3.Connection) -> Dict:
+    def _check_dart_freshness(self, stats: Dict) -> Dict:
         """DART 데이터 최신성 체크 (기본분석 45% 비중 지원)"""
         try:
-            disclosure_query = """
-                SELECT 
-                    DATE(MAX(created_at)) as latest_date, 
-                    COUNT(*) as disclosure_count,
-                    COUNT(DISTINCT corp_code) as corp_count
-                FROM disclosures
-                WHERE created_at >= datetime('now', '-7 days')
-            """
-            disclosure_result = pd.read_sql(disclosure_query, conn).iloc[0]
-            
-            financial_query = """
-                SELECT 
-                    COUNT(DISTINCT corp_code) as financial_corps,
-                    MAX(created_at) as latest_financial
-                FROM financial_statements
-                WHERE created_at >= datetime('now', '-30 days')
-            """
-            
-            try:
-                financial_result = pd.read_sql(financial_query, conn).iloc[0]
-            except:
-                financial_result = {'financial_corps': 0, 'latest_financial': None}
+            disclosure_result = stats['disclosures']
+            financial_result = stats['financial_statements']
             
             return {
                 'type': 'fundamental_data',
@@ -280,39 +450,16 @@ class DataMonitor:
             logger.error(f"DART 데이터 체크 실패: {e}")
             return {'error': str(e)}
     
-    def _check_kis_freshness(self, conn: sqlite3.Connection) -> Dict:
+    def _check_kis_freshness(self, stats: Dict) -> Dict:
         """KIS 데이터 최신성 체크"""
-        try:
-            kis_query = """
-                SELECT 
-                    MAX(timestamp) as latest_timestamp,
-                    COUNT(DISTINCT stock_code) as stock_count,
-                    COUNT(*) as quote_count
-                FROM realtime_quotes
-                WHERE timestamp >= datetime('now', '-1 hour')
-            """
-            
-            try:
-                kis_result = pd.read_sql(kis_query, conn).iloc[0]
-                return {
-                    'type': 'realtime_data',
-                    'latest_timestamp': kis_result['latest_timestamp'],
-                    'stock_count': kis_result['stock_count'],
-                    'quote_count': kis_result['quote_count'],
-                    'is_fresh': kis_result['quote_count'] > 0
-                }
-            except:
-                return {
-                    'type': 'realtime_data',
-                    'latest_timestamp': None,
-                    'stock_count': 0,
-                    'quote_count': 0,
-                    'is_fresh': False
-                }
-                
-        except Exception as e:
-            logger.error(f"KIS 데이터 체크 실패: {e}")
-            return {'error': str(e)}
+        kis_result = stats['realtime_quotes']
+        return {
+            'type': 'realtime_data',
+            'latest_timestamp': kis_result['latest_timestamp'],
+            'stock_count': kis_result['stock_count'],
+            'quote_count': kis_result['quote_count'],
+            'is_fresh': kis_result['quote_count'] > 0
+        }
     
     def _calculate_stock_health_score(self, stock_result, buffett_result, tech_result, is_fresh) -> int:
         """주식 데이터 종합 건강도 점수 계산 (0-100)"""
@@ -329,203 +476,137 @@ class DataMonitor:
             score += 20
         
         # 데이터 품질 (30점)
-        if buffett_result['avg_score'] > 0:  # 평균 스코어 존재
+        if (buffett_result['avg_score'] or 0) > 0:  # 평균 스코어 존재
             score += 15
-        if tech_result['avg_tech_score'] > 0:  # 기술적 분석 점수 존재
+        if (tech_result['avg_tech_score'] or 0) > 0:  # 기술적 분석 점수 존재
             score += 15
         
         return min(score, 100)
     
-    def check_data_quality(self) -> Dict[str, Dict]:
+    def check_data_quality(self, snapshot: Optional[Dict] = None) -> Dict[str, Dict]:
         """워런 버핏 시스템 데이터 품질 체크"""
         logger.info("📊 데이터 품질 체크 시작...")
+        snapshot = snapshot if snapshot is not None else self.collect_snapshot_stats()
         results = {}
         
         # 주가 데이터 품질 체크
-        results['stock_quality'] = self._check_stock_data_quality()
+        results['stock_quality'] = self._check_stock_data_quality(snapshot.get('stock', {}))
         
         # 워런 버핏 스코어카드 품질 체크
-        results['buffett_quality'] = self._check_buffett_scorecard_quality()
+        results['buffett_quality'] = self._check_buffett_scorecard_quality(snapshot.get('stock', {}))
         
         # 중복 데이터 체크
-        results['duplicates'] = self._check_duplicates()
+        results['duplicates'] = self._check_duplicates(snapshot)
         
         # 누락 데이터 체크
-        results['missing_data'] = self._check_missing_data()
+        results['missing_data'] = self._check_missing_data(snapshot.get('stock', {}))
         
         return results
     
-    def _check_stock_data_quality(self) -> Dict:
+    def _check_stock_data_quality(self, stats: Dict) -> Dict:
         """주가 데이터 품질 체크"""
         try:
-            with get_db_connection('stock') as conn:
-                # 비정상적인 가격 데이터 체크
-                invalid_query = """
-                    SELECT COUNT(*) as invalid_count
-                    FROM stock_prices
-                    WHERE open_price <= 0 OR high_price <= 0 OR low_price <= 0 OR close_price <= 0
-                       OR high_price < low_price
-                       OR open_price NOT BETWEEN low_price AND high_price
-                       OR close_price NOT BETWEEN low_price AND high_price
-                """
-                invalid_count = pd.read_sql(invalid_query, conn).iloc[0]['invalid_count']
-                
-                # 전체 레코드 수
-                total_query = "SELECT COUNT(*) as total FROM stock_prices"
-                total_count = pd.read_sql(total_query, conn).iloc[0]['total']
-                
-                # 최근 7일 데이터 완성도
-                recent_query = """
-                    SELECT 
-                        COUNT(DISTINCT stock_code) as recent_stocks,
-                        COUNT(DISTINCT date) as recent_dates
-                    FROM stock_prices 
-                    WHERE date >= date('now', '-7 days')
-                """
-                recent_result = pd.read_sql(recent_query, conn).iloc[0]
-                
-                quality_score = (total_count - invalid_count) / total_count * 100 if total_count > 0 else 0
-                
-                return {
-                    'total_records': total_count,
-                    'invalid_records': invalid_count,
-                    'quality_score': round(quality_score, 2),
-                    'recent_stocks': recent_result['recent_stocks'],
-                    'recent_dates': recent_result['recent_dates'],
-                    'status': 'excellent' if quality_score >= 99 else 'good' if quality_score >= 95 else 'poor'
-                }
-                
+            if 'error' in stats:
+                return {'error': stats['error']}
+            
+            cumulative = stats['stock_prices']['cumulative']
+            total_count = cumulative['total_records']
+            invalid_count = cumulative['invalid_records']
+            
+            # 최근 7일 데이터 완성도
+            recent = stats['stock_prices']['recent']
+            last_week = recent[recent['date'] >= (datetime.now() - timedelta(days=7)).strftime('%Y-%m-%d')]
+            
+            quality_score = (total_count - invalid_count) / total_count * 100 if total_count > 0 else 0
+            
+            return {
+                'total_records': total_count,
+                'invalid_records': invalid_count,
+                'null_counts': cumulative['null_counts'],
+                'quality_score': round(quality_score, 2),
+                'recent_stocks': int(last_week['stock_code'].nunique()),
+                'recent_dates': int(last_week['date'].nunique()),
+                'status': 'excellent' if quality_score >= 99 else 'good' if quality_score >= 95 else 'poor'
+            }
+            
         except Exception as e:
             logger.error(f"주가 데이터 품질 체크 실패: {e}")
             return {'error': str(e)}
     
-    def _check_buffett_scorecard_quality(self) -> Dict:
+    def _check_buffett_scorecard_quality(self, stats: Dict) -> Dict:
         """워런 버핏 스코어카드 품질 체크"""
         try:
-            with get_db_connection('stock') as conn:
-                scorecard_query = """
-                    SELECT 
-                        COUNT(*) as total_companies,
-                        COUNT(CASE WHEN total_buffett_score IS NOT NULL THEN 1 END) as scored_companies,
-                        AVG(total_buffett_score) as avg_total_score,
-                        AVG(profitability_score) as avg_profitability,
-                        AVG(growth_score) as avg_growth,
-                        AVG(stability_score) as avg_stability,
-                        AVG(efficiency_score) as avg_efficiency,
-                        AVG(valuation_score) as avg_valuation,
-                        MIN(total_buffett_score) as min_score,
-                        MAX(total_buffett_score) as max_score
-                    FROM financial_ratios
-                    WHERE quarter IS NULL  -- 연간 데이터만
-                """
-                
-                result = pd.read_sql(scorecard_query, conn).iloc[0]
-                
-                # 스코어카드 커버리지 계산
-                coverage = result['scored_companies'] / result['total_companies'] * 100 if result['total_companies'] > 0 else 0
-                
-                # 점수 분포 체크
-                distribution_query = """
-                    SELECT 
-                        COUNT(CASE WHEN total_buffett_score >= 90 THEN 1 END) as excellent,
-                        COUNT(CASE WHEN total_buffett_score >= 80 AND total_buffett_score < 90 THEN 1 END) as very_good,
-                        COUNT(CASE WHEN total_buffett_score >= 70 AND total_buffett_score < 80 THEN 1 END) as good,
-                        COUNT(CASE WHEN total_buffett_score >= 60 AND total_buffett_score < 70 THEN 1 END) as fair,
-                        COUNT(CASE WHEN total_buffett_score < 60 THEN 1 END) as poor
-                    FROM financial_ratios
-                    WHERE total_buffett_score IS NOT NULL AND quarter IS NULL
-                """
-                
-                distribution = pd.read_sql(distribution_query, conn).iloc[0]
-                
-                return {
-                    'total_companies': result['total_companies'],
-                    'scored_companies': result['scored_companies'],
-                    'coverage_percentage': round(coverage, 2),
-                    'avg_scores': {
-                        'total': round(result['avg_total_score'] or 0, 2),
-                        'profitability': round(result['avg_profitability'] or 0, 2),
-                        'growth': round(result['avg_growth'] or 0, 2),
-                        'stability': round(result['avg_stability'] or 0, 2),
-                        'efficiency': round(result['avg_efficiency'] or 0, 2),
-                        'valuation': round(result['avg_valuation'] or 0, 2)
-                    },
-                    'score_range': {
-                        'min': result['min_score'],
-                        'max': result['max_score']
-                    },
-                    'grade_distribution': {
-                        'excellent': distribution['excellent'],
-                        'very_good': distribution['very_good'],
-                        'good': distribution['good'],
-                        'fair': distribution['fair'],
-                        'poor': distribution['poor']
-                    },
-                    'status': 'excellent' if coverage >= 90 else 'good' if coverage >= 70 else 'poor'
-                }
-                
+            if 'error' in stats:
+                return {'error': stats['error']}
+            
+            result = stats['financial_ratios']
+            
+            # 스코어카드 커버리지 계산
+            coverage = result['scored_companies'] / result['total_companies'] * 100 if result['total_companies'] > 0 else 0
+            
+            return {
+                'total_companies': result['total_companies'],
+                'scored_companies': result['scored_companies'],
+                'coverage_percentage': round(coverage, 2),
+                'avg_scores': {
+                    'total': round(result.get('avg_total_score') or 0, 2),
+                    'profitability': round(result.get('avg_profitability') or 0, 2),
+                    'growth': round(result.get('avg_growth') or 0, 2),
+                    'stability': round(result.get('avg_stability') or 0, 2),
+                    'efficiency': round(result.get('avg_efficiency') or 0, 2),
+                    'valuation': round(result.get('avg_valuation') or 0, 2)
+                },
+                'score_range': {
+                    'min': result.get('min_score'),
+                    'max': result.get('max_score')
+                },
+                'grade_distribution': {
+                    'excellent': result.get('excellent', 0),
+                    'very_good': result.get('very_good', 0),
+                    'good': result.get('good', 0),
+                    'fair': result.get('fair', 0),
+                    'poor': result.get('poor', 0)
+                },
+                'status': 'excellent' if coverage >= 90 else 'good' if coverage >= 70 else 'poor'
+            }
+            
         except Exception as e:
             logger.error(f"워런 버핏 스코어카드 품질 체크 실패: {e}")
             return {'error': str(e)}
     
-    def _check_duplicates(self) -> Dict:
-        """중복 데이터 체크"""
+    def _check_duplicates(self, snapshot: Dict) -> Dict:
+        """중복 데이터 체크 (누적 통계의 중복 그룹 수)"""
         results = {}
         
         try:
-            # 주가 데이터 중복 체크
-            with get_db_connection('stock') as conn:
-                stock_dup_query = """
-                    SELECT stock_code, date, COUNT(*) as dup_count
-                    FROM stock_prices
-                    GROUP BY stock_code, date
-                    HAVING COUNT(*) > 1
-                """
-                stock_duplicates = pd.read_sql(stock_dup_query, conn)
-                results['stock_duplicates'] = len(stock_duplicates)
-            
-            # 뉴스 데이터 중복 체크
-            with get_db_connection('news') as conn:
-                news_dup_query = """
-                    SELECT title, pubDate, COUNT(*) as dup_count
-                    FROM news_articles
-                    GROUP BY title, pubDate
-                    HAVING COUNT(*) > 1
-                """
-                news_duplicates = pd.read_sql(news_dup_query, conn)
-                results['news_duplicates'] = len(news_duplicates)
-                
-        except Exception as e:
-            logger.error(f"중복 데이터 체크 실패: {e}")
-            results['error'] = str(e)
+            results['stock_duplicates'] = snapshot['stock']['stock_prices']['cumulative']['duplicate_groups']
+            results['news_duplicates'] = snapshot['news']['news_articles']['cumulative']['duplicate_groups']
+        except KeyError as e:
+            logger.error(f"중복 데이터 체크 실패: {e} 통계 없음")
+            results['error'] = f"{e} 통계 없음"
         
         return results
     
-    def _check_missing_data(self) -> Dict:
+    def _check_missing_data(self, stats: Dict) -> Dict:
         """누락 데이터 체크"""
         try:
-            # 최근 5일간 영업일 중 누락된 날짜 체크
-            with get_db_connection('stock') as conn:
-                # 영업일 생성 (주말 제외)
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=10)
-                date_range = pd.date_range(start=start_date, end=end_date, freq='B')
-                
-                missing_dates = []
-                for date in date_range:
-                    date_str = date.strftime('%Y-%m-%d')
-                    count_query = f"SELECT COUNT(DISTINCT stock_code) as count FROM stock_prices WHERE date = '{date_str}'"
-                    count_result = pd.read_sql(count_query, conn).iloc[0]['count']
-                    
-                    if count_result == 0:
-                        missing_dates.append(date_str)
-                
-                return {
-                    'missing_dates': missing_dates,
-                    'missing_count': len(missing_dates),
-                    'status': 'good' if len(missing_dates) == 0 else 'warning' if len(missing_dates) <= 2 else 'critical'
-                }
-                
+            if 'error' in stats:
+                return {'error': stats['error']}
+            
+            # 최근 10일 KRX 거래일 중 데이터가 없는 날짜
+            calendar = get_krx_calendar()
+            end_date = calendar.latest_completed_session()
+            sessions = calendar.sessions_in_range(end_date - timedelta(days=10), end_date)
+            
+            present_dates = set(stats['stock_prices']['recent']['date'])
+            missing_dates = [str(day) for day in sessions if str(day) not in present_dates]
+            
+            return {
+                'missing_dates': missing_dates,
+                'missing_count': len(missing_dates),
+                'status': 'good' if len(missing_dates) == 0 else 'warning' if len(missing_dates) <= 2 else 'critical'
+            }
+            
         except Exception as e:
             logger.error(f"누락 데이터 체크 실패: {e}")
             return {'error': str(e)}
@@ -535,12 +616,15 @@ class DataMonitor:
         try:
             logger.info("🏥 워런 버핏 시스템 헬스 체크 시작...")
             
+            # DB별 스냅샷 1회 수집 후 최신성/품질 평가에 공유
+            snapshot = self.collect_snapshot_stats()
+            
             report = {
                 'timestamp': datetime.now().isoformat(),
                 'system_name': 'Warren Buffett Investment System',
                 'version': '1.0.0',
-                'data_freshness': self.check_data_freshness(),
-                'data_quality': self.check_data_quality(),
+                'data_freshness': self.check_data_freshness(snapshot),
+                'data_quality': self.check_data_quality(snapshot),
                 'database_sizes': self._get_database_sizes(),
                 'system_status': 'healthy',
                 'issues': [],
@@ -647,15 +731,27 @@ class DataMonitor:
         return sizes
 
 class DataBackupManager:
-    """데이터 백업 관리 클래스"""
+    """데이터 백업 관리 클래스
+    
+    증분 백업 구조 (backups/):
+        chunks/ab/abcdef....z        SHA-256 주소 청크 (zlib 압축, 스냅샷 간 공유)
+        manifests/stock_daily_20250101_020000.json   스냅샷별 청크 목록
+    
+    스냅샷은 sqlite3 백업 API로 만들어 WAL 모드 DB에서도 쓰기를 막지 않고 일관성을 보장한다.
+    """
+    
+    # 청크당 페이지 수 (page_size 4096 기준 256KB)
+    PAGES_PER_CHUNK = 64
     
     def __init__(self):
         self.backup_dir = project_root / 'backups'
         self.backup_dir.mkdir(exist_ok=True)
+        self.chunk_dir = self.backup_dir / 'chunks'
+        self.manifest_dir = self.backup_dir / 'manifests'
         self.databases = ['stock', 'dart', 'news', 'kis']
     
-    def create_backup(self, backup_type: str = 'daily') -> Dict[str, str]:
-        """백업 생성"""
+    def create_backup(self, backup_type: str = 'daily', incremental: bool = True) -> Dict[str, str]:
+        """백업 생성 (기본: 온라인 증분 백업, incremental=False면 단일 파일 전체 백업)"""
         try:
             logger.info(f"💾 {backup_type} 백업 생성 시작...")
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -666,19 +762,10 @@ class DataBackupManager:
                     source_path = get_database_path(db_name)
                     
                     if source_path.exists():
-                        backup_filename = f"{db_name}_{backup_type}_{timestamp}.db"
-                        backup_path = self.backup_dir / backup_filename
-                        
-                        # 백업 실행
-                        shutil.copy2(source_path, backup_path)
-                        
-                        # 주간 백업은 압축
-                        if backup_type == 'weekly':
-                            with open(backup_path, 'rb') as f_in:
-                                with gzip.open(f"{backup_path}.gz", 'wb') as f_out:
-                                    shutil.copyfileobj(f_in, f_out)
-                            backup_path.unlink()  # 원본 삭제
-                            backup_path = f"{backup_path}.gz"
+                        if incremental:
+                            backup_path = self._create_incremental_snapshot(db_name, source_path, backup_type, timestamp)
+                        else:
+                            backup_path = self._create_full_backup(db_name, source_path, backup_type, timestamp)
                         
                         backup_results[db_name] = str(backup_path)
                         logger.info(f"✅ 백업 완료: {db_name} -> {backup_path.name}")
@@ -697,8 +784,148 @@ class DataBackupManager:
             logger.error(f"백업 생성 실패: {e}")
             return {'error': str(e)}
     
+    def _snapshot_to_file(self, source_path: Path, target_path: Path):
+        """sqlite3 백업 API로 일관된 스냅샷 생성
+        
+        한 번의 step(pages=-1)으로 복사해 단일 읽기 트랜잭션 시점의 상태를 얻는다.
+        WAL 모드에서는 읽기 트랜잭션이 쓰기를 막지 않는다.
+        """
+        src = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True, timeout=60)
+        dst = sqlite3.connect(str(target_path))
+        try:
+            src.backup(dst, pages=-1)
+            # 스냅샷 파일은 롤백 저널 모드로 두어 단일 파일로 완결되게 함
+            dst.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            dst.close()
+            src.close()
+    
+    def _create_full_backup(self, db_name: str, source_path: Path, backup_type: str, timestamp: str) -> Path:
+        """단일 파일 전체 백업 (주간 백업은 스트리밍 gzip)"""
+        backup_path = self.backup_dir / f"{db_name}_{backup_type}_{timestamp}.db"
+        self._snapshot_to_file(source_path, backup_path)
+        
+        if backup_type == 'weekly':
+            gz_path = Path(f"{backup_path}.gz")
+            with open(backup_path, 'rb') as f_in:
+                with gzip.open(gz_path, 'wb') as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+            backup_path.unlink()
+            backup_path = gz_path
+        
+        return backup_path
+    
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunk_dir / digest[:2] / f"{digest}.z"
+    
+    def _create_incremental_snapshot(self, db_name: str, source_path: Path, backup_type: str, timestamp: str) -> Path:
+        """온라인 스냅샷을 페이지 청크로 나눠 저장 (이미 있는 청크는 재사용, 신규 청크만 압축·기록)"""
+        self.chunk_dir.mkdir(exist_ok=True)
+        self.manifest_dir.mkdir(exist_ok=True)
+        
+        # WAL 모드에서는 커밋된 페이지가 -wal 파일에만 있을 수 있어 원본을 직접 읽지 않고
+        # 백업 디렉터리의 임시 파일로 스냅샷을 뜬 뒤 청크 단위로 읽는다 (메모리 사용 ≈ 청크 1개)
+        with tempfile.TemporaryDirectory(dir=self.backup_dir) as tmp_dir:
+            snapshot_path = Path(tmp_dir) / f"{db_name}.db"
+            self._snapshot_to_file(source_path, snapshot_path)
+            db_size = snapshot_path.stat().st_size
+            
+            chunks = []
+            new_chunks = 0
+            stored_bytes = 0
+            
+            with open(snapshot_path, 'rb') as f:
+                header = f.read(100)
+                page_size = int.from_bytes(header[16:18], 'big') if len(header) >= 18 else 0
+                page_size = 65536 if page_size == 1 else page_size
+                page_count = db_size // page_size if page_size else 0
+                chunk_size = (page_size or 4096) * self.PAGES_PER_CHUNK
+                f.seek(0)
+                
+                while True:
+                    data = f.read(chunk_size)
+                    if not data:
+                        break
+                    digest = hashlib.sha256(data).hexdigest()
+                    chunks.append(digest)
+                    
+                    chunk_path = self._chunk_path(digest)
+                    if not chunk_path.exists():
+                        chunk_path.parent.mkdir(exist_ok=True)
+                        compressed = zlib.compress(data, 6)
+                        # 중간 실패 시 깨진 청크가 남지 않도록 임시 파일 후 교체
+                        tmp_chunk = chunk_path.with_suffix('.tmp')
+                        tmp_chunk.write_bytes(compressed)
+                        os.replace(tmp_chunk, chunk_path)
+                        new_chunks += 1
+                        stored_bytes += len(compressed)
+        
+        manifest = {
+            'database': db_name,
+            'type': backup_type,
+            'timestamp': timestamp,
+            'page_size': page_size,
+            'page_count': page_count,
+            'chunk_size': chunk_size,
+            'size': db_size,
+            'chunks': chunks,
+            'new_chunks': new_chunks,
+            'stored_bytes': stored_bytes
+        }
+        manifest_path = self.manifest_dir / f"{db_name}_{backup_type}_{timestamp}.json"
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        
+        logger.info(f"  🧩 {db_name}: 청크 {len(chunks)}개 중 신규 {new_chunks}개 "
+                    f"({stored_bytes / (1024 * 1024):.1f}MB 저장 / 원본 {db_size / (1024 * 1024):.1f}MB)")
+        return manifest_path
+    
+    def _load_manifest(self, manifest_path: Path) -> Dict:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _materialize_snapshot(self, manifest: Dict, output_path: Path):
+        """매니페스트의 청크를 순서대로 풀어 DB 파일 복원"""
+        with open(output_path, 'wb') as f_out:
+            for digest in manifest['chunks']:
+                chunk_path = self._chunk_path(digest)
+                if not chunk_path.exists():
+                    raise FileNotFoundError(f"백업 청크 누락: {digest}")
+                data = zlib.decompress(chunk_path.read_bytes())
+                if hashlib.sha256(data).hexdigest() != digest:
+                    raise ValueError(f"백업 청크 손상: {digest}")
+                f_out.write(data)
+        
+        if output_path.stat().st_size != manifest['size']:
+            raise ValueError(f"복원 크기 불일치: {output_path.stat().st_size} != {manifest['size']}")
+    
+    def find_snapshot(self, db_name: str, as_of: Optional[datetime] = None) -> Optional[Path]:
+        """특정 시점 이전의 가장 최근 스냅샷 매니페스트 (as_of 없으면 최신)"""
+        if not self.manifest_dir.exists():
+            return None
+        
+        candidates = []
+        for manifest_path in self.manifest_dir.glob(f"{db_name}_*.json"):
+            parts = manifest_path.stem.split('_')
+            try:
+                taken_at = datetime.strptime(f"{parts[-2]}_{parts[-1]}", '%Y%m%d_%H%M%S')
+            except (ValueError, IndexError):
+                continue
+            if as_of is None or taken_at <= as_of:
+                candidates.append((taken_at, manifest_path))
+        
+        return max(candidates)[1] if candidates else None
+    
+    def restore_point_in_time(self, target_db: str, as_of: Optional[datetime] = None) -> bool:
+        """특정 시점 기준 증분 스냅샷으로 복원"""
+        manifest_path = self.find_snapshot(target_db, as_of)
+        if manifest_path is None:
+            logger.error(f"❌ {as_of or '최신'} 시점 이전 스냅샷 없음: {target_db}")
+            return False
+        return self.restore_backup(str(manifest_path), target_db)
+    
     def cleanup_old_backups(self, keep_days: int = 30) -> int:
-        """오래된 백업 정리"""
+        """오래된 백업 정리 (증분 매니페스트 삭제 후 참조되지 않는 청크 제거)"""
         try:
             logger.info(f"🧹 {keep_days}일 이상된 백업 파일 정리...")
             cutoff_date = datetime.now() - timedelta(days=keep_days)
@@ -710,6 +937,24 @@ class DataBackupManager:
                     deleted_count += 1
                     logger.debug(f"🗑️ 오래된 백업 삭제: {backup_file.name}")
             
+            if self.manifest_dir.exists():
+                live_chunks = set()
+                for manifest_path in self.manifest_dir.glob("*.json"):
+                    if manifest_path.stat().st_mtime < cutoff_date.timestamp():
+                        manifest_path.unlink()
+                        deleted_count += 1
+                        logger.debug(f"🗑️ 오래된 스냅샷 삭제: {manifest_path.name}")
+                    else:
+                        live_chunks.update(self._load_manifest(manifest_path)['chunks'])
+                
+                orphan_count = 0
+                for chunk_path in self.chunk_dir.glob("*/*.z"):
+                    if chunk_path.stem not in live_chunks:
+                        chunk_path.unlink()
+                        orphan_count += 1
+                if orphan_count:
+                    logger.info(f"🧩 참조되지 않는 청크 {orphan_count}개 삭제")
+            
             logger.info(f"✅ {deleted_count}개 백업 파일 삭제 완료")
             return deleted_count
             
@@ -718,7 +963,7 @@ class DataBackupManager:
             return 0
     
     def restore_backup(self, backup_file: str, target_db: str) -> bool:
-        """백업 복원"""
+        """백업 복원 (증분 매니페스트 .json / 전체 백업 .db / .db.gz)"""
         try:
             logger.info(f"🔄 백업 복원: {backup_file} -> {target_db}")
             backup_path = Path(backup_file)
@@ -728,19 +973,32 @@ class DataBackupManager:
                 logger.error(f"❌ 백업 파일이 존재하지 않음: {backup_path}")
                 return False
             
-            # 현재 데이터베이스 백업
-            current_backup = f"{target_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
-            if target_path.exists():
-                shutil.copy2(target_path, current_backup)
-                logger.info(f"💾 기존 데이터베이스 백업: {current_backup}")
-            
-            # 백업 복원
-            if backup_path.suffix == '.gz':
-                with gzip.open(backup_path, 'rb') as f_in:
-                    with open(target_path, 'wb') as f_out:
-                        shutil.copyfileobj(f_in, f_out)
-            else:
-                shutil.copy2(backup_path, target_path)
+            with tempfile.TemporaryDirectory(dir=self.backup_dir) as tmp_dir:
+                restored_path = Path(tmp_dir) / 'restored.db'
+                
+                if backup_path.suffix == '.json':
+                    self._materialize_snapshot(self._load_manifest(backup_path), restored_path)
+                elif backup_path.suffix == '.gz':
+                    with gzip.open(backup_path, 'rb') as f_in:
+                        with open(restored_path, 'wb') as f_out:
+                            shutil.copyfileobj(f_in, f_out)
+                else:
+                    shutil.copy2(backup_path, restored_path)
+                
+                # 현재 데이터베이스 백업
+                if target_path.exists():
+                    current_backup = Path(f"{target_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+                    self._snapshot_to_file(target_path, current_backup)
+                    logger.info(f"💾 기존 데이터베이스 백업: {current_backup}")
+                
+                # 백업 API로 덮어써 WAL/열린 연결이 있어도 일관되게 교체
+                src = sqlite3.connect(str(restored_path))
+                dst = sqlite3.connect(str(target_path), timeout=60)
+                try:
+                    src.backup(dst)
+                finally:
+                    dst.close()
+                    src.close()
             
             logger.info(f"✅ 백업 복원 완료: {backup_file} -> {target_path}")
             return True
@@ -750,7 +1008,7 @@ class DataBackupManager:
             return False
     
     def list_backups(self) -> List[Dict]:
-        """백업 파일 목록 조회"""
+        """백업 파일 목록 조회 (증분 스냅샷 포함)"""
         backups = []
         
         try:
@@ -764,6 +1022,19 @@ class DataBackupManager:
                     'database': backup_file.name.split('_')[0],
                     'type': backup_file.name.split('_')[1] if '_' in backup_file.name else 'unknown'
                 })
+            
+            if self.manifest_dir.exists():
+                for manifest_path in sorted(self.manifest_dir.glob("*.json"), key=lambda x: x.stat().st_mtime, reverse=True):
+                    manifest = self._load_manifest(manifest_path)
+                    backups.append({
+                        'filename': manifest_path.name,
+                        'path': str(manifest_path),
+                        # 스냅샷이 새로 저장한 청크 크기 (원본 크기는 size 필드)
+                        'size_mb': round(manifest.get('stored_bytes', 0) / (1024 * 1024), 2),
+                        'created': datetime.fromtimestamp(manifest_path.stat().st_mtime).strftime('%Y-%m-%d %H:%M:%S'),
+                        'database': manifest['database'],
+                        'type': f"{manifest['type']}(incremental)"
+                    })
         except Exception as e:
             logger.error(f"백업 목록 조회 실패: {e}")
         
@@ -959,19 +1230,19 @@ class AlertManager:
             return False
         
         try:
-            msg = MimeMultipart()
+            msg = MIMEMultipart()
             msg['From'] = self.email_user
             msg['To'] = ', '.join(self.alert_recipients)
             msg['Subject'] = subject
             
-            msg.attach(MimeText(body, 'plain', 'utf-8'))
+            msg.attach(MIMEText(body, 'plain', 'utf-8'))
             
             # 첨부파일 처리
             if attachments:
                 for file_path in attachments:
                     if Path(file_path).exists():
                         with open(file_path, 'rb') as attachment:
-                            part = MimeBase('application', 'octet-stream')
+                            part = MIMEBase('application', 'octet-stream')
                             part.set_payload(attachment.read())
                         
                         encoders.encode_base64(part)
@@ -1003,6 +1274,8 @@ def main():
     parser.add_argument('--backup-file', help='복원할 백업 파일')
     parser.add_argument('--target-db', help='복원 대상 데이터베이스')
     parser.add_argument('--keep-days', type=int, default=30, help='백업 보관 일수')
+    parser.add_argument('--full', action='store_true', help='증분 대신 단일 파일 전체 백업')
+    parser.add_argument('--as-of', help='해당 시점 이전 최신 스냅샷으로 복원 (YYYY-MM-DD HH:MM)')
     parser.add_argument('--send-email', action='store_true', help='이메일 알림 전송')
     parser.add_argument('--verbose', '-v', action='store_true', help='상세 로그 출력')
     
@@ -1051,7 +1324,7 @@ def main():
             print(f"💾 {args.backup_type} 백업을 시작합니다...")
             
             backup_manager = DataBackupManager()
-            backup_results = backup_manager.create_backup(args.backup_type)
+            backup_results = backup_manager.create_backup(args.backup_type, incremental=not args.full)
             
             if 'error' not in backup_results:
                 successful = [db for db, result in backup_results.items() if not result.startswith('error')]
@@ -1074,14 +1347,18 @@ def main():
                 print(f"❌ 백업 실패: {backup_results['error']}")
         
         elif args.action == 'restore':
-            if not args.backup_file or not args.target_db:
-                print("❌ 복원에는 --backup-file과 --target-db가 필요합니다.")
+            if not args.target_db or not (args.backup_file or args.as_of):
+                print("❌ 복원에는 --target-db와 --backup-file 또는 --as-of가 필요합니다.")
                 return False
             
-            print(f"🔄 백업 복원: {args.backup_file} -> {args.target_db}")
-            
             backup_manager = DataBackupManager()
-            success = backup_manager.restore_backup(args.backup_file, args.target_db)
+            if args.backup_file:
+                print(f"🔄 백업 복원: {args.backup_file} -> {args.target_db}")
+                success = backup_manager.restore_backup(args.backup_file, args.target_db)
+            else:
+                as_of = datetime.strptime(args.as_of, '%Y-%m-%d %H:%M')
+                print(f"🔄 시점 복원: {args.as_of} -> {args.target_db}")
+                success = backup_manager.restore_point_in_time(args.target_db, as_of)
             
             if success:
                 print("✅ 복원 완료!")
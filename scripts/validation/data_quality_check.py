@@ -3,7 +3,7 @@
 워런 버핏 스코어카드 시스템 데이터 품질 검증 스크립트
 scripts/validation/data_quality_check.py
 
-- 주가 데이터 품질 검증 (기술분석 30% 비중)
+- 주가 데이터 품질 검증 (기술분석 30% 비중, 전체 이력 벡터화 검증)
 - 재무 데이터 무결성 검증 (기본분석 45% 비중)
 - 뉴스 감정분석 품질 검증 (감정분석 25% 비중)
 - 워런 버핏 스코어카드 정확성 검증
@@ -35,6 +35,8 @@ except ImportError:
         db_path = Path(f'data/databases/{db_name}_data.db')
         return sqlite3.connect(str(db_path))
 
+from src.utils.krx_calendar import get_krx_calendar
+
 # 로깅 설정
 log_dir = project_root / 'logs'
 log_dir.mkdir(exist_ok=True)
@@ -49,6 +51,175 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class OHLCVValidator:
+    """stock_prices 전체 이력 벡터화 검증기
+    
+    종목 묶음 단위로 (stock_code, date) 순서대로 읽어 모든 규칙을 NumPy 배열 연산으로 한 번에 평가하고,
+    종목별 이상치 집계표를 만든다. SQL은 종목 묶음당 1회만 실행한다.
+    
+    start_date를 주면 종목별로 그 직전 봉을 기준 봉(is_context)으로 함께 읽어, 단일 일자 검증에서도
+    첫 봉의 가격 급변/결측 거래일을 평가한다. 기준 봉 자체는 집계하지 않는다.
+    """
+    
+    # KRX 가격제한폭 (전일 종가 대비 ±30%)
+    PRICE_LIMIT = 0.30
+    
+    # 종목별 이상치 집계 컬럼
+    FLAG_COLUMNS = ['null_price', 'non_positive', 'high_low', 'ohlc_bounds', 'negative_volume',
+                    'zero_volume', 'price_jump', 'off_calendar']
+    
+    def __init__(self, stocks_per_chunk: int = 200, price_limit: float = PRICE_LIMIT):
+        self.stocks_per_chunk = stocks_per_chunk
+        self.price_limit = price_limit
+        self.calendar = get_krx_calendar()
+    
+    def iter_chunks(self, conn, stock_codes: List[str] = None,
+                    start_date: str = None, end_date: str = None):
+        """종목 묶음별 (stock_code, date) 정렬 데이터프레임"""
+        if stock_codes is None:
+            stock_codes = [row[0] for row in conn.execute(
+                "SELECT DISTINCT stock_code FROM stock_prices ORDER BY stock_code"
+            ).fetchall()]
+        
+        date_clause = ""
+        date_params = []
+        if start_date:
+            date_clause += " AND date >= ?"
+            date_params.append(start_date)
+        if end_date:
+            date_clause += " AND date <= ?"
+            date_params.append(end_date)
+        
+        columns = "stock_code, date, open_price, high_price, low_price, close_price, volume"
+        for i in range(0, len(stock_codes), self.stocks_per_chunk):
+            batch = list(stock_codes[i:i + self.stocks_per_chunk])
+            in_clause = f"stock_code IN ({','.join(['?'] * len(batch))})"
+            query = f"""
+                SELECT {columns}, 0 AS is_context
+                FROM stock_prices
+                WHERE {in_clause} {date_clause}
+            """
+            params = batch + date_params
+            if start_date:
+                # 종목별 start_date 직전 봉 ((stock_code, date) 인덱스로 종목당 1회 조회)
+                query += f"""
+                UNION ALL
+                SELECT {columns}, 1 AS is_context
+                FROM stock_prices p
+                WHERE {in_clause}
+                  AND date = (SELECT MAX(date) FROM stock_prices q
+                              WHERE q.stock_code = p.stock_code AND q.date < ?)
+                """
+                params += batch + [start_date]
+            chunk = pd.read_sql(query + " ORDER BY stock_code, date", conn, params=params)
+            
+            # 구간 안에 봉이 없는 종목의 기준 봉은 제외
+            in_range = chunk['is_context'] == 0
+            chunk = chunk[chunk['stock_code'].isin(chunk.loc[in_range, 'stock_code'])].reset_index(drop=True)
+            if not chunk.empty:
+                yield chunk
+    
+    def evaluate_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """청크 하나의 모든 규칙 평가 → 종목별 집계 (is_context 기준 봉은 비교에만 사용)"""
+        codes, stock_index = np.unique(chunk['stock_code'].values, return_inverse=True)
+        n_stocks = len(codes)
+        if 'is_context' in chunk.columns:
+            keep = chunk['is_context'].to_numpy() == 0
+        else:
+            keep = np.ones(len(chunk), dtype=bool)
+        
+        o = chunk['open_price'].to_numpy(dtype=float)
+        h = chunk['high_price'].to_numpy(dtype=float)
+        l = chunk['low_price'].to_numpy(dtype=float)
+        c = chunk['close_price'].to_numpy(dtype=float)
+        v = chunk['volume'].to_numpy(dtype=float)
+        dates = pd.to_datetime(chunk['date']).values.astype('datetime64[D]')
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            flags = {
+                'null_price': np.isnan(o) | np.isnan(h) | np.isnan(l) | np.isnan(c),
+                'non_positive': (o <= 0) | (h <= 0) | (l <= 0) | (c <= 0),
+                'high_low': h < l,
+                'ohlc_bounds': (o < l) | (o > h) | (c < l) | (c > h),
+                'negative_volume': v < 0,
+                'zero_volume': v == 0,
+            }
+            
+            # 같은 종목 내 직전 봉 대비 변동률 (종목 경계는 제외)
+            same_stock = np.zeros(len(c), dtype=bool)
+            same_stock[1:] = stock_index[1:] == stock_index[:-1]
+            prev_close = np.empty_like(c)
+            prev_close[0] = np.nan
+            prev_close[1:] = c[:-1]
+            change = np.where(same_stock & (prev_close > 0), c / prev_close - 1, np.nan)
+        
+        abs_change = np.abs(change)
+        # 호가단위 반올림 여유 0.5%p
+        flags['price_jump'] = abs_change > self.price_limit + 0.005
+        
+        # KRX 거래일 캘린더 기준: 휴장일에 찍힌 봉, 직전 봉과 현재 봉 사이에 빠진 거래일 수
+        flags['off_calendar'] = ~self.calendar.is_session_array(dates)
+        gap_days = np.where(same_stock, self.calendar.missing_sessions_between(dates), 0)
+        
+        # 기준 봉 제외 후 집계
+        flags = {name: mask[keep] for name, mask in flags.items()}
+        gap_days = gap_days[keep]
+        abs_change = abs_change[keep]
+        stock_index = stock_index[keep]
+        dates = dates[keep]
+        same_stock = np.zeros(len(dates), dtype=bool)
+        same_stock[1:] = stock_index[1:] == stock_index[:-1]
+        
+        table = pd.DataFrame({'stock_code': codes})
+        table['bars'] = np.bincount(stock_index, minlength=n_stocks)
+        for name, mask in flags.items():
+            table[name] = np.bincount(stock_index, weights=np.nan_to_num(mask).astype(float),
+                                      minlength=n_stocks).astype(int)
+        table['missing_days'] = np.bincount(stock_index, weights=gap_days, minlength=n_stocks).astype(int)
+        
+        max_change = np.full(n_stocks, np.nan)
+        valid = ~np.isnan(abs_change)
+        np.fmax.at(max_change, stock_index[valid], abs_change[valid])
+        table['max_abs_change_pct'] = np.round(max_change * 100, 2)
+        
+        first = np.ones(len(dates), dtype=bool)
+        first[1:] = ~same_stock[1:]
+        last = np.ones(len(dates), dtype=bool)
+        last[:-1] = first[1:]
+        table['first_date'] = pd.to_datetime(dates[first]).strftime('%Y-%m-%d')
+        table['last_date'] = pd.to_datetime(dates[last]).strftime('%Y-%m-%d')
+        
+        return table
+    
+    def validate(self, conn, stock_codes: List[str] = None,
+                 start_date: str = None, end_date: str = None) -> Dict:
+        """전체 이력 검증 → 규칙별 합계 + 종목별 이상치 표"""
+        tables = []
+        seen_dates = []
+        for chunk in self.iter_chunks(conn, stock_codes, start_date, end_date):
+            tables.append(self.evaluate_chunk(chunk))
+            seen_dates.append(chunk.loc[chunk['is_context'] == 0, 'date'].unique())
+        
+        if not tables:
+            return {'total_records': 0, 'totals': {}, 'anomalies': pd.DataFrame(), 'dates': set()}
+        
+        per_stock = pd.concat(tables, ignore_index=True)
+        count_columns = self.FLAG_COLUMNS + ['missing_days']
+        totals = {name: int(per_stock[name].sum()) for name in count_columns}
+        totals['max_abs_change_pct'] = float(per_stock['max_abs_change_pct'].max()) if per_stock['max_abs_change_pct'].notna().any() else 0.0
+        
+        anomaly_columns = [name for name in count_columns if name not in ('zero_volume', 'off_calendar')]
+        anomalies = per_stock[(per_stock[anomaly_columns] > 0).any(axis=1)].reset_index(drop=True)
+        
+        return {
+            'total_records': int(per_stock['bars'].sum()),
+            'total_stocks': len(per_stock),
+            'totals': totals,
+            'anomalies': anomalies,
+            'dates': set(np.concatenate(seen_dates))
+        }
+
+
 class StockDataQualityChecker:
     """주가 데이터 품질 검증 클래스 (기술분석 30% 비중)"""
     
@@ -58,31 +229,19 @@ class StockDataQualityChecker:
             'high_low_order': "고가 >= 저가",
             'ohlc_logic': "시가, 종가는 고가와 저가 사이에 있어야 함",
             'volume_non_negative': "거래량은 0 이상이어야 함",
-            'price_reasonable': "가격 변동이 합리적 범위 내에 있어야 함",
+            'price_reasonable': "일간 변동이 가격제한폭(±30%) 이내여야 함",
             'consecutive_data': "연속된 영업일 데이터가 존재해야 함"
         }
+        self.validator = OHLCVValidator()
     
     def check_stock_data_quality(self, target_date: str = None, stock_codes: List[str] = None) -> Dict:
-        """주가 데이터 품질 종합 검증"""
+        """주가 데이터 품질 종합 검증 (OHLCVValidator 단일 패스)"""
         logger.info("📈 주가 데이터 품질 검증 시작...")
         
         try:
             with get_db_connection('stock') as conn:
-                # 기본 쿼리 조건
-                where_clause = "WHERE 1=1"
-                params = []
-                
-                if target_date:
-                    where_clause += " AND date = ?"
-                    params.append(target_date)
-                
-                if stock_codes:
-                    where_clause += f" AND stock_code IN ({','.join(['?' for _ in stock_codes])})"
-                    params.extend(stock_codes)
-                
-                # 전체 데이터 통계
-                total_query = f"SELECT COUNT(*) as total_records FROM stock_prices {where_clause}"
-                total_records = pd.read_sql(total_query, conn, params=params).iloc[0]['total_records']
+                validation = self.validator.validate(conn, stock_codes, start_date=target_date, end_date=target_date)
+                total_records = validation['total_records']
                 
                 if total_records == 0:
                     return {
@@ -91,27 +250,35 @@ class StockDataQualityChecker:
                         'total_records': 0
                     }
                 
-                # 각 품질 규칙 검증
-                quality_results = {}
-                
-                # 1. 가격 양수 검증
-                quality_results['price_positive'] = self._check_positive_prices(conn, where_clause, params)
-                
-                # 2. 고가/저가 순서 검증
-                quality_results['high_low_order'] = self._check_high_low_order(conn, where_clause, params)
-                
-                # 3. OHLC 논리 검증
-                quality_results['ohlc_logic'] = self._check_ohlc_logic(conn, where_clause, params)
-                
-                # 4. 거래량 검증
-                quality_results['volume_check'] = self._check_volume_data(conn, where_clause, params)
-                
-                # 5. 가격 변동 합리성 검증
-                quality_results['price_variation'] = self._check_price_variation(conn, where_clause, params)
+                totals = validation['totals']
+                anomalies = validation['anomalies']
+                
+                # 각 품질 규칙 결과
+                quality_results = {
+                    'price_positive': self._rule_result('price_positive', totals['non_positive'],
+                                                        {'null_price': totals['null_price']}),
+                    'high_low_order': self._rule_result('high_low_order', totals['high_low']),
+                    'ohlc_logic': self._rule_result('ohlc_logic', totals['ohlc_bounds']),
+                    'volume_check': self._rule_result('volume_non_negative', totals['negative_volume'],
+                                                      {'zero_volume': totals['zero_volume']}),
+                    'price_variation': self._rule_result(
+                        'price_reasonable', totals['price_jump'],
+                        {'limit_pct': self.validator.price_limit * 100,
+                         'max_variation': totals['max_abs_change_pct']},
+                        passed=totals['price_jump'] < total_records * 0.01  # 1% 미만은 허용
+                    ),
+                    'trading_gaps': {
+                        'rule': "거래일 캘린더 대비 종목별 결측 거래일",
+                        'missing_days': totals['missing_days'],
+                        'stocks_with_gaps': int((anomalies['missing_days'] > 0).sum()) if not anomalies.empty else 0,
+                        'off_calendar_bars': totals['off_calendar'],
+                        'passed': totals['missing_days'] == 0
+                    }
+                }
                 
-                # 6. 데이터 연속성 검증
+                # 데이터 연속성 검증
                 if not target_date:  # 특정 날짜가 아닌 경우만
-                    quality_results['data_continuity'] = self._check_data_continuity(conn, stock_codes)
+                    quality_results['data_continuity'] = self._check_data_continuity(validation['dates'])
                 
                 # 종합 품질 점수 계산
                 overall_score = self._calculate_overall_quality_score(quality_results, total_records)
@@ -122,7 +289,9 @@ class StockDataQualityChecker:
                     'target_date': target_date,
                     'stock_codes': stock_codes,
                     'total_records': total_records,
+                    'total_stocks': validation['total_stocks'],
                     'quality_results': quality_results,
+                    'anomalies': json.loads(anomalies.to_json(orient='records')),
                     'overall_score': overall_score,
                     'quality_grade': self._get_quality_grade(overall_score)
                 }
@@ -135,178 +304,27 @@ class StockDataQualityChecker:
                 'timestamp': datetime.now().isoformat()
             }
     
-    def _check_positive_prices(self, conn, where_clause, params) -> Dict:
-        """양수 가격 검증"""
-        try:
-            invalid_query = f"""
-                SELECT COUNT(*) as invalid_count,
-                       COUNT(CASE WHEN open_price <= 0 THEN 1 END) as invalid_open,
-                       COUNT(CASE WHEN high_price <= 0 THEN 1 END) as invalid_high,
-                       COUNT(CASE WHEN low_price <= 0 THEN 1 END) as invalid_low,
-                       COUNT(CASE WHEN close_price <= 0 THEN 1 END) as invalid_close
-                FROM stock_prices {where_clause}
-                AND (open_price <= 0 OR high_price <= 0 OR low_price <= 0 OR close_price <= 0)
-            """
-            
-            result = pd.read_sql(invalid_query, conn, params=params).iloc[0]
-            
-            return {
-                'rule': self.quality_rules['price_positive'],
-                'invalid_count': result['invalid_count'],
-                'details': {
-                    'invalid_open': result['invalid_open'],
-                    'invalid_high': result['invalid_high'],
-                    'invalid_low': result['invalid_low'],
-                    'invalid_close': result['invalid_close']
-                },
-                'passed': result['invalid_count'] == 0
-            }
-            
-        except Exception as e:
-            return {'rule': self.quality_rules['price_positive'], 'error': str(e), 'passed': False}
-    
-    def _check_high_low_order(self, conn, where_clause, params) -> Dict:
-        """고가/저가 순서 검증"""
-        try:
-            invalid_query = f"""
-                SELECT COUNT(*) as invalid_count
-                FROM stock_prices {where_clause}
-                AND high_price < low_price
-            """
-            
-            invalid_count = pd.read_sql(invalid_query, conn, params=params).iloc[0]['invalid_count']
-            
-            return {
-                'rule': self.quality_rules['high_low_order'],
-                'invalid_count': invalid_count,
-                'passed': invalid_count == 0
-            }
-            
-        except Exception as e:
-            return {'rule': self.quality_rules['high_low_order'], 'error': str(e), 'passed': False}
-    
-    def _check_ohlc_logic(self, conn, where_clause, params) -> Dict:
-        """OHLC 논리 검증"""
-        try:
-            invalid_query = f"""
-                SELECT COUNT(*) as invalid_count,
-                       COUNT(CASE WHEN open_price NOT BETWEEN low_price AND high_price THEN 1 END) as invalid_open,
-                       COUNT(CASE WHEN close_price NOT BETWEEN low_price AND high_price THEN 1 END) as invalid_close
-                FROM stock_prices {where_clause}
-                AND (open_price NOT BETWEEN low_price AND high_price 
-                     OR close_price NOT BETWEEN low_price AND high_price)
-            """
-            
-            result = pd.read_sql(invalid_query, conn, params=params).iloc[0]
-            
-            return {
-                'rule': self.quality_rules['ohlc_logic'],
-                'invalid_count': result['invalid_count'],
-                'details': {
-                    'invalid_open': result['invalid_open'],
-                    'invalid_close': result['invalid_close']
-                },
-                'passed': result['invalid_count'] == 0
-            }
-            
-        except Exception as e:
-            return {'rule': self.quality_rules['ohlc_logic'], 'error': str(e), 'passed': False}
-    
-    def _check_volume_data(self, conn, where_clause, params) -> Dict:
-        """거래량 데이터 검증"""
-        try:
-            volume_query = f"""
-                SELECT COUNT(*) as total_records,
-                       COUNT(CASE WHEN volume < 0 THEN 1 END) as negative_volume,
-                       COUNT(CASE WHEN volume = 0 THEN 1 END) as zero_volume,
-                       AVG(volume) as avg_volume,
-                       MAX(volume) as max_volume
-                FROM stock_prices {where_clause}
-            """
-            
-            result = pd.read_sql(volume_query, conn, params=params).iloc[0]
-            
-            return {
-                'rule': self.quality_rules['volume_non_negative'],
-                'invalid_count': result['negative_volume'],
-                'details': {
-                    'negative_volume': result['negative_volume'],
-                    'zero_volume': result['zero_volume'],
-                    'avg_volume': int(result['avg_volume'] or 0),
-                    'max_volume': int(result['max_volume'] or 0)
-                },
-                'passed': result['negative_volume'] == 0
-            }
-            
-        except Exception as e:
-            return {'rule': self.quality_rules['volume_non_negative'], 'error': str(e), 'passed': False}
-    
-    def _check_price_variation(self, conn, where_clause, params) -> Dict:
-        """가격 변동 합리성 검증"""
-        try:
-            # 일일 변동률이 ±30%를 초과하는 경우를 비정상으로 간주
-            variation_query = f"""
-                SELECT stock_code, date, close_price,
-                       LAG(close_price) OVER (PARTITION BY stock_code ORDER BY date) as prev_close,
-                       ABS((close_price - LAG(close_price) OVER (PARTITION BY stock_code ORDER BY date)) 
-                           / LAG(close_price) OVER (PARTITION BY stock_code ORDER BY date)) * 100 as daily_change_pct
-                FROM stock_prices {where_clause}
-            """
-            
-            variations = pd.read_sql(variation_query, conn, params=params)
-            
-            # 30% 초과 변동 검출
-            extreme_variations = variations[variations['daily_change_pct'] > 30].dropna()
-            
-            return {
-                'rule': self.quality_rules['price_reasonable'],
-                'invalid_count': len(extreme_variations),
-                'details': {
-                    'extreme_variations': len(extreme_variations),
-                    'max_variation': round(variations['daily_change_pct'].max() or 0, 2),
-                    'avg_variation': round(variations['daily_change_pct'].mean() or 0, 2)
-                },
-                'passed': len(extreme_variations) < len(variations) * 0.01  # 1% 미만은 허용
-            }
-            
-        except Exception as e:
-            return {'rule': self.quality_rules['price_reasonable'], 'error': str(e), 'passed': False}
+    def _rule_result(self, rule_name: str, invalid_count: int, details: Dict = None, passed: bool = None) -> Dict:
+        """규칙별 결과 형식"""
+        result = {
+            'rule': self.quality_rules[rule_name],
+            'invalid_count': invalid_count,
+            'passed': invalid_count == 0 if passed is None else bool(passed)
+        }
+        if details:
+            result['details'] = details
+        return result
     
-    def _check_data_continuity(self, conn, stock_codes: List[str] = None) -> Dict:
-        """데이터 연속성 검증"""
+    def _check_data_continuity(self, present_dates: set) -> Dict:
+        """데이터 연속성 검증 (최근 30 거래일 중 데이터가 전혀 없는 날)"""
         try:
-            # 최근 30일간 영업일 기준 연속성 체크
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=50)  # 여유를 두고 50일
-            
-            # 영업일 생성 (주말 제외)
-            business_days = pd.date_range(start=start_date, end=end_date, freq='B')
-            expected_dates = [d.strftime('%Y-%m-%d') for d in business_days[-30:]]  # 최근 30 영업일
-            
-            # 종목별 데이터 연속성 체크
-            stock_condition = ""
-            params = []
-            
-            if stock_codes:
-                stock_condition = f"AND stock_code IN ({','.join(['?' for _ in stock_codes])})"
-                params = stock_codes
-            
-            # 각 예상 날짜별 데이터 존재 여부 확인
-            missing_dates = []
+            calendar = self.validator.calendar
+            end_date = calendar.latest_completed_session()
+            start_date = calendar.add_sessions(end_date, -29)
+            expected_dates = [str(d) for d in calendar.sessions_in_range(start_date, end_date)]  # 최근 30 거래일
+            missing_dates = [d for d in expected_dates if d not in present_dates]
             total_expected = len(expected_dates)
             
-            for date in expected_dates:
-                count_query = f"""
-                    SELECT COUNT(DISTINCT stock_code) as stock_count 
-                    FROM stock_prices 
-                    WHERE date = ? {stock_condition}
-                """
-                count_result = pd.read_sql(count_query, conn, params=[date] + params)
-                stock_count = count_result.iloc[0]['stock_count']
-                
-                if stock_count == 0:
-                    missing_dates.append(date)
-            
             continuity_score = (total_expected - len(missing_dates)) / total_expected * 100
             
             return {
@@ -848,6 +866,7 @@ def main():
     parser.add_argument('--year', type=int, help='재무데이터 검증 연도')
     parser.add_argument('--days', type=int, default=7, help='뉴스 데이터 검증 일수')
     parser.add_argument('--output', help='결과 저장 파일 (JSON)')
+    parser.add_argument('--anomaly-output', help='종목별 주가 이상치 표 저장 파일 (CSV)')
     parser.add_argument('--verbose', '-v', action='store_true', help='상세 로그 출력')
     
     args = parser.parse_args()
@@ -876,6 +895,11 @@ def main():
             if stock_result['status'] == 'completed':
                 print(f"   ✅ 품질 점수: {stock_result['overall_score']}/100 ({stock_result['quality_grade']})")
                 print(f"   📊 총 레코드: {stock_result['total_records']:,}개")
+                print(f"   🚨 이상 종목: {len(stock_result['anomalies']):,}/{stock_result['total_stocks']:,}개")
+                
+                if args.anomaly_output:
+                    pd.DataFrame(stock_result['anomalies']).to_csv(args.anomaly_output, index=False, encoding='utf-8-sig')
+                    print(f"   💾 종목별 이상치 표: {args.anomaly_output}")
             else:
                 print(f"   ❌ 검증 실패: {stock_result.get('message', stock_result.get('error', '알 수 없는 오류'))}")
         
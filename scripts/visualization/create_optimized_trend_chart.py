@@ -6,6 +6,7 @@
 실행 방법:
 python scripts/visualization/create_optimized_trend_chart.py --stock_code=000660 --period=6M
 python scripts/visualization/create_optimized_trend_chart.py --stock_code=000660 --save_png --show_signals --report
+python scripts/visualization/create_optimized_trend_chart.py --stock_code=005930 --period=10Y  # 주봉/월봉 자동 집계
 """
 
 import os
@@ -14,9 +15,12 @@ import sqlite3
 import pandas as pd
 import numpy as np
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import argparse
+import json
 import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from pathlib import Path
@@ -26,6 +30,9 @@ import warnings
 project_root = Path(__file__).parent.parent.parent
 sys.path.append(str(project_root))
 
+from src.utils.cache_utils import get_persistent_cache
+from src.utils.chart_downsampling import FREQUENCY_LABELS, downsample_for_chart, max_points_for_width
+
 try:
     from config import config_manager
     logger = config_manager.get_logger(__name__) if config_manager else logging.getLogger(__name__)
@@ -35,6 +42,35 @@ except:
 
 warnings.filterwarnings('ignore')
 
+# 조회 기간 → 일수
+PERIOD_DAYS = {
+    '1M': 30,
+    '3M': 90,
+    '6M': 180,
+    '1Y': 365,
+    '2Y': 730,
+    '3Y': 1095,
+    '5Y': 1825,
+    '10Y': 3650,
+}
+
+PRICE_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+INDICATOR_COLUMNS = [
+    'sma_5', 'sma_20', 'sma_60', 'sma_120', 'sma_200',
+    'ema_12', 'ema_26', 'rsi', 'macd', 'macd_signal', 'macd_histogram',
+    'bb_upper', 'bb_middle', 'bb_lower', 'stoch_k', 'stoch_d',
+    'obv', 'vwap', 'volume_sma_20', 'atr'
+]
+
+# 차트 구성(트레이스/레이아웃)이 바뀌면 함께 올려 기존 캐시 무효화
+CHART_CACHE_VERSION = 'v1'
+
+# 일괄 렌더링 결과 저장 위치 (기간별 하위 디렉토리, 파일명 고정)
+BATCH_OUTPUT_DIR = project_root / 'output' / 'charts' / 'batch'
+BATCH_MANIFEST_NAME = '_manifest.json'
+BATCH_MANIFEST_FLUSH_EVERY = 200
+
 
 class OptimizedTrendChartGenerator:
     """최적화된 추세 지표 차트 생성 클래스"""
@@ -60,6 +96,7 @@ class OptimizedTrendChartGenerator:
             'theme': 'plotly_white',
             'font_size': 12,
             'title_font_size': 16,
+            'max_points': max_points_for_width(1200),  # 이보다 길면 주봉/월봉으로 집계
             'colors': {
                 'price': '#2563eb',
                 'sma_5': '#ef4444',
@@ -75,6 +112,9 @@ class OptimizedTrendChartGenerator:
                 'signal': '#dc2626'
             }
         }
+        
+        # 렌더링된 Figure JSON 캐시 (종목, 기간, 지표 설정, 데이터 버전 기준)
+        self.figure_cache = get_persistent_cache('trend_charts')
     
     def check_technical_indicators_availability(self, stock_code: str) -> Dict[str, Any]:
         """기술적 지표 데이터 가용성 확인"""
@@ -111,142 +151,89 @@ class OptimizedTrendChartGenerator:
             logger.error(f"기술적 지표 가용성 확인 실패: {stock_code} - {e}")
             return {'available': False, 'count': 0}
     
+    @staticmethod
+    def get_period_range(period: str) -> Tuple[str, str]:
+        """조회 기간 → (시작일, 종료일) 문자열"""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=PERIOD_DAYS.get(period, PERIOD_DAYS['6M']))
+        return start_date.strftime('%Y-%m-%d'), end_date.strftime('%Y-%m-%d')
+    
+    @staticmethod
+    def indicator_status_from_frame(df: pd.DataFrame) -> Dict[str, Any]:
+        """로드된 데이터에서 기술적 지표 가용성 계산 (별도 조회 없음)"""
+        if df.empty:
+            return {'available': False, 'count': 0, 'start_date': None, 'end_date': None}
+        
+        has_values = df[INDICATOR_COLUMNS].notna().any(axis=1)
+        count = int(has_values.sum())
+        if count == 0:
+            return {'available': False, 'count': 0, 'start_date': None, 'end_date': None}
+        
+        dates = df.index[has_values.to_numpy()]
+        return {
+            'available': True,
+            'count': count,
+            'start_date': dates[0].strftime('%Y-%m-%d'),
+            'end_date': dates[-1].strftime('%Y-%m-%d')
+        }
+    
     def load_stock_data_with_indicators(self, stock_code: str, period: str = '6M') -> pd.DataFrame:
         """
         주가 데이터와 저장된 기술적 지표를 함께 로드
         
         Args:
             stock_code: 주식 코드 (예: '005930')
-            period: 조회 기간 ('1M', '3M', '6M', '1Y', '2Y')
+            period: 조회 기간 ('1M', '3M', '6M', '1Y', '2Y', '3Y', '5Y', '10Y')
         
         Returns:
-            주가 데이터 + 기술적 지표 DataFrame
+            주가 데이터 + 기술적 지표 DataFrame (지표가 없는 날짜는 NaN)
         """
         try:
-            # 기간 계산
-            end_date = datetime.now()
-            if period == '1M':
-                start_date = end_date - timedelta(days=30)
-            elif period == '3M':
-                start_date = end_date - timedelta(days=90)
-            elif period == '6M':
-                start_date = end_date - timedelta(days=180)
-            elif period == '1Y':
-                start_date = end_date - timedelta(days=365)
-            elif period == '2Y':
-                start_date = end_date - timedelta(days=730)
-            else:
-                start_date = end_date - timedelta(days=180)  # 기본 6개월
+            start_date, end_date = self.get_period_range(period)
             
-            # 기술적 지표 가용성 확인
-            indicator_status = self.check_technical_indicators_availability(stock_code)
+            # LEFT JOIN 한 번으로 로드 (지표가 없으면 지표 컬럼이 NaN)
+            query = f"""
+                SELECT 
+                    sp.date,
+                    sp.open_price as open,
+                    sp.high_price as high,
+                    sp.low_price as low,
+                    sp.close_price as close,
+                    sp.volume,
+                    {', '.join(f'ti.{col}' for col in INDICATOR_COLUMNS)}
+                FROM stock_prices sp
+                LEFT JOIN technical_indicators ti ON sp.stock_code = ti.stock_code AND sp.date = ti.date
+                WHERE sp.stock_code = ? 
+                    AND sp.date >= ? 
+                    AND sp.date <= ?
+                ORDER BY sp.date ASC
+            """
             
-            if indicator_status['available']:
-                # 저장된 기술적 지표가 있는 경우: JOIN 쿼리 사용
-                logger.info(f"저장된 기술적 지표 사용: {stock_code} ({indicator_status['count']}개)")
-                
-                query = """
-                    SELECT 
-                        sp.date,
-                        sp.open_price as open,
-                        sp.high_price as high,
-                        sp.low_price as low,
-                        sp.close_price as close,
-                        sp.volume,
-                        ti.sma_5,
-                        ti.sma_20,
-                        ti.sma_60,
-                        ti.sma_120,
-                        ti.sma_200,
-                        ti.ema_12,
-                        ti.ema_26,
-                        ti.rsi,
-                        ti.macd,
-                        ti.macd_signal,
-                        ti.macd_histogram,
-                        ti.bb_upper,
-                        ti.bb_middle,
-                        ti.bb_lower,
-                        ti.stoch_k,
-                        ti.stoch_d,
-                        ti.obv,
-                        ti.vwap,
-                        ti.volume_sma_20,
-                        ti.atr
-                    FROM stock_prices sp
-                    LEFT JOIN technical_indicators ti ON sp.stock_code = ti.stock_code AND sp.date = ti.date
-                    WHERE sp.stock_code = ? 
-                        AND sp.date >= ? 
-                        AND sp.date <= ?
-                    ORDER BY sp.date ASC
-                """
-                
-                cursor = self.db_conn.cursor()
-                cursor.execute(query, (
-                    stock_code, 
-                    start_date.strftime('%Y-%m-%d'),
-                    end_date.strftime('%Y-%m-%d')
-                ))
-                
-                rows = cursor.fetchall()
-                if not rows:
-                    logger.warning(f"데이터 없음: {stock_code} ({period})")
-                    return pd.DataFrame()
-                
-                # DataFrame 생성
-                df = pd.DataFrame(rows, columns=[
-                    'date', 'open', 'high', 'low', 'close', 'volume',
-                    'sma_5', 'sma_20', 'sma_60', 'sma_120', 'sma_200',
-                    'ema_12', 'ema_26', 'rsi', 'macd', 'macd_signal', 'macd_histogram',
-                    'bb_upper', 'bb_middle', 'bb_lower', 'stoch_k', 'stoch_d',
-                    'obv', 'vwap', 'volume_sma_20', 'atr'
-                ])
-                
-            else:
-                # 저장된 기술적 지표가 없는 경우: 기본 주가 데이터만 로드
-                logger.warning(f"기술적 지표 없음: {stock_code}. 기본 데이터만 로드")
-                
-                query = """
-                    SELECT 
-                        date,
-                        open_price as open,
-                        high_price as high,
-                        low_price as low,
-                        close_price as close,
-                        volume
+            cursor = self.db_conn.cursor()
+            try:
+                cursor.execute(query, (stock_code, start_date, end_date))
+                columns = PRICE_COLUMNS + INDICATOR_COLUMNS
+            except sqlite3.OperationalError as e:
+                # 지표 테이블이 없거나 스키마가 다르면 기본 주가 데이터만 로드
+                logger.warning(f"기술적 지표 조회 불가: {stock_code} - {e}")
+                cursor.execute("""
+                    SELECT date, open_price, high_price, low_price, close_price, volume
                     FROM stock_prices 
-                    WHERE stock_code = ? 
-                        AND date >= ? 
-                        AND date <= ?
+                    WHERE stock_code = ? AND date >= ? AND date <= ?
                     ORDER BY date ASC
-                """
-                
-                cursor = self.db_conn.cursor()
-                cursor.execute(query, (
-                    stock_code, 
-                    start_date.strftime('%Y-%m-%d'),
-                    end_date.strftime('%Y-%m-%d')
-                ))
-                
-                rows = cursor.fetchall()
-                if not rows:
-                    logger.warning(f"데이터 없음: {stock_code} ({period})")
-                    return pd.DataFrame()
-                
-                # DataFrame 생성 (지표 컬럼들을 NaN으로 채움)
-                df = pd.DataFrame(rows, columns=['date', 'open', 'high', 'low', 'close', 'volume'])
-                
-                # 기술적 지표 컬럼들을 NaN으로 추가
-                indicator_columns = [
-                    'sma_5', 'sma_20', 'sma_60', 'sma_120', 'sma_200',
-                    'ema_12', 'ema_26', 'rsi', 'macd', 'macd_signal', 'macd_histogram',
-                    'bb_upper', 'bb_middle', 'bb_lower', 'stoch_k', 'stoch_d',
-                    'obv', 'vwap', 'volume_sma_20', 'atr'
-                ]
-                for col in indicator_columns:
+                """, (stock_code, start_date, end_date))
+                columns = PRICE_COLUMNS
+            
+            rows = cursor.fetchall()
+            if not rows:
+                logger.warning(f"데이터 없음: {stock_code} ({period})")
+                return pd.DataFrame()
+            
+            df = pd.DataFrame([tuple(row) for row in rows], columns=columns)
+            for col in INDICATOR_COLUMNS:
+                if col not in df.columns:
                     df[col] = np.nan
             
-            # 공통 처리
             # 날짜 인덱스 설정
             df['date'] = pd.to_datetime(df['date'])
             df.set_index('date', inplace=True)
@@ -255,6 +242,9 @@ class OptimizedTrendChartGenerator:
             numeric_columns = df.columns
             df[numeric_columns] = df[numeric_columns].apply(pd.to_numeric, errors='coerce')
             
+            if df[INDICATOR_COLUMNS].isna().all().all():
+                logger.warning(f"기술적 지표 없음: {stock_code}. 기본 데이터만 사용")
+            
             logger.info(f"데이터 로드 완료: {stock_code} ({len(df)}일, {period})")
             return df
             
@@ -262,6 +252,57 @@ class OptimizedTrendChartGenerator:
             logger.error(f"데이터 로드 실패: {stock_code} - {e}")
             return pd.DataFrame()
     
+    def get_data_version(self, stock_code: str, period: str = '6M') -> str:
+        """
+        차트 캐시 키용 데이터 버전
+        
+        기간 내 주가/지표의 행 수와 최대 id 조합. 새 행이 추가되면 최대 id가,
+        기간 시작일이 지나 행이 빠지면 행 수가 바뀐다.
+        """
+        versions = self.get_data_versions(period, [stock_code])
+        return versions.get(stock_code, '')
+    
+    def get_data_versions(self, period: str = '6M',
+                          stock_codes: Optional[List[str]] = None) -> Dict[str, str]:
+        """종목별 데이터 버전 일괄 조회 (테이블당 GROUP BY 한 번)"""
+        start_date, end_date = self.get_period_range(period)
+        code_filter = ''
+        params: List[Any] = [start_date, end_date]
+        if stock_codes is not None:
+            if not stock_codes:
+                return {}
+            if len(stock_codes) <= 500:
+                code_filter = f" AND stock_code IN ({','.join('?' * len(stock_codes))})"
+                params += list(stock_codes)
+        
+        def table_versions(table: str) -> Dict[str, str]:
+            cursor = self.db_conn.cursor()
+            cursor.execute(f"""
+                SELECT stock_code,
+                       COUNT(*) || ':' || IFNULL(MAX(id), 0) || ':' || IFNULL(MAX(updated_at), '')
+                FROM {table}
+                WHERE date >= ? AND date <= ?{code_filter}
+                GROUP BY stock_code
+            """, params)
+            return {row[0]: row[1] for row in cursor.fetchall()}
+        
+        try:
+            price_versions = table_versions('stock_prices')
+        except Exception as e:
+            logger.debug(f"데이터 버전 조회 실패: {e}")
+            return {}
+        try:
+            indicator_versions = table_versions('technical_indicators')
+        except sqlite3.OperationalError:
+            indicator_versions = {}
+        
+        wanted = set(stock_codes) if stock_codes is not None else None
+        return {
+            code: f"{version}|{indicator_versions.get(code, '0:0:')}"
+            for code, version in price_versions.items()
+            if wanted is None or code in wanted
+        }
+    
     def get_company_info(self, stock_code: str) -> Dict[str, str]:
         """회사 정보 조회"""
         try:
@@ -458,18 +499,43 @@ class OptimizedTrendChartGenerator:
             return {'signals': [], 'current_trend': '분석 불가', 'trend_strength': 0}
     
     def create_trend_chart(self, stock_code: str, period: str = '6M', 
-                          indicators: Dict[str, bool] = None) -> go.Figure:
+                          indicators: Dict[str, bool] = None,
+                          use_cache: bool = True) -> go.Figure:
         """
         추세 지표 차트 생성
         
+        데이터 버전이 같으면 캐시된 Figure JSON을 재사용한다.
+        
         Args:
             stock_code: 주식 코드
             period: 조회 기간
             indicators: 표시할 지표 설정
+            use_cache: Figure 캐시 사용 여부
         
         Returns:
             Plotly Figure 객체
         """
+        cache_key = None
+        if use_cache:
+            version = self.get_data_version(stock_code, period)
+            if version:
+                cache_key = (CHART_CACHE_VERSION, stock_code, period,
+                             tuple(sorted((indicators or {}).items())),
+                             self.chart_config['max_points'], version)
+                cached = self.figure_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"캐시된 차트 사용: {stock_code} ({period})")
+                    return pio.from_json(cached)
+        
+        fig = self._build_trend_chart(stock_code, period, indicators)
+        
+        if cache_key is not None:
+            self.figure_cache.set(cache_key, fig.to_json())
+        return fig
+    
+    def _build_trend_chart(self, stock_code: str, period: str,
+                           indicators: Optional[Dict[str, bool]]) -> go.Figure:
+        """추세 지표 차트 구성 (분석은 일봉 전체, 표시는 다운샘플링된 봉 기준)"""
         
         # 기본 지표 설정
         if indicators is None:
@@ -500,9 +566,8 @@ class OptimizedTrendChartGenerator:
             )
             return fig
         
-        # 기술적 지표 가용성 확인
-        indicator_status = self.check_technical_indicators_availability(stock_code)
-        has_indicators = indicator_status['available']
+        # 기술적 지표 가용성 (로드된 데이터 기준)
+        has_indicators = self.indicator_status_from_frame(df)['available']
         
         # 회사 정보
         company_info = self.get_company_info(stock_code)
@@ -510,9 +575,13 @@ class OptimizedTrendChartGenerator:
         # 추세 분석
         trend_analysis = self.analyze_trend_signals(df)
         
+        # 표시용 다운샘플링 (장기 차트는 주봉/월봉으로 집계)
+        plot_df, freq = downsample_for_chart(df, self.chart_config['max_points'])
+        freq_label = f" ({FREQUENCY_LABELS[freq]})" if freq != 'D' else ""
+        
         # 서브플롯 생성 (가격, 거래량, RSI, MACD)
         subplot_titles = [
-            f"{company_info['company_name']} ({stock_code}) - 추세 분석",
+            f"{company_info['company_name']} ({stock_code}) - 추세 분석{freq_label}",
             "거래량",
             "RSI",
             "MACD"
@@ -535,11 +604,11 @@ class OptimizedTrendChartGenerator:
         # 1. 메인 차트: 캔들스틱 + 이동평균선
         fig.add_trace(
             go.Candlestick(
-                x=df.index,
-                open=df['open'],
-                high=df['high'],
-                low=df['low'],
-                close=df['close'],
+                x=plot_df.index,
+                open=plot_df['open'],
+                high=plot_df['high'],
+                low=plot_df['low'],
+                close=plot_df['close'],
                 name="가격",
                 increasing_line_color=self.chart_config['colors']['price'],
                 decreasing_line_color='red'
@@ -549,12 +618,12 @@ class OptimizedTrendChartGenerator:
         
         # 볼린저 밴드 (배경으로 먼저 그리기)
         if indicators.get('bb_bands', True) and has_indicators:
-            if 'bb_upper' in df.columns and 'bb_lower' in df.columns:
+            if 'bb_upper' in plot_df.columns and 'bb_lower' in plot_df.columns:
                 # 볼린저 밴드 영역 채우기
                 fig.add_trace(
                     go.Scatter(
-                        x=df.index,
-                        y=df['bb_upper'],
+                        x=plot_df.index,
+                        y=plot_df['bb_upper'],
                         mode='lines',
                         line=dict(color='rgba(128,128,128,0.3)', width=1),
                         name='볼린저 상단',
@@ -565,8 +634,8 @@ class OptimizedTrendChartGenerator:
                 
                 fig.add_trace(
                     go.Scatter(
-                        x=df.index,
-                        y=df['bb_lower'],
+                        x=plot_df.index,
+                        y=plot_df['bb_lower'],
                         mode='lines',
                         line=dict(color='rgba(128,128,128,0.3)', width=1),
                         fill='tonexty',
@@ -578,11 +647,11 @@ class OptimizedTrendChartGenerator:
                 )
                 
                 # 중간선
-                if 'bb_middle' in df.columns:
+                if 'bb_middle' in plot_df.columns:
                     fig.add_trace(
                         go.Scatter(
-                            x=df.index,
-                            y=df['bb_middle'],
+                            x=plot_df.index,
+                            y=plot_df['bb_middle'],
                             mode='lines',
                             line=dict(color='gray', width=1, dash='dot'),
                             name='볼린저 중간',
@@ -604,13 +673,13 @@ class OptimizedTrendChartGenerator:
             ]
             
             for col_name, name, line_style in ma_lines:
-                if indicators.get(col_name, False) and col_name in df.columns:
+                if indicators.get(col_name, False) and col_name in plot_df.columns:
                     # NaN이 아닌 데이터가 있는지 확인
-                    if not df[col_name].isna().all():
+                    if not plot_df[col_name].isna().all():
                         fig.add_trace(
                             go.Scatter(
-                                x=df.index,
-                                y=df[col_name],
+                                x=plot_df.index,
+                                y=plot_df[col_name],
                                 mode='lines',
                                 name=name,
                                 line=dict(
@@ -626,12 +695,12 @@ class OptimizedTrendChartGenerator:
         # 2. 거래량 차트
         if indicators.get('volume', True):
             colors = ['red' if close < open else 'blue' 
-                     for close, open in zip(df['close'], df['open'])]
+                     for close, open in zip(plot_df['close'], plot_df['open'])]
             
             fig.add_trace(
                 go.Bar(
-                    x=df.index,
-                    y=df['volume'],
+                    x=plot_df.index,
+                    y=plot_df['volume'],
                     name='거래량',
                     marker_color=colors,
                     opacity=0.6,
@@ -641,11 +710,11 @@ class OptimizedTrendChartGenerator:
             )
             
             # 거래량 이평선 (저장된 지표가 있는 경우)
-            if has_indicators and 'volume_sma_20' in df.columns and not df['volume_sma_20'].isna().all():
+            if has_indicators and 'volume_sma_20' in plot_df.columns and not plot_df['volume_sma_20'].isna().all():
                 fig.add_trace(
                     go.Scatter(
-                        x=df.index,
-                        y=df['volume_sma_20'],
+                        x=plot_df.index,
+                        y=plot_df['volume_sma_20'],
                         mode='lines',
                         name='거래량 20일 평균',
                         line=dict(color='orange', width=1),
@@ -655,11 +724,11 @@ class OptimizedTrendChartGenerator:
                 )
         
         # 3. RSI 차트
-        if indicators.get('rsi', True) and has_indicators and 'rsi' in df.columns and not df['rsi'].isna().all():
+        if indicators.get('rsi', True) and has_indicators and 'rsi' in plot_df.columns and not plot_df['rsi'].isna().all():
             fig.add_trace(
                 go.Scatter(
-                    x=df.index,
-                    y=df['rsi'],
+                    x=plot_df.index,
+                    y=plot_df['rsi'],
                     mode='lines',
                     name='RSI',
                     line=dict(color=self.chart_config['colors']['rsi'], width=2),
@@ -677,11 +746,11 @@ class OptimizedTrendChartGenerator:
         
         # 4. MACD 차트
         if indicators.get('macd', True) and has_indicators:
-            if 'macd' in df.columns and not df['macd'].isna().all():
+            if 'macd' in plot_df.columns and not plot_df['macd'].isna().all():
                 fig.add_trace(
                     go.Scatter(
-                        x=df.index,
-                        y=df['macd'],
+                        x=plot_df.index,
+                        y=plot_df['macd'],
                         mode='lines',
                         name='MACD',
                         line=dict(color=self.chart_config['colors']['macd'], width=2),
@@ -690,11 +759,11 @@ class OptimizedTrendChartGenerator:
                     row=4, col=1
                 )
             
-            if 'macd_signal' in df.columns and not df['macd_signal'].isna().all():
+            if 'macd_signal' in plot_df.columns and not plot_df['macd_signal'].isna().all():
                 fig.add_trace(
                     go.Scatter(
-                        x=df.index,
-                        y=df['macd_signal'],
+                        x=plot_df.index,
+                        y=plot_df['macd_signal'],
                         mode='lines',
                         name='Signal',
                         line=dict(color=self.chart_config['colors']['signal'], width=1),
@@ -703,12 +772,12 @@ class OptimizedTrendChartGenerator:
                     row=4, col=1
                 )
             
-            if 'macd_histogram' in df.columns and not df['macd_histogram'].isna().all():
-                colors = ['red' if val < 0 else 'green' for val in df['macd_histogram'] if not pd.isna(val)]
+            if 'macd_histogram' in plot_df.columns and not plot_df['macd_histogram'].isna().all():
+                colors = ['red' if val < 0 else 'green' for val in plot_df['macd_histogram'] if not pd.isna(val)]
                 fig.add_trace(
                     go.Bar(
-                        x=df.index,
-                        y=df['macd_histogram'],
+                        x=plot_df.index,
+                        y=plot_df['macd_histogram'],
                         name='Histogram',
                         marker_color=colors,
                         opacity=0.6,
@@ -750,15 +819,21 @@ class OptimizedTrendChartGenerator:
         logger.info(f"차트 생성 완료: {stock_code} ({period})")
         return fig
     
-    def save_chart(self, fig: go.Figure, filename: str, format: str = 'html') -> str:
-        """차트 저장"""
+    def save_chart(self, fig: go.Figure, filename: str, format: str = 'html',
+                   output_dir: Optional[Path] = None, include_plotlyjs: Any = True) -> str:
+        """
+        차트 저장
+        
+        include_plotlyjs='directory'이면 plotly.js를 HTML에 내장하지 않고
+        같은 디렉토리의 plotly.min.js 하나를 공유한다 (없을 때만 생성).
+        """
         try:
-            output_dir = project_root / 'output' / 'charts'
+            output_dir = Path(output_dir) if output_dir else project_root / 'output' / 'charts'
             output_dir.mkdir(parents=True, exist_ok=True)
             
             if format.lower() == 'html':
                 filepath = output_dir / f"{filename}.html"
-                fig.write_html(str(filepath))
+                fig.write_html(str(filepath), include_plotlyjs=include_plotlyjs)
             elif format.lower() == 'png':
                 filepath = output_dir / f"{filename}.png"
                 fig.write_image(str(filepath))
@@ -784,7 +859,7 @@ class OptimizedTrendChartGenerator:
             
             company_info = self.get_company_info(stock_code)
             trend_analysis = self.analyze_trend_signals(df)
-            indicator_status = self.check_technical_indicators_availability(stock_code)
+            indicator_status = self.indicator_status_from_frame(df)
             
             # 기본 통계
             latest = df.iloc[-1]
@@ -826,11 +901,11 @@ class OptimizedTrendChartGenerator:
     def get_stock_list(self, limit: int = None) -> List[str]:
         """저장된 주식 목록 조회"""
         try:
+            # (stock_code, date) 인덱스만으로 처리되도록 조인 없이 조회
             query = """
-                SELECT DISTINCT sp.stock_code, ci.company_name
-                FROM stock_prices sp
-                LEFT JOIN company_info ci ON sp.stock_code = ci.stock_code
-                ORDER BY sp.stock_code
+                SELECT DISTINCT stock_code
+                FROM stock_prices
+                ORDER BY stock_code
             """
             if limit:
                 query += f" LIMIT {limit}"
@@ -844,6 +919,134 @@ class OptimizedTrendChartGenerator:
         except Exception as e:
             logger.error(f"주식 목록 조회 실패: {e}")
             return []
+    
+    def render_batch(self, stock_codes: Optional[List[str]] = None, period: str = '6M',
+                     format: str = 'html', max_workers: Optional[int] = None,
+                     force: bool = False, output_dir: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        전체 종목 차트 일괄 렌더링
+        
+        - 프로세스 풀에서 병렬 렌더링 (워커마다 생성기/DB 연결 1개)
+        - HTML은 plotly.js 번들 하나를 공유
+        - 매니페스트의 데이터 버전이 같고 파일이 남아 있으면 건너뜀
+        
+        Returns:
+            {'total', 'rendered', 'skipped', 'failed', 'output_dir', 'failures'}
+        """
+        output_dir = Path(output_dir) if output_dir else BATCH_OUTPUT_DIR / period
+        output_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = output_dir / BATCH_MANIFEST_NAME
+        manifest = _load_batch_manifest(manifest_path)
+        
+        if stock_codes is None:
+            stock_codes = self.get_stock_list()
+        versions = self.get_data_versions(period, stock_codes)
+        
+        pending = []
+        skipped = 0
+        for stock_code in stock_codes:
+            version = versions.get(stock_code)
+            if version is None:
+                continue  # 기간 내 주가 데이터 없음
+            entry = manifest.get(stock_code)
+            if (not force and entry and entry.get('version') == version
+                    and entry.get('chart_version') == CHART_CACHE_VERSION
+                    and entry.get('format') == format
+                    and (output_dir / entry.get('file', '')).exists()):
+                skipped += 1
+                continue
+            pending.append((stock_code, version))
+        
+        stats = {
+            'total': len(stock_codes),
+            'rendered': 0,
+            'skipped': skipped,
+            'failed': 0,
+            'output_dir': str(output_dir),
+            'failures': []
+        }
+        logger.info(f"📊 일괄 차트 렌더링: 대상 {len(pending)}개, 변경 없음 {skipped}개 건너뜀")
+        if not pending:
+            return stats
+        
+        # 공유 plotly.js 번들은 워커 시작 전에 한 번만 기록 (동시 생성 경합 방지)
+        bundle_path = output_dir / 'plotly.min.js'
+        if format.lower() == 'html' and not bundle_path.exists():
+            from plotly.offline import get_plotlyjs
+            bundle_path.write_text(get_plotlyjs(), encoding='utf-8')
+        
+        max_workers = max_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_batch_worker) as executor:
+            futures = {
+                executor.submit(_render_batch_chart, stock_code, period, format, str(output_dir)): (stock_code, version)
+                for stock_code, version in pending
+            }
+            for done, future in enumerate(as_completed(futures), 1):
+                stock_code, version = futures[future]
+                try:
+                    filename = future.result()
+                except Exception as e:
+                    filename = None
+                    logger.warning(f"차트 렌더링 실패: {stock_code} - {e}")
+                
+                if filename:
+                    manifest[stock_code] = {
+                        'version': version,
+                        'chart_version': CHART_CACHE_VERSION,
+                        'format': format,
+                        'file': filename,
+                        'rendered_at': datetime.now().isoformat(timespec='seconds')
+                    }
+                    stats['rendered'] += 1
+                else:
+                    stats['failed'] += 1
+                    stats['failures'].append(stock_code)
+                
+                # 중단되더라도 완료분은 다음 실행에서 건너뛰도록 주기적으로 기록
+                if done % BATCH_MANIFEST_FLUSH_EVERY == 0:
+                    _save_batch_manifest(manifest_path, manifest)
+                    logger.info(f"진행상황: {done}/{len(pending)}")
+        
+        _save_batch_manifest(manifest_path, manifest)
+        logger.info(f"✅ 일괄 차트 렌더링 완료: 생성 {stats['rendered']}개, "
+                    f"건너뜀 {stats['skipped']}개, 실패 {stats['failed']}개")
+        return stats
+
+
+def _load_batch_manifest(path: Path) -> Dict[str, Any]:
+    """일괄 렌더링 매니페스트 로드 (종목코드 → 버전/파일)"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_batch_manifest(path: Path, manifest: Dict[str, Any]):
+    """매니페스트 원자적 저장"""
+    tmp_path = path.with_suffix('.json.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+# 워커 프로세스별 차트 생성기 (SQLite 연결은 프로세스 간 공유 불가)
+_batch_generator: Optional[OptimizedTrendChartGenerator] = None
+
+
+def _init_batch_worker():
+    global _batch_generator
+    _batch_generator = OptimizedTrendChartGenerator()
+
+
+def _render_batch_chart(stock_code: str, period: str, format: str, output_dir: str) -> Optional[str]:
+    """워커: 차트 한 개 렌더링 후 파일명 반환 (실패 시 None)"""
+    # 일괄 렌더링은 매니페스트로 변경 여부를 판단하므로 Figure 캐시는 사용하지 않음
+    fig = _batch_generator.create_trend_chart(stock_code, period, use_cache=False)
+    filename = f"trend_{stock_code}_{period}"
+    saved_path = _batch_generator.save_chart(fig, filename, format, output_dir=Path(output_dir),
+                                             include_plotlyjs='directory')
+    return Path(saved_path).name if saved_path else None
 
 
 def main():
@@ -852,13 +1055,16 @@ def main():
     parser.add_argument('--stock_code', type=str, help='주식 코드 (예: 005930)')
     parser.add_argument('--all_stocks', action='store_true', help='모든 주식 처리')
     parser.add_argument('--limit', type=int, help='처리할 주식 수 제한')
-    parser.add_argument('--period', type=str, default='6M', choices=['1M', '3M', '6M', '1Y', '2Y'], help='조회 기간')
+    parser.add_argument('--period', type=str, default='6M', choices=list(PERIOD_DAYS), help='조회 기간')
     parser.add_argument('--output', type=str, default='html', choices=['html', 'png', 'pdf'], help='출력 형식')
     parser.add_argument('--save_png', action='store_true', help='PNG 파일로도 저장')
     parser.add_argument('--show_signals', action='store_true', help='매매 신호 표시')
     parser.add_argument('--report', action='store_true', help='분석 리포트 출력')
     parser.add_argument('--check_indicators', action='store_true', help='기술적 지표 가용성만 확인')
     parser.add_argument('--top_signals', action='store_true', help='매매 신호 상위 종목만 차트 생성')
+    parser.add_argument('--workers', type=int, help='일괄 렌더링 프로세스 수 (기본: CPU 코어 수)')
+    parser.add_argument('--force', action='store_true', help='데이터 변경 여부와 무관하게 전체 재생성')
+    parser.add_argument('--yes', action='store_true', help='전체 종목 차트 생성 확인 생략')
     
     args = parser.parse_args()
     
@@ -952,33 +1158,27 @@ def main():
                 return
             
             else:
-                # 전체 종목 차트 생성 (권장하지 않음)
-                print(f"⚠️ 전체 종목 차트 생성은 시간이 많이 걸립니다.")
-                print(f"📝 처리 예정: {len(stock_list)}개 종목")
+                # 전체 종목 차트 일괄 생성 (변경된 종목만 병렬 렌더링)
+                print(f"📝 처리 대상: {len(stock_list)}개 종목 (데이터 변경 없는 종목은 건너뜀)")
                 
-                confirm = input("계속 진행하시겠습니까? (y/N): ")
-                if confirm.lower() != 'y':
-                    print("취소되었습니다.")
-                    return
+                if not args.yes:
+                    confirm = input("계속 진행하시겠습니까? (y/N): ")
+                    if confirm.lower() != 'y':
+                        print("취소되었습니다.")
+                        return
                 
-                success_count = 0
-                for i, stock_code in enumerate(stock_list, 1):
-                    print(f"진행상황: {i}/{len(stock_list)} - {stock_code}")
-                    
-                    try:
-                        fig = generator.create_trend_chart(stock_code, args.period)
-                        
-                        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                        filename = f"bulk_chart_{stock_code}_{args.period}_{timestamp}"
-                        
-                        saved_path = generator.save_chart(fig, filename, args.output)
-                        print(f"  ✅ {stock_code} 완료")
-                        success_count += 1
-                        
-                    except Exception as e:
-                        print(f"  ❌ {stock_code} 실패: {e}")
+                start_time = datetime.now()
+                stats = generator.render_batch(
+                    stock_list, args.period, format=args.output,
+                    max_workers=args.workers, force=args.force
+                )
+                elapsed = (datetime.now() - start_time).total_seconds()
                 
-                print(f"\n📊 전체 차트 생성 완료: {success_count}/{len(stock_list)} 성공")
+                print(f"\n📊 전체 차트 생성 완료 ({elapsed:.0f}초)")
+                print(f"  생성: {stats['rendered']}개 / 건너뜀: {stats['skipped']}개 / 실패: {stats['failed']}개")
+                print(f"  저장 위치: {stats['output_dir']}")
+                if stats['failures']:
+                    print(f"  실패 종목: {', '.join(stats['failures'][:20])}")
                 return
         
         # 단일 종목 처리 (기존 코드)
@@ -28,16 +28,8 @@ try:
     from src.analysis.fundamental.buffett_scorecard_110_complete import BuffettScorecard110, BuffettAnalysis
 except ImportError:
     from buffett_scorecard_110_complete import BuffettScorecard110, BuffettAnalysis
+from src.database.latest_snapshot import LatestSnapshot
 
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('buffett_scorecard_batch.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 class BuffettBatchProcessor:
@@ -52,6 +44,7 @@ class BuffettBatchProcessor:
         self.dart_db_path = self.data_dir / "dart_data.db"
         self.stock_db_path = self.data_dir / "stock_data.db"
         self.scorecard_db_path = self.data_dir / "buffett_scorecard.db"
+        self._snapshot_ready = False
         
         # 스코어카드 데이터베이스 초기화
         self._init_scorecard_database()
@@ -226,23 +219,26 @@ class BuffettBatchProcessor:
         """특정 종목의 시장 데이터 조회"""
         try:
             with sqlite3.connect(self.stock_db_path) as conn:
-                query = """
-                    SELECT close, shares_outstanding
-                    FROM stock_data
+                if not self._snapshot_ready:
+                    LatestSnapshot().ensure(conn)
+                    self._snapshot_ready = True
+                
+                # 종목별 최신값 스냅샷 (트리거로 유지되는 단일 행 조회)
+                row = conn.execute("""
+                    SELECT close_price, shares_outstanding, market_cap
+                    FROM latest_snapshot
                     WHERE stock_code = ?
-                    ORDER BY date DESC
-                    LIMIT 1
-                """
-                df = pd.read_sql_query(query, conn, params=[stock_code])
+                """, [stock_code]).fetchone()
                 
-                if df.empty:
+                if row is None or row[0] is None:
                     return {'stock_price': 0}
                 
-                latest = df.iloc[0]
+                close_price, shares, market_cap = row
                 
                 market_data = {
-                    'stock_price': float(latest.get('close', 0)),
-                    'shares_outstanding': float(latest.get('shares_outstanding', 0))
+                    'stock_price': float(close_price),
+                    'shares_outstanding': float(shares or 0),
+                    'market_cap': float(market_cap or 0)
                 }
                 
                 return market_data
@@ -524,6 +520,16 @@ def main():
     
     args = parser.parse_args()
     
+    # 로깅 설정 (import 시 파일이 생기지 않도록 실행 시점에만 핸들러 등록)
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('buffett_scorecard_batch.log'),
+            logging.StreamHandler()
+        ]
+    )
+    
     # 배치 처리기 초기화
     processor = BuffettBatchProcessor(data_dir=args.data_dir)
     
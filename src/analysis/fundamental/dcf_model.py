@@ -0,0 +1,58 @@
+"""
+DCF 모델 (현금흐름 할인법)
+2단계 성장 DCF를 NumPy 배열 연산으로 계산 (종목 × 시나리오 배열에 브로드캐스트)
+
+연도별 현금흐름을 반복하지 않고 성장 연금의 현재가치 닫힌 식을 사용:
+    PV(1~N년) = CF × q × (1 - q^N) / (1 - q),   q = (1 + g) / (1 + r)
+    터미널 PV = CF × q^N × (1 + g_t) / (r - g_t)
+"""
+
+import numpy as np
+
+DEFAULT_FORECAST_YEARS = 10
+DEFAULT_TERMINAL_GROWTH = 0.02
+MIN_SPREAD = 0.01  # 할인율 - 영구성장률 최소 차이
+
+
+def _annuity_factor(q, q_n, years: int):
+    one_minus_q = 1 - q
+    near_one = np.abs(one_minus_q) < 1e-9
+    return np.where(near_one, years, q * (1 - q_n) / np.where(near_one, 1.0, one_minus_q))
+
+
+def growing_annuity_pv(base, growth, discount, years: int = DEFAULT_FORECAST_YEARS):
+    """기준 현금흐름이 매년 growth로 성장할 때 1~years년 현금흐름의 현재가치"""
+    q = (1 + np.asarray(growth, dtype=float)) / (1 + np.asarray(discount, dtype=float))
+    return np.asarray(base, dtype=float) * _annuity_factor(q, q ** years, years)
+
+
+def two_stage_multiplier(growth, discount, years: int = DEFAULT_FORECAST_YEARS,
+                         terminal_growth: float = DEFAULT_TERMINAL_GROWTH):
+    """
+    2단계 DCF 배수 (가치 = 기준 현금흐름 × 배수)
+
+    배수는 성장률/할인율에만 의존하므로 같은 시나리오를 쓰는 모델끼리 공유할 수 있다.
+    terminal_growth는 할인율 - MIN_SPREAD로 상한.
+    """
+    growth = np.asarray(growth, dtype=float)
+    discount = np.asarray(discount, dtype=float)
+    terminal_growth = np.minimum(terminal_growth, discount - MIN_SPREAD)
+
+    q = (1 + growth) / (1 + discount)
+    q_n = q ** years
+    return _annuity_factor(q, q_n, years) + q_n * (1 + terminal_growth) / (discount - terminal_growth)
+
+
+def two_stage_dcf(base, growth, discount, years: int = DEFAULT_FORECAST_YEARS,
+                  terminal_growth: float = DEFAULT_TERMINAL_GROWTH):
+    """
+    2단계 DCF 가치 (주당 값을 넣으면 주당 가치)
+
+    Args:
+        base: 기준 연도 현금흐름 (종목별 배열)
+        growth: 예측 기간 성장률 (종목 × 시나리오 브로드캐스트 가능)
+        discount: 할인율
+        years: 예측 기간
+        terminal_growth: 영구 성장률
+    """
+    return np.asarray(base, dtype=float) * two_stage_multiplier(growth, discount, years, terminal_growth)
@@ -0,0 +1,32 @@
+"""
+DDM 모델 (배당 할인법) / 고든 성장 모델
+영구 성장 가치 = 다음 해 현금흐름 / (할인율 - 성장률), NumPy 배열 브로드캐스트 지원
+"""
+
+import numpy as np
+
+try:
+    from .dcf_model import MIN_SPREAD
+except ImportError:
+    from dcf_model import MIN_SPREAD
+
+DEFAULT_MAX_PERPETUAL_GROWTH = 0.05
+
+
+def gordon_multiplier(growth, discount, max_growth: float = DEFAULT_MAX_PERPETUAL_GROWTH):
+    """영구 성장 배수 (1 + g) / (r - g), 성장률은 max_growth와 할인율 - MIN_SPREAD로 상한"""
+    discount = np.asarray(discount, dtype=float)
+    growth = np.minimum(np.minimum(np.asarray(growth, dtype=float), max_growth), discount - MIN_SPREAD)
+    return (1 + growth) / (discount - growth)
+
+
+def gordon_growth_value(base, growth, discount, max_growth: float = DEFAULT_MAX_PERPETUAL_GROWTH):
+    """영구 성장 가치"""
+    return np.asarray(base, dtype=float) * gordon_multiplier(growth, discount, max_growth)
+
+
+def ddm_value(dividend_per_share, growth, discount, max_growth: float = DEFAULT_MAX_PERPETUAL_GROWTH):
+    """배당 할인 가치 (무배당 종목은 NaN)"""
+    dividend_per_share = np.asarray(dividend_per_share, dtype=float)
+    value = gordon_growth_value(dividend_per_share, growth, discount, max_growth)
+    return np.where(dividend_per_share > 0, value, np.nan)
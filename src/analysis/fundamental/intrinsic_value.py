@@ -1,41 +1,309 @@
 """
 내재가치 계산 시스템
-5가지 모델 통합 내재가치 계산
+5가지 모델 통합 내재가치 계산 (전체 종목 × Monte Carlo 시나리오 벡터화)
+
+모델 (모두 주당 가치):
+- DCF: 잉여현금흐름 2단계 성장 할인
+- DDM: 주당배당금 고든 성장 모델
+- PER/PBR: 업종 중앙값 PER × EPS, PBR × BPS 평균
+- 소유주 이익: 버핏식 소유주 이익 2단계 성장 할인
+- FCF: 잉여현금흐름 영구 성장 모델
+
+Monte Carlo:
+- 할인율은 시장 공통 시나리오 (시나리오별 1개), 성장률은 종목별 독립 샘플
+- 같은 seed와 종목 순서면 청크 크기와 무관하게 같은 결과
+- 시나리오별로 사용 가능한 모델 평균 → 분포의 5/50/95 백분위수와 저평가 확률
+
+사용법:
+    calculator = IntrinsicValueCalculator(n_scenarios=10000, seed=42)
+    valuations = calculator.calculate_all(conn)   # 주식 DB 연결
 """
 
+import logging
+import sqlite3
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .dcf_model import two_stage_dcf, two_stage_multiplier, DEFAULT_FORECAST_YEARS, DEFAULT_TERMINAL_GROWTH
+    from .ddm_model import gordon_growth_value, gordon_multiplier, ddm_value
+    from .owner_earnings import owner_earnings
+except ImportError:
+    from dcf_model import two_stage_dcf, two_stage_multiplier, DEFAULT_FORECAST_YEARS, DEFAULT_TERMINAL_GROWTH
+    from ddm_model import gordon_growth_value, gordon_multiplier, ddm_value
+    from owner_earnings import owner_earnings
+
+logger = logging.getLogger(__name__)
+
+MODELS = ['dcf', 'ddm', 'per_pbr', 'owner_earnings', 'fcf']
+
+# 성장률 추정에 쓰는 3년 CAGR 컬럼 (단위: %)
+GROWTH_COLUMNS = ['eps_growth_3y', 'net_income_growth_3y', 'fcf_growth_3y', 'revenue_growth_3y']
+DEFAULT_GROWTH = 0.03
+GROWTH_BOUNDS = (-0.10, 0.20)
+
+# 업종 배수 이상치 제한
+PER_BOUNDS = (3.0, 40.0)
+PBR_BOUNDS = (0.2, 8.0)
+
+
 class IntrinsicValueCalculator:
-    def __init__(self):
+    """Monte Carlo 내재가치 계산기"""
+
+    def __init__(self, n_scenarios: int = 10000, seed: Optional[int] = 42,
+                 discount_rate: float = 0.08, discount_rate_std: float = 0.01,
+                 growth_std: float = 0.03, terminal_growth: float = DEFAULT_TERMINAL_GROWTH,
+                 forecast_years: int = DEFAULT_FORECAST_YEARS, chunk_size: int = 128):
         self.safety_margin = 0.5  # 50% 안전마진
-    
-    def dcf_model(self, cash_flows, discount_rate):
-        """DCF 모델 (현금흐름 할인법)"""
-        pass
-    
+        self.n_scenarios = n_scenarios
+        self.seed = seed
+        self.discount_rate = discount_rate
+        self.discount_rate_std = discount_rate_std
+        self.growth_std = growth_std
+        self.terminal_growth = terminal_growth
+        self.forecast_years = forecast_years
+        self.chunk_size = chunk_size
+
+    # ------------------------------------------------------------------
+    # 개별 모델 (스칼라/배열 모두 지원, 브로드캐스트)
+    # ------------------------------------------------------------------
+    def dcf_model(self, cash_flows, discount_rate, growth_rate=DEFAULT_GROWTH):
+        """DCF 모델 (현금흐름 할인법) - 양의 현금흐름만 평가"""
+        cash_flows = np.asarray(cash_flows, dtype=float)
+        value = two_stage_dcf(cash_flows, growth_rate, discount_rate,
+                              self.forecast_years, self.terminal_growth)
+        return np.where(cash_flows > 0, value, np.nan)
+
     def ddm_model(self, dividends, growth_rate, required_return):
         """DDM 모델 (배당 할인법)"""
-        pass
-    
-    def per_pbr_model(self, eps, bps, industry_avg):
-        """PER/PBR 적정가치 모델"""
-        pass
-    
-    def owner_earnings_model(self, owner_earnings):
-        """소유주 이익 모델 (버핏 방식)"""
-        pass
-    
-    def fcf_model(self, free_cash_flow, growth_rate):
-        """잉여현금흐름 모델"""
-        pass
-    
-    def calculate_intrinsic_value(self, financial_data):
-        """5가지 모델 통합 내재가치 계산"""
-        values = [
-            self.dcf_model(),
-            self.ddm_model(),
-            self.per_pbr_model(),
-            self.owner_earnings_model(),
-            self.fcf_model()
-        ]
+        return ddm_value(dividends, growth_rate, required_return)
+
+    def per_pbr_model(self, eps, bps, industry_avg: Dict[str, np.ndarray]):
+        """PER/PBR 적정가치 모델 (industry_avg: {'per': 업종 PER, 'pbr': 업종 PBR})"""
+        eps = np.asarray(eps, dtype=float)
+        bps = np.asarray(bps, dtype=float)
+        per_value = np.where(eps > 0, eps * industry_avg['per'], np.nan)
+        pbr_value = np.where(bps > 0, bps * industry_avg['pbr'], np.nan)
+        stacked = np.stack(np.broadcast_arrays(per_value, pbr_value))
+        counts = np.sum(~np.isnan(stacked), axis=0)
+        return np.where(counts > 0, np.nansum(stacked, axis=0) / np.maximum(counts, 1), np.nan)
+
+    def owner_earnings_model(self, owner_earnings, discount_rate=None, growth_rate=DEFAULT_GROWTH):
+        """소유주 이익 모델 (버핏 방식) - 양의 소유주 이익만 평가"""
+        discount_rate = self.discount_rate if discount_rate is None else discount_rate
+        owner_earnings = np.asarray(owner_earnings, dtype=float)
+        value = two_stage_dcf(owner_earnings, growth_rate, discount_rate,
+                              self.forecast_years, self.terminal_growth)
+        return np.where(owner_earnings > 0, value, np.nan)
+
+    def fcf_model(self, free_cash_flow, growth_rate, discount_rate=None):
+        """잉여현금흐름 모델 (영구 성장, 장기 성장률은 예측 성장률의 절반)"""
+        discount_rate = self.discount_rate if discount_rate is None else discount_rate
+        free_cash_flow = np.asarray(free_cash_flow, dtype=float)
+        value = gordon_growth_value(free_cash_flow, np.asarray(growth_rate, dtype=float) / 2, discount_rate)
+        return np.where(free_cash_flow > 0, value, np.nan)
+
+    # ------------------------------------------------------------------
+    # 입력 준비
+    # ------------------------------------------------------------------
+    @staticmethod
+    def load_inputs(conn: sqlite3.Connection) -> pd.DataFrame:
+        """종목별 최신 재무(연간 우선) + 업종 + 최신 종가"""
+        query = """
+            WITH ranked AS (
+                SELECT fr.*,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY fr.stock_code
+                           ORDER BY fr.year DESC, fr.quarter IS NOT NULL, fr.quarter DESC
+                       ) AS rn
+                FROM financial_ratios fr
+            ),
+            last_price AS (
+                SELECT stock_code, MAX(date) AS date FROM stock_prices GROUP BY stock_code
+            )
+            SELECT r.stock_code, c.sector, r.year,
+                   r.net_income, r.operating_income, r.ebitda, r.free_cash_flow,
+                   r.dividend_paid, r.shares_outstanding, r.eps, r.bps, r.per, r.pbr,
+                   r.dividend_growth_3y, {growth},
+                   sp.close_price AS current_price
+            FROM ranked r
+            LEFT JOIN company_info c ON c.stock_code = r.stock_code
+            LEFT JOIN last_price lp ON lp.stock_code = r.stock_code
+            LEFT JOIN stock_prices sp ON sp.stock_code = lp.stock_code AND sp.date = lp.date
+            WHERE r.rn = 1
+            ORDER BY r.stock_code
+        """.format(growth=', '.join(f'r.{col}' for col in GROWTH_COLUMNS))
+        return pd.read_sql_query(query, conn)
+
+    @staticmethod
+    def prepare_inputs(df: pd.DataFrame) -> pd.DataFrame:
+        """주당 현금흐름/배당/소유주 이익, 기대 성장률, 업종 배수 계산"""
+        df = df.copy()
+        numeric = ['net_income', 'operating_income', 'ebitda', 'free_cash_flow', 'dividend_paid',
+                   'shares_outstanding', 'eps', 'bps', 'per', 'pbr', 'dividend_growth_3y',
+                   'current_price'] + GROWTH_COLUMNS
+        for col in numeric:
+            df[col] = pd.to_numeric(df[col], errors='coerce') if col in df.columns else np.nan
+
+        # 발행주식수가 없으면 순이익 / EPS로 추정
+        shares = df['shares_outstanding'].where(df['shares_outstanding'] > 0)
+        implied = (df['net_income'] / df['eps']).where((df['eps'].abs() > 0) & (df['net_income'] * df['eps'] > 0))
+        shares = shares.fillna(implied)
+
+        df['fcf_per_share'] = df['free_cash_flow'] / shares
+        df['dps'] = df['dividend_paid'].abs() / shares
+        df['owner_earnings_per_share'] = owner_earnings(df) / shares
+
+        growth = df[GROWTH_COLUMNS].median(axis=1, skipna=True) / 100
+        df['expected_growth'] = growth.fillna(DEFAULT_GROWTH).clip(*GROWTH_BOUNDS)
+        df['dividend_growth'] = (df['dividend_growth_3y'] / 100).fillna(df['expected_growth']).clip(*GROWTH_BOUNDS)
+
+        # 업종 중앙값 배수 (양수만, 업종 정보가 없으면 시장 중앙값)
+        per = df['per'].where(df['per'] > 0)
+        pbr = df['pbr'].where(df['pbr'] > 0)
+        sector = df.get('sector', pd.Series('', index=df.index)).fillna('')
+        df['sector_per'] = per.groupby(sector).transform('median').fillna(per.median()).clip(*PER_BOUNDS)
+        df['sector_pbr'] = pbr.groupby(sector).transform('median').fillna(pbr.median()).clip(*PBR_BOUNDS)
+        return df
+
+    # ------------------------------------------------------------------
+    # Monte Carlo
+    # ------------------------------------------------------------------
+    def _model_terms(self, inputs: pd.DataFrame, growth: np.ndarray,
+                     discount: np.ndarray) -> Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """
+        모델별 (주당 기준값, 시나리오 배수) - 가치 = 기준값 × 배수
+
+        모든 모델이 기준값에 선형이므로 배수만 시나리오 배열로 계산하고,
+        DCF와 소유주 이익은 같은 2단계 배수를 공유한다. 평가 불가 종목은 기준값 NaN.
+        """
+        column = lambda name: inputs[name].to_numpy(dtype=float)[:, None]
+        positive = lambda values: np.where(values > 0, values, np.nan)
+
+        fcf = positive(column('fcf_per_share'))
+        two_stage = two_stage_multiplier(growth, discount, self.forecast_years, self.terminal_growth)
+        perpetual = gordon_multiplier(growth / 2, discount)
+        dividend_growth = column('dividend_growth') + (growth - column('expected_growth'))
+        relative = self.per_pbr_model(column('eps'), column('bps'),
+                                      {'per': column('sector_per'), 'pbr': column('sector_pbr')})
+        return {
+            'dcf': (fcf, two_stage),
+            'ddm': (positive(column('dps')), gordon_multiplier(dividend_growth, discount)),
+            'per_pbr': (relative, None),
+            'owner_earnings': (positive(column('owner_earnings_per_share')), two_stage),
+            'fcf': (fcf, perpetual),
+        }
+
+    def simulate(self, inputs: pd.DataFrame) -> pd.DataFrame:
+        """
+        전체 종목 Monte Carlo 내재가치 분포 요약
+
+        Returns:
+            stock_code별 intrinsic_value(중앙값), intrinsic_value_low/high(5/95%),
+            undervalued_probability, 모델별 중앙값(<model>_value), model_count
+        """
+        n = len(inputs)
+        rng = np.random.default_rng(self.seed)
+        # 할인율: 시장 공통 시나리오 (영구성장률 + 2%p 이상)
+        discount = np.clip(self.discount_rate + self.discount_rate_std * rng.standard_normal(self.n_scenarios),
+                           self.terminal_growth + 0.02, 0.20)[None, :]
+
+        out = {key: np.full(n, np.nan) for key in
+               ['intrinsic_value', 'intrinsic_value_low', 'intrinsic_value_high', 'undervalued_probability']}
+        out.update({f'{model}_value': np.full(n, np.nan) for model in MODELS})
+        out['model_count'] = np.zeros(n, dtype=int)
+
+        expected = inputs['expected_growth'].to_numpy(dtype=float)
+        prices = inputs['current_price'].to_numpy(dtype=float)
+
+        for start in range(0, n, self.chunk_size):
+            stop = min(start + self.chunk_size, n)
+            # 종목별 독립 성장률 샘플 (청크를 나눠도 같은 난수열)
+            growth = np.clip(expected[start:stop, None]
+                             + self.growth_std * rng.standard_normal((stop - start, self.n_scenarios)),
+                             *GROWTH_BOUNDS)
+
+            total = np.zeros_like(growth)
+            count = np.zeros(stop - start, dtype=int)
+            multiplier_medians = {}
+            for model, (base, multiplier) in self._model_terms(inputs.iloc[start:stop], growth, discount).items():
+                available = ~np.isnan(base[:, 0])
+                count += available
+                if multiplier is None:
+                    total += np.where(available, base[:, 0], 0.0)[:, None]
+                    out[f'{model}_value'][start:stop] = base[:, 0]
+                    continue
+                total += np.where(available[:, None], base * multiplier, 0.0)
+                # 기준값이 양수이므로 가치 중앙값 = 기준값 × 배수 중앙값 (공유 배수는 한 번만 계산)
+                key = id(multiplier)
+                if key not in multiplier_medians:
+                    multiplier_medians[key] = np.median(multiplier, axis=1)
+                out[f'{model}_value'][start:stop] = base[:, 0] * multiplier_medians[key]
+
+            valid = count > 0
+            if not valid.any():
+                continue
+            combined = total[valid] / count[valid, None]
+            low, mid, high = np.percentile(combined, [5, 50, 95], axis=1)
+            index = np.arange(start, stop)[valid]
+            out['intrinsic_value'][index] = mid
+            out['intrinsic_value_low'][index] = low
+            out['intrinsic_value_high'][index] = high
+            out['model_count'][start:stop] = count
+
+            price = prices[index]
+            priced = ~np.isnan(price)
+            probability = np.full(len(index), np.nan)
+            probability[priced] = (combined[priced] > price[priced, None]).mean(axis=1)
+            out['undervalued_probability'][index] = probability
+
+        result = pd.DataFrame(out)
+        result.insert(0, 'stock_code', inputs['stock_code'].to_numpy())
+        result['current_price'] = prices
+        result['discount_rate'] = self.discount_rate
+        result['margin_of_safety'] = (result['intrinsic_value'] - result['current_price']) \
+            / result['intrinsic_value'].where(result['intrinsic_value'] > 0) * 100
+        result['buy_price'] = result['intrinsic_value'] * (1 - self.safety_margin)
+        return result
+
+    def calculate_all(self, conn: sqlite3.Connection,
+                      stock_codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        전체 종목 내재가치 계산
+
+        업종 배수는 항상 전체 시장 기준으로 구한 뒤 stock_codes로 필터링한다.
+        """
+        inputs = self.load_inputs(conn)
+        if inputs.empty:
+            return pd.DataFrame()
+        inputs = self.prepare_inputs(inputs)
+        if stock_codes is not None:
+            inputs = inputs[inputs['stock_code'].isin(list(stock_codes))].reset_index(drop=True)
+            if inputs.empty:
+                return pd.DataFrame()
+
+        result = self.simulate(inputs)
+        logger.info(f"💰 내재가치 계산 완료: {int(result['intrinsic_value'].notna().sum())}/{len(result)}개 종목 "
+                    f"({self.n_scenarios:,}개 시나리오)")
+        return result
+
+    def calculate_intrinsic_value(self, financial_data) -> Dict[str, float]:
+        """5가지 모델 통합 내재가치 계산 (단일 종목, 기대값 시나리오 1개)"""
+        frame = pd.DataFrame([financial_data]) if isinstance(financial_data, dict) else financial_data
+        inputs = self.prepare_inputs(frame)
+        growth = inputs['expected_growth'].to_numpy(dtype=float)[:, None]
+        discount = np.array([[self.discount_rate]])
+
+        values = {}
+        for model, (base, multiplier) in self._model_terms(inputs, growth, discount).items():
+            value = base if multiplier is None else base * multiplier
+            values[model] = float(value[0, 0])
+
+        available = [value for value in values.values() if not np.isnan(value)]
         # 평균값 계산 후 안전마진 적용
-        avg_value = sum(values) / len(values)
-        return avg_value * self.safety_margin
+        avg_value = sum(available) / len(available) if available else float('nan')
+        values['intrinsic_value'] = avg_value
+        values['buy_price'] = avg_value * (1 - self.safety_margin)
+        return values
@@ -0,0 +1,31 @@
+"""
+소유주 이익 (Owner Earnings, 버핏 방식)
+소유주 이익 = 순이익 + 감가상각비 - 유지보수 설비투자
+
+재무 데이터에 감가상각비/설비투자가 따로 없으므로 다음으로 추정한다.
+- 감가상각비 ≈ EBITDA - 영업이익
+- 총 설비투자 ≈ 순이익 + 감가상각비 - 잉여현금흐름 (운전자본 변동 무시)
+- 유지보수 설비투자 ≈ 총 설비투자 × MAINTENANCE_CAPEX_SHARE
+"""
+
+import numpy as np
+import pandas as pd
+
+MAINTENANCE_CAPEX_SHARE = 0.7
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name in df.columns:
+        return pd.to_numeric(df[name], errors='coerce').to_numpy(dtype=float)
+    return np.full(len(df), np.nan)
+
+
+def owner_earnings(df: pd.DataFrame, maintenance_share: float = MAINTENANCE_CAPEX_SHARE) -> np.ndarray:
+    """종목별 소유주 이익 (순이익이 없으면 NaN, 현금흐름 정보가 없으면 순이익)"""
+    net_income = _column(df, 'net_income')
+    depreciation = np.clip(np.nan_to_num(_column(df, 'ebitda') - _column(df, 'operating_income')), 0, None)
+    free_cash_flow = _column(df, 'free_cash_flow')
+
+    capex = np.clip(net_income + depreciation - free_cash_flow, 0, None)
+    estimated = net_income + depreciation - maintenance_share * capex
+    return np.where(np.isnan(free_cash_flow), net_income, estimated)
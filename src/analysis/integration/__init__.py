@@ -0,0 +1,12 @@
+"""
+Integration Module
+기본분석 + 기술분석 + 감정분석 통합 점수 패키지
+"""
+
+from .score_integrator import ScoreIntegrator, IntegratedAnalyzer, score_row_to_result
+
+__all__ = [
+    'ScoreIntegrator',
+    'IntegratedAnalyzer',
+    'score_row_to_result'
+]
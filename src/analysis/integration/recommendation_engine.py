@@ -0,0 +1,179 @@
+"""
+투자 추천 엔진
+통합 점수 계산에 쓰이는 영역별 점수 변환, 등급/추천/위험도 판정을 전체 종목에 대해 벡터화 처리
+
+- 기본분석: 워런 버핏 스코어카드 (110점 → 100점 환산)
+- 기술분석: 저장된 technical_score, 없으면 RSI/MACD/이동평균/52주 위치로 산출
+- 감정분석: sentiment_final_score, 없으면 주간/일간 감정(-1~1), 그마저 없으면 시장 감정지수
+- 가중치: 기본분석 45% + 기술분석 30% + 감정분석 25% (없는 영역은 제외 후 재정규화)
+- 신뢰도: 종목 자체 데이터로 확보된 영역 가중치 비율 (시장 감정지수 대체는 제외)
+- 추천/위험도 라벨: RECOMMENDATION_ORDER / RISK_LEVELS (investment_scores 스키마 주석과 동일)
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# investment_scores 스키마의 영역별 가중치
+SCORE_WEIGHTS = {
+    'fundamental': 0.45,
+    'technical': 0.30,
+    'sentiment': 0.25,
+}
+
+BUFFETT_MAX_SCORE = 110.0
+
+# (하한 점수, 등급) - 높은 점수부터
+GRADE_THRESHOLDS = [
+    (90, 'S+'), (85, 'S'), (80, 'A+'), (75, 'A'), (70, 'B+'),
+    (65, 'B'), (60, 'C+'), (55, 'C'), (45, 'D'),
+]
+
+RECOMMENDATION_THRESHOLDS = [
+    (80, 'STRONG_BUY'), (70, 'BUY'), (60, 'WEAK_BUY'), (45, 'HOLD'),
+    (35, 'WEAK_SELL'), (25, 'SELL'),
+]
+
+RECOMMENDATION_ORDER = ['STRONG_BUY', 'BUY', 'WEAK_BUY', 'HOLD', 'WEAK_SELL', 'SELL', 'STRONG_SELL']
+
+RISK_LEVELS = ['LOW', 'MEDIUM', 'HIGH']
+
+
+def _column(df: pd.DataFrame, name: str) -> pd.Series:
+    """컬럼을 float Series로 반환 (없으면 NaN)"""
+    if name in df.columns:
+        return pd.to_numeric(df[name], errors='coerce').astype(float)
+    return pd.Series(np.nan, index=df.index, dtype=float)
+
+
+def _signed_to_score(values: pd.Series) -> pd.Series:
+    """-1~1 감정값은 0~100으로 환산, 이미 0~100 범위인 값은 그대로"""
+    return values.where(values.abs() > 1, 50 + 50 * values).clip(0, 100)
+
+
+def fundamental_scores(df: pd.DataFrame) -> pd.Series:
+    """버핏 스코어카드 → 0~100 기본분석 점수"""
+    percentage = _column(df, 'score_percentage')
+    from_total = _column(df, 'buffett_total_score') / BUFFETT_MAX_SCORE * 100
+    return percentage.fillna(from_total).clip(0, 100)
+
+
+def technical_scores(df: pd.DataFrame) -> pd.Series:
+    """저장된 기술 점수 또는 지표 기반 0~100 기술분석 점수"""
+    close = _column(df, 'current_price')
+    rsi = _column(df, 'rsi')
+    high_52w = _column(df, 'week_52_high')
+    low_52w = _column(df, 'week_52_low')
+
+    # 각 항목은 입력이 없으면 0 기여, 항목이 하나도 없으면 NaN
+    terms = {
+        'sma_20': 10 * np.sign(close - _column(df, 'sma_20')),
+        'sma_200': 15 * np.sign(close - _column(df, 'sma_200')),
+        'macd': 10 * np.sign(_column(df, 'macd') - _column(df, 'macd_signal')),
+        'rsi': pd.Series(np.select([rsi < 30, rsi > 70], [10.0, -10.0], 0.0), index=df.index).where(rsi.notna()),
+        'range_52w': ((close - low_52w) / (high_52w - low_52w).where(high_52w > low_52w) - 0.5) * 10,
+    }
+    contributions = pd.DataFrame(terms, index=df.index)
+    derived = (50 + contributions.sum(axis=1, min_count=1)).clip(0, 100)
+
+    return _column(df, 'technical_score').fillna(derived).clip(0, 100)
+
+
+def sentiment_raw(df: pd.DataFrame) -> pd.Series:
+    """종목 감정 지수 (-1~1, 주간 우선)"""
+    return _column(df, 'weekly_sentiment').fillna(_column(df, 'daily_sentiment'))
+
+
+def _stock_sentiment_scores(df: pd.DataFrame) -> pd.Series:
+    return _column(df, 'sentiment_final_score').fillna(_signed_to_score(sentiment_raw(df)))
+
+
+def sentiment_scores(df: pd.DataFrame) -> pd.Series:
+    """종목 감정 → 0~100 감정분석 점수 (종목 데이터가 없으면 시장 감정지수로 대체)"""
+    market_score = _signed_to_score(_column(df, 'market_sentiment_index'))
+    return _stock_sentiment_scores(df).fillna(market_score).clip(0, 100)
+
+
+def sentiment_is_fallback(df: pd.DataFrame) -> pd.Series:
+    """감정분석 점수가 종목 데이터 없이 시장 감정지수로 대체된 행"""
+    return _stock_sentiment_scores(df).isna() & _column(df, 'market_sentiment_index').notna()
+
+
+def combine_scores(components: pd.DataFrame, weights: dict = None,
+                   fallbacks: Optional[Dict[str, pd.Series]] = None) -> pd.DataFrame:
+    """
+    영역별 점수 가중 결합
+
+    Args:
+        components: fundamental_score / technical_score / sentiment_score 컬럼
+        weights: 영역별 가중치 (기본 45/30/25)
+        fallbacks: 영역별 대체값 사용 여부 (총점에는 반영, 신뢰도 계산에서는 없는 영역으로 봄)
+
+    Returns:
+        weighted_* 컬럼, total_investment_score, confidence_level 을 가진 DataFrame
+    """
+    weights = weights or SCORE_WEIGHTS
+    fallbacks = fallbacks or {}
+    result = pd.DataFrame(index=components.index)
+    available_weight = pd.Series(0.0, index=components.index)
+    observed_weight = pd.Series(0.0, index=components.index)
+    weighted_sum = pd.Series(0.0, index=components.index)
+
+    for area, weight in weights.items():
+        score = components[f'{area}_score']
+        weighted = score * weight
+        result[f'weighted_{area}'] = weighted
+        available_weight += score.notna() * weight
+        fallback = fallbacks.get(area, pd.Series(False, index=components.index))
+        observed_weight += (score.notna() & ~fallback.astype(bool)) * weight
+        weighted_sum += weighted.fillna(0)
+
+    # 없는 영역은 빼고 가중치 재정규화, 신뢰도는 종목 자체 데이터로 확보된 가중치 비율
+    result['total_investment_score'] = (weighted_sum / available_weight.where(available_weight > 0)).round(2)
+    result['confidence_level'] = (observed_weight / sum(weights.values())).round(3)
+    return result
+
+
+def grades(total: pd.Series) -> pd.Series:
+    """총점 → 등급 (S+ ~ F)"""
+    conditions = [total >= threshold for threshold, _ in GRADE_THRESHOLDS]
+    labels = [label for _, label in GRADE_THRESHOLDS]
+    return pd.Series(np.select(conditions, labels, 'F'), index=total.index).where(total.notna())
+
+
+def recommendations(total: pd.Series) -> pd.Series:
+    """총점 → 투자 추천 (STRONG_BUY ~ STRONG_SELL)"""
+    conditions = [total >= threshold for threshold, _ in RECOMMENDATION_THRESHOLDS]
+    labels = [label for _, label in RECOMMENDATION_THRESHOLDS]
+    return pd.Series(np.select(conditions, labels, 'STRONG_SELL'), index=total.index).where(total.notna())
+
+
+def risk_levels(df: pd.DataFrame, fundamental: pd.Series, confidence: pd.Series) -> pd.Series:
+    """
+    위험도 판정 (LOW / MEDIUM / HIGH)
+
+    위험 점수: 일중 변동성(ATR/주가) 4% 초과 +1, 6% 초과 +1, 60일 연환산 변동성 60% 초과 +1,
+    252일 최대낙폭 -40% 미만 +1, 기본분석 40점 미만 +1, 스코어카드 위험도 HIGH +1,
+    데이터 신뢰도 60% 미만 +1 → 0~1 LOW, 2 MEDIUM, 3 이상 HIGH (위험 지표가 없으면 해당 항목 0점)
+    """
+    atr_ratio = _column(df, 'atr') / _column(df, 'current_price').where(lambda s: s > 0)
+    volatility = _column(df, 'volatility')
+    max_drawdown = _column(df, 'max_drawdown')
+    buffett_risk = df['buffett_risk_level'] if 'buffett_risk_level' in df.columns else pd.Series(None, index=df.index)
+
+    points = (
+        (atr_ratio > 0.04).astype(int)
+        + (atr_ratio > 0.06).astype(int)
+        + (volatility > 0.6).astype(int)
+        + (max_drawdown < -0.4).astype(int)
+        + (fundamental < 40).astype(int)
+        + buffett_risk.astype(str).str.upper().isin(['HIGH', '높음']).astype(int)
+        + (confidence < 0.6).astype(int)
+    )
+    return pd.Series(np.select([points >= 3, points == 2], ['HIGH', 'MEDIUM'], 'LOW'), index=df.index)
+
+
+def margin_of_safety(intrinsic_value: pd.Series, current_price: pd.Series) -> pd.Series:
+    """안전마진 (%) = (내재가치 - 현재가) / 내재가치"""
+    return ((intrinsic_value - current_price) / intrinsic_value.where(intrinsic_value > 0) * 100).round(2)
@@ -0,0 +1,431 @@
+"""
+통합 투자 점수 산출기
+워런 버핏 스코어카드(45%) + 기술분석(30%) + 감정분석(25%)을 전체 종목에 대해 일괄 계산
+
+- 주식 DB에 뉴스 DB / 스코어카드 DB를 ATTACH해 종목별 최신 행을 한 번의 쿼리로 결합
+- 위험 지표(변동성/베타/샤프/최대낙폭)는 risk_metrics 최신 행 (RiskMetricsCalculator가 매일 갱신)
+- 점수/등급/추천/위험도는 recommendation_engine에서 벡터화 계산
+- 내재가치는 IntrinsicValueCalculator Monte Carlo 중앙값 (재무 데이터가 없으면 스코어카드 목표가 평균)
+- 결과는 investment_scores에 당일 날짜로 한 트랜잭션에 upsert
+
+사용법:
+    integrator = ScoreIntegrator()
+    scores = integrator.run()                      # 전체 종목 계산 + 저장
+    scores = integrator.compute(stock_codes=['005930'])
+"""
+
+import logging
+import sqlite3
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from config.database_config import DatabaseConfig
+from src.analysis.fundamental.intrinsic_value import IntrinsicValueCalculator
+
+try:
+    from . import recommendation_engine as engine
+except ImportError:
+    import recommendation_engine as engine
+
+logger = logging.getLogger(__name__)
+
+SCORECARD_DB_NAME = 'buffett_scorecard.db'
+
+# investment_scores에 저장하는 컬럼 (stock_code, date 제외)
+SCORE_COLUMNS = [
+    'fundamental_score', 'technical_score', 'sentiment_score',
+    'weighted_fundamental', 'weighted_technical', 'weighted_sentiment',
+    'total_investment_score', 'recommendation', 'risk_level', 'confidence_level',
+    'intrinsic_value', 'intrinsic_value_low', 'intrinsic_value_high', 'undervalued_probability',
+    'current_price', 'discount_rate', 'margin_of_safety',
+    'volatility', 'beta', 'sharpe_ratio', 'max_drawdown',
+]
+
+_VALUATION_FIELDS = ['intrinsic_value', 'intrinsic_value_low', 'intrinsic_value_high',
+                     'undervalued_probability', 'discount_rate', 'model_count']
+
+_TECHNICAL_FIELDS = ['technical_score', 'rsi', 'macd', 'macd_signal', 'sma_20', 'sma_200',
+                     'atr', 'week_52_high', 'week_52_low']
+_FUNDAMENTAL_FIELDS = {
+    'total_score': 'buffett_total_score',
+    'score_percentage': 'score_percentage',
+    'risk_level': 'buffett_risk_level',
+    'target_price_low': 'target_price_low',
+    'target_price_high': 'target_price_high',
+}
+_SENTIMENT_FIELDS = ['sentiment_final_score', 'weekly_sentiment', 'daily_sentiment', 'total_news_count']
+# risk_metrics 컬럼 → investment_scores 위험 지표 컬럼
+_RISK_FIELDS = {
+    'volatility_60': 'volatility',
+    'beta_252': 'beta',
+    'sharpe_252': 'sharpe_ratio',
+    'max_drawdown_252': 'max_drawdown',
+}
+
+
+class ScoreIntegrator:
+    """전체 종목 통합 투자 점수 배치 계산기"""
+
+    def __init__(self, db_config: Optional[DatabaseConfig] = None,
+                 scorecard_db_path: Optional[Path] = None,
+                 weights: Optional[Dict[str, float]] = None,
+                 valuation: Optional[IntrinsicValueCalculator] = None):
+        self.db_config = db_config or DatabaseConfig()
+        self.scorecard_db_path = Path(scorecard_db_path) if scorecard_db_path else \
+            self.db_config.base_path / SCORECARD_DB_NAME
+        self.weights = weights or engine.SCORE_WEIGHTS
+        self.valuation = valuation or IntrinsicValueCalculator()
+
+    def _connect(self) -> sqlite3.Connection:
+        """주식 DB 연결 + 뉴스/스코어카드 DB ATTACH"""
+        conn = self.db_config.get_connection('stock')
+        attachments = {
+            'news': self.db_config.databases['news']['path'],
+            'scorecard': self.scorecard_db_path,
+        }
+        for alias, path in attachments.items():
+            if Path(path).exists():
+                conn.execute(f"ATTACH DATABASE ? AS {alias}", (str(path),))
+        return conn
+
+    @staticmethod
+    def _has_table(conn: sqlite3.Connection, schema: str, table: str) -> bool:
+        try:
+            row = conn.execute(
+                f"SELECT 1 FROM {schema}.sqlite_master WHERE type = 'table' AND name = ?", (table,)
+            ).fetchone()
+            return row is not None
+        except sqlite3.OperationalError:
+            return False  # 스키마가 ATTACH되지 않음
+
+    def load_inputs(self, conn: sqlite3.Connection, as_of: str,
+                    stock_codes: Optional[Sequence[str]] = None,
+                    technical_days: int = 252, sentiment_days: int = 30) -> pd.DataFrame:
+        """
+        종목별 최신 주가 / 기술지표 / 스코어카드 / 감정 행을 한 번의 쿼리로 결합
+
+        각 소스는 (stock_code, date) 인덱스로 종목별 MAX(date)를 구한 뒤 해당 행을 조인한다.
+        없는 테이블은 NULL 컬럼으로 대체한다.
+        """
+        as_of_date = datetime.strptime(as_of, '%Y-%m-%d')
+        params: Dict[str, Any] = {
+            'as_of': as_of,
+            'tech_from': (as_of_date - timedelta(days=technical_days)).strftime('%Y-%m-%d'),
+            'sent_from': (as_of_date - timedelta(days=sentiment_days)).strftime('%Y-%m-%d'),
+        }
+
+        ctes = ["""
+            last_price AS (
+                SELECT stock_code, MAX(date) AS date FROM stock_prices
+                WHERE date <= :as_of GROUP BY stock_code
+            )"""]
+        selects = ["sp.close_price AS current_price"]
+        joins = ["""
+            LEFT JOIN last_price lp ON lp.stock_code = u.stock_code
+            LEFT JOIN stock_prices sp ON sp.stock_code = lp.stock_code AND sp.date = lp.date"""]
+        presence = []
+
+        if self._has_table(conn, 'main', 'technical_indicators'):
+            ctes.append("""
+            last_tech AS (
+                SELECT stock_code, MAX(date) AS date FROM technical_indicators
+                WHERE date <= :as_of AND date >= :tech_from GROUP BY stock_code
+            )""")
+            selects += [f"ti.{col} AS {col}" for col in _TECHNICAL_FIELDS]
+            joins.append("""
+            LEFT JOIN last_tech lt ON lt.stock_code = u.stock_code
+            LEFT JOIN technical_indicators ti ON ti.stock_code = lt.stock_code AND ti.date = lt.date""")
+            presence.append("ti.stock_code IS NOT NULL")
+        else:
+            selects += [f"NULL AS {col}" for col in _TECHNICAL_FIELDS]
+
+        if self._has_table(conn, 'scorecard', 'buffett_analysis_110'):
+            ctes.append("""
+            last_fund AS (
+                SELECT stock_code, MAX(analysis_date) AS analysis_date FROM scorecard.buffett_analysis_110
+                WHERE analysis_date <= :as_of GROUP BY stock_code
+            )""")
+            selects += [f"ba.{col} AS {alias}" for col, alias in _FUNDAMENTAL_FIELDS.items()]
+            joins.append("""
+            LEFT JOIN last_fund lf ON lf.stock_code = u.stock_code
+            LEFT JOIN scorecard.buffett_analysis_110 ba
+                ON ba.stock_code = lf.stock_code AND ba.analysis_date = lf.analysis_date""")
+            presence.append("ba.stock_code IS NOT NULL")
+        else:
+            selects += [f"NULL AS {alias}" for alias in _FUNDAMENTAL_FIELDS.values()]
+
+        # 위험 지표는 점수 산출 대상 판정(presence)에는 쓰지 않음
+        if self._has_table(conn, 'main', 'risk_metrics'):
+            ctes.append("""
+            last_risk AS (
+                SELECT stock_code, MAX(date) AS date FROM risk_metrics
+                WHERE date <= :as_of AND date >= :tech_from GROUP BY stock_code
+            )""")
+            selects += [f"rm.{col} AS {alias}" for col, alias in _RISK_FIELDS.items()]
+            joins.append("""
+            LEFT JOIN last_risk lr ON lr.stock_code = u.stock_code
+            LEFT JOIN risk_metrics rm ON rm.stock_code = lr.stock_code AND rm.date = lr.date""")
+        else:
+            selects += [f"NULL AS {alias}" for alias in _RISK_FIELDS.values()]
+
+        if self._has_table(conn, 'news', 'sentiment_scores'):
+            ctes.append("""
+            last_sent AS (
+                SELECT stock_code, MAX(date) AS date FROM news.sentiment_scores
+                WHERE date <= :as_of AND date >= :sent_from GROUP BY stock_code
+            )""")
+            selects += [f"ss.{col} AS {col}" for col in _SENTIMENT_FIELDS]
+            joins.append("""
+            LEFT JOIN last_sent ls ON ls.stock_code = u.stock_code
+            LEFT JOIN news.sentiment_scores ss ON ss.stock_code = ls.stock_code AND ss.date = ls.date""")
+            presence.append("ss.stock_code IS NOT NULL")
+        else:
+            selects += [f"NULL AS {col}" for col in _SENTIMENT_FIELDS]
+
+        # 시장 전체 감정지수 (종목 감정이 없을 때 대체값)
+        if self._has_table(conn, 'news', 'market_sentiment'):
+            selects.append("""(SELECT market_sentiment_index FROM news.market_sentiment
+                WHERE date <= :as_of AND date >= :sent_from
+                ORDER BY date DESC LIMIT 1) AS market_sentiment_index""")
+        else:
+            selects.append("NULL AS market_sentiment_index")
+
+        where = [f"({' OR '.join(presence)})"] if presence else ["0"]
+        if stock_codes:
+            placeholders = ', '.join(f':code{i}' for i in range(len(stock_codes)))
+            where.append(f"u.stock_code IN ({placeholders})")
+            params.update({f'code{i}': code for i, code in enumerate(stock_codes)})
+
+        query = f"""
+            WITH {','.join(ctes)}
+            SELECT u.stock_code, u.company_name, {', '.join(selects)}
+            FROM company_info u
+            {''.join(joins)}
+            WHERE {' AND '.join(where)}
+        """
+        return pd.read_sql_query(query, conn, params=params)
+
+    def compute(self, as_of: Optional[str] = None, stock_codes: Optional[Sequence[str]] = None,
+                technical_days: int = 252, sentiment_days: int = 30,
+                conn: Optional[sqlite3.Connection] = None) -> pd.DataFrame:
+        """통합 점수 계산 (저장하지 않음)"""
+        as_of = as_of or datetime.now().strftime('%Y-%m-%d')
+        own_conn = conn is None
+        conn = conn or self._connect()
+        try:
+            df = self.load_inputs(conn, as_of, stock_codes, technical_days, sentiment_days)
+            valuations = self._valuations(conn, stock_codes) if not df.empty else None
+        finally:
+            if own_conn:
+                conn.close()
+
+        if df.empty:
+            return df
+
+        components = pd.DataFrame({
+            'fundamental_score': engine.fundamental_scores(df),
+            'technical_score': engine.technical_scores(df),
+            'sentiment_score': engine.sentiment_scores(df),
+        }, index=df.index)
+        combined = engine.combine_scores(components, self.weights,
+                                         fallbacks={'sentiment': engine.sentiment_is_fallback(df)})
+
+        result = pd.concat([df, components.round(2), combined], axis=1)
+        result = result.loc[:, ~result.columns.duplicated(keep='last')]
+        result['date'] = as_of
+        result['final_grade'] = engine.grades(result['total_investment_score'])
+        result['recommendation'] = engine.recommendations(result['total_investment_score'])
+        result['risk_level'] = engine.risk_levels(result, result['fundamental_score'],
+                                                  result['confidence_level'])
+        result['sentiment_raw'] = engine.sentiment_raw(df)
+
+        targets = result[['target_price_low', 'target_price_high']].apply(pd.to_numeric, errors='coerce')
+        result = result.merge(valuations, on='stock_code', how='left')
+        result['intrinsic_value'] = result['intrinsic_value'].fillna(targets.mean(axis=1)).round(0)
+        result['intrinsic_value_low'] = result['intrinsic_value_low'].round(0)
+        result['intrinsic_value_high'] = result['intrinsic_value_high'].round(0)
+        result['undervalued_probability'] = result['undervalued_probability'].round(3)
+        result['current_price'] = pd.to_numeric(result['current_price'], errors='coerce')
+        result['margin_of_safety'] = engine.margin_of_safety(result['intrinsic_value'], result['current_price'])
+
+        return result.sort_values('total_investment_score', ascending=False, na_position='last') \
+                     .reset_index(drop=True)
+
+    def _valuations(self, conn: sqlite3.Connection,
+                    stock_codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """Monte Carlo 내재가치 (financial_ratios가 없으면 빈 결과)"""
+        empty = pd.DataFrame({'stock_code': pd.Series(dtype=object),
+                              **{col: pd.Series(dtype=float) for col in _VALUATION_FIELDS}})
+        if not self._has_table(conn, 'main', 'financial_ratios'):
+            return empty
+        try:
+            valuations = self.valuation.calculate_all(conn, stock_codes)
+        except (sqlite3.Error, ValueError) as e:
+            logger.warning(f"⚠️ 내재가치 계산 실패, 목표가로 대체: {e}")
+            return empty
+        return empty if valuations.empty else valuations[['stock_code'] + _VALUATION_FIELDS]
+
+    def _ensure_columns(self, conn: sqlite3.Connection):
+        """이전 스키마로 만들어진 investment_scores에 누락 컬럼 추가"""
+        conn.execute(self.db_config.table_schemas['investment_scores'])
+        existing = {row[1] for row in conn.execute("PRAGMA table_info(investment_scores)")}
+        for column in SCORE_COLUMNS:
+            if column not in existing:
+                kind = 'TEXT' if column in ('recommendation', 'risk_level') else 'REAL'
+                conn.execute(f"ALTER TABLE investment_scores ADD COLUMN {column} {kind}")
+
+    def save(self, scores: pd.DataFrame, conn: Optional[sqlite3.Connection] = None) -> int:
+        """investment_scores 당일 행 upsert (한 트랜잭션)"""
+        scores = scores[scores['total_investment_score'].notna()]
+        if scores.empty:
+            return 0
+
+        columns = ['stock_code', 'date'] + SCORE_COLUMNS
+        frame = scores[columns].astype(object).where(scores[columns].notna(), None)
+        rows = list(frame.itertuples(index=False, name=None))
+
+        updates = ', '.join(f"{col} = excluded.{col}" for col in SCORE_COLUMNS)
+        sql = f"""
+            INSERT INTO investment_scores ({', '.join(columns)})
+            VALUES ({', '.join('?' * len(columns))})
+            ON CONFLICT(stock_code, date) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+        """
+
+        own_conn = conn is None
+        conn = conn or self.db_config.get_connection('stock')
+        try:
+            self._ensure_columns(conn)
+            with conn:
+                conn.executemany(sql, rows)
+        finally:
+            if own_conn:
+                conn.close()
+
+        logger.info(f"💾 investment_scores 저장 완료: {len(rows)}개 종목 ({scores['date'].iloc[0]})")
+        return len(rows)
+
+    def run(self, as_of: Optional[str] = None, stock_codes: Optional[Sequence[str]] = None,
+            save: bool = True, technical_days: int = 252, sentiment_days: int = 30) -> pd.DataFrame:
+        """전체 종목 통합 점수 계산 후 저장"""
+        start_time = datetime.now()
+        scores = self.compute(as_of, stock_codes, technical_days, sentiment_days)
+        if scores.empty:
+            logger.warning("통합 점수를 계산할 종목이 없습니다")
+            return scores
+
+        if save:
+            self.save(scores)
+
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"✅ 통합 점수 계산 완료: {len(scores)}개 종목 ({elapsed:.1f}초)")
+        return scores
+
+
+def _highlights(row: pd.Series) -> List[str]:
+    """투자 포인트 요약"""
+    highlights = []
+    if row.get('fundamental_score', 0) >= 70:
+        highlights.append(f"우수한 펀더멘털 (버핏 스코어 {row['fundamental_score']:.0f}/100)")
+    if pd.notna(row.get('margin_of_safety')) and row['margin_of_safety'] >= 20:
+        highlights.append(f"안전마진 {row['margin_of_safety']:.0f}%")
+    if pd.notna(row.get('rsi')) and row['rsi'] < 30:
+        highlights.append(f"RSI 과매도 구간 ({row['rsi']:.1f})")
+    if row.get('sentiment_score', 0) >= 65:
+        highlights.append("뉴스 감정 긍정적")
+    return highlights
+
+
+def _risk_factors(row: pd.Series) -> List[str]:
+    """주의사항 요약"""
+    risks = []
+    if pd.notna(row.get('fundamental_score')) and row['fundamental_score'] < 40:
+        risks.append("펀더멘털 취약")
+    if pd.notna(row.get('rsi')) and row['rsi'] > 70:
+        risks.append(f"RSI 과매수 구간 ({row['rsi']:.1f})")
+    if pd.notna(row.get('sentiment_score')) and row['sentiment_score'] < 35:
+        risks.append("뉴스 감정 부정적")
+    if pd.notna(row.get('volatility')) and row['volatility'] > 0.6:
+        risks.append(f"높은 변동성 (연 {row['volatility'] * 100:.0f}%)")
+    if pd.notna(row.get('max_drawdown')) and row['max_drawdown'] < -0.4:
+        risks.append(f"1년 최대낙폭 {row['max_drawdown'] * 100:.0f}%")
+    if row.get('confidence_level', 1) < 0.6:
+        risks.append("분석 데이터 부족")
+    return risks
+
+
+def score_row_to_result(row: pd.Series, weights: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """통합 점수 행 → 리포트/출력용 결과 딕셔너리"""
+    weights = weights or engine.SCORE_WEIGHTS
+    raw_scores = {
+        'fundamental': row.get('buffett_total_score'),
+        'technical': row.get('technical_score'),
+        'sentiment': row.get('sentiment_raw'),
+    }
+
+    analysis_scores = {}
+    for area, weight in weights.items():
+        score = row.get(f'{area}_score')
+        available = pd.notna(score)
+        raw = raw_scores[area]
+        analysis_scores[area] = {
+            'available': bool(available),
+            'score': float(score) if available else None,
+            'weighted_score': float(row[f'weighted_{area}']) if available else 0.0,
+            'weight': weight * 100,
+            'raw_score': float(raw) if pd.notna(raw) else (float(score) if available else 0.0),
+        }
+
+    def _value(key):
+        value = row.get(key)
+        return None if value is None or pd.isna(value) else (value.item() if hasattr(value, 'item') else value)
+
+    return {
+        'stock_code': row['stock_code'],
+        'company_name': row.get('company_name') or row['stock_code'],
+        'analysis_date': row['date'],
+        'total_score': float(row['total_investment_score']),
+        'final_grade': row['final_grade'],
+        'investment_recommendation': row['recommendation'],
+        'risk_level': row['risk_level'],
+        'data_quality': float(row['confidence_level']) * 100,
+        'analysis_scores': analysis_scores,
+        'investment_highlights': _highlights(row),
+        'risk_factors': _risk_factors(row),
+        'intrinsic_value': _value('intrinsic_value'),
+        'current_price': _value('current_price'),
+        'margin_of_safety': _value('margin_of_safety'),
+    }
+
+
+class IntegratedAnalyzer:
+    """단일 종목 통합 분석 (ScoreIntegrator 기반)"""
+
+    def __init__(self, integrator: Optional[ScoreIntegrator] = None):
+        self.integrator = integrator or ScoreIntegrator()
+
+    def analyze_stock(self, stock_code: str, technical_days: int = 252,
+                      sentiment_days: int = 30) -> Dict[str, Any]:
+        """종목 하나의 통합 점수 계산"""
+        try:
+            scores = self.integrator.compute(stock_codes=[stock_code], technical_days=technical_days,
+                                             sentiment_days=sentiment_days)
+        except Exception as e:
+            logger.error(f"통합 분석 실패: {stock_code} - {e}")
+            return {'error': str(e), 'stock_code': stock_code}
+
+        if scores.empty or pd.isna(scores.iloc[0]['total_investment_score']):
+            return {'error': '분석 데이터 없음', 'stock_code': stock_code}
+        return score_row_to_result(scores.iloc[0], self.integrator.weights)
+
+    def save_to_database(self, result: Dict[str, Any]) -> bool:
+        """분석 결과 저장 (해당 종목만 다시 계산해 upsert)"""
+        try:
+            scores = self.integrator.compute(as_of=result['analysis_date'],
+                                             stock_codes=[result['stock_code']])
+            return self.integrator.save(scores) > 0
+        except Exception as e:
+            logger.error(f"통합 분석 결과 저장 실패: {result.get('stock_code')} - {e}")
+            return False
@@ -0,0 +1,24 @@
+"""
+Risk Module
+가격 패널 기반 전 종목 위험 지표 (변동성 / 베타 / 샤프 / 최대낙폭) 패키지
+"""
+
+from .risk_metrics import (
+    RiskMetricsCalculator,
+    rolling_beta,
+    rolling_max_drawdown,
+    rolling_moments,
+    rolling_sharpe,
+    rolling_sum,
+    rolling_volatility,
+)
+
+__all__ = [
+    'RiskMetricsCalculator',
+    'rolling_sum',
+    'rolling_moments',
+    'rolling_volatility',
+    'rolling_sharpe',
+    'rolling_beta',
+    'rolling_max_drawdown',
+]
@@ -0,0 +1,372 @@
+"""
+전 종목 위험 지표 일괄 계산
+가격 패널(거래일 × 종목) 위에서 이동 변동성 / 베타 / 샤프 / 최대낙폭을 종목 루프 없이 행렬 연산으로 계산
+
+- 이동 합계: 열별 누적합 차분 (창 길이와 무관하게 O(거래일 × 종목)), NaN은 건너뛰고 유효 개수를 함께 집계
+- 변동성/샤프: 이동 합·제곱합 → 표본 표준편차 (연환산 √252)
+- 베타: 소속 시장 지수(KOSPI/KOSDAQ) 수익률과의 이동 공분산 / 지수 분산 (둘 다 값이 있는 날만)
+  지수는 kis DB market_indicators, 지수 값이 없는 날은 해당 시장 동일가중 수익률로 대체
+- 최대낙폭: 종가 행렬을 창 길이로 겹쳐 본 strided 뷰(sliding_window_view)에서 창별 누적 고점 대비 최저 하락률
+- 결과는 stock DB risk_metrics에 (stock_code, date)별로 upsert, 통합 점수(investment_scores)의 위험 지표 입력
+
+사용법:
+    calculator = RiskMetricsCalculator()
+    metrics = calculator.run()                                   # 마지막 저장일부터 증분 계산 + 저장
+    metrics = calculator.compute(start='2024-01-02', codes=['005930'])
+"""
+
+import logging
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가 (파이프라인 단계로 직접 실행 시)
+PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from config.database_config import DatabaseConfig
+from src.database.db_manager import DatabaseManager
+from src.database.price_panel import DateLike, PricePanel, get_price_panel
+
+logger = logging.getLogger(__name__)
+
+TRADING_DAYS_PER_YEAR = 252
+RISK_FREE_RATE = 0.02  # FinancialCalculator.calculate_sharpe_ratio 기본값과 동일
+
+VOLATILITY_WINDOWS = (20, 60, 252)
+BETA_WINDOWS = (60, 252)
+SHARPE_WINDOW = 252
+DRAWDOWN_WINDOW = 252
+# 가장 긴 창 + 첫 수익률을 위한 직전 종가 1행
+LOOKBACK_ROWS = max(VOLATILITY_WINDOWS + BETA_WINDOWS + (SHARPE_WINDOW, DRAWDOWN_WINDOW)) + 1
+
+# 베타 기준 지수 → market_indicators 컬럼
+BENCHMARKS = {'KOSPI': 'kospi_index', 'KOSDAQ': 'kosdaq_index'}
+
+RISK_COLUMNS = ['benchmark', 'volatility_20', 'volatility_60', 'volatility_252',
+                'beta_60', 'beta_252', 'sharpe_252', 'max_drawdown_252']
+
+# 저장 기록이 없을 때 계산할 최근 거래일 수 / 한 번에 계산·저장할 거래일 수
+DEFAULT_BACKFILL_SESSIONS = 252
+SESSIONS_PER_BATCH = 60
+# 최대낙폭 strided 창을 한 번에 펼칠 원소 수 (float64 약 32MB)
+DRAWDOWN_CHUNK_ELEMENTS = 4_000_000
+
+
+def min_periods_for(window: int) -> int:
+    """창의 3/4 이상 값이 있어야 지표 산출 (상장 초기/거래정지 구간 제외)"""
+    return max(2, window * 3 // 4)
+
+
+# =============================================================================
+# 이동 통계 (행 = 거래일, 열 = 종목)
+# =============================================================================
+
+def rolling_sum(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    열별 이동 합계와 유효 개수 (NaN 제외)
+
+    누적합을 한 번 구한 뒤 t행 값에서 t - window행 값을 빼서 창 합계를 얻는다.
+    """
+    valid = ~np.isnan(values)
+    sums = np.zeros((len(values) + 1,) + values.shape[1:], dtype=np.float64)
+    np.cumsum(np.where(valid, values, 0.0), axis=0, out=sums[1:])
+    counts = np.zeros(sums.shape, dtype=np.int64)
+    np.cumsum(valid, axis=0, out=counts[1:])
+
+    lag = np.maximum(np.arange(1, len(values) + 1) - window, 0)
+    return sums[1:] - sums[lag], counts[1:] - counts[lag]
+
+
+def rolling_moments(returns: np.ndarray, window: int,
+                    min_periods: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """이동 (유효 개수, 평균, 표본 표준편차) - 유효 개수가 min_periods 미만이면 평균/표준편차 NaN"""
+    min_periods = min_periods or min_periods_for(window)
+    total, count = rolling_sum(returns, window)
+    total_sq, _ = rolling_sum(returns ** 2, window)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+        variance = (total_sq - total * mean) / (count - 1)
+    # 누적합 차분의 반올림 오차로 생기는 아주 작은 음수 분산 제거
+    std = np.sqrt(np.maximum(variance, 0.0))
+
+    short = count < min_periods
+    mean[short] = np.nan
+    std[short] = np.nan
+    return count, mean, std
+
+
+def rolling_volatility(returns: np.ndarray, window: int, min_periods: Optional[int] = None,
+                       annualize: bool = True) -> np.ndarray:
+    """이동 변동성 (일간 수익률 표본 표준편차, annualize면 × √252)"""
+    _, _, std = rolling_moments(returns, window, min_periods)
+    return std * np.sqrt(TRADING_DAYS_PER_YEAR) if annualize else std
+
+
+def rolling_sharpe(returns: np.ndarray, window: int, risk_free_rate: float = RISK_FREE_RATE,
+                   min_periods: Optional[int] = None) -> np.ndarray:
+    """이동 샤프 비율 = (평균 수익률 - 일간 무위험 수익률) / 표준편차 × √252"""
+    _, mean, std = rolling_moments(returns, window, min_periods)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = (mean - risk_free_rate / TRADING_DAYS_PER_YEAR) / std * np.sqrt(TRADING_DAYS_PER_YEAR)
+    sharpe[~(std > 0)] = np.nan
+    return sharpe
+
+
+def rolling_beta(returns: np.ndarray, market: np.ndarray, window: int,
+                 min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    이동 베타 = cov(종목, 기준) / var(기준)
+
+    Args:
+        returns: (거래일, 종목) 일간 수익률
+        market: (거래일,) 공통 기준 수익률 또는 (거래일, 종목) 종목별 기준 수익률
+    """
+    min_periods = min_periods or min_periods_for(window)
+    market = np.broadcast_to(market[:, None] if market.ndim == 1 else market, returns.shape)
+
+    # 종목과 기준이 둘 다 값이 있는 날만 사용
+    paired = ~np.isnan(returns) & ~np.isnan(market)
+    x = np.where(paired, returns, np.nan)
+    m = np.where(paired, market, np.nan)
+
+    sum_x, count = rolling_sum(x, window)
+    sum_m, _ = rolling_sum(m, window)
+    sum_xm, _ = rolling_sum(x * m, window)
+    sum_mm, _ = rolling_sum(m * m, window)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sum_xm - sum_x * sum_m / count
+        var = sum_mm - sum_m ** 2 / count
+        beta = cov / var
+    beta[(count < min_periods) | ~(var > 0)] = np.nan
+    return beta
+
+
+def rolling_max_drawdown(close: np.ndarray, window: int, start: int = 0,
+                         min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    이동 최대낙폭 (창 안의 누적 고점 대비 최저 하락률, 0 이하)
+
+    종가 앞에 window - 1행의 NaN을 붙여 sliding_window_view로 (거래일, 종목, window) 뷰를 만들고
+    start행 이후만 청크 단위로 누적 고점(fmax.accumulate) → 하락률 → 최솟값을 구한다.
+
+    Returns:
+        (거래일 - start, 종목) 행렬
+    """
+    min_periods = min_periods or min_periods_for(window)
+    n_rows, n_cols = close.shape
+    padded = np.vstack([np.full((window - 1, n_cols), np.nan), close])
+    windows = sliding_window_view(padded, window, axis=0)  # [t] = close[t - window + 1 : t + 1]
+
+    result = np.full((max(n_rows - start, 0), n_cols), np.nan)
+    chunk = max(1, DRAWDOWN_CHUNK_ELEMENTS // max(n_cols * window, 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for lo in range(start, n_rows, chunk):
+            block = windows[lo:lo + chunk]
+            peaks = np.fmax.accumulate(block, axis=2)  # NaN(거래 없음)은 건너뛴 누적 고점
+            result[lo - start:lo - start + len(block)] = np.fmin.reduce(block / peaks - 1, axis=2)
+
+    _, count = rolling_sum(close, window)
+    result[count[start:] < min_periods] = np.nan
+    return result
+
+
+# =============================================================================
+# 전 종목 계산 / 저장
+# =============================================================================
+
+class RiskMetricsCalculator:
+    """가격 패널 기반 전 종목 일별 위험 지표 계산기"""
+
+    def __init__(self, db_config: Optional[DatabaseConfig] = None, panel: Optional[PricePanel] = None,
+                 risk_free_rate: float = RISK_FREE_RATE):
+        self.db_config = db_config or DatabaseConfig()
+        self.db = DatabaseManager(self.db_config)
+        self.risk_free_rate = risk_free_rate
+        self._panel = panel
+
+    @property
+    def panel(self) -> PricePanel:
+        if self._panel is None:
+            self._panel = get_price_panel(refresh=True)
+        return self._panel
+
+    def market_types(self, codes: Sequence[str]) -> np.ndarray:
+        """종목별 베타 기준 시장 ('KOSDAQ' 외에는 'KOSPI')"""
+        info = self.db.get_company_info(list(codes), columns=('market_type',))
+        market_type = info['market_type'].reindex(list(codes)).fillna('').astype(str).str.upper()
+        return np.where(market_type.str.contains('KOSDAQ'), 'KOSDAQ', 'KOSPI')
+
+    def index_levels(self, dates: np.ndarray) -> np.ndarray:
+        """
+        거래일별 KOSPI / KOSDAQ 지수 (kis DB market_indicators, 없는 날은 NaN)
+
+        Returns:
+            (거래일, len(BENCHMARKS)) 행렬
+        """
+        levels = np.full((len(dates), len(BENCHMARKS)), np.nan)
+        if len(dates) == 0 or not Path(self.db_config.databases['kis']['path']).exists():
+            return levels
+
+        with self.db.connect('kis') as conn:
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(market_indicators)')}
+            if not set(BENCHMARKS.values()) <= columns:
+                logger.info("market_indicators 지수 컬럼 없음 - 시장별 동일가중 수익률로 대체")
+                return levels
+            rows = conn.execute(
+                f"SELECT date, {', '.join(BENCHMARKS.values())} FROM market_indicators "
+                "WHERE substr(date, 1, 10) BETWEEN ? AND ?",
+                (str(dates[0]), str(dates[-1])),
+            ).fetchall()
+
+        if not rows:
+            return levels
+        frame = pd.DataFrame(rows, columns=['date', *BENCHMARKS.values()])
+        frame['date'] = pd.to_datetime(frame['date'].str[:10]).values.astype('datetime64[D]')
+        frame = frame.drop_duplicates('date', keep='last')
+
+        positions = np.searchsorted(dates, frame['date'].to_numpy())
+        matched = positions < len(dates)
+        matched[matched] = dates[positions[matched]] == frame['date'].to_numpy()[matched]
+        values = frame[list(BENCHMARKS.values())].to_numpy(dtype=np.float64, na_value=np.nan)
+        levels[positions[matched]] = np.where(values[matched] > 0, values[matched], np.nan)
+        return levels
+
+    def benchmark_returns(self, dates: np.ndarray, returns: np.ndarray, markets: np.ndarray) -> np.ndarray:
+        """
+        기준 지수 일간 수익률 (거래일, len(BENCHMARKS))
+
+        지수 수익률이 없는 날은 같은 시장 종목들의 동일가중 평균 수익률로 채운다.
+        """
+        levels = self.index_levels(dates)
+        index_returns = np.full_like(levels, np.nan)
+        index_returns[1:] = levels[1:] / levels[:-1] - 1
+
+        for k, name in enumerate(BENCHMARKS):
+            members = returns[:, markets == name]
+            counts = (~np.isnan(members)).sum(axis=1)
+            equal_weight = np.divide(np.nansum(members, axis=1), counts,
+                                     out=np.full(len(counts), np.nan), where=counts > 0)
+            index_returns[:, k] = np.where(np.isnan(index_returns[:, k]), equal_weight, index_returns[:, k])
+        return index_returns
+
+    def compute(self, start: DateLike = None, end: DateLike = None,
+                codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        [start, end] 거래일의 전 종목 위험 지표 (저장하지 않음)
+
+        Returns:
+            stock_code, date, RISK_COLUMNS... long 형식 (해당일 종가가 있는 종목만)
+        """
+        panel = self.panel
+        rows, cols = panel.rows(start, end), panel.columns(codes)
+        if rows.start >= rows.stop or len(cols) == 0:
+            return pd.DataFrame(columns=['stock_code', 'date', *RISK_COLUMNS])
+
+        # 가장 긴 창을 채울 만큼 앞 거래일까지 포함해 계산한 뒤 대상 구간만 남김
+        lo = max(rows.start - LOOKBACK_ROWS, 0)
+        offset = rows.start - lo
+        close = np.asarray(panel.close[lo:rows.stop][:, cols], dtype=np.float64)
+        returns = np.full_like(close, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[1:] = close[1:] / close[:-1] - 1
+
+        codes = panel.codes[cols]
+        markets = self.market_types(codes)
+        benchmarks = self.benchmark_returns(panel.dates[lo:rows.stop], returns, markets)
+        market = benchmarks[:, [list(BENCHMARKS).index(name) for name in markets]]
+
+        metrics: Dict[str, np.ndarray] = {}
+        for window in VOLATILITY_WINDOWS:
+            metrics[f'volatility_{window}'] = rolling_volatility(returns, window)[offset:]
+        metrics[f'sharpe_{SHARPE_WINDOW}'] = rolling_sharpe(returns, SHARPE_WINDOW, self.risk_free_rate)[offset:]
+        for window in BETA_WINDOWS:
+            metrics[f'beta_{window}'] = rolling_beta(returns, market, window)[offset:]
+        metrics[f'max_drawdown_{DRAWDOWN_WINDOW}'] = rolling_max_drawdown(close, DRAWDOWN_WINDOW, start=offset)
+
+        date_index, code_index = np.nonzero(~np.isnan(close[offset:]))
+        frame = pd.DataFrame({
+            'stock_code': codes[code_index],
+            'date': pd.DatetimeIndex(panel.dates[rows][date_index]).strftime('%Y-%m-%d'),
+            'benchmark': markets[code_index],
+        })
+        for column in RISK_COLUMNS[1:]:
+            frame[column] = np.round(metrics[column][date_index, code_index], 6)
+        return frame
+
+    def last_saved_date(self) -> Optional[str]:
+        """risk_metrics 마지막 저장일 (없으면 None)"""
+        with self.db.connect('stock') as conn:
+            conn.execute(self.db_config.table_schemas['risk_metrics'])
+            row = conn.execute('SELECT MAX(date) FROM risk_metrics').fetchone()
+        return row[0] if row else None
+
+    def save(self, metrics: pd.DataFrame) -> int:
+        """risk_metrics (stock_code, date) upsert"""
+        with self.db.connect('stock') as conn:
+            conn.execute(self.db_config.table_schemas['risk_metrics'])
+        return self.db.upsert_frame('risk_metrics', metrics[['stock_code', 'date', *RISK_COLUMNS]])
+
+    def run(self, start: DateLike = None, end: DateLike = None,
+            codes: Optional[Sequence[str]] = None, save: bool = True) -> pd.DataFrame:
+        """
+        위험 지표 계산 후 저장
+
+        start가 없으면 마지막 저장일(당일 재계산 포함)부터, 저장 기록도 없으면 최근 252거래일.
+        거래일 SESSIONS_PER_BATCH개 단위로 나눠 계산·저장해 백필 시 메모리를 제한한다.
+        """
+        panel = self.panel
+        if len(panel.dates) == 0:
+            logger.warning("가격 패널이 비어 있어 위험 지표를 계산하지 않습니다")
+            return pd.DataFrame(columns=['stock_code', 'date', *RISK_COLUMNS])
+
+        if start is None:
+            start = self.last_saved_date() or panel.dates[max(len(panel.dates) - DEFAULT_BACKFILL_SESSIONS, 0)]
+        rows = panel.rows(start, end)
+
+        frames, saved = [], 0
+        for lo in range(rows.start, rows.stop, SESSIONS_PER_BATCH):
+            hi = min(lo + SESSIONS_PER_BATCH, rows.stop) - 1
+            frame = self.compute(panel.dates[lo], panel.dates[hi], codes)
+            if save:
+                saved += self.save(frame)
+            frames.append(frame)
+
+        result = pd.concat(frames, ignore_index=True) if frames else \
+            pd.DataFrame(columns=['stock_code', 'date', *RISK_COLUMNS])
+        if save:
+            logger.info(f"💾 risk_metrics 저장 완료: {saved:,}행 "
+                        f"({rows.stop - rows.start}거래일, {result['stock_code'].nunique()}개 종목)")
+        return result
+
+
+def main():
+    """위험 지표 갱신 (파이프라인 단계)"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='전 종목 위험 지표(변동성/베타/샤프/최대낙폭) 계산')
+    parser.add_argument('--start', help='계산 시작일 (기본: 마지막 저장일)')
+    parser.add_argument('--end', help='계산 종료일 (기본: 패널 마지막 거래일)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    metrics = RiskMetricsCalculator().run(start=args.start, end=args.end)
+    print(json.dumps({
+        'rows': len(metrics),
+        'stocks': int(metrics['stock_code'].nunique()) if not metrics.empty else 0,
+        'start': metrics['date'].min() if not metrics.empty else None,
+        'end': metrics['date'].max() if not metrics.empty else None,
+    }, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,367 @@
+"""
+상장주식수 통합 조회기
+여러 소스의 상장주식수를 비용이 낮은 순서로 조회하고 출처/기준일과 함께 캐시
+
+- 1단계 (일괄): FinanceDataReader 상장종목 목록 → KRX 전종목 시세 (시장 전체 1~2회 호출)
+- 2단계 (종목별): 일괄 소스에서 못 찾은 종목만 네이버 → 다음 순으로 스크래핑 (동시 작업 수/초당 호출 제한)
+- 결과는 shares_outstanding_cache 테이블에 출처(source)와 기준일(as_of)로 저장
+- 다음 실행에서는 기준일이 오래된 종목(기본 30일)과 재시도 기간이 지난 실패 종목만 다시 조회
+
+사용법:
+    resolver = SharesResolver()
+    shares = resolver.resolve()                    # 전체 종목
+    shares = resolver.resolve(['005930'], force=True)
+    resolver.apply_to_company_info(shares)
+"""
+
+import re
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from config.database_config import DatabaseConfig
+from src.utils.api_utils import RateLimiter
+from src.utils.http_cache import CachedHTTPFetcher
+from src.utils.krx_calendar import get_krx_calendar
+
+logger = logging.getLogger(__name__)
+
+# 상장주식수 유효 범위 (10만 ~ 100억주)
+MIN_SHARES = 100000
+MAX_SHARES = 10000000000
+
+KRX_JSON_URL = "http://data.krx.co.kr/comm/bldAttendant/getJsonData.cmd"
+KRX_MARKET_IDS = ('STK', 'KSQ')  # KOSPI, KOSDAQ
+
+# 조회 실패 기록 출처
+NOT_FOUND = 'NOT_FOUND'
+
+CACHE_COLUMNS = ['stock_code', 'shares_outstanding', 'source', 'as_of']
+
+_USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+               '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+
+def _valid_shares(value) -> Optional[int]:
+    """상장주식수 정수 변환 (범위 밖이면 None)"""
+    try:
+        shares = int(float(str(value).replace(',', '')))
+    except (TypeError, ValueError):
+        return None
+    return shares if MIN_SHARES <= shares <= MAX_SHARES else None
+
+
+def _first_valid_number(text: str) -> Optional[int]:
+    for num_str in re.findall(r'[\d,]+', text):
+        shares = _valid_shares(num_str)
+        if shares:
+            return shares
+    return None
+
+
+def parse_naver_shares(response) -> Optional[int]:
+    """네이버 종목 메인 페이지에서 상장주식수 파싱"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(response.text, 'html.parser')
+    patterns = [
+        ('.sub_section table tr', '상장주식수'),
+        ('.section table tr', '상장주식'),
+        ('.tb_type1 tr', '상장주식수'),
+        ('.company_info tr', '상장주식'),
+        ('.info_table tr', '주식수'),
+    ]
+    for selector, label in patterns:
+        for row in soup.select(selector):
+            text = row.get_text()
+            if label in text:
+                shares = _first_valid_number(text)
+                if shares:
+                    return shares
+    return None
+
+
+def parse_daum_shares(response) -> Optional[int]:
+    """다음 금융 종목 페이지에서 상장주식수 파싱"""
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(response.text, 'html.parser')
+    for item in soup.select('.info_major dl'):
+        dt = item.find('dt')
+        dd = item.find('dd')
+        if dt and dd and '상장주식수' in dt.get_text():
+            shares = _first_valid_number(dd.get_text())
+            if shares:
+                return shares
+    return None
+
+
+class SharesResolver:
+    """일괄 소스 우선, 누락 종목만 개별 스크래핑하는 상장주식수 조회기"""
+
+    def __init__(self, db_config: Optional[DatabaseConfig] = None,
+                 max_age_days: int = 30, retry_failed_days: int = 7,
+                 max_workers: int = 5, calls_per_second: float = 5.0,
+                 session=None, fetcher: Optional[CachedHTTPFetcher] = None):
+        self.db_config = db_config or DatabaseConfig()
+        self.max_age_days = max_age_days
+        self.retry_failed_days = retry_failed_days
+        self.max_workers = max_workers
+        self.rate_limiter = RateLimiter(calls_per_second=calls_per_second,
+                                        burst_size=max(1, int(calls_per_second)))
+
+        if session is None:
+            import requests
+            session = requests.Session()
+            session.headers.update({'User-Agent': _USER_AGENT,
+                                    'Accept-Language': 'ko-KR,ko;q=0.8,en-US;q=0.5,en;q=0.3'})
+        self.session = session
+        self.http = fetcher or CachedHTTPFetcher(session=self.session)
+
+        # (출처, 조회 함수) - 비용이 낮은 순서
+        self.bulk_sources: List[Tuple[str, Callable[[], pd.DataFrame]]] = [
+            ('FDR_LISTING', self.fetch_fdr_listing),
+            ('KRX', self.fetch_krx_listing),
+        ]
+        self.scrapers: List[Tuple[str, Callable[[str], Optional[int]]]] = [
+            ('NAVER', self.scrape_naver),
+            ('DAUM', self.scrape_daum),
+        ]
+        self.stats: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # 캐시
+    # ------------------------------------------------------------------
+    def _ensure_table(self, conn: sqlite3.Connection):
+        conn.execute(self.db_config.table_schemas['shares_outstanding_cache'])
+
+    def load_cache(self, conn: sqlite3.Connection) -> pd.DataFrame:
+        """저장된 상장주식수 캐시"""
+        self._ensure_table(conn)
+        return pd.read_sql_query(f"SELECT {', '.join(CACHE_COLUMNS)} FROM shares_outstanding_cache", conn)
+
+    def stale_codes(self, cache: pd.DataFrame, stock_codes: Sequence[str],
+                    today: Optional[date] = None) -> List[str]:
+        """
+        다시 조회할 종목 선택
+
+        캐시에 없거나, 기준일이 max_age_days보다 오래됐거나,
+        조회 실패 기록이 retry_failed_days보다 오래된 종목.
+        """
+        today = today or date.today()
+        cached = cache.set_index('stock_code').reindex(list(stock_codes))
+        as_of = pd.to_datetime(cached['as_of'], errors='coerce')
+        age_days = (pd.Timestamp(today) - as_of).dt.days
+
+        failed = cached['source'] == NOT_FOUND
+        max_age = failed.map({True: self.retry_failed_days, False: self.max_age_days})
+        stale = as_of.isna() | (age_days > max_age)
+        return cached.index[stale].tolist()
+
+    def save(self, conn: sqlite3.Connection, resolved: pd.DataFrame) -> int:
+        """조회 결과 캐시 upsert (한 트랜잭션)"""
+        if resolved.empty:
+            return 0
+        frame = resolved[CACHE_COLUMNS].astype(object).where(resolved[CACHE_COLUMNS].notna(), None)
+        rows = list(frame.itertuples(index=False, name=None))
+        self._ensure_table(conn)
+        with conn:
+            conn.executemany("""
+                INSERT INTO shares_outstanding_cache (stock_code, shares_outstanding, source, as_of)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(stock_code) DO UPDATE SET
+                    shares_outstanding = excluded.shares_outstanding,
+                    source = excluded.source,
+                    as_of = excluded.as_of,
+                    resolved_at = CURRENT_TIMESTAMP
+            """, rows)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # 일괄 소스
+    # ------------------------------------------------------------------
+    @staticmethod
+    def fetch_fdr_listing() -> pd.DataFrame:
+        """FinanceDataReader 상장종목 목록 (KRX 전체, 1회 호출)"""
+        import FinanceDataReader as fdr
+
+        listing = fdr.StockListing('KRX')
+        column = next((col for col in ('Stocks', 'Shares') if col in listing.columns), None)
+        if column is None:
+            return pd.DataFrame(columns=['stock_code', 'shares_outstanding'])
+        return pd.DataFrame({
+            'stock_code': listing['Code'].astype(str).str.zfill(6),
+            'shares_outstanding': listing[column].map(_valid_shares),
+        })
+
+    def fetch_krx_listing(self) -> pd.DataFrame:
+        """KRX 전종목 시세 (시장별 1회 호출, 최근 완료 거래일 기준)"""
+        trade_date = get_krx_calendar().latest_completed_session().strftime('%Y%m%d')
+        frames = []
+        for market_id in KRX_MARKET_IDS:
+            self.rate_limiter.acquire()
+            response = self.session.post(KRX_JSON_URL, data={
+                'bld': 'dbms/MDC/STAT/standard/MDCSTAT01501',
+                'mktId': market_id,
+                'trdDd': trade_date,
+                'money': '1',
+                'csvxls_isNo': 'false',
+            }, timeout=30)
+            response.raise_for_status()
+            items = response.json().get('OutBlock_1', [])
+            frames.append(pd.DataFrame({
+                'stock_code': [str(item.get('ISU_SRT_CD', '')).zfill(6) for item in items],
+                'shares_outstanding': [_valid_shares(item.get('LIST_SHRS')) for item in items],
+            }))
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    # ------------------------------------------------------------------
+    # 종목별 스크래퍼
+    # ------------------------------------------------------------------
+    def scrape_naver(self, stock_code: str) -> Optional[int]:
+        url = f"https://finance.naver.com/item/main.naver?code={stock_code}"
+        return self.http.fetch_parsed(url, parse_naver_shares,
+                                      parser_key='naver_shares:v1', source='naver_finance')
+
+    def scrape_daum(self, stock_code: str) -> Optional[int]:
+        url = f"https://finance.daum.net/quotes/A{stock_code}"
+        return self.http.fetch_parsed(url, parse_daum_shares,
+                                      parser_key='daum_shares:v1', source='daum_finance')
+
+    def _scrape_one(self, stock_code: str) -> Tuple[str, Optional[int], str]:
+        """종목 하나를 스크래퍼 우선순위대로 조회"""
+        for source, scrape in self.scrapers:
+            self.rate_limiter.acquire()
+            try:
+                shares = scrape(stock_code)
+            except Exception as e:
+                logger.debug(f"⚠️ {stock_code} {source} 실패: {e}")
+                continue
+            if shares:
+                return stock_code, shares, source
+        return stock_code, None, NOT_FOUND
+
+    # ------------------------------------------------------------------
+    # 실행
+    # ------------------------------------------------------------------
+    def resolve(self, stock_codes: Optional[Sequence[str]] = None, force: bool = False,
+                save: bool = True) -> pd.DataFrame:
+        """
+        상장주식수 조회
+
+        Args:
+            stock_codes: 대상 종목 (None이면 company_info 전체)
+            force: 캐시 기준일과 무관하게 모두 다시 조회
+            save: 조회 결과를 캐시에 저장
+
+        Returns:
+            stock_code, shares_outstanding, source, as_of DataFrame (대상 종목 전체, 실패는 shares NaN)
+        """
+        start_time = datetime.now()
+        today = date.today()
+        as_of = get_krx_calendar().latest_completed_session().isoformat()
+        self.stats = {'requested': 0, 'cached': 0, 'not_found': 0}
+
+        conn = self.db_config.get_connection('stock')
+        try:
+            if stock_codes is None:
+                stock_codes = [row[0] for row in conn.execute("SELECT stock_code FROM company_info")]
+            stock_codes = list(dict.fromkeys(stock_codes))
+            cache = self.load_cache(conn)
+
+            pending = list(stock_codes) if force else self.stale_codes(cache, stock_codes, today)
+            self.stats['requested'] = len(stock_codes)
+            self.stats['cached'] = len(stock_codes) - len(pending)
+            logger.info(f"📋 상장주식수 조회 대상: {len(pending):,}/{len(stock_codes):,}개 종목 "
+                        f"(캐시 유효 {self.stats['cached']:,}개)")
+
+            found: Dict[str, Tuple[int, str, str]] = {}
+            remaining = set(pending)
+
+            # 1단계: 일괄 소스
+            for source, fetch in self.bulk_sources:
+                if not remaining:
+                    break
+                try:
+                    listing = fetch()
+                except Exception as e:
+                    logger.warning(f"⚠️ {source} 일괄 조회 실패: {e}")
+                    continue
+                listing = listing.dropna(subset=['shares_outstanding'])
+                hits = listing[listing['stock_code'].isin(remaining)].drop_duplicates('stock_code')
+                for code, shares in hits[['stock_code', 'shares_outstanding']].itertuples(index=False, name=None):
+                    found[code] = (int(shares), source, as_of)
+                remaining -= set(hits['stock_code'])
+                self.stats[source.lower()] = len(hits)
+                logger.info(f"✅ {source}: {len(hits):,}개 확보 (남은 종목 {len(remaining):,}개)")
+
+            # 2단계: 남은 종목만 개별 스크래핑 (스크래퍼가 없으면 다음 실행에서 다시 조회)
+            if remaining and self.scrapers:
+                scraped_date = today.isoformat()
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = [executor.submit(self._scrape_one, code) for code in sorted(remaining)]
+                    for future in as_completed(futures):
+                        code, shares, source = future.result()
+                        found[code] = (shares, source, scraped_date)
+                        key = source.lower()
+                        self.stats[key] = self.stats.get(key, 0) + 1
+
+            resolved = pd.DataFrame(
+                [(code, shares, source, day) for code, (shares, source, day) in found.items()],
+                columns=CACHE_COLUMNS,
+            )
+            self.stats['not_found'] = int((resolved['source'] == NOT_FOUND).sum())
+            if save:
+                self.save(conn, resolved)
+
+            # 대상 종목 전체 결과 (새로 조회한 값 우선, 나머지는 캐시)
+            combined = pd.concat([resolved, cache[~cache['stock_code'].isin(resolved['stock_code'])]],
+                                 ignore_index=True)
+        finally:
+            conn.close()
+
+        result = combined[combined['stock_code'].isin(stock_codes)].reset_index(drop=True)
+        result['shares_outstanding'] = pd.to_numeric(result['shares_outstanding'], errors='coerce').astype('Int64')
+
+        elapsed = (datetime.now() - start_time).total_seconds()
+        logger.info(f"🏁 상장주식수 조회 완료: {result['shares_outstanding'].notna().sum():,}/{len(stock_codes):,}개 "
+                    f"({elapsed:.1f}초, 실패 {self.stats['not_found']:,}개)")
+        return result
+
+    def apply_to_company_info(self, resolved: pd.DataFrame) -> int:
+        """조회된 상장주식수를 company_info에 일괄 반영 (UPDATE 1회)"""
+        rows = [(code, int(shares))
+                for code, shares in resolved[['stock_code', 'shares_outstanding']]
+                .dropna().itertuples(index=False, name=None)]
+        if not rows:
+            return 0
+
+        conn = self.db_config.get_connection('stock')
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TEMP TABLE IF NOT EXISTS resolved_shares (
+                        stock_code TEXT PRIMARY KEY, shares_outstanding INTEGER
+                    )
+                """)
+                conn.execute("DELETE FROM temp.resolved_shares")
+                conn.executemany("INSERT INTO temp.resolved_shares VALUES (?, ?)", rows)
+                # UPDATE ... FROM은 SQLite 3.33+ 전용이라 상관 서브쿼리 사용 (임시 테이블 PK로 종목당 1회 조회)
+                updated = conn.execute("""
+                    UPDATE company_info
+                    SET shares_outstanding = (
+                            SELECT s.shares_outstanding FROM temp.resolved_shares AS s
+                            WHERE s.stock_code = company_info.stock_code
+                        ),
+                        updated_at = CURRENT_TIMESTAMP
+                    WHERE stock_code IN (SELECT stock_code FROM temp.resolved_shares)
+                """).rowcount
+        finally:
+            conn.close()
+
+        logger.info(f"💾 company_info 상장주식수 반영: {updated:,}개 종목")
+        return updated
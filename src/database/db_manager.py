@@ -0,0 +1,339 @@
+"""
+통합 데이터 접근 계층
+스크립트마다 흩어진 SQL/연결/DataFrame 변환을 한 곳에 모아 벌크 조회·저장을 제공
+
+- 조회: 종목 리스트는 고정 크기 IN 청크로 나누고 마지막 청크를 패딩해 SQL 문자열을 동일하게 유지
+  → 연결의 statement cache에서 같은 prepared statement 재사용
+- 결과: pandas DataFrame 또는 종목 × 날짜 NumPy 블록 (OHLCVBlock), iterrows 없음
+- 저장: executemany + ON CONFLICT(자연키) DO UPDATE 한 트랜잭션
+- 계측: 메서드별 호출 수 / 행 수 / 소요 시간 누적 (stats)
+
+사용법:
+    db = DatabaseManager()
+    block = db.get_ohlcv(['005930', '000660'], start='2024-01-01')
+    close = block.field('close_price')               # (종목, 날짜) 행렬
+    ratios = db.get_latest_ratios(['005930'])        # stock_code 인덱스
+    news = db.get_news(['005930'], since='2024-06-01')
+    db.save_prices(df)                               # (stock_code, date) upsert
+    with db.bulk_load(stock_codes=codes):            # 대량 적재 (스냅샷 트리거 해제 후 1회 재구성)
+        db.save_prices(history)
+"""
+
+import functools
+import logging
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+from config.database_config import DatabaseConfig
+from src.database.latest_snapshot import LatestSnapshot
+from src.database.models import OHLCV_FIELDS, OHLCVBlock
+
+logger = logging.getLogger(__name__)
+
+# SQLite 기본 바인딩 변수 한도(999) 안에서 다른 파라미터 여유를 남긴 IN 청크 크기
+DEFAULT_CHUNK_SIZE = 900
+
+DateLike = Union[str, date, datetime, None]
+
+# 테이블별 자연키 (upsert 충돌 대상)
+NATURAL_KEYS = {
+    'stock_prices': ('stock_code', 'date'),
+    'technical_indicators': ('stock_code', 'date'),
+    'investment_scores': ('stock_code', 'date'),
+    'company_info': ('stock_code',),
+    'risk_metrics': ('stock_code', 'date'),
+}
+
+NEWS_COLUMNS = ('stock_code', 'title', 'description', 'originallink', 'link', 'pubDate', 'source',
+                'category', 'sentiment_score', 'sentiment_label', 'created_at')
+
+
+def _to_date_str(value: DateLike) -> Optional[str]:
+    if value is None:
+        return None
+    return pd.Timestamp(value).strftime('%Y-%m-%d')
+
+
+def _instrumented(method):
+    """호출 수 / 반환 행 수 / 소요 시간 누적"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        elapsed = time.perf_counter() - started
+
+        if isinstance(result, OHLCVBlock):
+            rows = int(result.present.sum()) if result.values.size else 0
+        elif isinstance(result, (pd.DataFrame, list)):
+            rows = len(result)
+        elif isinstance(result, int):
+            rows = result
+        else:
+            rows = 0
+
+        stat = self.stats.setdefault(method.__name__, {'calls': 0, 'rows': 0, 'seconds': 0.0})
+        stat['calls'] += 1
+        stat['rows'] += rows
+        stat['seconds'] += elapsed
+        logger.debug(f"{method.__name__}: {rows:,}행 {elapsed * 1000:.1f}ms")
+        return result
+    return wrapper
+
+
+class DatabaseManager:
+    """stock / news DB 벌크 조회·저장"""
+
+    def __init__(self, db_config: Optional[DatabaseConfig] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.db_config = db_config or DatabaseConfig()
+        self.chunk_size = chunk_size
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    # =========================================================================
+    # 연결 / 청크 헬퍼
+    # =========================================================================
+
+    @contextmanager
+    def connect(self, db_name: str = 'stock') -> Iterator[sqlite3.Connection]:
+        """튜플 행 연결 (DataFrame/NumPy 변환용, 종료 시 close)"""
+        conn = self.db_config.get_connection(db_name)
+        conn.row_factory = None
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _code_chunks(self, codes: Sequence[str]) -> Iterator[List[str]]:
+        """고정 크기 청크 (마지막 청크는 마지막 코드로 패딩 - IN 결과는 같고 SQL 문자열은 동일)"""
+        codes = list(dict.fromkeys(codes))
+        for start in range(0, len(codes), self.chunk_size):
+            chunk = codes[start:start + self.chunk_size]
+            if len(codes) > self.chunk_size:
+                chunk = chunk + [chunk[-1]] * (self.chunk_size - len(chunk))
+            yield chunk
+
+    def _read_frame(self, conn: sqlite3.Connection, sql: str, codes: Optional[Sequence[str]],
+                    params: Sequence[Any] = (), columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        {codes} 자리에 IN 조건을 넣어 청크별 실행 후 결합
+
+        Args:
+            sql: '{codes}' 플레이스홀더를 가진 쿼리 (codes가 None이면 '1 = 1')
+            params: IN 목록 뒤에 바인딩할 파라미터
+        """
+        if codes is None:
+            cursor = conn.execute(sql.format(codes='1 = 1'), list(params))
+            names = [desc[0] for desc in cursor.description]
+            return pd.DataFrame.from_records(cursor.fetchall(), columns=columns or names)
+
+        frames = []
+        for chunk in self._code_chunks(codes):
+            query = sql.format(codes=f"stock_code IN ({', '.join('?' * len(chunk))})")
+            cursor = conn.execute(query, chunk + list(params))
+            names = [desc[0] for desc in cursor.description]
+            frames.append(pd.DataFrame.from_records(cursor.fetchall(), columns=columns or names))
+
+        if not frames:
+            return pd.DataFrame(columns=list(columns) if columns else None)
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    @staticmethod
+    def _date_clause(column: str, start: DateLike, end: DateLike) -> Tuple[str, List[str]]:
+        clauses, params = [], []
+        if start is not None:
+            clauses.append(f'{column} >= ?')
+            params.append(_to_date_str(start))
+        if end is not None:
+            clauses.append(f'{column} <= ?')
+            params.append(_to_date_str(end))
+        return ''.join(f' AND {clause}' for clause in clauses), params
+
+    # =========================================================================
+    # 조회
+    # =========================================================================
+
+    @_instrumented
+    def get_stock_codes(self, market: Optional[str] = None) -> List[str]:
+        """company_info 종목코드 (market: KOSPI / KOSDAQ)"""
+        with self.connect('stock') as conn:
+            if market:
+                rows = conn.execute('SELECT stock_code FROM company_info WHERE market_type = ? ORDER BY stock_code',
+                                    (market,)).fetchall()
+            else:
+                rows = conn.execute('SELECT stock_code FROM company_info ORDER BY stock_code').fetchall()
+        return [row[0] for row in rows]
+
+    @_instrumented
+    def get_company_info(self, codes: Optional[Sequence[str]] = None,
+                         columns: Sequence[str] = ('company_name', 'market_type', 'sector', 'industry',
+                                                   'listing_date', 'market_cap', 'shares_outstanding')
+                         ) -> pd.DataFrame:
+        """기업 기본정보 (stock_code 인덱스)"""
+        sql = f"SELECT stock_code, {', '.join(columns)} FROM company_info WHERE {{codes}}"
+        with self.connect('stock') as conn:
+            frame = self._read_frame(conn, sql, codes, columns=['stock_code', *columns])
+        return frame.set_index('stock_code').sort_index()
+
+    @_instrumented
+    def get_prices(self, codes: Optional[Sequence[str]] = None, start: DateLike = None, end: DateLike = None,
+                   columns: Sequence[str] = OHLCV_FIELDS) -> pd.DataFrame:
+        """주가 long 형식 (stock_code, date, columns...) - 종목/날짜 순 정렬"""
+        date_sql, date_params = self._date_clause('date', start, end)
+        sql = f"SELECT stock_code, date, {', '.join(columns)} FROM stock_prices WHERE {{codes}}{date_sql}"
+        with self.connect('stock') as conn:
+            frame = self._read_frame(conn, sql, codes, date_params, columns=['stock_code', 'date', *columns])
+        return frame.sort_values(['stock_code', 'date'], ignore_index=True)
+
+    @_instrumented
+    def get_ohlcv(self, codes: Optional[Sequence[str]] = None, start: DateLike = None, end: DateLike = None,
+                  fields: Sequence[str] = OHLCV_FIELDS) -> OHLCVBlock:
+        """
+        주가를 종목 × 날짜 × 필드 블록으로 조회
+
+        Returns:
+            OHLCVBlock (행이 없는 종목·날짜 칸은 NaN, 조회했지만 행이 전혀 없는 종목은 제외)
+        """
+        fields = tuple(fields)
+        date_sql, date_params = self._date_clause('date', start, end)
+        sql = f"SELECT stock_code, date, {', '.join(fields)} FROM stock_prices WHERE {{codes}}{date_sql}"
+        with self.connect('stock') as conn:
+            frame = self._read_frame(conn, sql, codes, date_params, columns=['stock_code', 'date', *fields])
+        return OHLCVBlock.from_frame(frame, fields)
+
+    @_instrumented
+    def get_latest_ratios(self, codes: Optional[Sequence[str]] = None,
+                          columns: Sequence[str] = ('per', 'pbr', 'roe', 'roa', 'debt_ratio', 'current_ratio',
+                                                    'operating_margin', 'net_margin', 'dividend_yield',
+                                                    'eps', 'bps'),
+                          annual_only: bool = False) -> pd.DataFrame:
+        """
+        종목별 최신 재무비율 1행 (stock_code 인덱스, year / quarter 포함)
+
+        최신 연도 우선, 같은 연도에서는 연간(quarter NULL) → 최근 분기 순 (latest_snapshot과 동일 기준)
+        """
+        annual_sql = ' AND quarter IS NULL' if annual_only else ''
+        select_columns = ['year', 'quarter', *columns]
+        sql = f"""
+            SELECT stock_code, {', '.join(select_columns)}
+            FROM (
+                SELECT stock_code, {', '.join(select_columns)},
+                       ROW_NUMBER() OVER (PARTITION BY stock_code
+                                          ORDER BY year DESC, quarter IS NOT NULL, quarter DESC) AS rn
+                FROM financial_ratios
+                WHERE {{codes}}{annual_sql}
+            )
+            WHERE rn = 1
+        """
+        with self.connect('stock') as conn:
+            frame = self._read_frame(conn, sql, codes, columns=['stock_code', *select_columns])
+        return frame.set_index('stock_code').sort_index()
+
+    @_instrumented
+    def get_news(self, codes: Optional[Sequence[str]] = None, since: DateLike = None, until: DateLike = None,
+                 columns: Sequence[str] = NEWS_COLUMNS) -> pd.DataFrame:
+        """
+        종목 뉴스 (published_at 컬럼 추가, 최신순)
+
+        pubDate는 수집 원문(RFC 822) 문자열이라 SQL 비교가 불가능하므로
+        created_at(수집 시각 ≥ 발행 시각)으로 먼저 좁힌 뒤 pubDate를 벡터 파싱해 정확히 거른다.
+        created_at은 UTC(CURRENT_TIMESTAMP)이므로 KST 기준 since보다 하루 앞에서 자른다.
+        """
+        columns = list(dict.fromkeys(['stock_code', 'pubDate', *columns]))
+        params: List[str] = []
+        created_sql = ''
+        if since is not None:
+            created_sql = ' AND (created_at >= ? OR created_at IS NULL)'
+            params.append(_to_date_str(pd.Timestamp(since) - pd.Timedelta(days=1)))
+
+        sql = f"SELECT {', '.join(columns)} FROM news_articles WHERE {{codes}}{created_sql}"
+        with self.connect('news') as conn:
+            frame = self._read_frame(conn, sql, codes, params, columns=columns)
+
+        # 네이버 pubDate: 'Tue, 18 Jun 2024 09:30:00 +0900' → 한국 시간 naive
+        published = pd.to_datetime(frame['pubDate'], format='%a, %d %b %Y %H:%M:%S %z', errors='coerce', utc=True)
+        fallback = pd.to_datetime(frame['pubDate'].where(published.isna()), errors='coerce')
+        frame['published_at'] = (published.dt.tz_convert('Asia/Seoul').dt.tz_localize(None)
+                                 .fillna(fallback))
+
+        mask = pd.Series(True, index=frame.index)
+        if since is not None:
+            mask &= frame['published_at'] >= pd.Timestamp(since)
+        if until is not None:
+            mask &= frame['published_at'] < pd.Timestamp(until) + pd.Timedelta(days=1)
+        return frame[mask].sort_values('published_at', ascending=False, ignore_index=True)
+
+    # =========================================================================
+    # 저장
+    # =========================================================================
+
+    @_instrumented
+    def upsert_frame(self, table: str, df: pd.DataFrame, key_columns: Optional[Sequence[str]] = None,
+                     db_name: str = 'stock') -> int:
+        """
+        DataFrame 벌크 upsert (한 트랜잭션, executemany)
+
+        Args:
+            table: 대상 테이블
+            df: 테이블 컬럼명과 같은 컬럼을 가진 DataFrame
+            key_columns: 충돌 판정 자연키 (기본 NATURAL_KEYS[table], 나머지 컬럼은 갱신)
+        """
+        if df.empty:
+            return 0
+
+        key_columns = tuple(key_columns or NATURAL_KEYS[table])
+        columns = list(df.columns)
+        updates = [column for column in columns if column not in key_columns]
+
+        with self.connect(db_name) as conn:
+            table_columns = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+            set_clause = ', '.join(f'{column} = excluded.{column}' for column in updates)
+            if 'updated_at' in table_columns and 'updated_at' not in columns:
+                set_clause = f'{set_clause}, updated_at = CURRENT_TIMESTAMP' if set_clause else \
+                    'updated_at = CURRENT_TIMESTAMP'
+            conflict = f"DO UPDATE SET {set_clause}" if set_clause else 'DO NOTHING'
+
+            sql = f"""
+                INSERT INTO {table} ({', '.join(columns)})
+                VALUES ({', '.join('?' * len(columns))})
+                ON CONFLICT({', '.join(key_columns)}) {conflict}
+            """
+            # NumPy 스칼라/NaN → 파이썬 기본형/None
+            records = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+            with conn:
+                conn.executemany(sql, records)
+        return len(df)
+
+    @contextmanager
+    def bulk_load(self, tables: Sequence[str] = ('stock_prices',),
+                  stock_codes: Optional[Sequence[str]] = None) -> Iterator[None]:
+        """대량 저장 구간 (latest_snapshot 행 단위 트리거를 끄고 종료 시 한 번에 재구성)"""
+        with LatestSnapshot(self.db_config).bulk_load(tables, stock_codes):
+            yield
+
+    def save_prices(self, df: pd.DataFrame) -> int:
+        """주가 upsert ((stock_code, date) 기준, date는 YYYY-MM-DD 문자열로 정규화)"""
+        df = df.copy()
+        df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+        return self.upsert_frame('stock_prices', df)
+
+    def save_technical_indicators(self, df: pd.DataFrame) -> int:
+        """기술지표 upsert ((stock_code, date) 기준)"""
+        df = df.copy()
+        df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d')
+        return self.upsert_frame('technical_indicators', df)
+
+    # =========================================================================
+    # 계측
+    # =========================================================================
+
+    def reset_stats(self):
+        self.stats.clear()
+
+    def stats_frame(self) -> pd.DataFrame:
+        """메서드별 호출 수 / 행 수 / 누적 시간"""
+        frame = pd.DataFrame.from_dict(self.stats, orient='index', columns=['calls', 'rows', 'seconds'])
+        return frame.sort_values('seconds', ascending=False)
@@ -0,0 +1,245 @@
+"""
+종목별 최신값 스냅샷
+latest_snapshot 테이블 (stock_code 기준 1행)에서 최신 종가/거래량/시가총액/재무비율/기술점수/통합점수를 조회
+
+- 평상시: stock_prices / company_info / financial_ratios / technical_indicators / investment_scores
+  INSERT·UPDATE 트리거가 같은 트랜잭션 안에서 스냅샷 행을 갱신 (config/database_config.py)
+- 최초 생성, 원본 행 삭제 후: rebuild()로 원본 테이블에서 한 번에 재구성
+- 대량 적재: 행 단위 트리거(prev_close 상관 서브쿼리 포함)가 적재 행마다 실행되므로
+  bulk_load()로 트리거를 잠시 내리고 적재가 끝나면 트리거 복구 + rebuild() 1회
+
+사용법:
+    snapshot = LatestSnapshot()
+    row = snapshot.get('005930')                                   # 단일 종목
+    top = snapshot.load(order_by='market_cap DESC', limit=50)     # 스크리닝/대시보드
+    with snapshot.bulk_load(stock_codes=codes):                   # 대량 적재 (끝나면 재구성)
+        db.save_prices(prices)
+"""
+
+import logging
+import sqlite3
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence
+
+from config.database_config import DatabaseConfig
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_COLUMNS = [
+    'stock_code', 'company_name', 'market_type', 'sector', 'shares_outstanding', 'market_cap',
+    'price_date', 'close_price', 'prev_close', 'volume',
+    'ratio_year', 'ratio_quarter', 'per', 'pbr', 'roe', 'debt_ratio', 'dividend_yield', 'eps', 'bps',
+    'technical_date', 'technical_score', 'rsi',
+    'score_date', 'total_investment_score', 'fundamental_score', 'sentiment_score', 'recommendation',
+]
+
+# 원본 테이블 전체에서 종목별 최신 행을 골라 스냅샷 재구성 ({filter}: 종목 제한 조건)
+_REBUILD_QUERY = """
+    WITH prices AS (
+        SELECT stock_code, date, close_price, volume,
+               ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY date DESC) AS rn
+        FROM stock_prices
+        WHERE 1 = 1 {filter}
+    ),
+    last_prices AS (
+        SELECT stock_code,
+               MAX(CASE WHEN rn = 1 THEN date END) AS price_date,
+               MAX(CASE WHEN rn = 1 THEN close_price END) AS close_price,
+               MAX(CASE WHEN rn = 2 THEN close_price END) AS prev_close,
+               MAX(CASE WHEN rn = 1 THEN volume END) AS volume
+        FROM prices
+        WHERE rn <= 2
+        GROUP BY stock_code
+    ),
+    ratios AS (
+        SELECT stock_code, year, quarter, per, pbr, roe, debt_ratio, dividend_yield, eps, bps,
+               ROW_NUMBER() OVER (PARTITION BY stock_code
+                                  ORDER BY year DESC, quarter IS NOT NULL, quarter DESC) AS rn
+        FROM financial_ratios
+        WHERE 1 = 1 {filter}
+    ),
+    technicals AS (
+        SELECT stock_code, date, technical_score, rsi,
+               ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY date DESC) AS rn
+        FROM technical_indicators
+        WHERE 1 = 1 {filter}
+    ),
+    scores AS (
+        SELECT stock_code, date, total_investment_score, fundamental_score, sentiment_score, recommendation,
+               ROW_NUMBER() OVER (PARTITION BY stock_code ORDER BY date DESC) AS rn
+        FROM investment_scores
+        WHERE 1 = 1 {filter}
+    ),
+    codes AS (
+        SELECT stock_code FROM company_info WHERE 1 = 1 {filter}
+        UNION SELECT stock_code FROM last_prices
+        UNION SELECT stock_code FROM ratios WHERE rn = 1
+        UNION SELECT stock_code FROM technicals WHERE rn = 1
+        UNION SELECT stock_code FROM scores WHERE rn = 1
+    )
+    SELECT k.stock_code, ci.company_name, ci.market_type, ci.sector, ci.shares_outstanding,
+           COALESCE(CAST(p.close_price * ci.shares_outstanding / 100000000 AS INTEGER), ci.market_cap),
+           p.price_date, p.close_price, p.prev_close, p.volume,
+           r.year, r.quarter, r.per, r.pbr, r.roe, r.debt_ratio, r.dividend_yield, r.eps, r.bps,
+           t.date, t.technical_score, t.rsi,
+           s.date, s.total_investment_score, s.fundamental_score, s.sentiment_score, s.recommendation
+    FROM codes k
+    LEFT JOIN company_info ci ON ci.stock_code = k.stock_code
+    LEFT JOIN last_prices p ON p.stock_code = k.stock_code
+    LEFT JOIN ratios r ON r.stock_code = k.stock_code AND r.rn = 1
+    LEFT JOIN technicals t ON t.stock_code = k.stock_code AND t.rn = 1
+    LEFT JOIN scores s ON s.stock_code = k.stock_code AND s.rn = 1
+"""
+
+
+class LatestSnapshot:
+    """latest_snapshot 테이블 관리/조회"""
+
+    def __init__(self, db_config: Optional[DatabaseConfig] = None):
+        self.db_config = db_config or DatabaseConfig()
+
+    def ensure(self, conn: sqlite3.Connection):
+        """스냅샷 테이블/인덱스/트리거 생성 (비어 있으면 원본 테이블에서 재구성)"""
+        # 트리거 대상 원본 테이블이 없는 기존 DB 대비 (CREATE IF NOT EXISTS)
+        for table in self.db_config.databases['stock']['tables']:
+            conn.execute(self.db_config.table_schemas[table])
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_latest_snapshot_market_cap ON latest_snapshot(market_cap)')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_latest_snapshot_total_score '
+                     'ON latest_snapshot(total_investment_score)')
+        self.db_config.create_latest_snapshot_triggers(conn)
+        conn.commit()
+
+        if conn.execute('SELECT 1 FROM latest_snapshot LIMIT 1').fetchone() is None:
+            self.rebuild(conn)
+
+    def rebuild(self, conn: Optional[sqlite3.Connection] = None,
+                stock_codes: Optional[Sequence[str]] = None) -> int:
+        """원본 테이블에서 스냅샷 재구성 (한 트랜잭션, stock_codes 지정 시 해당 종목만)"""
+        own_conn = conn is None
+        conn = conn or self.db_config.get_connection('stock')
+        try:
+            params: List[Any] = []
+            filter_sql = ''
+            if stock_codes is not None:
+                stock_codes = list(stock_codes)
+                placeholders = ', '.join('?' * len(stock_codes))
+                filter_sql = f'AND stock_code IN ({placeholders})'
+                # {filter}가 쿼리에 나오는 횟수만큼 파라미터 반복
+                params = stock_codes * _REBUILD_QUERY.count('{filter}')
+
+            with conn:
+                if stock_codes is None:
+                    conn.execute('DELETE FROM latest_snapshot')
+                else:
+                    conn.execute(f'DELETE FROM latest_snapshot WHERE stock_code IN ({placeholders})', stock_codes)
+                cursor = conn.execute(
+                    f"INSERT INTO latest_snapshot ({', '.join(SNAPSHOT_COLUMNS)}) "
+                    + _REBUILD_QUERY.format(filter=filter_sql),
+                    params,
+                )
+                count = cursor.rowcount
+        finally:
+            if own_conn:
+                conn.close()
+
+        logger.info(f"🗂️ latest_snapshot 재구성 완료: {count:,}개 종목")
+        return count
+
+    @contextmanager
+    def bulk_load(self, tables: Sequence[str] = ('stock_prices',), stock_codes: Optional[Sequence[str]] = None,
+                  conn: Optional[sqlite3.Connection] = None) -> Iterator[sqlite3.Connection]:
+        """
+        대량 적재 구간 동안 스냅샷 트리거를 끄고, 끝나면 트리거 복구 후 한 번만 재구성
+
+        트리거 삭제는 DB 전체에 적용되므로 다른 연결의 적재분도 종료 시 재구성으로 반영된다.
+        적재 중 예외가 나도 이미 커밋된 행이 있을 수 있어 트리거 복구와 재구성은 항상 실행한다.
+        트리거가 없던 DB(스냅샷 미사용)는 아무것도 하지 않는다.
+
+        Args:
+            tables: 트리거를 끌 원본 테이블
+            stock_codes: 적재 대상 종목 (재구성 범위, None이면 전체)
+        """
+        if stock_codes is not None:
+            stock_codes = sorted(set(stock_codes))
+            # 재구성 쿼리는 종목 목록을 {filter} 수만큼 바인딩하므로 종목이 많으면 전체 재구성
+            if len(stock_codes) * _REBUILD_QUERY.count('{filter}') > 900:
+                stock_codes = None
+
+        own_conn = conn is None
+        conn = conn or self.db_config.get_connection('stock')
+        try:
+            dropped = self.db_config.drop_latest_snapshot_triggers(conn, list(tables))
+            conn.commit()
+            if dropped:
+                logger.info(f"⏸️ latest_snapshot 트리거 해제: {len(dropped)}개 (대량 적재)")
+            try:
+                yield conn
+            finally:
+                if dropped:
+                    self.db_config.create_latest_snapshot_triggers(conn)
+                    conn.commit()
+                    self.rebuild(conn, stock_codes)
+        finally:
+            if own_conn:
+                conn.close()
+
+    def get(self, stock_code: str, conn: Optional[sqlite3.Connection] = None) -> Optional[Dict[str, Any]]:
+        """단일 종목 최신값 (없으면 None)"""
+        own_conn = conn is None
+        conn = conn or self.db_config.get_connection('stock')
+        try:
+            cursor = conn.execute('SELECT * FROM latest_snapshot WHERE stock_code = ?', (stock_code,))
+            row = cursor.fetchone()
+            if row is None:
+                return None
+            return dict(zip([desc[0] for desc in cursor.description], row))
+        finally:
+            if own_conn:
+                conn.close()
+
+    def load(self, columns: Optional[Sequence[str]] = None, stock_codes: Optional[Sequence[str]] = None,
+             where: Optional[str] = None, order_by: Optional[str] = None, limit: Optional[int] = None,
+             conn: Optional[sqlite3.Connection] = None) -> 'pd.DataFrame':
+        """
+        스냅샷 조회 (단일 테이블)
+
+        Args:
+            columns: 조회 컬럼 (기본 전체)
+            stock_codes: 종목 제한
+            where: 추가 조건 SQL (예: 'market_cap > 0')
+            order_by: 정렬 SQL (예: 'market_cap DESC')
+            limit: 최대 행 수
+        """
+        for column in columns or ():
+            if column not in SNAPSHOT_COLUMNS and column != 'updated_at':
+                raise ValueError(f"latest_snapshot에 없는 컬럼: {column}")
+
+        clauses, params = [], []
+        if stock_codes is not None:
+            stock_codes = list(stock_codes)
+            clauses.append(f"stock_code IN ({', '.join('?' * len(stock_codes))})")
+            params.extend(stock_codes)
+        if where:
+            clauses.append(f'({where})')
+
+        query = f"SELECT {', '.join(columns) if columns else '*'} FROM latest_snapshot"
+        if clauses:
+            query += ' WHERE ' + ' AND '.join(clauses)
+        if order_by:
+            query += f' ORDER BY {order_by}'
+        if limit:
+            query += f' LIMIT {int(limit)}'
+
+        # pandas는 DataFrame 조회 시에만 로드 (get()만 쓰는 수집기 기동 비용 절감)
+        import pandas as pd
+
+        own_conn = conn is None
+        conn = conn or self.db_config.get_connection('stock')
+        try:
+            return pd.read_sql_query(query, conn, params=params)
+        finally:
+            if own_conn:
+                conn.close()
@@ -0,0 +1,84 @@
+"""
+데이터 접근 계층 결과 모델
+DatabaseManager 벌크 조회 결과를 종목 × 날짜 NumPy 블록으로 담는 컨테이너
+"""
+
+from dataclasses import dataclass
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+OHLCV_FIELDS = ('open_price', 'high_price', 'low_price', 'close_price', 'volume')
+
+
+@dataclass
+class OHLCVBlock:
+    """
+    종목 × 날짜 × 필드 주가 블록
+
+    Attributes:
+        codes: 종목코드 (n_codes,), 정렬됨
+        dates: 거래일 (n_dates,) datetime64[D], 정렬됨 - 조회 종목 중 하나라도 행이 있는 날짜
+        fields: 필드명 (values 마지막 축 순서)
+        values: (n_codes, n_dates, n_fields) float64, 행이 없는 칸은 NaN
+    """
+    codes: np.ndarray
+    dates: np.ndarray
+    fields: Tuple[str, ...]
+    values: np.ndarray
+
+    @classmethod
+    def empty(cls, fields: Tuple[str, ...] = OHLCV_FIELDS) -> 'OHLCVBlock':
+        return cls(
+            codes=np.array([], dtype=object),
+            dates=np.array([], dtype='datetime64[D]'),
+            fields=tuple(fields),
+            values=np.empty((0, 0, len(fields)), dtype=np.float64),
+        )
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fields: Tuple[str, ...] = OHLCV_FIELDS) -> 'OHLCVBlock':
+        """stock_code / date / 필드 컬럼의 long 형식 DataFrame → 블록 (행 순서 무관)"""
+        if df.empty:
+            return cls.empty(fields)
+
+        codes, code_index = np.unique(df['stock_code'].to_numpy(dtype=str), return_inverse=True)
+        dates, date_index = np.unique(df['date'].to_numpy(dtype='datetime64[D]'), return_inverse=True)
+
+        values = np.full((len(codes), len(dates), len(fields)), np.nan, dtype=np.float64)
+        values[code_index, date_index] = df[list(fields)].to_numpy(dtype=np.float64, na_value=np.nan)
+        return cls(codes=codes.astype(object), dates=dates, fields=tuple(fields), values=values)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.codes), len(self.dates)
+
+    def field(self, name: str) -> np.ndarray:
+        """필드 하나의 (n_codes, n_dates) 뷰"""
+        return self.values[:, :, self.fields.index(name)]
+
+    @property
+    def present(self) -> np.ndarray:
+        """행 존재 여부 (n_codes, n_dates) - 조회한 필드 중 하나라도 값이 있으면 존재"""
+        return ~np.all(np.isnan(self.values), axis=-1)
+
+    def code_index(self, stock_code: str) -> int:
+        position = int(np.searchsorted(self.codes, stock_code))
+        if position >= len(self.codes) or self.codes[position] != stock_code:
+            raise KeyError(stock_code)
+        return position
+
+    def series(self, stock_code: str) -> pd.DataFrame:
+        """단일 종목 날짜 인덱스 DataFrame (행이 없는 날짜 제외)"""
+        block = self.values[self.code_index(stock_code)]
+        frame = pd.DataFrame(block, index=pd.DatetimeIndex(self.dates, name='date'), columns=list(self.fields))
+        return frame[~np.all(np.isnan(block), axis=-1)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """long 형식 (stock_code, date, 필드...) - 존재하는 행만"""
+        code_index, date_index = np.nonzero(self.present)
+        frame = pd.DataFrame(self.values[code_index, date_index], columns=list(self.fields))
+        frame.insert(0, 'date', self.dates[date_index])
+        frame.insert(0, 'stock_code', self.codes[code_index])
+        return frame
@@ -0,0 +1,515 @@
+"""
+전 종목 가격 패널 (거래일 × 종목)
+stock_prices를 한 번 읽어 종가/거래량을 float32 밀집 행렬로 보관하고, 횡단면 통계를 행렬 연산으로 계산
+
+- 행: KRX 거래일 (krx_calendar), 열: 종목코드 (정렬), 값이 없는 칸은 NaN
+- 저장: <root>/close.npy, volume.npy (np.lib.format 메모리 맵, 여유 행 확보) + panel.json 매니페스트
+- 갱신: id / updated_at 워터마크 이후 변경 행만 읽어 새 거래일은 행 추가, 과거 거래일은 제자리 수정
+  (새 종목 등장 / 시작일 이전 데이터 / 워터마크 없음 → 전체 재구성)
+- 읽기: 읽기 전용 메모리 맵이라 여러 프로세스가 같은 파일을 공유하고 필요한 페이지만 로드
+
+사용법:
+    panel = get_price_panel()                         # 없으면 생성, 있으면 증분 갱신 후 열기
+    corr = panel.correlation(['005930', '000660'], start='2024-01-01')
+    betas = panel.beta(window=252)                    # 동일가중 시장 대비 전 종목 베타
+    breadth = panel.breadth()                         # 일별 상승/하락 종목 수, ADL, 이동평균 상회 비율
+"""
+
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+# 프로젝트 루트 디렉토리를 Python 경로에 추가 (파이프라인 단계로 직접 실행 시)
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.append(str(PROJECT_ROOT))
+
+from config.database_config import DatabaseConfig
+from src.utils.krx_calendar import get_krx_calendar
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PANEL_ROOT = PROJECT_ROOT / 'data' / 'cache' / 'price_panel'
+PANEL_FIELDS = {'close_price': 'close.npy', 'volume': 'volume.npy'}
+MANIFEST_FILE = 'panel.json'
+
+# 행 추가 시 파일 재할당을 줄이기 위한 여유 행 (약 1년치 거래일)
+ROW_HEADROOM = 256
+FETCH_BATCH = 200_000
+
+DateLike = Union[str, date, datetime, np.datetime64, None]
+
+
+def _ffill_rows(matrix: np.ndarray) -> np.ndarray:
+    """열별로 직전 유효값 채우기 (행 축, 앞쪽 NaN은 유지)"""
+    valid = ~np.isnan(matrix)
+    index = np.where(valid, np.arange(matrix.shape[0])[:, None], 0)
+    np.maximum.accumulate(index, axis=0, out=index)
+    filled = matrix[index, np.arange(matrix.shape[1])]
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+class PricePanel:
+    """(거래일 × 종목) 종가/거래량 행렬과 횡단면 통계"""
+
+    def __init__(self, dates: np.ndarray, codes: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        self.dates = dates.astype('datetime64[D]')
+        self.codes = np.asarray(codes, dtype=object)
+        self.close = close
+        self.volume = volume
+        self._code_positions = {code: i for i, code in enumerate(self.codes)}
+
+    @property
+    def shape(self):
+        return self.close.shape
+
+    @property
+    def mask(self) -> np.ndarray:
+        """거래일 × 종목 데이터 존재 여부"""
+        return ~np.isnan(self.close)
+
+    # -------------------------------------------------------------------------
+    # 선택
+    # -------------------------------------------------------------------------
+
+    def columns(self, codes: Optional[Sequence[str]]) -> np.ndarray:
+        """종목코드 → 열 위치 (패널에 없는 종목은 제외)"""
+        if codes is None:
+            return np.arange(len(self.codes))
+        return np.array([self._code_positions[c] for c in codes if c in self._code_positions], dtype=np.intp)
+
+    def rows(self, start: DateLike = None, end: DateLike = None) -> slice:
+        """[start, end] 거래일 행 구간"""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start).date(), 'D')))
+        hi = len(self.dates) if end is None else int(
+            np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end).date(), 'D'), side='right'))
+        return slice(lo, hi)
+
+    def frame(self, field: str = 'close_price', codes: Optional[Sequence[str]] = None,
+              start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+        """거래일 인덱스 × 종목 컬럼 DataFrame (차트/기존 pandas 코드 연동용)"""
+        matrix = self.close if field == 'close_price' else self.volume
+        rows, cols = self.rows(start, end), self.columns(codes)
+        return pd.DataFrame(np.asarray(matrix[rows][:, cols], dtype=np.float64),
+                            index=pd.DatetimeIndex(self.dates[rows], name='date'), columns=self.codes[cols])
+
+    # -------------------------------------------------------------------------
+    # 수익률 / 상관 / 베타
+    # -------------------------------------------------------------------------
+
+    def returns(self, periods: int = 1, codes: Optional[Sequence[str]] = None,
+                start: DateLike = None, end: DateLike = None) -> np.ndarray:
+        """기간 수익률 행렬 (float64, 첫 periods 행과 결측 구간은 NaN)"""
+        rows, cols = self.rows(start, end), self.columns(codes)
+        # 구간 첫 행의 수익률도 구할 수 있도록 periods만큼 앞 행까지 포함해서 계산
+        lo = max(rows.start - periods, 0)
+        close = np.asarray(self.close[lo:rows.stop][:, cols], dtype=np.float64)
+        result = np.full_like(close, np.nan)
+        result[periods:] = close[periods:] / close[:-periods] - 1
+        return result[rows.start - lo:]
+
+    def market_returns(self, start: DateLike = None, end: DateLike = None) -> np.ndarray:
+        """동일가중 시장 일간 수익률 (거래 종목 평균)"""
+        returns = self.returns(start=start, end=end)
+        counts = (~np.isnan(returns)).sum(axis=1)
+        totals = np.nansum(returns, axis=1)
+        return np.divide(totals, counts, out=np.full(len(totals), np.nan), where=counts > 0)
+
+    def correlation(self, codes: Optional[Sequence[str]] = None, start: DateLike = None, end: DateLike = None,
+                    min_periods: int = 20) -> pd.DataFrame:
+        """
+        일간 수익률 상관행렬 (종목 쌍별로 둘 다 값이 있는 날만 사용)
+
+        쌍별 표본 수/합/제곱합/교차곱을 행렬곱 6번으로 구해 종목 수에 대해 루프 없이 계산
+        """
+        cols = self.columns(codes)
+        returns = self.returns(codes=self.codes[cols], start=start, end=end)
+        valid = (~np.isnan(returns)).astype(np.float64)
+        values = np.nan_to_num(returns)
+
+        n = valid.T @ valid
+        sum_x = values.T @ valid          # [i, j]: j와 겹치는 날의 i 합
+        sum_xx = (values ** 2).T @ valid
+        cross = values.T @ values
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = cross - sum_x * sum_x.T / n
+            var_x = sum_xx - sum_x ** 2 / n
+            corr = cov / np.sqrt(var_x * var_x.T)
+        corr[n < min_periods] = np.nan
+        np.fill_diagonal(corr, np.where(np.diag(n) >= min_periods, 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.codes[cols], columns=self.codes[cols])
+
+    def beta(self, benchmark: Union[str, np.ndarray, None] = None, window: Optional[int] = None,
+             codes: Optional[Sequence[str]] = None, min_periods: int = 20) -> pd.Series:
+        """
+        전 종목 베타 = cov(종목, 기준) / var(기준) (종목별로 둘 다 값이 있는 날만 사용)
+
+        Args:
+            benchmark: 기준 종목코드 / 일간 수익률 배열(패널 행 길이) / None이면 동일가중 시장
+            window: 최근 거래일 수 (None이면 전체)
+        """
+        cols = self.columns(codes)
+        if isinstance(benchmark, str):
+            market = self.returns(codes=[benchmark])[:, 0]
+        elif benchmark is None:
+            market = self.market_returns()
+        else:
+            market = np.asarray(benchmark, dtype=np.float64)
+
+        returns = self.returns(codes=self.codes[cols])
+        if window:
+            returns, market = returns[-window:], market[-window:]
+
+        valid = ~np.isnan(returns) & ~np.isnan(market)[:, None]
+        n = valid.sum(axis=0)
+        x = np.where(valid, returns, 0.0)
+        m = np.where(valid, market[:, None], 0.0)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cov = (x * m).sum(axis=0) - x.sum(axis=0) * m.sum(axis=0) / n
+            var = (m ** 2).sum(axis=0) - m.sum(axis=0) ** 2 / n
+            beta = cov / var
+        beta[n < min_periods] = np.nan
+        return pd.Series(beta, index=self.codes[cols], name='beta')
+
+    # -------------------------------------------------------------------------
+    # 횡단면 지표
+    # -------------------------------------------------------------------------
+
+    def relative_strength(self, lookback: int = 60, codes: Optional[Sequence[str]] = None) -> pd.DataFrame:
+        """
+        최근 lookback 거래일 수익률과 전 종목 대비 백분위 (거래정지 구간은 직전 종가 사용)
+
+        Returns:
+            stock_code 인덱스, period_return / rs_percentile(0~100) 컬럼
+        """
+        cols = self.columns(codes)
+        close = _ffill_rows(np.asarray(self.close[:, cols], dtype=np.float64))
+        if len(close) <= lookback:
+            period_return = np.full(len(cols), np.nan)
+        else:
+            period_return = close[-1] / close[-1 - lookback] - 1
+
+        result = pd.DataFrame({'period_return': period_return}, index=pd.Index(self.codes[cols], name='stock_code'))
+        result['rs_percentile'] = (result['period_return'].rank(pct=True) * 100).round(2)
+        return result
+
+    def breadth(self, start: DateLike = None, end: DateLike = None, ma_window: int = 20) -> pd.DataFrame:
+        """
+        일별 시장 폭
+
+        Returns:
+            거래일 인덱스, advancers / decliners / unchanged / traded / ad_line / pct_above_ma 컬럼
+        """
+        rows = self.rows(start, end)
+        lo = max(rows.start - ma_window, 0)
+        close = np.asarray(self.close[lo:rows.stop], dtype=np.float64)
+        change = np.full_like(close, np.nan)
+        change[1:] = close[1:] - close[:-1]
+
+        # 결측을 제외한 이동평균 (누적합 차분)
+        valid = ~np.isnan(close)
+        csum = np.vstack([np.zeros((1, close.shape[1])), np.cumsum(np.nan_to_num(close), axis=0)])
+        ccount = np.vstack([np.zeros((1, close.shape[1])), np.cumsum(valid, axis=0)])
+        top = np.arange(1, len(close) + 1)
+        bottom = np.maximum(top - ma_window, 0)
+        window_count = ccount[top] - ccount[bottom]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            moving_average = (csum[top] - csum[bottom]) / window_count
+        has_ma = valid & (window_count >= ma_window)
+
+        offset = rows.start - lo
+        advancers = (change > 0).sum(axis=1)[offset:]
+        decliners = (change < 0).sum(axis=1)[offset:]
+        traded = valid.sum(axis=1)[offset:]
+        above = ((close > moving_average) & has_ma).sum(axis=1)[offset:]
+        ma_count = has_ma.sum(axis=1)[offset:]
+
+        result = pd.DataFrame({
+            'advancers': advancers,
+            'decliners': decliners,
+            'unchanged': (change == 0).sum(axis=1)[offset:],
+            'traded': traded,
+        }, index=pd.DatetimeIndex(self.dates[rows], name='date'))
+        result['ad_line'] = (result['advancers'] - result['decliners']).cumsum()
+        result['pct_above_ma'] = np.round(
+            np.divide(above, ma_count, out=np.full(len(above), np.nan), where=ma_count > 0) * 100, 2)
+        return result
+
+    def group_returns(self, groups: Union[pd.Series, Dict[str, str]], periods: int = 1,
+                      start: DateLike = None, end: DateLike = None) -> pd.DataFrame:
+        """
+        그룹(섹터 등)별 동일가중 수익률 (거래일 × 그룹) - 원-핫 행렬곱 1회
+
+        Args:
+            groups: 종목코드 → 그룹명 (패널에 없는 종목/결측 그룹은 제외)
+        """
+        groups = pd.Series(groups).dropna()
+        groups = groups[groups.index.isin(list(self._code_positions))]
+        labels, group_index = np.unique(groups.to_numpy(dtype=str), return_inverse=True)
+
+        returns = self.returns(periods=periods, codes=groups.index, start=start, end=end)
+        one_hot = np.zeros((len(groups), len(labels)))
+        one_hot[np.arange(len(groups)), group_index] = 1.0
+
+        valid = ~np.isnan(returns)
+        totals = np.nan_to_num(returns) @ one_hot
+        counts = valid.astype(np.float64) @ one_hot
+        with np.errstate(divide='ignore', invalid='ignore'):
+            averages = totals / counts
+        return pd.DataFrame(averages, index=pd.DatetimeIndex(self.dates[self.rows(start, end)], name='date'),
+                            columns=labels)
+
+
+class PricePanelStore:
+    """가격 패널 파일 생성 / 증분 갱신 / 열기"""
+
+    def __init__(self, root: Union[str, Path, None] = None, db_config: Optional[DatabaseConfig] = None):
+        self.root = Path(root) if root else DEFAULT_PANEL_ROOT
+        self.db_config = db_config or DatabaseConfig()
+        self.calendar = get_krx_calendar()
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # 매니페스트 / 파일
+    # -------------------------------------------------------------------------
+
+    def load_manifest(self) -> Optional[Dict[str, Any]]:
+        path = self.root / MANIFEST_FILE
+        if not path.exists():
+            return None
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict[str, Any]):
+        manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        tmp_path = self.root / f'{MANIFEST_FILE}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.root / MANIFEST_FILE)
+
+    def _session_dates(self, manifest: Dict[str, Any]) -> np.ndarray:
+        sessions = self.calendar.sessions_in_range(manifest['start'], self.calendar.last)
+        return sessions[:manifest['n_rows']]
+
+    def _create_matrix(self, name: str, capacity: int, n_codes: int) -> np.memmap:
+        """NaN으로 채운 새 .npy (임시 파일, _commit_matrix로 교체)"""
+        matrix = np.lib.format.open_memmap(self.root / f'{name}.tmp', mode='w+', dtype=np.float32,
+                                           shape=(capacity, n_codes))
+        matrix[:] = np.nan
+        return matrix
+
+    def _commit_matrix(self, name: str, matrix: np.memmap):
+        matrix.flush()
+        del matrix
+        os.replace(self.root / f'{name}.tmp', self.root / name)
+
+    # -------------------------------------------------------------------------
+    # 원본 읽기
+    # -------------------------------------------------------------------------
+
+    def _scatter_rows(self, cursor, start: np.datetime64, codes: np.ndarray, matrices: Dict[str, np.ndarray]) -> int:
+        """
+        (stock_code, date, close_price, volume) 커서 결과를 행렬에 배치 기록
+
+        Returns:
+            기록한 최대 행 위치 + 1 (거래일 아닌 날짜/패널 밖 종목 행은 무시)
+        """
+        start_rank = int(self.calendar.session_positions(np.array([start]))[0])
+        max_row = 0
+        skipped = 0
+        while True:
+            batch = cursor.fetchmany(FETCH_BATCH)
+            if not batch:
+                break
+            stock_codes, dates, close, volume = zip(*batch)
+            days = pd.to_datetime(pd.Series(dates), errors='coerce').to_numpy(dtype='datetime64[D]')
+
+            in_range = ~np.isnat(days) & (days >= start) & (days <= self.calendar.last)
+            code_array = np.asarray(stock_codes, dtype=object)
+            col = np.searchsorted(codes, code_array)
+            col = np.minimum(col, len(codes) - 1)
+            in_range &= codes[col] == code_array
+
+            keep = np.flatnonzero(in_range)
+            is_session = self.calendar.is_session_array(days[keep])
+            skipped += int((~is_session).sum()) + len(batch) - len(keep)
+            keep = keep[is_session]
+
+            row = self.calendar.session_positions(days[keep]) - start_rank
+            matrices['close_price'][row, col[keep]] = np.asarray(close, dtype=np.float64)[keep]
+            matrices['volume'][row, col[keep]] = np.asarray(volume, dtype=np.float64)[keep]
+            if len(row):
+                max_row = max(max_row, int(row.max()) + 1)
+
+        if skipped:
+            logger.debug(f"가격 패널: 거래일 아님/범위 밖 {skipped:,}행 제외")
+        return max_row
+
+    @staticmethod
+    def _watermark(conn) -> Dict[str, Any]:
+        max_id, max_updated = conn.execute('SELECT MAX(id), MAX(updated_at) FROM stock_prices').fetchone()
+        return {'max_id': max_id or 0, 'max_updated_at': max_updated or ''}
+
+    # -------------------------------------------------------------------------
+    # 생성 / 갱신
+    # -------------------------------------------------------------------------
+
+    def build(self) -> Dict[str, Any]:
+        """stock_prices 전체에서 패널 재구성"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        conn = self.db_config.get_connection('stock')
+        conn.row_factory = None
+        try:
+            watermark = self._watermark(conn)
+            codes = np.array([row[0] for row in conn.execute(
+                'SELECT DISTINCT stock_code FROM stock_prices ORDER BY stock_code')], dtype=object)
+            first, last = conn.execute('SELECT MIN(date), MAX(date) FROM stock_prices').fetchone()
+            if not len(codes) or first is None:
+                logger.warning("가격 패널: stock_prices가 비어 있습니다.")
+                return {'rows': 0, 'codes': 0}
+
+            first_day = max(pd.Timestamp(first).date(), self.calendar.origin.astype(object))
+            start = np.datetime64(self.calendar.session_on_or_after(first_day), 'D')
+            n_sessions = self.calendar.session_count(start, pd.Timestamp(last).date())
+            capacity = n_sessions + ROW_HEADROOM
+
+            matrices = {field: self._create_matrix(name, capacity, len(codes))
+                        for field, name in PANEL_FIELDS.items()}
+            cursor = conn.execute('SELECT stock_code, date, close_price, volume FROM stock_prices')
+            n_rows = self._scatter_rows(cursor, start, codes, matrices)
+        finally:
+            conn.close()
+
+        for field, name in PANEL_FIELDS.items():
+            self._commit_matrix(name, matrices.pop(field))
+
+        manifest = {'start': str(start), 'n_rows': n_rows, 'capacity': capacity,
+                    'codes': codes.tolist(), 'watermark': watermark}
+        self._save_manifest(manifest)
+        logger.info(f"🧮 가격 패널 생성: {n_rows:,}거래일 × {len(codes):,}종목 ({self.root})")
+        return {'rows': n_rows, 'codes': len(codes), 'rebuilt': True}
+
+    def _grow(self, manifest: Dict[str, Any], required_rows: int):
+        """여유 행이 부족하면 더 큰 파일로 복사 후 교체"""
+        capacity = max(required_rows + ROW_HEADROOM, int(manifest['capacity'] * 1.5))
+        n_codes = len(manifest['codes'])
+        for name in PANEL_FIELDS.values():
+            old = np.load(self.root / name, mmap_mode='r')
+            new = self._create_matrix(name, capacity, n_codes)
+            new[:manifest['n_rows']] = old[:manifest['n_rows']]
+            del old
+            self._commit_matrix(name, new)
+        manifest['capacity'] = capacity
+
+    def update(self) -> Dict[str, Any]:
+        """워터마크 이후 변경 행 반영 (새 거래일 행 추가 / 과거 행 수정)"""
+        with self._lock:
+            manifest = self.load_manifest()
+            if manifest is None or not all((self.root / name).exists() for name in PANEL_FIELDS.values()):
+                return self.build()
+
+            conn = self.db_config.get_connection('stock')
+            conn.row_factory = None
+            try:
+                watermark = self._watermark(conn)
+                previous = manifest['watermark']
+                # updated_at은 초 단위라 워터마크와 같은 초의 행도 다시 반영 (덮어쓰기라 중복 무해)
+                changed = 'FROM stock_prices WHERE id > ? OR updated_at >= ?'
+                params = (previous['max_id'], previous['max_updated_at'])
+
+                first, last = conn.execute(f'SELECT MIN(date), MAX(date) {changed}', params).fetchone()
+                changed_codes = [row[0] for row in conn.execute(f'SELECT DISTINCT stock_code {changed}', params)]
+                known_codes = set(manifest['codes'])
+                rebuild = bool(changed_codes) and (
+                    not set(changed_codes) <= known_codes
+                    or pd.Timestamp(first).date() < pd.Timestamp(manifest['start']).date()
+                )
+
+                if changed_codes and not rebuild:
+                    required = self.calendar.session_count(manifest['start'], pd.Timestamp(last).date())
+                    if required > manifest['capacity']:
+                        self._grow(manifest, required)
+
+                    matrices = {field: np.load(self.root / name, mmap_mode='r+')
+                                for field, name in PANEL_FIELDS.items()}
+                    cursor = conn.execute(f'SELECT stock_code, date, close_price, volume {changed}', params)
+                    max_row = self._scatter_rows(cursor, np.datetime64(manifest['start'], 'D'),
+                                                 np.array(manifest['codes'], dtype=object), matrices)
+                    for matrix in matrices.values():
+                        matrix.flush()
+                    del matrices
+            finally:
+                conn.close()
+
+            if rebuild:
+                logger.info("가격 패널: 새 종목/시작일 이전 데이터 → 전체 재구성")
+                return self.build()
+            if not changed_codes:
+                return {'rows': manifest['n_rows'], 'codes': len(manifest['codes']), 'changed': 0, 'appended': 0}
+
+            appended = max(max_row - manifest['n_rows'], 0)
+            manifest['n_rows'] = max(manifest['n_rows'], max_row)
+            manifest['watermark'] = watermark
+            self._save_manifest(manifest)
+            logger.info(f"🧮 가격 패널 갱신: 변경 종목 {len(changed_codes):,}개, 추가 거래일 {appended}")
+            return {'rows': manifest['n_rows'], 'codes': len(manifest['codes']), 'changed': len(changed_codes),
+                    'appended': appended}
+
+    def open(self, refresh: bool = False) -> PricePanel:
+        """읽기 전용 메모리 맵 패널 (파일이 없거나 refresh=True면 먼저 생성/갱신)"""
+        if refresh or self.load_manifest() is None:
+            self.update()
+        manifest = self.load_manifest()
+        if manifest is None:
+            empty = np.empty((0, 0), dtype=np.float32)
+            return PricePanel(np.array([], dtype='datetime64[D]'), np.array([], dtype=object), empty, empty)
+
+        n_rows = manifest['n_rows']
+        matrices = {field: np.load(self.root / name, mmap_mode='r')[:n_rows]
+                    for field, name in PANEL_FIELDS.items()}
+        return PricePanel(self._session_dates(manifest), np.array(manifest['codes'], dtype=object),
+                          matrices['close_price'], matrices['volume'])
+
+
+_default_store: Optional[PricePanelStore] = None
+_default_lock = threading.Lock()
+
+
+def get_price_panel(refresh: bool = True) -> PricePanel:
+    """기본 경로의 가격 패널 (refresh=True면 증분 갱신 후 열기)"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = PricePanelStore()
+    return _default_store.open(refresh=refresh)
+
+
+def main():
+    """가격 패널 갱신 (파이프라인 단계)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='전 종목 가격 패널(메모리 맵) 갱신')
+    parser.add_argument('--rebuild', action='store_true', help='증분 대신 전체 재구성')
+    parser.add_argument('--root', help='패널 파일 경로 (기본: data/cache/price_panel)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    store = PricePanelStore(args.root)
+    result = store.build() if args.rebuild else store.update()
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,8 +11,10 @@ Finance Data Vibe - 유틸리티 모듈 초기화
     from src.utils import get_logger, log_execution_time
 """
 
+import importlib
 import sys
 import os
+from importlib.util import find_spec
 from typing import Dict, Any, Optional, List, Union, Tuple
 import warnings
 
@@ -27,491 +29,232 @@ if current_dir not in sys.path:
     sys.path.insert(0, current_dir)
 
 # =============================================================================
-# API 관련 유틸리티
+# 지연 로딩 (공개 이름 → 하위 모듈)
 # =============================================================================
-try:
-    from .api_utils import (
+# 하위 모듈은 pandas/requests/plotly 등 무거운 의존성을 가지므로 패키지 import 시점에는
+# 아무것도 불러오지 않고, 이름에 처음 접근할 때 해당 모듈만 import (PEP 562)
+#   from src.utils import format_currency   → formatting_utils만 로드
+#   import src.utils.krx_calendar           → 패키지 초기화 비용 없음
+_LAZY_EXPORTS: Dict[str, Tuple[str, ...]] = {
+    # API 관련 유틸리티
+    'api_utils': (
         # API 관리 클래스
-        APIRateLimiter,
-        APIRetryManager,
-        APIHealthChecker,
-        APIResponseValidator,
-        
+        'APIRateLimiter', 'APIRetryManager', 'APIHealthChecker', 'APIResponseValidator',
         # HTTP 유틸리티
-        make_request,
-        handle_api_error,
-        parse_api_response,
-        
+        'make_request', 'handle_api_error', 'parse_api_response',
         # 인증 및 보안
-        generate_api_signature,
-        validate_api_key,
-        
+        'generate_api_signature', 'validate_api_key',
         # 캐싱
-        cache_api_response,
-        get_cached_response,
-        clear_api_cache,
-        
+        'cache_api_response', 'get_cached_response', 'clear_api_cache',
         # 모니터링
-        log_api_call,
-        track_api_usage,
-        get_api_stats
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import api_utils: {e}")
-
-# =============================================================================
-# 계산 관련 유틸리티
-# =============================================================================
-try:
-    from .calculation_utils import (
+        'log_api_call', 'track_api_usage', 'get_api_stats',
+    ),
+    # 계산 관련 유틸리티
+    'calculation_utils': (
         # 기본 재무 계산
-        calculate_roe,
-        calculate_roa,
-        calculate_per,
-        calculate_pbr,
-        calculate_peg,
-        calculate_debt_ratio,
-        calculate_current_ratio,
-        calculate_quick_ratio,
-        
+        'calculate_roe', 'calculate_roa', 'calculate_per', 'calculate_pbr', 'calculate_peg',
+        'calculate_debt_ratio', 'calculate_current_ratio', 'calculate_quick_ratio',
         # 고급 재무 계산
-        calculate_dcf_value,
-        calculate_ddm_value,
-        calculate_capm,
-        calculate_wacc,
-        calculate_eva,
-        calculate_altman_z_score,
-        
+        'calculate_dcf_value', 'calculate_ddm_value', 'calculate_capm', 'calculate_wacc',
+        'calculate_eva', 'calculate_altman_z_score',
         # 수익률 계산
-        calculate_returns,
-        calculate_cumulative_returns,
-        calculate_volatility,
-        calculate_sharpe_ratio,
-        calculate_max_drawdown,
-        
+        'calculate_returns', 'calculate_cumulative_returns', 'calculate_volatility',
+        'calculate_sharpe_ratio', 'calculate_max_drawdown',
         # 통계 계산
-        calculate_correlation,
-        calculate_beta,
-        calculate_var,
-        calculate_cvar,
-        
+        'calculate_correlation', 'calculate_beta', 'calculate_var', 'calculate_cvar',
         # 유틸리티 함수
-        safe_divide,
-        safe_percentage,
-        normalize_values,
-        weighted_average,
-        compound_growth_rate,
-        
+        'safe_divide', 'safe_percentage', 'normalize_values', 'weighted_average',
+        'compound_growth_rate',
         # 상수
-        TRADING_DAYS_PER_YEAR,
-        RISK_FREE_RATE,
-        MARKET_RISK_PREMIUM
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import calculation_utils: {e}")
-
-# =============================================================================
-# 차트 관련 유틸리티
-# =============================================================================
-try:
-    from .chart_utils import (
+        'TRADING_DAYS_PER_YEAR', 'RISK_FREE_RATE', 'MARKET_RISK_PREMIUM',
+    ),
+    # 차트 관련 유틸리티
+    'chart_utils': (
         # 차트 생성 클래스
-        BaseChart,
-        LineChart,
-        CandlestickChart,
-        VolumeChart,
-        FinancialChart,
-        ComparisonChart,
-        
+        'BaseChart', 'LineChart', 'CandlestickChart', 'VolumeChart', 'FinancialChart',
+        'ComparisonChart',
         # 차트 유틸리티
-        create_stock_chart,
-        create_financial_chart,
-        create_comparison_chart,
-        create_portfolio_chart,
-        create_analysis_chart,
-        
+        'create_stock_chart', 'create_financial_chart', 'create_comparison_chart',
+        'create_portfolio_chart', 'create_analysis_chart',
         # 스타일 및 설정
-        get_chart_colors,
-        get_chart_layout,
-        format_chart_data,
-        
+        'get_chart_colors', 'get_chart_layout', 'format_chart_data',
         # 인터랙티브 기능
-        add_technical_indicators,
-        add_annotations,
-        add_trendlines,
-        
+        'add_technical_indicators', 'add_annotations', 'add_trendlines',
         # 내보내기
-        export_chart,
-        save_chart_image,
-        
+        'export_chart', 'save_chart_image',
         # 상수
-        CHART_THEMES,
-        DEFAULT_COLORS,
-        CHART_SIZES
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import chart_utils: {e}")
-
-# =============================================================================
-# 데이터 검증 유틸리티
-# =============================================================================
-try:
-    from .data_validation import (
+        'CHART_THEMES', 'DEFAULT_COLORS', 'CHART_SIZES',
+    ),
+    # 데이터 검증 유틸리티
+    'data_validation': (
         # 검증 클래스
-        DataValidator,
-        StockDataValidator,
-        FinancialDataValidator,
-        NewsDataValidator,
-        
+        'DataValidator', 'StockDataValidator', 'FinancialDataValidator', 'NewsDataValidator',
         # 기본 검증 함수
-        validate_stock_code,
-        validate_date,
-        validate_financial_data,
-        validate_price_data,
-        validate_volume_data,
-        
+        'validate_stock_code', 'validate_date', 'validate_financial_data',
+        'validate_price_data', 'validate_volume_data',
         # 데이터 정리
-        clean_financial_data,
-        clean_price_data,
-        clean_text_data,
-        remove_outliers,
-        
+        'clean_financial_data', 'clean_price_data', 'clean_text_data', 'remove_outliers',
         # 데이터 품질 확인
-        check_data_quality,
-        check_data_completeness,
-        check_data_consistency,
-        
+        'check_data_quality', 'check_data_completeness', 'check_data_consistency',
         # 예외 클래스
-        ValidationError,
-        DataQualityError,
-        
+        'ValidationError', 'DataQualityError',
         # 상수
-        STOCK_CODE_PATTERN,
-        VALID_EXCHANGES,
-        DATA_QUALITY_THRESHOLDS
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import data_validation: {e}")
-
-# =============================================================================
-# 날짜 관련 유틸리티
-# =============================================================================
-try:
-    from .date_utils import (
+        'STOCK_CODE_PATTERN', 'VALID_EXCHANGES', 'DATA_QUALITY_THRESHOLDS',
+    ),
+    # 날짜 관련 유틸리티
+    'date_utils': (
         # 날짜 변환
-        parse_date,
-        format_date,
-        to_datetime,
-        to_timestamp,
-        
+        'parse_date', 'format_date', 'to_datetime', 'to_timestamp',
         # 날짜 계산
-        add_business_days,
-        subtract_business_days,
-        get_business_days_between,
-        get_quarter_dates,
-        get_year_dates,
-        
+        'add_business_days', 'subtract_business_days', 'get_business_days_between',
+        'get_quarter_dates', 'get_year_dates',
         # 거래일 관련
-        is_business_day,
-        get_next_business_day,
-        get_previous_business_day,
-        get_business_days_in_period,
-        
+        'is_business_day', 'get_next_business_day', 'get_previous_business_day',
+        'get_business_days_in_period',
         # 기간 계산
-        get_date_range,
-        get_quarterly_dates,
-        get_monthly_dates,
-        get_weekly_dates,
-        
+        'get_date_range', 'get_quarterly_dates', 'get_monthly_dates', 'get_weekly_dates',
         # 한국 시장 특화
-        get_krx_trading_days,
-        is_krx_holiday,
-        get_krx_business_days,
-        
+        'get_krx_trading_days', 'is_krx_holiday', 'get_krx_business_days',
         # 유틸리티
-        get_current_quarter,
-        get_fiscal_year,
-        get_days_until_earnings,
-        
+        'get_current_quarter', 'get_fiscal_year', 'get_days_until_earnings',
         # 상수
-        KRX_HOLIDAYS,
-        BUSINESS_DAYS_PER_YEAR,
-        TRADING_HOURS
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import date_utils: {e}")
-
-# =============================================================================
-# 이메일 관련 유틸리티
-# =============================================================================
-try:
-    from .email_utils import (
+        'KRX_HOLIDAYS', 'BUSINESS_DAYS_PER_YEAR', 'TRADING_HOURS',
+    ),
+    # 이메일 관련 유틸리티
+    'email_utils': (
         # 이메일 클래스
-        EmailSender,
-        EmailTemplate,
-        EmailScheduler,
-        
+        'EmailSender', 'EmailTemplate', 'EmailScheduler',
         # 이메일 전송
-        send_email,
-        send_html_email,
-        send_bulk_email,
-        
+        'send_email', 'send_html_email', 'send_bulk_email',
         # 알림 이메일
-        send_analysis_alert,
-        send_portfolio_alert,
-        send_error_alert,
-        send_daily_report,
-        
+        'send_analysis_alert', 'send_portfolio_alert', 'send_error_alert', 'send_daily_report',
         # 템플릿
-        create_analysis_report,
-        create_portfolio_summary,
-        create_screening_results,
-        
+        'create_analysis_report', 'create_portfolio_summary', 'create_screening_results',
         # 설정
-        setup_email_config,
-        validate_email_config,
-        
+        'setup_email_config', 'validate_email_config',
         # 유틸리티
-        validate_email_address,
-        format_email_content,
-        
+        'validate_email_address', 'format_email_content',
         # 상수
-        EMAIL_TEMPLATES,
-        DEFAULT_EMAIL_CONFIG
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import email_utils: {e}")
-
-# =============================================================================
-# 파일 관련 유틸리티
-# =============================================================================
-try:
-    from .file_utils import (
+        'EMAIL_TEMPLATES', 'DEFAULT_EMAIL_CONFIG',
+    ),
+    # 파일 관련 유틸리티
+    'file_utils': (
         # 파일 관리 클래스
-        FileManager,
-        DataFileManager,
-        ConfigFileManager,
-        
+        'FileManager', 'DataFileManager', 'ConfigFileManager',
         # 파일 읽기/쓰기
-        read_file,
-        write_file,
-        read_json,
-        write_json,
-        read_csv,
-        write_csv,
-        read_excel,
-        write_excel,
-        
+        'read_file', 'write_file', 'read_json', 'write_json', 'read_csv', 'write_csv',
+        'read_excel', 'write_excel',
         # 파일 정보
-        get_file_size,
-        get_file_modified_time,
-        get_file_extension,
-        
+        'get_file_size', 'get_file_modified_time', 'get_file_extension',
         # 디렉토리 관리
-        create_directory,
-        remove_directory,
-        list_files,
-        find_files,
-        
+        'create_directory', 'remove_directory', 'list_files', 'find_files',
         # 파일 압축
-        compress_file,
-        decompress_file,
-        create_archive,
-        extract_archive,
-        
+        'compress_file', 'decompress_file', 'create_archive', 'extract_archive',
         # 백업 관리
-        backup_file,
-        restore_file,
-        cleanup_old_backups,
-        
+        'backup_file', 'restore_file', 'cleanup_old_backups',
         # 보안
-        encrypt_file,
-        decrypt_file,
-        calculate_file_hash,
-        
+        'encrypt_file', 'decrypt_file', 'calculate_file_hash',
         # 상수
-        SUPPORTED_FILE_TYPES,
-        MAX_FILE_SIZE,
-        BACKUP_RETENTION_DAYS
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import file_utils: {e}")
-
-# =============================================================================
-# 포맷팅 관련 유틸리티
-# =============================================================================
-try:
-    from .formatting_utils import (
+        'SUPPORTED_FILE_TYPES', 'MAX_FILE_SIZE', 'BACKUP_RETENTION_DAYS',
+    ),
+    # 포맷팅 관련 유틸리티
+    'formatting_utils': (
         # 숫자 포맷팅
-        format_number,
-        format_currency,
-        format_percentage,
-        format_large_number,
-        format_scientific,
-        
+        'format_number', 'format_currency', 'format_percentage', 'format_large_number',
+        'format_scientific',
         # 재무 데이터 포맷팅
-        format_financial_value,
-        format_ratio,
-        format_return,
-        format_volatility,
-        
+        'format_financial_value', 'format_ratio', 'format_return', 'format_volatility',
         # 문자열 포맷팅
-        format_stock_code,
-        format_company_name,
-        format_text,
-        truncate_text,
-        
+        'format_stock_code', 'format_company_name', 'format_text', 'truncate_text',
         # 테이블 포맷팅
-        format_table,
-        format_dataframe,
-        create_summary_table,
-        
+        'format_table', 'format_dataframe', 'create_summary_table',
         # 리포트 포맷팅
-        format_analysis_report,
-        format_screening_results,
-        format_portfolio_summary,
-        
+        'format_analysis_report', 'format_screening_results', 'format_portfolio_summary',
         # 색상 및 스타일
-        get_color_for_value,
-        get_trend_indicator,
-        format_with_color,
-        
+        'get_color_for_value', 'get_trend_indicator', 'format_with_color',
         # 유틸리티
-        clean_text,
-        normalize_text,
-        escape_html,
-        
+        'clean_text', 'normalize_text', 'escape_html',
         # 상수
-        CURRENCY_SYMBOLS,
-        NUMBER_FORMATS,
-        COLOR_SCHEMES
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import formatting_utils: {e}")
-
-# =============================================================================
-# 로깅 관련 유틸리티
-# =============================================================================
-try:
-    from .logging_utils import (
+        'CURRENCY_SYMBOLS', 'NUMBER_FORMATS', 'COLOR_SCHEMES',
+    ),
+    # 로깅 관련 유틸리티
+    'logging_utils': (
         # 로거 클래스
-        LoggerManager,
-        PerformanceLogger,
-        InvestmentLogger,
-        
+        'LoggerManager', 'PerformanceLogger', 'InvestmentLogger',
         # 로거 인스턴스
-        get_logger_manager,
-        get_logger,
-        
+        'get_logger_manager', 'get_logger',
         # 데코레이터
-        log_execution_time,
-        log_function_call,
-        
+        'log_execution_time', 'log_function_call',
         # 컨텍스트 매니저
-        log_context,
-        
+        'log_context',
         # 편의 함수
-        debug,
-        info,
-        warning,
-        error,
-        critical,
-        
+        'debug', 'info', 'warning', 'error', 'critical',
         # 설정
-        initialize_logging,
-        setup_error_logging,
-        
+        'initialize_logging', 'setup_error_logging',
         # 모니터링
-        log_memory_usage,
-        log_system_info,
-        
+        'log_memory_usage', 'log_system_info',
         # 상수
-        LOG_LEVELS
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import logging_utils: {e}")
-
-# =============================================================================
-# 메모리 관련 유틸리티
-# =============================================================================
-try:
-    from .memory_utils import (
+        'LOG_LEVELS',
+    ),
+    # 메모리 관련 유틸리티
+    'memory_utils': (
         # 메모리 관리 클래스
-        MemoryManager,
-        MemoryMonitor,
-        DataCache,
-        
+        'MemoryManager', 'MemoryMonitor', 'DataCache',
         # 메모리 모니터링
-        get_memory_usage,
-        monitor_memory,
-        log_memory_stats,
-        
+        'get_memory_usage', 'monitor_memory', 'log_memory_stats',
         # 캐시 관리
-        create_cache,
-        get_from_cache,
-        set_to_cache,
-        clear_cache,
-        
+        'create_cache', 'get_from_cache', 'set_to_cache', 'clear_cache',
         # 메모리 최적화
-        optimize_memory,
-        cleanup_memory,
-        garbage_collect,
-        
+        'optimize_memory', 'cleanup_memory', 'garbage_collect',
         # 데이터 관리
-        manage_large_dataset,
-        chunk_data,
-        stream_data,
-        
+        'manage_large_dataset', 'chunk_data', 'stream_data',
         # 상수
-        MEMORY_THRESHOLDS,
-        CACHE_SIZES,
-        CLEANUP_INTERVALS
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import memory_utils: {e}")
-
-# =============================================================================
-# 보안 관련 유틸리티
-# =============================================================================
-try:
-    from .security_utils import (
+        'MEMORY_THRESHOLDS', 'CACHE_SIZES', 'CLEANUP_INTERVALS',
+    ),
+    # 보안 관련 유틸리티
+    'security_utils': (
         # 암호화 클래스
-        DataEncryption,
-        PasswordManager,
-        TokenManager,
-        
+        'DataEncryption', 'PasswordManager', 'TokenManager',
         # 암호화/복호화
-        encrypt_data,
-        decrypt_data,
-        hash_data,
-        
+        'encrypt_data', 'decrypt_data', 'hash_data',
         # 비밀번호 관리
-        hash_password,
-        verify_password,
-        generate_password,
-        
+        'hash_password', 'verify_password', 'generate_password',
         # 토큰 관리
-        generate_token,
-        validate_token,
-        refresh_token,
-        
+        'generate_token', 'validate_token', 'refresh_token',
         # API 보안
-        generate_api_key,
-        validate_api_key,
-        sign_request,
-        
+        'generate_api_key', 'validate_api_key', 'sign_request',
         # 데이터 보안
-        sanitize_input,
-        validate_input,
-        escape_sql,
-        
+        'sanitize_input', 'validate_input', 'escape_sql',
         # 상수
-        ENCRYPTION_ALGORITHMS,
-        HASH_ALGORITHMS,
-        TOKEN_TYPES
-    )
-except ImportError as e:
-    warnings.warn(f"Failed to import security_utils: {e}")
+        'ENCRYPTION_ALGORITHMS', 'HASH_ALGORITHMS', 'TOKEN_TYPES',
+    ),
+}
+
+# 이름 → 모듈 (중복 이름은 뒤쪽 모듈 우선, 기존 import 순서와 동일)
+_LAZY_NAMES: Dict[str, str] = {
+    name: module for module, names in _LAZY_EXPORTS.items() for name in names
+}
+
+
+def __getattr__(name: str) -> Any:
+    """공개 이름 최초 접근 시 하위 모듈 import 후 캐시"""
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    try:
+        module = importlib.import_module(f'.{module_name}', __name__)
+        value = getattr(module, name)
+    except (ImportError, AttributeError) as e:
+        raise AttributeError(f"{name} 로드 실패 ({module_name}): {e}") from e
+
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_NAMES))
+
 
 # =============================================================================
 # 통합 유틸리티 함수들
@@ -521,11 +264,14 @@ def get_all_utils() -> Dict[str, Any]:
     """모든 유틸리티 함수와 클래스 목록 반환"""
     utils_dict = {}
     
-    # 현재 모듈의 모든 공개 객체 수집
+    # 현재 모듈의 모든 공개 객체 수집 (지연 로딩 이름은 이 시점에 import, 로드 실패는 제외)
     current_module = sys.modules[__name__]
     for name in dir(current_module):
         if not name.startswith('_'):
-            obj = getattr(current_module, name)
+            try:
+                obj = getattr(current_module, name)
+            except AttributeError:
+                continue
             if callable(obj) or isinstance(obj, type):
                 utils_dict[name] = obj
     
@@ -573,12 +319,10 @@ def validate_utils_environment():
         if not os.path.exists(dir_name):
             issues.append(f"필수 디렉토리 누락: {dir_name}")
     
-    # 필수 패키지 확인
+    # 필수 패키지 확인 (설치 여부만 확인, import 비용 없음)
     required_packages = ['pandas', 'numpy', 'plotly', 'requests']
     for package in required_packages:
-        try:
-            __import__(package)
-        except ImportError:
+        if find_spec(package) is None:
             issues.append(f"필수 패키지 누락: {package}")
     
     if issues:
@@ -604,6 +348,7 @@ def initialize_utils():
     
     # 로깅 초기화
     try:
+        from .logging_utils import initialize_logging
         initialize_logging()
         print("✓ 로깅 시스템 초기화 완료")
     except Exception as e:
@@ -716,7 +461,9 @@ __all__ = [
 ]
 
 # 자동 초기화 (환경 변수로 제어 가능)
-if os.getenv('FINANCE_DATA_VIBE_AUTO_INIT', '1') == '1':
+# 기본값은 비활성: import만으로 로그 디렉토리 생성/루트 로거 재설정/출력이 일어나지 않도록 하고,
+# 전체 로깅 설정이 필요한 엔트리포인트는 initialize_utils() 호출 또는 FINANCE_DATA_VIBE_AUTO_INIT=1
+if os.getenv('FINANCE_DATA_VIBE_AUTO_INIT', '0') == '1':
     try:
         initialize_utils()
     except Exception as e:
@@ -6,8 +6,7 @@ HTTP 요청, API 호출, 에러 처리 등 API 관련 유틸리티 함수들
 import time
 import requests
 import json
-import hashlib
-from typing import Dict, Any, Optional, List, Union, Callable
+from typing import Dict, Any, Optional, List, Union, Callable, Hashable
 from urllib.parse import urljoin, urlencode
 from datetime import datetime, timedelta
 import logging
@@ -15,6 +14,12 @@ from functools import wraps
 import threading
 from collections import defaultdict, deque
 
+try:
+    from .cache_utils import LRUCache
+except ImportError:
+    # 스크립트로 직접 실행하는 경우
+    from cache_utils import LRUCache
+
 logger = logging.getLogger(__name__)
 
 class APIError(Exception):
@@ -39,91 +44,77 @@ class RateLimiter:
         self.lock = threading.Lock()
     
     def acquire(self):
-        """요청 허용 여부 확인 및 대기"""
-        with self.lock:
-            now = time.time()
-            
-            # 오래된 호출 기록 제거
-            while self.calls and self.calls[0] <= now - 1.0:
-                self.calls.popleft()
-            
-            # 버스트 크기 확인
-            if len(self.calls) >= self.burst_size:
-                sleep_time = 1.0 / self.calls_per_second
-                time.sleep(sleep_time)
-                return self.acquire()
-            
-            # 초당 호출 수 확인
-            if len(self.calls) >= self.calls_per_second:
-                sleep_time = self.calls[0] + 1.0 - now
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                    return self.acquire()
+        """요청 허용 여부 확인 및 대기 (대기는 락 밖에서 수행해 여러 스레드에서 사용 가능)"""
+        while True:
+            with self.lock:
+                now = time.time()
+                
+                # 오래된 호출 기록 제거
+                while self.calls and self.calls[0] <= now - 1.0:
+                    self.calls.popleft()
+                
+                # 버스트 크기 확인
+                if len(self.calls) >= self.burst_size:
+                    sleep_time = 1.0 / self.calls_per_second
+                # 초당 호출 수 확인
+                elif len(self.calls) >= self.calls_per_second:
+                    sleep_time = self.calls[0] + 1.0 - now
+                else:
+                    sleep_time = 0
+                
+                if sleep_time <= 0:
+                    self.calls.append(now)
+                    return
             
-            self.calls.append(now)
+            time.sleep(sleep_time)
 
 class APICache:
-    """API 응답 캐시 클래스"""
+    """API 응답 캐시 클래스 (LRU + TTL, O(1) 조회/저장/제거)"""
     
-    def __init__(self, ttl: int = 300, max_size: int = 1000):
+    def __init__(self, ttl: int = 300, max_size: int = 1000,
+                 max_bytes: Optional[int] = None, disk_path: Optional[str] = None,
+                 namespace: str = 'api'):
         self.ttl = ttl
         self.max_size = max_size
-        self.cache = {}
-        self.timestamps = {}
-        self.lock = threading.Lock()
-    
-    def _generate_key(self, url: str, params: Dict = None, headers: Dict = None) -> str:
-        """캐시 키 생성"""
-        key_data = {
-            'url': url,
-            'params': params or {},
-            'headers': headers or {}
-        }
-        key_string = json.dumps(key_data, sort_keys=True)
-        return hashlib.md5(key_string.encode()).hexdigest()
+        self.cache = LRUCache(max_size=max_size, ttl=ttl, max_bytes=max_bytes,
+                              disk_path=disk_path, namespace=namespace)
+    
+    @staticmethod
+    def _freeze(mapping: Optional[Dict]) -> tuple:
+        """딕셔너리를 해시 가능한 튜플로 변환"""
+        if not mapping:
+            return ()
+        return tuple(sorted(
+            (k, tuple(v) if isinstance(v, list) else v) for k, v in mapping.items()
+        ))
+    
+    def _generate_key(self, url: str, params: Dict = None, headers: Dict = None) -> Hashable:
+        """캐시 키 생성 (직렬화/해시 없이 튜플 키 사용)"""
+        try:
+            key = (url, self._freeze(params), self._freeze(headers))
+            hash(key)
+            return key
+        except TypeError:
+            # 해시 불가능한 값이 섞인 경우에만 JSON 직렬화
+            key_data = {'url': url, 'params': params or {}, 'headers': headers or {}}
+            return json.dumps(key_data, sort_keys=True, default=str)
     
     def get(self, url: str, params: Dict = None, headers: Dict = None) -> Optional[Any]:
         """캐시에서 응답 조회"""
-        key = self._generate_key(url, params, headers)
-        
-        with self.lock:
-            if key in self.cache:
-                # TTL 확인
-                if time.time() - self.timestamps[key] < self.ttl:
-                    return self.cache[key]
-                else:
-                    # 만료된 항목 제거
-                    del self.cache[key]
-                    del self.timestamps[key]
-        
-        return None
+        return self.cache.get(self._generate_key(url, params, headers))
     
-    def set(self, url: str, response: Any, params: Dict = None, headers: Dict = None):
+    def set(self, url: str, response: Any, params: Dict = None, headers: Dict = None,
+            ttl: Optional[float] = None):
         """캐시에 응답 저장"""
-        key = self._generate_key(url, params, headers)
-        
-        with self.lock:
-            # 캐시 크기 확인
-            if len(self.cache) >= self.max_size:
-                self._evict_oldest()
-            
-            self.cache[key] = response
-            self.timestamps[key] = time.time()
-    
-    def _evict_oldest(self):
-        """가장 오래된 항목 제거"""
-        if not self.timestamps:
-            return
-        
-        oldest_key = min(self.timestamps, key=self.timestamps.get)
-        del self.cache[oldest_key]
-        del self.timestamps[oldest_key]
+        self.cache.set(self._generate_key(url, params, headers), response, ttl=ttl)
     
     def clear(self):
         """캐시 전체 삭제"""
-        with self.lock:
-            self.cache.clear()
-            self.timestamps.clear()
+        self.cache.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 (hit/miss/eviction)"""
+        return self.cache.get_stats()
 
 class APIClient:
     """API 클라이언트 클래스"""
@@ -134,14 +125,15 @@ class APIClient:
                  retry_delay: float = 1.0,
                  rate_limit: float = 1.0,
                  use_cache: bool = True,
-                 cache_ttl: int = 300):
+                 cache_ttl: int = 300,
+                 cache_path: Optional[str] = None):
         
         self.base_url = base_url
         self.timeout = timeout
         self.retry_count = retry_count
         self.retry_delay = retry_delay
         self.rate_limiter = RateLimiter(rate_limit)
-        self.cache = APICache(cache_ttl) if use_cache else None
+        self.cache = APICache(cache_ttl, disk_path=cache_path) if use_cache else None
         
         # 세션 설정
         self.session = requests.Session()
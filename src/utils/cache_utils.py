@@ -0,0 +1,355 @@
+"""
+캐시 유틸리티
+OrderedDict 기반 LRU+TTL 캐시와 SQLite 디스크 계층
+
+- get/set/evict 모두 O(1) (OrderedDict.move_to_end / popitem)
+- 항목 수(max_size)와 바이트 크기(max_bytes) 제한
+- hit/miss/eviction 카운터
+- 선택적 디스크 계층: 재시작 후에도 DART 기업코드, 기업개황, 컨센서스 응답 재사용
+"""
+
+import os
+import sys
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# 기본 디스크 캐시 경로 (ConfigManager가 data/cache 디렉토리를 생성함)
+DEFAULT_CACHE_DIR = Path(__file__).parent.parent.parent / 'data' / 'cache'
+DEFAULT_DISK_CACHE_PATH = DEFAULT_CACHE_DIR / 'api_cache.db'
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """값의 대략적인 메모리 크기(bytes) 추정
+
+    bytes/str은 길이, dict/list는 1단계 원소까지 합산한다.
+    정확한 측정보다 O(1)에 가까운 비용을 우선한다.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value) if value.isascii() else len(value.encode('utf-8', errors='ignore'))
+
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += sys.getsizeof(k) + sys.getsizeof(v)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            size += sys.getsizeof(item)
+    return size
+
+
+class SQLiteCacheStore:
+    """SQLite 기반 디스크 캐시 계층"""
+
+    def __init__(self, db_path: Union[str, Path] = None, namespace: str = 'default'):
+        self.db_path = Path(db_path) if db_path else DEFAULT_DISK_CACHE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.namespace = namespace
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                namespace TEXT NOT NULL,
+                cache_key TEXT NOT NULL,
+                value BLOB NOT NULL,
+                expires_at REAL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (namespace, cache_key)
+            )
+        ''')
+        self.conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries(expires_at)'
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def _disk_key(key: Hashable) -> str:
+        """디스크 저장용 문자열 키 (메모리 계층에서는 사용하지 않음)"""
+        if isinstance(key, str):
+            return key
+        return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+    def get(self, key: Hashable) -> Any:
+        """디스크에서 (값, 만료시각) 조회 (없거나 만료 시 값은 _MISSING)"""
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND cache_key = ?',
+                (self.namespace, self._disk_key(key))
+            ).fetchone()
+
+        if row is None:
+            return _MISSING, None
+
+        value_blob, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return _MISSING, None
+
+        try:
+            return pickle.loads(value_blob), expires_at
+        except Exception as e:
+            logger.warning(f"디스크 캐시 역직렬화 실패: {e}")
+            self.delete(key)
+            return _MISSING, None
+
+    def set(self, key: Hashable, value: Any, expires_at: Optional[float] = None):
+        """디스크에 값 저장"""
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"디스크 캐시 직렬화 불가 항목 건너뜀: {e}")
+            return
+
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO cache_entries (namespace, cache_key, value, expires_at, created_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (self.namespace, self._disk_key(key), sqlite3.Binary(blob), expires_at, time.time())
+            )
+            self.conn.commit()
+
+    def delete(self, key: Hashable):
+        """디스크 항목 삭제"""
+        with self.lock:
+            self.conn.execute(
+                'DELETE FROM cache_entries WHERE namespace = ? AND cache_key = ?',
+                (self.namespace, self._disk_key(key))
+            )
+            self.conn.commit()
+
+    def purge_expired(self) -> int:
+        """만료된 항목 일괄 삭제"""
+        with self.lock:
+            cursor = self.conn.execute(
+                'DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?',
+                (time.time(),)
+            )
+            self.conn.commit()
+            return cursor.rowcount
+
+    def clear(self):
+        """현재 네임스페이스 전체 삭제"""
+        with self.lock:
+            self.conn.execute('DELETE FROM cache_entries WHERE namespace = ?', (self.namespace,))
+            self.conn.commit()
+
+    def count(self) -> int:
+        """현재 네임스페이스 항목 수"""
+        with self.lock:
+            return self.conn.execute(
+                'SELECT COUNT(*) FROM cache_entries WHERE namespace = ?', (self.namespace,)
+            ).fetchone()[0]
+
+    def close(self):
+        """연결 종료"""
+        with self.lock:
+            self.conn.close()
+
+
+class LRUCache:
+    """LRU + TTL 캐시 (O(1) get/set/evict)
+
+    OrderedDict의 순서를 최근 사용 순서로 유지하고, 가득 차면 가장 오래 사용되지 않은
+    항목을 popitem(last=False)으로 제거한다. 만료 항목은 조회 시점에 지연 제거한다.
+    sliding=True면 메모리 계층 조회 성공 시 만료 시각을 그 항목을 저장할 때 쓴 ttl만큼 다시 연장한다
+    (디스크에서 올라온 항목은 원래 ttl을 알 수 없어 저장된 만료 시각을 그대로 둔다).
+
+    ttl은 초 단위이며 None 또는 0이면 만료 없음, 음수는 ValueError.
+    set(ttl=None)은 캐시 기본 ttl을 쓴다.
+    """
+
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = 300,
+                 max_bytes: Optional[int] = None,
+                 sizeof: Callable[[Any], int] = estimate_size,
+                 disk_path: Union[str, Path, None] = None,
+                 namespace: str = 'default',
+                 sliding: bool = False):
+        self.max_size = max_size
+        self.ttl = self._validate_ttl(ttl)
+        self.sliding = sliding
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+
+        # key -> (value, expires_at, size, ttl)
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._bytes = 0
+        self.lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_hits = 0
+
+        self.disk = SQLiteCacheStore(disk_path, namespace) if disk_path else None
+
+    @staticmethod
+    def _validate_ttl(ttl: Optional[float]) -> Optional[float]:
+        if ttl is not None and ttl < 0:
+            raise ValueError(f"ttl은 0 이상이어야 합니다 (0/None = 만료 없음): {ttl}")
+        return ttl
+
+    def _resolve_ttl(self, ttl: Optional[float]) -> Optional[float]:
+        """항목 ttl (None이면 캐시 기본값, 만료 없음은 None으로 정규화)"""
+        ttl = self.ttl if ttl is None else self._validate_ttl(ttl)
+        return ttl or None
+
+    @staticmethod
+    def _expires_at(ttl: Optional[float]) -> Optional[float]:
+        return time.time() + ttl if ttl else None
+
+    def _remove(self, key: Hashable):
+        _, _, size, _ = self._data.pop(key)
+        self._bytes -= size
+
+    def _insert(self, key: Hashable, value: Any, expires_at: Optional[float], ttl: Optional[float] = None):
+        if key in self._data:
+            self._remove(key)
+
+        size = self.sizeof(value) if self.max_bytes else 0
+        if self.max_bytes and size > self.max_bytes:
+            # 단일 항목이 전체 한도를 넘으면 메모리에는 두지 않음
+            return
+
+        self._data[key] = (value, expires_at, size, ttl)
+        self._bytes += size
+
+        while len(self._data) > self.max_size or (self.max_bytes and self._bytes > self.max_bytes):
+            _, (_, _, evicted_size, _) = self._data.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시에서 값 조회 (메모리 → 디스크 순)"""
+        with self.lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, expires_at, size, ttl = entry
+                if expires_at is None or expires_at > time.time():
+                    if self.sliding and ttl is not None:
+                        self._data[key] = (value, self._expires_at(ttl), size, ttl)
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._remove(key)
+                self.expirations += 1
+
+            if self.disk is None:
+                self.misses += 1
+                return default
+
+        value, expires_at = self.disk.get(key)
+        with self.lock:
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self._insert(key, value, expires_at)
+            self.hits += 1
+            self.disk_hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """캐시에 값 저장 (디스크 계층이 있으면 write-through, ttl=None은 기본값, 0은 만료 없음)"""
+        ttl = self._resolve_ttl(ttl)
+        expires_at = self._expires_at(ttl)
+        with self.lock:
+            self._insert(key, value, expires_at, ttl)
+
+        if self.disk is not None:
+            self.disk.set(key, value, expires_at)
+
+    def delete(self, key: Hashable):
+        """항목 삭제"""
+        with self.lock:
+            if key in self._data:
+                self._remove(key)
+        if self.disk is not None:
+            self.disk.delete(key)
+
+    def clear(self, include_disk: bool = True):
+        """캐시 전체 삭제"""
+        with self.lock:
+            self._data.clear()
+            self._bytes = 0
+        if include_disk and self.disk is not None:
+            self.disk.clear()
+
+    def keys(self):
+        """메모리 계층 키 목록 (LRU → MRU 순)"""
+        with self.lock:
+            return list(self._data.keys())
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self.lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.time())
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """캐시 통계 반환"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._data),
+                'max_size': self.max_size,
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups * 100 if lookups > 0 else 0,
+                'disk_enabled': self.disk is not None,
+            }
+
+    def reset_stats(self):
+        """카운터 초기화"""
+        with self.lock:
+            self.hits = self.misses = self.evictions = self.expirations = self.disk_hits = 0
+
+
+# 네임스페이스별 영구 캐시 (프로세스 내 공유)
+_persistent_caches: Dict[str, LRUCache] = {}
+_persistent_lock = threading.Lock()
+
+# 네임스페이스별 기본 TTL (초)
+PERSISTENT_CACHE_TTLS = {
+    'trend_charts': 7 * 86400,         # 추세 차트 Figure JSON (키에 데이터 버전 포함)
+}
+
+
+def get_persistent_cache(namespace: str, ttl: Optional[float] = None,
+                         max_size: int = 5000, max_bytes: Optional[int] = 64 * 1024 * 1024,
+                         disk_path: Union[str, Path, None] = None) -> LRUCache:
+    """디스크 계층이 붙은 네임스페이스 캐시 반환 (재시작 후에도 유지)"""
+    with _persistent_lock:
+        cache = _persistent_caches.get(namespace)
+        if cache is None:
+            cache = LRUCache(
+                max_size=max_size,
+                ttl=ttl if ttl is not None else PERSISTENT_CACHE_TTLS.get(namespace, 86400),
+                max_bytes=max_bytes,
+                disk_path=disk_path or os.getenv('FDV_CACHE_PATH') or DEFAULT_DISK_CACHE_PATH,
+                namespace=namespace,
+            )
+            _persistent_caches[namespace] = cache
+        return cache
@@ -11,6 +11,11 @@ from scipy import stats
 import warnings
 import logging
 
+try:
+    from .rolling_windows import ema, rolling_max, rolling_mean, rolling_min, rolling_std, wilder
+except ImportError:
+    from rolling_windows import ema, rolling_max, rolling_mean, rolling_min, rolling_std, wilder
+
 logger = logging.getLogger(__name__)
 
 class CalculationError(Exception):
@@ -269,18 +274,18 @@ class ValuationCalculator:
         if discount_rate <= 0:
             raise CalculationError("할인율은 0보다 커야 합니다.")
         
-        present_value = 0
+        flows = np.asarray(cash_flows, dtype=float)
+        discount_factors = (1 + discount_rate) ** -np.arange(1, len(flows) + 1)
         
         # 예측 기간 현금흐름 할인
-        for i, cf in enumerate(cash_flows[:-1]):
-            present_value += cf / (1 + discount_rate) ** (i + 1)
+        present_value = float(np.dot(flows[:-1], discount_factors[:-1]))
         
         # 터미널 가치 계산
-        terminal_cf = cash_flows[-1] * (1 + terminal_growth_rate)
+        terminal_cf = flows[-1] * (1 + terminal_growth_rate)
         terminal_value = terminal_cf / (discount_rate - terminal_growth_rate)
-        terminal_pv = terminal_value / (1 + discount_rate) ** len(cash_flows)
+        terminal_pv = terminal_value * discount_factors[-1]
         
-        return present_value + terminal_pv
+        return present_value + float(terminal_pv)
     
     @staticmethod
     def calculate_ddm(dividends: List[float], discount_rate: float,
@@ -340,77 +345,35 @@ class TechnicalCalculator:
     
     @staticmethod
     def calculate_sma(prices: List[float], period: int) -> List[float]:
-        """단순이동평균 계산"""
+        """단순이동평균 계산 (누적합 차분)"""
         if len(prices) < period:
             raise CalculationError(f"최소 {period}개의 가격 데이터가 필요합니다.")
         
-        sma_values = []
-        for i in range(period - 1, len(prices)):
-            sma = np.mean(prices[i - period + 1:i + 1])
-            sma_values.append(sma)
-        
-        return sma_values
+        return rolling_mean(prices, period)[period - 1:].tolist()
     
     @staticmethod
     def calculate_ema(prices: List[float], period: int) -> List[float]:
-        """지수이동평균 계산"""
+        """지수이동평균 계산 (첫 값은 period개 단순평균)"""
         if len(prices) < period:
             raise CalculationError(f"최소 {period}개의 가격 데이터가 필요합니다.")
         
-        ema_values = []
-        multiplier = 2 / (period + 1)
-        
-        # 첫 번째 EMA는 SMA로 계산
-        ema = np.mean(prices[:period])
-        ema_values.append(ema)
-        
-        # 이후 EMA 계산
-        for i in range(period, len(prices)):
-            ema = (prices[i] * multiplier) + (ema * (1 - multiplier))
-            ema_values.append(ema)
-        
-        return ema_values
+        return ema(prices, period)[period - 1:].tolist()
     
     @staticmethod
     def calculate_rsi(prices: List[float], period: int = 14) -> List[float]:
-        """RSI (상대강도지수) 계산"""
+        """RSI (상대강도지수) 계산 (상승/하락폭 Wilder 평활)"""
         if len(prices) < period + 1:
             raise CalculationError(f"최소 {period + 1}개의 가격 데이터가 필요합니다.")
         
-        # 가격 변화 계산
-        price_changes = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
-        
-        gains = [change if change > 0 else 0 for change in price_changes]
-        losses = [-change if change < 0 else 0 for change in price_changes]
-        
-        rsi_values = []
+        price_changes = np.diff(np.asarray(prices, dtype=np.float64))
+        avg_gain = wilder(np.maximum(price_changes, 0.0), period)[period - 1:]
+        avg_loss = wilder(np.maximum(-price_changes, 0.0), period)[period - 1:]
         
-        # 첫 번째 RSI는 단순 평균으로 계산
-        avg_gain = np.mean(gains[:period])
-        avg_loss = np.mean(losses[:period])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = 100 - (100 / (1 + avg_gain / avg_loss))
+        rsi[avg_loss == 0] = 100
         
-        if avg_loss == 0:
-            rsi = 100
-        else:
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-        
-        rsi_values.append(rsi)
-        
-        # 이후 RSI는 지수이동평균으로 계산
-        for i in range(period, len(price_changes)):
-            avg_gain = ((avg_gain * (period - 1)) + gains[i]) / period
-            avg_loss = ((avg_loss * (period - 1)) + losses[i]) / period
-            
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            rsi_values.append(rsi)
-        
-        return rsi_values
+        return rsi.tolist()
     
     @staticmethod
     def calculate_macd(prices: List[float], fast_period: int = 12, 
@@ -447,14 +410,10 @@ class TechnicalCalculator:
             raise CalculationError(f"최소 {period}개의 가격 데이터가 필요합니다.")
         
         sma = TechnicalCalculator.calculate_sma(prices, period)
+        std = rolling_std(prices, period)[period - 1:]
         
-        upper_band = []
-        lower_band = []
-        
-        for i in range(period - 1, len(prices)):
-            std = np.std(prices[i - period + 1:i + 1])
-            upper_band.append(sma[i - period + 1] + (std * std_dev))
-            lower_band.append(sma[i - period + 1] - (std * std_dev))
+        upper_band = (np.asarray(sma) + std * std_dev).tolist()
+        lower_band = (np.asarray(sma) - std * std_dev).tolist()
         
         return {
             'upper': upper_band,
@@ -473,18 +432,14 @@ class TechnicalCalculator:
         if len(closes) < k_period:
             raise CalculationError(f"최소 {k_period}개의 데이터가 필요합니다.")
         
-        k_values = []
-        
-        for i in range(k_period - 1, len(closes)):
-            highest_high = max(highs[i - k_period + 1:i + 1])
-            lowest_low = min(lows[i - k_period + 1:i + 1])
-            
-            if highest_high == lowest_low:
-                k = 50  # 중간값으로 설정
-            else:
-                k = ((closes[i] - lowest_low) / (highest_high - lowest_low)) * 100
-            
-            k_values.append(k)
+        highest_high = rolling_max(highs, k_period)[k_period - 1:]
+        lowest_low = rolling_min(lows, k_period)[k_period - 1:]
+        price_range = highest_high - lowest_low
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            k = (np.asarray(closes, dtype=np.float64)[k_period - 1:] - lowest_low) / price_range * 100
+        k[price_range == 0] = 50  # 중간값으로 설정
+        k_values = k.tolist()
         
         # %D 계산 (K의 이동평균)
         d_values = TechnicalCalculator.calculate_sma(k_values, d_period)
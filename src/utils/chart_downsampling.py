@@ -0,0 +1,209 @@
+"""
+차트 다운샘플링 유틸리티
+장기 주가 차트를 그리기 전에 데이터 포인트 수를 화면 해상도 수준으로 줄임
+
+- OHLCV 봉 집계: 일봉 → 주봉/월봉 (시가=첫값, 고가=최대, 저가=최소, 종가=마지막, 거래량=합계)
+- 포인트 예산 기반 주기 자동 선택 (일봉이 예산 안이면 그대로 사용)
+- LTTB(Largest-Triangle-Three-Buckets) 라인 다운샘플링 (모양을 보존하며 포인트 선택)
+
+plotly 의존성이 없어 차트 생성 전 단계(스크립트, 캐시 키 계산 등)에서 바로 사용할 수 있다.
+
+사용법:
+    plot_df, freq = downsample_for_chart(df, max_points=max_points_for_width(1200))
+"""
+
+import logging
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# 차트 한 개에 그릴 최대 봉 수 (1200px 기준 봉당 2px)
+DEFAULT_MAX_POINTS = 600
+
+FREQUENCY_LABELS = {
+    'D': '일봉',
+    'W': '주봉',
+    'M': '월봉',
+}
+
+# 주봉은 금요일 마감 기준
+_PERIOD_RULES = {
+    'W': 'W-FRI',
+    'M': 'M',
+}
+
+# 주기별 일봉 환산 개수 (주기 자동 선택용)
+_BARS_PER_PERIOD = {
+    'D': 1,
+    'W': 5,
+    'M': 21,
+}
+
+
+def max_points_for_width(width_px: int, px_per_point: float = 2.0) -> int:
+    """차트 폭(px)에서 표시 가능한 포인트 수 계산"""
+    return max(int(width_px / px_per_point), 10)
+
+
+def choose_frequency(n_rows: int, max_points: Optional[int] = DEFAULT_MAX_POINTS) -> str:
+    """포인트 예산에 맞는 가장 촘촘한 봉 주기 선택 ('D', 'W', 'M')"""
+    if not max_points or n_rows <= max_points:
+        return 'D'
+    for freq in ('W', 'M'):
+        if n_rows / _BARS_PER_PERIOD[freq] <= max_points:
+            return freq
+    return 'M'
+
+
+def _find_column(df: pd.DataFrame, name: str) -> Optional[str]:
+    """대소문자 구분 없이 컬럼 찾기 ('close' / 'Close')"""
+    for column in df.columns:
+        if isinstance(column, str) and column.lower() == name:
+            return column
+    return None
+
+
+def ohlcv_columns(df: pd.DataFrame) -> Dict[str, str]:
+    """DataFrame의 OHLCV 컬럼명 매핑 (open/high/low/close/volume → 실제 컬럼명)"""
+    mapping = {}
+    for name in ('open', 'high', 'low', 'close', 'volume'):
+        column = _find_column(df, name)
+        if column is not None:
+            mapping[name] = column
+    return mapping
+
+
+def aggregate_ohlcv(df: pd.DataFrame, freq: str,
+                    sum_columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    일봉 DataFrame을 주봉/월봉으로 집계
+
+    Args:
+        df: DatetimeIndex를 가진 일봉 데이터
+        freq: 'D'(그대로), 'W'(주봉), 'M'(월봉)
+        sum_columns: 합계로 집계할 추가 컬럼 (기본: 거래량만)
+
+    Returns:
+        집계된 DataFrame (인덱스는 각 구간의 마지막 실제 거래일)
+
+    OHLCV 외 컬럼(이동평균, RSI 등 지표)은 구간의 마지막 유효값을 사용한다.
+    """
+    if freq == 'D' or df.empty:
+        return df
+    if freq not in _PERIOD_RULES:
+        raise ValueError(f"지원하지 않는 주기: {freq}")
+
+    if not isinstance(df.index, pd.DatetimeIndex):
+        df = df.copy()
+        df.index = pd.to_datetime(df.index)
+
+    columns = ohlcv_columns(df)
+    agg = {column: 'last' for column in df.columns}
+    if 'open' in columns:
+        agg[columns['open']] = 'first'
+    if 'high' in columns:
+        agg[columns['high']] = 'max'
+    if 'low' in columns:
+        agg[columns['low']] = 'min'
+    if 'volume' in columns:
+        agg[columns['volume']] = 'sum'
+    for column in sum_columns or ():
+        if column in agg:
+            agg[column] = 'sum'
+
+    periods = df.index.to_period(_PERIOD_RULES[freq])
+    grouped = df.groupby(periods, sort=True)
+    result = grouped.agg(agg)
+
+    # 구간 라벨 대신 실제 마지막 거래일을 x축 값으로 사용 (호버/신호 표시 일관성)
+    last_dates = pd.Series(df.index, index=df.index).groupby(periods, sort=True).max()
+    result.index = pd.DatetimeIndex(last_dates.values, name=df.index.name)
+    return result[list(df.columns)]
+
+
+def lttb_indices(y, threshold: int, x=None) -> np.ndarray:
+    """
+    LTTB 알고리즘으로 남길 포인트의 인덱스 선택
+
+    첫/마지막 포인트는 항상 포함되며, 나머지 구간마다 인접 구간과 만드는 삼각형
+    면적이 최대인 포인트 하나를 고른다. NaN 값은 후보에서 제외한다.
+    """
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    valid = np.flatnonzero(np.isfinite(y))
+    if threshold >= len(valid) or threshold < 3:
+        return valid if len(valid) < n else np.arange(n)
+
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+    xs, ys = x[valid], y[valid]
+    m = len(valid)
+
+    # 첫/마지막 포인트 사이를 threshold-2개 구간으로 분할
+    edges = np.floor(np.linspace(1, m - 1, threshold - 1)).astype(np.int64)
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = m - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start = end
+        next_end = edges[i + 2] if i + 2 < len(edges) else m
+        avg_x = xs[next_start:next_end].mean()
+        avg_y = ys[next_start:next_end].mean()
+
+        area = np.abs((xs[a] - avg_x) * (ys[start:end] - ys[a])
+                      - (xs[a] - xs[start:end]) * (avg_y - ys[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return valid[selected]
+
+
+def lttb_downsample(df: pd.DataFrame, column: str, max_points: int) -> pd.DataFrame:
+    """기준 컬럼의 모양을 보존하도록 LTTB로 행 선택 (다른 컬럼은 같은 행을 공유)"""
+    if max_points is None or len(df) <= max_points:
+        return df
+    return df.iloc[lttb_indices(df[column].to_numpy(dtype=float, na_value=np.nan), max_points)]
+
+
+def downsample_for_chart(df: pd.DataFrame, max_points: Optional[int] = DEFAULT_MAX_POINTS,
+                         freq: Optional[str] = None,
+                         sum_columns: Optional[Iterable[str]] = None) -> Tuple[pd.DataFrame, str]:
+    """
+    차트용 다운샘플링
+
+    OHLC 컬럼이 있으면 봉 집계(일/주/월)를, 없으면 종가(또는 첫 숫자 컬럼) 기준 LTTB를 적용한다.
+
+    Args:
+        df: DatetimeIndex를 가진 일봉 데이터
+        max_points: 포인트 예산 (None이면 다운샘플링 안 함)
+        freq: 봉 주기 강제 지정 ('D', 'W', 'M'), None이면 예산에 맞춰 자동 선택
+        sum_columns: 봉 집계 시 합계로 집계할 추가 컬럼
+
+    Returns:
+        (다운샘플링된 DataFrame, 적용 주기) - LTTB 적용 시 주기는 'D'
+    """
+    if df.empty:
+        return df, 'D'
+
+    columns = ohlcv_columns(df)
+    if all(name in columns for name in ('open', 'high', 'low', 'close')):
+        freq = freq or choose_frequency(len(df), max_points)
+        result = aggregate_ohlcv(df, freq, sum_columns=sum_columns)
+        if freq != 'D':
+            logger.debug(f"차트 봉 집계: {len(df)}일 → {len(result)}개 ({FREQUENCY_LABELS[freq]})")
+        return result, freq
+
+    if max_points is None or len(df) <= max_points:
+        return df, 'D'
+    base_column = columns.get('close')
+    if base_column is None:
+        numeric = df.select_dtypes(include='number').columns
+        if len(numeric) == 0:
+            return df, 'D'
+        base_column = numeric[0]
+    return lttb_downsample(df, base_column, max_points), 'D'
@@ -12,6 +12,11 @@ from typing import Dict, List, Optional, Union, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 
+try:
+    from .chart_downsampling import DEFAULT_MAX_POINTS, FREQUENCY_LABELS, downsample_for_chart
+except ImportError:
+    from chart_downsampling import DEFAULT_MAX_POINTS, FREQUENCY_LABELS, downsample_for_chart
+
 logger = logging.getLogger(__name__)
 
 class ChartError(Exception):
@@ -68,14 +73,25 @@ class StockChartGenerator:
     def create_candlestick_chart(self, df: pd.DataFrame, 
                                title: str = "주가 차트",
                                volume: bool = True,
-                               ma_periods: List[int] = [20, 60]) -> go.Figure:
-        """캔들스틱 차트 생성"""
+                               ma_periods: List[int] = [20, 60],
+                               max_points: Optional[int] = DEFAULT_MAX_POINTS) -> go.Figure:
+        """캔들스틱 차트 생성 (max_points 초과 시 주봉/월봉으로 집계, None이면 일봉 그대로)"""
         try:
             # 데이터 검증
             required_columns = ['Open', 'High', 'Low', 'Close']
             if not all(col in df.columns for col in required_columns):
                 raise ChartError(f"필수 컬럼 누락: {required_columns}")
             
+            # 이동평균은 일봉 기준으로 먼저 계산한 뒤 봉 집계
+            for period in ma_periods:
+                ma_col = f'MA_{period}'
+                if len(df) >= period and ma_col not in df.columns:
+                    df[ma_col] = df['Close'].rolling(window=period).mean()
+            
+            plot_df, freq = downsample_for_chart(df, max_points)
+            if freq != 'D':
+                title = f"{title} ({FREQUENCY_LABELS[freq]})"
+            
             # 서브플롯 생성
             if volume and 'Volume' in df.columns:
                 fig = make_subplots(
@@ -91,11 +107,11 @@ class StockChartGenerator:
             # 캔들스틱 차트 추가
             fig.add_trace(
                 go.Candlestick(
-                    x=df.index,
-                    open=df['Open'],
-                    high=df['High'],
-                    low=df['Low'],
-                    close=df['Close'],
+                    x=plot_df.index,
+                    open=plot_df['Open'],
+                    high=plot_df['High'],
+                    low=plot_df['Low'],
+                    close=plot_df['Close'],
                     name='Price',
                     increasing_line_color=self.theme.COLORS['bull'],
                     decreasing_line_color=self.theme.COLORS['bear']
@@ -105,15 +121,12 @@ class StockChartGenerator:
             
             # 이동평균선 추가
             for period in ma_periods:
-                if len(df) >= period:
-                    ma_col = f'MA_{period}'
-                    if ma_col not in df.columns:
-                        df[ma_col] = df['Close'].rolling(window=period).mean()
-                    
+                ma_col = f'MA_{period}'
+                if ma_col in plot_df.columns:
                     fig.add_trace(
                         go.Scatter(
-                            x=df.index,
-                            y=df[ma_col],
+                            x=plot_df.index,
+                            y=plot_df[ma_col],
                             name=f'MA{period}',
                             line=dict(width=2),
                             opacity=0.8
@@ -124,12 +137,12 @@ class StockChartGenerator:
             # 거래량 차트 추가
             if volume and 'Volume' in df.columns:
                 colors = [self.theme.COLORS['bull'] if close >= open else self.theme.COLORS['bear'] 
-                         for close, open in zip(df['Close'], df['Open'])]
+                         for close, open in zip(plot_df['Close'], plot_df['Open'])]
                 
                 fig.add_trace(
                     go.Bar(
-                        x=df.index,
-                        y=df['Volume'],
+                        x=plot_df.index,
+                        y=plot_df['Volume'],
                         name='Volume',
                         marker_color=colors,
                         opacity=0.7
@@ -163,11 +176,16 @@ class StockChartGenerator:
     def create_line_chart(self, df: pd.DataFrame, 
                          columns: List[str],
                          title: str = "주가 추이",
-                         colors: List[str] = None) -> go.Figure:
-        """라인 차트 생성"""
+                         colors: List[str] = None,
+                         max_points: Optional[int] = DEFAULT_MAX_POINTS) -> go.Figure:
+        """라인 차트 생성 (max_points 초과 시 종가 또는 첫 컬럼 기준 LTTB 다운샘플링)"""
         try:
             fig = go.Figure()
             
+            plot_columns = [column for column in columns if column in df.columns]
+            if plot_columns:
+                df, _ = downsample_for_chart(df[plot_columns], max_points)
+            
             if colors is None:
                 colors = [self.theme.COLORS['primary'], self.theme.COLORS['secondary'], 
                          self.theme.COLORS['success'], self.theme.COLORS['warning']]
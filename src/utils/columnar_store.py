@@ -0,0 +1,408 @@
+"""
+컬럼형(Parquet) 분석용 스냅샷
+stock_prices / technical_indicators / financial_ratios를 시장·연도별 Parquet으로 보관하고
+Arrow로 읽어 전 종목 횡단면 분석 시 SQLite를 거치지 않도록 한다.
+
+- 파티션: <root>/<table>/market=KOSPI/year=2024/part-0.parquet (hive 형식)
+- 증분 갱신: id(rowid) / updated_at 워터마크 이후 행만 읽어 해당 파티션만 재작성
+  (INSERT OR REPLACE로 id가 바뀐 행은 키 기준으로 최신 값만 유지)
+- 읽기: 메모리 맵 + 컬럼 선택 + 조건 푸시다운 (파티션 단위 pruning 포함)
+- 내보내기는 읽기 전용 연결의 단일 읽기 트랜잭션에서 수행하므로 수집기 쓰기를 막지 않음
+
+사용법:
+    store = get_columnar_store()
+    store.export_all()                                   # 증분 갱신
+    df = store.load_table('stock_prices', columns=['stock_code', 'date', 'close_price'],
+                          start_date='2024-01-01', markets=['KOSPI'])
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+DEFAULT_STOCK_DB_PATH = PROJECT_ROOT / 'data' / 'databases' / 'stock_data.db'
+DEFAULT_COLUMNAR_ROOT = PROJECT_ROOT / 'data' / 'columnar'
+
+# 테이블별 키 / 연도 기준 컬럼 / 증분 워터마크 컬럼
+TABLE_SPECS = {
+    'stock_prices': {
+        'key': ['stock_code', 'date'],
+        'date_column': 'date',
+        'watermarks': ['id', 'updated_at'],  # upsert 정정은 id를 유지하고 updated_at만 갱신
+    },
+    'technical_indicators': {
+        'key': ['stock_code', 'date'],
+        'date_column': 'date',
+        'watermarks': ['id', 'updated_at'],  # upsert 정정은 id를 유지하고 updated_at만 갱신
+    },
+    'financial_ratios': {
+        'key': ['stock_code', 'year', 'quarter'],
+        'date_column': None,
+        'watermarks': ['id', 'updated_at'],  # 스코어카드가 행을 제자리 UPDATE
+    },
+}
+
+PARTITION_COLUMNS = ['market', 'year']
+UNKNOWN_MARKET = 'UNKNOWN'
+EXPORT_CHUNK_ROWS = 500_000
+
+
+def _require_pyarrow():
+    if not PYARROW_AVAILABLE:
+        raise ImportError("컬럼형 스냅샷에는 pyarrow가 필요합니다: pip install pyarrow")
+
+
+def _arrow_type(declared: str):
+    """SQLite 선언 타입 → Arrow 타입"""
+    declared = (declared or '').upper()
+    if 'INT' in declared:
+        return pa.int64()
+    if any(t in declared for t in ('REAL', 'FLOA', 'DOUB', 'NUMERIC', 'DECIMAL')):
+        return pa.float64()
+    return pa.string()
+
+
+class ColumnarStore:
+    """SQLite 테이블의 시장·연도 파티션 Parquet 스냅샷 관리"""
+
+    def __init__(self, db_path: Union[str, Path, None] = None, root: Union[str, Path, None] = None):
+        _require_pyarrow()
+        self.db_path = Path(db_path) if db_path else DEFAULT_STOCK_DB_PATH
+        self.root = Path(root) if root else Path(os.getenv('FDV_COLUMNAR_PATH', DEFAULT_COLUMNAR_ROOT))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.filesystem = pafs.LocalFileSystem(use_mmap=True)
+        self.lock = threading.Lock()
+
+    # ------------------------------------------------------------------ 메타데이터
+
+    def table_dir(self, table: str) -> Path:
+        return self.root / table
+
+    def _manifest_path(self, table: str) -> Path:
+        return self.table_dir(table) / '_manifest.json'
+
+    def load_manifest(self, table: str) -> Optional[Dict[str, Any]]:
+        """내보내기 상태 (워터마크, 행 수, 스키마)"""
+        path = self._manifest_path(table)
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except Exception as e:
+            logger.warning(f"매니페스트 읽기 실패 ({table}): {e}")
+            return None
+
+    def _save_manifest(self, table: str, manifest: Dict[str, Any]):
+        path = self._manifest_path(table)
+        tmp_path = path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding='utf-8')
+        os.replace(tmp_path, path)
+
+    def has_snapshot(self, table: str) -> bool:
+        return self.load_manifest(table) is not None
+
+    # ------------------------------------------------------------------ 내보내기
+
+    def _connect(self) -> sqlite3.Connection:
+        """읽기 전용 연결 (WAL 모드에서 쓰기와 경합하지 않음)
+
+        write_dataset이 배치 생성기를 작업 스레드에서 소비하므로 check_same_thread를 끈다
+        (연결은 한 번에 한 스레드만 사용).
+        """
+        conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, timeout=30,
+                               check_same_thread=False)
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _schema(self, conn: sqlite3.Connection, table: str) -> 'pa.Schema':
+        """SQLite 컬럼 + 파티션 컬럼 스키마 (year는 int32로 통일)"""
+        columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+        if not columns:
+            raise ValueError(f"테이블이 존재하지 않습니다: {table}")
+        fields = [pa.field(name, pa.int32() if name == 'year' else _arrow_type(declared))
+                  for _, name, declared, *_ in columns]
+        names = {f.name for f in fields}
+        fields.append(pa.field('market', pa.string()))
+        if 'year' not in names:
+            fields.append(pa.field('year', pa.int32()))
+        return pa.schema(fields)
+
+    @staticmethod
+    def _market_map(conn: sqlite3.Connection) -> Dict[str, str]:
+        try:
+            rows = conn.execute("SELECT stock_code, market_type FROM company_info").fetchall()
+        except sqlite3.Error:
+            return {}
+        return {code: (market or UNKNOWN_MARKET).strip().upper() or UNKNOWN_MARKET for code, market in rows}
+
+    def _to_arrow(self, df: pd.DataFrame, table: str, schema: 'pa.Schema',
+                  markets: Dict[str, str]) -> 'pa.Table':
+        """SQLite 청크 → 파티션 컬럼이 붙은 Arrow 테이블"""
+        spec = TABLE_SPECS[table]
+        df = df.copy()
+        df['market'] = df['stock_code'].map(markets).fillna(UNKNOWN_MARKET)
+        if spec['date_column']:
+            df['year'] = pd.to_numeric(df[spec['date_column']].astype(str).str[:4], errors='coerce')
+        else:
+            df['year'] = pd.to_numeric(df['year'], errors='coerce')
+        df['year'] = df['year'].fillna(0).astype('int32')
+        return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+
+    def _read_watermarks(self, conn: sqlite3.Connection, table: str) -> Dict[str, Any]:
+        columns = TABLE_SPECS[table]['watermarks']
+        row = conn.execute(f"SELECT {', '.join(f'MAX({c})' for c in columns)} FROM {table}").fetchone()
+        return dict(zip(columns, row))
+
+    def _changed_rows_query(self, table: str, watermarks: Dict[str, Any]):
+        """증분 조회 쿼리 (워터마크 이후 삽입/수정된 행)"""
+        conditions, params = [], []
+        for column, value in watermarks.items():
+            if value is None:
+                continue
+            conditions.append(f"{column} > ?")
+            params.append(value)
+        if not conditions:
+            return f"SELECT * FROM {table}", []
+        return f"SELECT * FROM {table} WHERE {' OR '.join(conditions)}", params
+
+    def export_table(self, table: str, rebuild: bool = False) -> Dict[str, Any]:
+        """테이블 스냅샷 갱신 (매니페스트가 없거나 스키마가 바뀌면 전체 재작성)"""
+        if table not in TABLE_SPECS:
+            raise ValueError(f"지원하지 않는 테이블: {table}")
+
+        with self.lock:
+            started = datetime.now()
+            conn = self._connect()
+            try:
+                # 단일 읽기 트랜잭션 = 일관된 스냅샷
+                conn.execute("BEGIN")
+                schema = self._schema(conn, table)
+                markets = self._market_map(conn)
+                new_watermarks = self._read_watermarks(conn, table)
+
+                manifest = self.load_manifest(table)
+                full = (rebuild or manifest is None
+                        or manifest.get('columns') != schema.names
+                        or set(manifest.get('watermarks', {})) != set(new_watermarks))
+
+                if full:
+                    rows = self._write_full(conn, table, schema, markets)
+                    partitions = None
+                else:
+                    rows, partitions = self._write_incremental(
+                        conn, table, schema, markets, manifest.get('watermarks', {})
+                    )
+                conn.rollback()
+            finally:
+                conn.close()
+
+            manifest = {
+                'table': table,
+                'watermarks': new_watermarks,
+                'columns': schema.names,
+                'exported_at': started.isoformat(timespec='seconds'),
+                'mode': 'full' if full else 'incremental',
+            }
+            self._save_manifest(table, manifest)
+
+        elapsed = (datetime.now() - started).total_seconds()
+        if full:
+            logger.info(f"📦 {table}: 전체 스냅샷 {rows:,}행 ({elapsed:.1f}초)")
+        else:
+            logger.info(f"📦 {table}: 증분 {rows:,}행, 파티션 {len(partitions)}개 갱신 ({elapsed:.1f}초)")
+        return {'table': table, 'mode': manifest['mode'], 'rows': rows,
+                'partitions': partitions, 'elapsed': elapsed}
+
+    def _iter_batches(self, conn: sqlite3.Connection, query: str, params: List, table: str,
+                      schema: 'pa.Schema', markets: Dict[str, str]):
+        for chunk in pd.read_sql(query, conn, params=params, chunksize=EXPORT_CHUNK_ROWS):
+            if not chunk.empty:
+                yield self._to_arrow(chunk, table, schema, markets)
+
+    def _write_full(self, conn: sqlite3.Connection, table: str, schema: 'pa.Schema',
+                    markets: Dict[str, str]) -> int:
+        """전체 재작성 (임시 디렉토리에 쓴 뒤 교체)"""
+        target = self.table_dir(table)
+        staging = self.root / f".{table}.staging"
+        shutil.rmtree(staging, ignore_errors=True)
+
+        total = 0
+        def batches():
+            nonlocal total
+            for arrow_table in self._iter_batches(conn, f"SELECT * FROM {table}", [], table, schema, markets):
+                total += arrow_table.num_rows
+                yield from arrow_table.to_batches()
+
+        ds.write_dataset(
+            batches(), staging, schema=schema, format='parquet',
+            partitioning=ds.partitioning(pa.schema([schema.field(c) for c in PARTITION_COLUMNS]), flavor='hive'),
+            basename_template='part-{i}.parquet',
+            existing_data_behavior='overwrite_or_ignore',
+            max_rows_per_group=256 * 1024,
+        )
+        staging.mkdir(parents=True, exist_ok=True)
+
+        retired = self.root / f".{table}.retired"
+        shutil.rmtree(retired, ignore_errors=True)
+        if target.exists():
+            os.replace(target, retired)
+        os.replace(staging, target)
+        shutil.rmtree(retired, ignore_errors=True)
+        return total
+
+    def _partition_dir(self, table: str, market: str, year: int) -> Path:
+        return self.table_dir(table) / f"market={market}" / f"year={year}"
+
+    def _write_incremental(self, conn: sqlite3.Connection, table: str, schema: 'pa.Schema',
+                           markets: Dict[str, str], watermarks: Dict[str, Any]):
+        """변경 행이 속한 파티션만 병합 후 재작성"""
+        query, params = self._changed_rows_query(table, watermarks)
+        changed = [t for t in self._iter_batches(conn, query, params, table, schema, markets)]
+        if not changed:
+            return 0, []
+
+        changes = pa.concat_tables(changed).to_pandas()
+        # 파티션 안에서는 market / year가 상수이므로 키에서 제외
+        key = [c for c in TABLE_SPECS[table]['key'] if c not in PARTITION_COLUMNS]
+        part_schema = pa.schema([f for f in schema if f.name not in PARTITION_COLUMNS])
+        touched = []
+
+        for (market, year), part in changes.groupby(['market', 'year'], sort=False):
+            part_dir = self._partition_dir(table, market, int(year))
+            part = part[part_schema.names]
+            if part_dir.exists():
+                existing = ds.dataset(str(part_dir), format='parquet', schema=part_schema,
+                                      filesystem=self.filesystem).to_table().to_pandas()
+                merged = pd.concat([existing, part], ignore_index=True)
+            else:
+                merged = part
+
+            # 같은 키는 나중 값(이번에 읽은 행)만 유지
+            merged = merged.drop_duplicates(subset=key, keep='last')
+            if 'id' in merged.columns:
+                merged = merged.sort_values('id')
+
+            part_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = part_dir / '.part-0.parquet.tmp'  # '.' 접두어 → 읽기 시 무시
+            pq.write_table(pa.Table.from_pandas(merged, schema=part_schema, preserve_index=False), tmp_path)
+
+            for old in part_dir.glob('part-*.parquet'):
+                if old.name != 'part-0.parquet':
+                    old.unlink()
+            os.replace(tmp_path, part_dir / 'part-0.parquet')
+            touched.append(f"{market}/{int(year)}")
+
+        return len(changes), touched
+
+    def export_all(self, tables: Optional[List[str]] = None, rebuild: bool = False) -> Dict[str, Dict]:
+        """여러 테이블 스냅샷 갱신 (실패한 테이블은 건너뜀)"""
+        results = {}
+        for table in tables or list(TABLE_SPECS):
+            try:
+                results[table] = self.export_table(table, rebuild=rebuild)
+            except Exception as e:
+                logger.error(f"❌ {table} 스냅샷 갱신 실패: {e}")
+                results[table] = {'table': table, 'error': str(e)}
+        return results
+
+    # ------------------------------------------------------------------ 읽기
+
+    def dataset(self, table: str) -> 'ds.Dataset':
+        """메모리 맵 Arrow 데이터셋 (파티션 컬럼 market / year 포함)"""
+        manifest = self.load_manifest(table)
+        if manifest is None:
+            raise FileNotFoundError(f"컬럼형 스냅샷이 없습니다: {table} (export_table 먼저 실행)")
+
+        partitioning = ds.partitioning(pa.schema([('market', pa.string()), ('year', pa.int32())]),
+                                       flavor='hive')
+        return ds.dataset(str(self.table_dir(table)), format='parquet', partitioning=partitioning,
+                          filesystem=self.filesystem, ignore_prefixes=['_', '.'])
+
+    def load_table(self, table: str, columns: Optional[List[str]] = None,
+                   stock_codes: Optional[List[str]] = None,
+                   start_date: Optional[str] = None, end_date: Optional[str] = None,
+                   markets: Optional[List[str]] = None,
+                   filter: Optional['ds.Expression'] = None,
+                   as_arrow: bool = False) -> Union[pd.DataFrame, 'pa.Table']:
+        """스냅샷 조회 (컬럼 선택 + 조건 푸시다운)
+
+        start_date/end_date는 'YYYY-MM-DD' (재무비율은 연도 단위로만 적용).
+        filter에는 추가 Arrow 조건식을 줄 수 있다. 예: ds.field('close_price') > ds.field('high_price')
+        """
+        spec = TABLE_SPECS[table]
+        dataset = self.dataset(table)
+        conditions = []
+
+        if markets:
+            conditions.append(ds.field('market').isin([m.upper() for m in markets]))
+        if stock_codes:
+            conditions.append(ds.field('stock_code').isin(list(stock_codes)))
+        if start_date:
+            conditions.append(ds.field('year') >= int(str(start_date)[:4]))
+            if spec['date_column']:
+                conditions.append(ds.field(spec['date_column']) >= str(start_date))
+        if end_date:
+            conditions.append(ds.field('year') <= int(str(end_date)[:4]))
+            if spec['date_column']:
+                conditions.append(ds.field(spec['date_column']) <= str(end_date))
+        if filter is not None:
+            conditions.append(filter)
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        result = dataset.to_table(columns=columns, filter=expression)
+        return result if as_arrow else result.to_pandas()
+
+
+# 프로세스 내 공유 인스턴스
+_default_store: Optional[ColumnarStore] = None
+_default_lock = threading.Lock()
+
+
+def get_columnar_store() -> ColumnarStore:
+    """기본 경로의 ColumnarStore 반환"""
+    global _default_store
+    with _default_lock:
+        if _default_store is None:
+            _default_store = ColumnarStore()
+        return _default_store
+
+
+def main():
+    """컬럼형 스냅샷 갱신 (파이프라인 단계)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='분석용 Parquet 스냅샷 갱신')
+    parser.add_argument('--tables', nargs='+', choices=list(TABLE_SPECS), help='대상 테이블 (기본: 전체)')
+    parser.add_argument('--rebuild', action='store_true', help='증분 대신 전체 재작성')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    results = get_columnar_store().export_all(args.tables, rebuild=args.rebuild)
+    return 1 if any('error' in r for r in results.values()) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
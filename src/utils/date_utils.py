@@ -12,6 +12,11 @@ import numpy as np
 from dateutil.relativedelta import relativedelta
 import logging
 
+try:
+    from .krx_calendar import get_krx_calendar
+except ImportError:
+    from krx_calendar import get_krx_calendar  # 스크립트로 직접 실행하는 경우
+
 logger = logging.getLogger(__name__)
 
 class DateFormatError(Exception):
@@ -40,18 +45,6 @@ class DateUtils:
         '%Y-%m-%dT%H:%M:%S.%f',  # 2024-01-01T12:00:00.123456
     ]
     
-    # 한국 거래소 휴장일 (고정 휴일)
-    FIXED_HOLIDAYS = {
-        '0101': '신정',
-        '0301': '삼일절',
-        '0505': '어린이날',
-        '0606': '현충일',
-        '0815': '광복절',
-        '1003': '개천절',
-        '1009': '한글날',
-        '1225': '성탄절'
-    }
-    
     @classmethod
     def now(cls, timezone: Optional[str] = 'Asia/Seoul') -> datetime:
         """현재 시간 반환"""
@@ -121,131 +114,36 @@ class DateUtils:
     @classmethod
     def add_business_days(cls, date_input: Union[str, datetime, date], 
                          days: int) -> datetime:
-        """영업일 기준으로 날짜 더하기"""
+        """영업일(KRX 거래일) 기준으로 날짜 더하기"""
         dt = cls.parse_date(date_input)
         
         if days == 0:
             return dt
         
-        # pandas의 business day 기능 사용
-        if days > 0:
-            business_dates = pd.bdate_range(start=dt, periods=days + 1, freq='B')
-            return business_dates[-1].to_pydatetime()
-        else:
-            business_dates = pd.bdate_range(end=dt, periods=abs(days) + 1, freq='B')
-            return business_dates[0].to_pydatetime()
+        result = get_krx_calendar().add_sessions(dt, days)
+        return datetime.combine(result, datetime.min.time())
     
     @classmethod
     def get_business_days_between(cls, start_date: Union[str, datetime, date], 
                                  end_date: Union[str, datetime, date]) -> int:
-        """두 날짜 사이의 영업일 수 계산"""
+        """두 날짜 사이의 영업일(KRX 거래일) 수 계산 (양 끝 포함)"""
         start_dt = cls.parse_date(start_date)
         end_dt = cls.parse_date(end_date)
         
         if start_dt > end_dt:
             return 0
         
-        business_dates = pd.bdate_range(start=start_dt, end=end_dt, freq='B')
-        return len(business_dates)
+        return get_krx_calendar().session_count(start_dt, end_dt)
     
     @classmethod
     def is_business_day(cls, date_input: Union[str, datetime, date]) -> bool:
-        """영업일 여부 확인"""
-        dt = cls.parse_date(date_input)
-        
-        # 주말 확인 (월요일: 0, 일요일: 6)
-        if dt.weekday() >= 5:  # 토요일(5), 일요일(6)
-            return False
-        
-        # 한국 공휴일 확인
-        if cls.is_korean_holiday(dt):
-            return False
-        
-        return True
+        """영업일(KRX 거래일) 여부 확인"""
+        return get_krx_calendar().is_session(cls.parse_date(date_input))
     
     @classmethod
     def is_korean_holiday(cls, date_input: Union[str, datetime, date]) -> bool:
-        """한국 공휴일 여부 확인"""
-        dt = cls.parse_date(date_input)
-        
-        # 고정 휴일 확인
-        date_str = dt.strftime('%m%d')
-        if date_str in cls.FIXED_HOLIDAYS:
-            return True
-        
-        # 음력 공휴일 (간략화된 버전)
-        year = dt.year
-        
-        # 설날 (음력 1월 1일) - 대략적인 계산
-        lunar_new_year = cls._get_lunar_new_year(year)
-        if lunar_new_year:
-            # 설날 연휴 (전날, 당일, 다음날)
-            for i in range(-1, 2):
-                holiday_date = lunar_new_year + timedelta(days=i)
-                if dt.date() == holiday_date:
-                    return True
-        
-        # 부처님 오신 날 (음력 4월 8일) - 대략적인 계산
-        buddha_birthday = cls._get_buddha_birthday(year)
-        if buddha_birthday and dt.date() == buddha_birthday:
-            return True
-        
-        # 추석 (음력 8월 15일) - 대략적인 계산
-        chuseok = cls._get_chuseok(year)
-        if chuseok:
-            # 추석 연휴 (전날, 당일, 다음날)
-            for i in range(-1, 2):
-                holiday_date = chuseok + timedelta(days=i)
-                if dt.date() == holiday_date:
-                    return True
-        
-        return False
-    
-    @classmethod
-    def _get_lunar_new_year(cls, year: int) -> Optional[date]:
-        """설날 날짜 계산 (근사치)"""
-        # 실제로는 음력 계산이 복잡하므로 사전 정의된 값 사용
-        lunar_new_years = {
-            2023: date(2023, 1, 22),
-            2024: date(2024, 2, 10),
-            2025: date(2025, 1, 29),
-            2026: date(2026, 2, 17),
-            2027: date(2027, 2, 6),
-            2028: date(2028, 1, 26),
-            2029: date(2029, 2, 13),
-            2030: date(2030, 2, 3),
-        }
-        return lunar_new_years.get(year)
-    
-    @classmethod
-    def _get_buddha_birthday(cls, year: int) -> Optional[date]:
-        """부처님 오신 날 계산 (근사치)"""
-        buddha_birthdays = {
-            2023: date(2023, 5, 27),
-            2024: date(2024, 5, 15),
-            2025: date(2025, 5, 5),
-            2026: date(2026, 5, 24),
-            2027: date(2027, 5, 13),
-            2028: date(2028, 5, 2),
-            2029: date(2029, 5, 20),
-            2030: date(2030, 5, 9),
-        }
-        return buddha_birthdays.get(year)
-    
-    @classmethod
-    def _get_chuseok(cls, year: int) -> Optional[date]:
-        """추석 날짜 계산 (근사치)"""
-        chuseoks = {
-            2023: date(2023, 9, 29),
-            2024: date(2024, 9, 17),
-            2025: date(2025, 10, 6),
-            2026: date(2026, 9, 25),
-            2027: date(2027, 9, 15),
-            2028: date(2028, 10, 3),
-            2029: date(2029, 9, 22),
-            2030: date(2030, 9, 12),
-        }
-        return chuseoks.get(year)
+        """한국 공휴일(KRX 휴장일) 여부 확인"""
+        return get_krx_calendar().is_holiday(cls.parse_date(date_input))
     
     @classmethod
     def get_quarter(cls, date_input: Union[str, datetime, date]) -> int:
@@ -325,51 +223,20 @@ class DateUtils:
     def get_trading_calendar(cls, start_date: Union[str, datetime, date], 
                            end_date: Union[str, datetime, date]) -> List[date]:
         """거래일 캘린더 생성"""
-        start_dt = cls.parse_date(start_date)
-        end_dt = cls.parse_date(end_date)
-        
-        trading_days = []
-        current_date = start_dt
-        
-        while current_date <= end_dt:
-            if cls.is_business_day(current_date):
-                trading_days.append(current_date.date())
-            current_date += timedelta(days=1)
-        
-        return trading_days
+        sessions = get_krx_calendar().sessions_in_range(cls.parse_date(start_date), cls.parse_date(end_date))
+        return sessions.astype(object).tolist()
     
     @classmethod
     def get_recent_business_day(cls, date_input: Optional[Union[str, datetime, date]] = None) -> date:
-        """가장 최근 영업일 반환"""
-        if date_input is None:
-            dt = cls.now()
-        else:
-            dt = cls.parse_date(date_input)
-        
-        # 해당 날짜가 영업일이면 그대로 반환
-        if cls.is_business_day(dt):
-            return dt.date()
-        
-        # 아니면 이전 영업일 찾기
-        current_date = dt - timedelta(days=1)
-        while not cls.is_business_day(current_date):
-            current_date -= timedelta(days=1)
-        
-        return current_date.date()
+        """가장 최근 영업일 반환 (해당 날짜 포함)"""
+        dt = cls.now() if date_input is None else cls.parse_date(date_input)
+        return get_krx_calendar().session_on_or_before(dt)
     
     @classmethod
     def get_next_business_day(cls, date_input: Optional[Union[str, datetime, date]] = None) -> date:
         """다음 영업일 반환"""
-        if date_input is None:
-            dt = cls.now()
-        else:
-            dt = cls.parse_date(date_input)
-        
-        current_date = dt + timedelta(days=1)
-        while not cls.is_business_day(current_date):
-            current_date += timedelta(days=1)
-        
-        return current_date.date()
+        dt = cls.now() if date_input is None else cls.parse_date(date_input)
+        return get_krx_calendar().next_session(dt)
     
     @classmethod
     def convert_timezone(cls, date_input: Union[str, datetime], 
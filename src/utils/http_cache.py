@@ -0,0 +1,346 @@
+"""
+HTTP 응답 캐시
+DART API / 네이버·다음 금융 스크래핑 응답을 디스크에 보관하고 재사용
+
+- URL + 파라미터 기준 캐시 키
+- 소스별 TTL (TTL 내에는 네트워크 요청 없이 로컬 응답 반환)
+- TTL 경과 후 ETag / Last-Modified 조건부 요청 (304 → 로컬 본문 재사용)
+- 본문 SHA-256 해시로 변경 여부 판단, 파싱 결과를 해시 기준으로 캐시해 재파싱 생략
+- 소스별 저장 조건 (예: DART는 HTTP 200이라도 status 000/013 응답만 저장)
+
+사용법:
+    fetcher = CachedHTTPFetcher(session=self.session)
+    result = fetcher.fetch_parsed(url, parse_fn, parser_key='naver_ratios', source='naver_finance')
+"""
+
+import json
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HTTP_CACHE_PATH = Path(__file__).parent.parent.parent / 'data' / 'cache' / 'http_cache.db'
+
+# 소스별 TTL (초)
+SOURCE_TTLS = {
+    'dart': 24 * 3600,             # DART 공시/재무 API
+    'dart_corp_codes': 7 * 24 * 3600,
+    'naver_finance': 6 * 3600,     # 네이버 종목 메인 (PER/PBR, 상장주식수)
+    'naver_forecast': 24 * 3600,   # 네이버 추정실적 / 투자의견
+    'daum_finance': 6 * 3600,
+    'default': 3600,
+}
+
+# DART 응답 중 캐시해도 되는 status (000: 정상, 013: 조회된 데이터 없음)
+DART_CACHEABLE_STATUS = frozenset({'000', '013'})
+
+
+def _dart_cacheable(response: 'CachedResponse') -> bool:
+    """DART API는 키 오류/사용한도 초과도 HTTP 200으로 돌려주므로 본문 status로 판단"""
+    try:
+        return str(response.json().get('status')) in DART_CACHEABLE_STATUS
+    except (ValueError, AttributeError):
+        return False
+
+
+# 소스별 저장 조건 (2xx 응답 중 추가 검사, 없으면 2xx 전부 저장)
+SOURCE_CACHEABLE: Dict[str, Callable[['CachedResponse'], bool]] = {
+    'dart': _dart_cacheable,
+}
+
+
+@dataclass
+class CachedResponse:
+    """캐시 계층을 거친 HTTP 응답"""
+    url: str
+    status_code: int
+    content: bytes
+    encoding: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    content_hash: str = ''
+    from_cache: bool = False      # 네트워크 요청 없이 반환됨
+    not_modified: bool = False    # 조건부 요청 결과 304
+    changed: bool = True          # 이전에 본 본문과 내용이 다름
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 300
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if not self.ok:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+
+class HTTPResponseCache:
+    """SQLite 기반 HTTP 응답 / 파싱 결과 저장소"""
+
+    def __init__(self, db_path: Union[str, Path, None] = None):
+        self.db_path = Path(db_path) if db_path else DEFAULT_HTTP_CACHE_PATH
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock = threading.Lock()
+
+        self.conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript('''
+            CREATE TABLE IF NOT EXISTS http_responses (
+                cache_key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                source TEXT,
+                status_code INTEGER,
+                headers TEXT,
+                encoding TEXT,
+                body BLOB,
+                content_hash TEXT,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                expires_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS parsed_results (
+                parser_key TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                value BLOB,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (parser_key, content_hash)
+            );
+            CREATE INDEX IF NOT EXISTS idx_http_responses_source ON http_responses(source);
+        ''')
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict] = None) -> str:
+        """URL + 파라미터 캐시 키 (인증키 등 crtfc_key는 제외)"""
+        items = sorted((k, str(v)) for k, v in (params or {}).items() if k != 'crtfc_key')
+        return hashlib.sha1(json.dumps([url, items], ensure_ascii=False).encode('utf-8')).hexdigest()
+
+    def load(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT url, status_code, headers, encoding, body, content_hash, etag, last_modified, '
+                'fetched_at, expires_at FROM http_responses WHERE cache_key = ?', (cache_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ['url', 'status_code', 'headers', 'encoding', 'body', 'content_hash',
+                'etag', 'last_modified', 'fetched_at', 'expires_at']
+        entry = dict(zip(keys, row))
+        entry['headers'] = json.loads(entry['headers'] or '{}')
+        return entry
+
+    def store(self, cache_key: str, source: str, response: CachedResponse,
+              etag: Optional[str], last_modified: Optional[str], ttl: float):
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO http_responses '
+                '(cache_key, url, source, status_code, headers, encoding, body, content_hash, '
+                ' etag, last_modified, fetched_at, expires_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (cache_key, response.url, source, response.status_code,
+                 json.dumps(response.headers, ensure_ascii=False), response.encoding,
+                 sqlite3.Binary(response.content), response.content_hash,
+                 etag, last_modified, now, now + ttl)
+            )
+            self.conn.commit()
+
+    def touch(self, cache_key: str, ttl: float):
+        """304 응답 시 만료 시각만 연장"""
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                'UPDATE http_responses SET fetched_at = ?, expires_at = ? WHERE cache_key = ?',
+                (now, now + ttl, cache_key)
+            )
+            self.conn.commit()
+
+    def get_parsed(self, parser_key: str, content_hash: str) -> tuple:
+        with self.lock:
+            row = self.conn.execute(
+                'SELECT value FROM parsed_results WHERE parser_key = ? AND content_hash = ?',
+                (parser_key, content_hash)
+            ).fetchone()
+        if row is None:
+            return False, None
+        try:
+            return True, pickle.loads(row[0])
+        except Exception:
+            return False, None
+
+    def set_parsed(self, parser_key: str, content_hash: str, value: Any):
+        try:
+            blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"파싱 결과 직렬화 불가: {e}")
+            return
+        with self.lock:
+            self.conn.execute(
+                'INSERT OR REPLACE INTO parsed_results (parser_key, content_hash, value, created_at) '
+                'VALUES (?, ?, ?, ?)',
+                (parser_key, content_hash, sqlite3.Binary(blob), time.time())
+            )
+            self.conn.commit()
+
+    def invalidate(self, source: Optional[str] = None):
+        """캐시 무효화 (source 지정 시 해당 소스만)"""
+        with self.lock:
+            if source:
+                self.conn.execute('DELETE FROM http_responses WHERE source = ?', (source,))
+            else:
+                self.conn.execute('DELETE FROM http_responses')
+                self.conn.execute('DELETE FROM parsed_results')
+            self.conn.commit()
+
+    def purge_parsed(self):
+        """더 이상 어떤 응답 본문과도 연결되지 않은 파싱 결과 정리"""
+        with self.lock:
+            self.conn.execute(
+                'DELETE FROM parsed_results WHERE content_hash NOT IN '
+                '(SELECT content_hash FROM http_responses WHERE content_hash IS NOT NULL)'
+            )
+            self.conn.commit()
+
+
+class CachedHTTPFetcher:
+    """조건부 요청을 지원하는 캐시 HTTP 클라이언트"""
+
+    def __init__(self, session=None, cache: Optional[HTTPResponseCache] = None,
+                 db_path: Union[str, Path, None] = None, ttls: Optional[Dict[str, float]] = None,
+                 cacheable: Optional[Dict[str, Callable[[CachedResponse], bool]]] = None):
+        if session is None:
+            import requests
+            session = requests.Session()
+        self.session = session
+        self.cache = cache or _get_shared_cache(db_path)
+        self.ttls = dict(SOURCE_TTLS, **(ttls or {}))
+        self.cacheable = dict(SOURCE_CACHEABLE, **(cacheable or {}))
+        self.stats = {'network': 0, 'cache_hits': 0, 'not_modified': 0, 'unchanged': 0, 'parse_skipped': 0,
+                      'not_stored': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def is_cacheable(self, response: CachedResponse, source: str) -> bool:
+        """저장 여부 (2xx + 소스별 조건)"""
+        if not response.ok:
+            return False
+        predicate = self.cacheable.get(source)
+        return predicate is None or predicate(response)
+
+    def fetch(self, url: str, params: Optional[Dict] = None, headers: Optional[Dict] = None,
+              source: str = 'default', timeout: float = 10, force: bool = False) -> CachedResponse:
+        """URL 조회 (TTL 내 로컬 응답, 이후 조건부 재검증)"""
+        cache_key = self.cache.make_key(url, params)
+        ttl = self.ttls.get(source, self.ttls['default'])
+        entry = self.cache.load(cache_key)
+
+        if entry and not force and entry['expires_at'] and entry['expires_at'] > time.time():
+            self._count('cache_hits')
+            return self._from_entry(entry, from_cache=True)
+
+        request_headers = dict(headers or {})
+        if entry:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self.session.get(url, params=params, headers=request_headers or None, timeout=timeout)
+        self._count('network')
+
+        if response.status_code == 304 and entry:
+            self._count('not_modified')
+            self.cache.touch(cache_key, ttl)
+            return self._from_entry(entry, not_modified=True)
+
+        content = response.content
+        content_hash = hashlib.sha256(content).hexdigest()
+        result = CachedResponse(
+            url=url,
+            status_code=response.status_code,
+            content=content,
+            encoding=response.encoding,
+            headers={k: v for k, v in response.headers.items()
+                     if k.lower() in ('content-type', 'etag', 'last-modified')},
+            content_hash=content_hash,
+            changed=not (entry and entry.get('content_hash') == content_hash),
+        )
+        if not result.changed:
+            self._count('unchanged')
+
+        # 오류 응답은 저장하지 않음 (재시도 시 다시 요청, 기존 항목은 유지)
+        if self.is_cacheable(result, source):
+            self.cache.store(cache_key, source, result,
+                             response.headers.get('ETag'), response.headers.get('Last-Modified'), ttl)
+        else:
+            self._count('not_stored')
+        return result
+
+    def fetch_parsed(self, url: str, parse_fn: Callable[[CachedResponse], Any], parser_key: str,
+                     params: Optional[Dict] = None, headers: Optional[Dict] = None,
+                     source: str = 'default', timeout: float = 10, force: bool = False) -> Any:
+        """URL 조회 후 파싱 (본문 해시가 같으면 저장된 파싱 결과 재사용)
+
+        오류 응답은 HTTPError를 발생시킨다. parser_key는 파서 로직이 바뀌면 함께 바꿔야 한다 (예: 'naver_ratios:v2').
+        """
+        response = self.fetch(url, params=params, headers=headers, source=source,
+                              timeout=timeout, force=force)
+        response.raise_for_status()
+
+        found, value = self.cache.get_parsed(parser_key, response.content_hash)
+        if found:
+            self._count('parse_skipped')
+            return value
+
+        value = parse_fn(response)
+        if value is not None and self.is_cacheable(response, source):
+            self.cache.set_parsed(parser_key, response.content_hash, value)
+        return value
+
+    @staticmethod
+    def _from_entry(entry: Dict[str, Any], from_cache: bool = False,
+                    not_modified: bool = False) -> CachedResponse:
+        return CachedResponse(
+            url=entry['url'],
+            status_code=entry['status_code'],
+            content=bytes(entry['body'] or b''),
+            encoding=entry['encoding'],
+            headers=entry['headers'],
+            content_hash=entry['content_hash'] or '',
+            from_cache=from_cache,
+            not_modified=not_modified,
+            changed=False,
+        )
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._stats_lock:
+            return dict(self.stats)
+
+
+# 프로세스 내 공유 저장소 (경로별 1개 연결)
+_shared_caches: Dict[str, HTTPResponseCache] = {}
+_shared_lock = threading.Lock()
+
+
+def _get_shared_cache(db_path: Union[str, Path, None] = None) -> HTTPResponseCache:
+    path = str(Path(db_path) if db_path else DEFAULT_HTTP_CACHE_PATH)
+    with _shared_lock:
+        if path not in _shared_caches:
+            _shared_caches[path] = HTTPResponseCache(path)
+        return _shared_caches[path]
@@ -0,0 +1,371 @@
+"""
+KRX 거래일 캘린더
+한국거래소 휴장일을 반영한 거래일(세션) 계산
+
+- 1970~2099년 전체 날짜의 거래일 여부를 bool 비트맵으로 미리 계산
+- is_session: O(1) (비트맵 조회)
+- 거래일 더하기/구간/개수: 누적 거래일 수 배열로 O(1), 날짜 배열 처리는 searchsorted O(log n)
+- 날짜 배열을 받는 벡터화 버전 제공 (주가 이력 결측일 계산 등)
+
+음력 휴장일(설날/석가탄신일/추석)은 표로만 알 수 있으므로 휴장일은 KRX_LUNAR_HOLIDAYS 표가 있는
+연도(2000~2030)에만 반영하고, 그 밖의 연도는 주말만 휴장으로 보는 평일 규칙으로 대체한다
+(is_exact로 구분). 비트맵 범위 밖 is_session/is_session_array도 평일 규칙을 쓰며,
+그 밖의 단일 날짜 조회는 ValueError, 구간 조회는 비트맵 범위로 잘라서 계산한다.
+"""
+
+import threading
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DateLike = Union[str, date, datetime, np.datetime64, pd.Timestamp]
+
+# 음력 휴장일 당일 (설날, 석가탄신일, 추석)
+KRX_LUNAR_HOLIDAYS: Dict[int, Tuple[str, str, str]] = {
+    2000: ('2000-02-05', '2000-05-11', '2000-09-12'),
+    2001: ('2001-01-24', '2001-05-01', '2001-10-01'),
+    2002: ('2002-02-12', '2002-05-19', '2002-09-21'),
+    2003: ('2003-02-01', '2003-05-08', '2003-09-11'),
+    2004: ('2004-01-22', '2004-05-26', '2004-09-28'),
+    2005: ('2005-02-09', '2005-05-15', '2005-09-18'),
+    2006: ('2006-01-29', '2006-05-05', '2006-10-06'),
+    2007: ('2007-02-18', '2007-05-24', '2007-09-25'),
+    2008: ('2008-02-07', '2008-05-12', '2008-09-14'),
+    2009: ('2009-01-26', '2009-05-02', '2009-10-03'),
+    2010: ('2010-02-14', '2010-05-21', '2010-09-22'),
+    2011: ('2011-02-03', '2011-05-10', '2011-09-12'),
+    2012: ('2012-01-23', '2012-05-28', '2012-09-30'),
+    2013: ('2013-02-10', '2013-05-17', '2013-09-19'),
+    2014: ('2014-01-31', '2014-05-06', '2014-09-08'),
+    2015: ('2015-02-19', '2015-05-25', '2015-09-27'),
+    2016: ('2016-02-08', '2016-05-14', '2016-09-15'),
+    2017: ('2017-01-28', '2017-05-03', '2017-10-04'),
+    2018: ('2018-02-16', '2018-05-22', '2018-09-24'),
+    2019: ('2019-02-05', '2019-05-12', '2019-09-13'),
+    2020: ('2020-01-25', '2020-04-30', '2020-10-01'),
+    2021: ('2021-02-12', '2021-05-19', '2021-09-21'),
+    2022: ('2022-02-01', '2022-05-08', '2022-09-10'),
+    2023: ('2023-01-22', '2023-05-27', '2023-09-29'),
+    2024: ('2024-02-10', '2024-05-15', '2024-09-17'),
+    2025: ('2025-01-29', '2025-05-05', '2025-10-06'),
+    2026: ('2026-02-17', '2026-05-24', '2026-09-25'),
+    2027: ('2027-02-06', '2027-05-13', '2027-09-15'),
+    2028: ('2028-01-26', '2028-05-02', '2028-10-03'),
+    2029: ('2029-02-13', '2029-05-20', '2029-09-22'),
+    2030: ('2030-02-03', '2030-05-09', '2030-09-12'),
+}
+
+# 선거일, 임시공휴일 등 비정기 휴장일
+KRX_SPECIAL_HOLIDAYS = {
+    '2000-04-13': '국회의원 선거',
+    '2002-06-13': '지방선거',
+    '2002-07-01': '임시공휴일',
+    '2002-12-19': '대통령 선거',
+    '2004-04-15': '국회의원 선거',
+    '2006-05-31': '지방선거',
+    '2007-12-19': '대통령 선거',
+    '2008-04-09': '국회의원 선거',
+    '2010-06-02': '지방선거',
+    '2012-04-11': '국회의원 선거',
+    '2012-12-19': '대통령 선거',
+    '2014-06-04': '지방선거',
+    '2015-08-14': '임시공휴일',
+    '2016-04-13': '국회의원 선거',
+    '2016-05-06': '임시공휴일',
+    '2017-05-09': '대통령 선거',
+    '2017-10-02': '임시공휴일',
+    '2018-06-13': '지방선거',
+    '2020-04-15': '국회의원 선거',
+    '2020-08-17': '임시공휴일',
+    '2022-03-09': '대통령 선거',
+    '2022-06-01': '지방선거',
+    '2023-10-02': '임시공휴일',
+    '2024-04-10': '국회의원 선거',
+    '2024-10-01': '국군의 날 임시공휴일',
+    '2025-01-27': '임시공휴일',
+    '2025-06-03': '대통령 선거',
+    '2026-06-03': '지방선거',
+}
+
+
+def _fixed_holidays(year: int) -> List[Tuple[date, str, Optional[int]]]:
+    """양력 휴장일 [(날짜, 이름, 대체휴일 적용 시작연도)]"""
+    holidays = [
+        (date(year, 1, 1), '신정', None),
+        (date(year, 3, 1), '삼일절', 2021),
+        (date(year, 5, 1), '근로자의 날', None),
+        (date(year, 5, 5), '어린이날', 2014),
+        (date(year, 6, 6), '현충일', None),
+        (date(year, 8, 15), '광복절', 2021),
+        (date(year, 10, 3), '개천절', 2021),
+        (date(year, 12, 25), '성탄절', 2023),
+    ]
+    if year <= 2005 or year >= 2013:
+        holidays.append((date(year, 10, 9), '한글날', 2021))
+    if year <= 2005:
+        holidays.append((date(year, 4, 5), '식목일', None))
+    if year <= 2007:
+        holidays.append((date(year, 7, 17), '제헌절', None))
+    return holidays
+
+
+def build_krx_holidays(year: int) -> Dict[date, str]:
+    """연도별 KRX 휴장일 (주말 제외 평일 휴장일 + 주말과 겹친 공휴일 포함)"""
+    fixed = _fixed_holidays(year)
+    lunar = KRX_LUNAR_HOLIDAYS.get(year)
+    if lunar:
+        seollal, buddha, chuseok = (datetime.strptime(d, '%Y-%m-%d').date() for d in lunar)
+        fixed.append((buddha, '석가탄신일', 2023))
+        lunar_blocks = [(seollal, '설날'), (chuseok, '추석')]
+    else:
+        lunar_blocks = []
+
+    # 날짜별 휴일 목록 [(이름, 대체휴일 대상 여부, 대체휴일 탐색 기준일, 주말 조건)]
+    entries: Dict[date, List[Tuple[str, bool, date, Set[int]]]] = {}
+    for day, name, substitute_from in fixed:
+        eligible = bool(substitute_from) and year >= substitute_from
+        entries.setdefault(day, []).append((name, eligible, day, {5, 6}))
+    for center, name in lunar_blocks:
+        # 설날/추석 연휴 (전날, 당일, 다음날), 2014년부터 일요일·공휴일과 겹치면 대체휴일
+        block_end = center + timedelta(days=1)
+        for i in (-1, 0, 1):
+            day = center + timedelta(days=i)
+            entries.setdefault(day, []).append((name, year >= 2014, block_end, {6}))
+
+    holidays: Dict[date, str] = {day: items[0][0] for day, items in entries.items()}
+
+    # 대체휴일: 주말과 겹치면 1일, 다른 휴일과 겹치면 겹친 수만큼
+    substitutes: List[Tuple[date, str]] = []
+    for day, items in entries.items():
+        eligible = [item for item in items if item[1]]
+        if not eligible:
+            continue
+        name, _, base, _ = max(eligible, key=lambda item: item[2])
+        if any(day.weekday() in item[3] for item in eligible):
+            substitutes.append((base, name))
+        elif len(items) > 1:
+            substitutes.extend([(base, name)] * (len(items) - 1))
+
+    for day_str, name in KRX_SPECIAL_HOLIDAYS.items():
+        if day_str.startswith(str(year)):
+            holidays[datetime.strptime(day_str, '%Y-%m-%d').date()] = name
+
+    for base, name in sorted(substitutes):
+        candidate = base + timedelta(days=1)
+        while candidate.weekday() >= 5 or candidate in holidays:
+            candidate += timedelta(days=1)
+        holidays[candidate] = f'{name} 대체휴일'
+
+    # 연말 휴장일 (그해 마지막 평일)
+    year_end = date(year, 12, 31)
+    while year_end.weekday() >= 5 or year_end in holidays:
+        year_end -= timedelta(days=1)
+    holidays[year_end] = '연말 휴장일'
+
+    return holidays
+
+
+def _to_day(value: DateLike) -> np.datetime64:
+    """단일 날짜 → datetime64[D] ('YYYYMMDD', 'YYYY-MM-DD', date, datetime 지원)"""
+    if isinstance(value, np.datetime64):
+        return value.astype('datetime64[D]')
+    if isinstance(value, str) and len(value) == 8 and value.isdigit():
+        value = f'{value[:4]}-{value[4:6]}-{value[6:]}'
+    return np.datetime64(pd.Timestamp(value).date(), 'D')
+
+
+def _to_days(values) -> np.ndarray:
+    """날짜 배열 → datetime64[D] 배열"""
+    if isinstance(values, np.ndarray) and np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[D]')
+    return pd.to_datetime(pd.Series(values)).values.astype('datetime64[D]')
+
+
+class KRXCalendar:
+    """KRX 거래일 캘린더 (사전 계산된 거래일 비트맵)
+
+    _session[i]: START + i일이 거래일인지 여부
+    _rank[i]: START ~ START + i일 사이(포함) 거래일 수
+    sessions: 거래일 배열 (정렬됨)
+    """
+
+    # 휴장일 표가 있는 구간 (밖은 평일 규칙)
+    START = date(min(KRX_LUNAR_HOLIDAYS), 1, 1)
+    END = date(max(KRX_LUNAR_HOLIDAYS), 12, 31)
+    # 비트맵 구간
+    SPAN_START = date(1970, 1, 1)
+    SPAN_END = date(2099, 12, 31)
+
+    def __init__(self, start: date = SPAN_START, end: date = SPAN_END):
+        self.origin = np.datetime64(start, 'D')
+        self.last = np.datetime64(end, 'D')
+        days = np.arange(self.origin, self.last + np.timedelta64(1, 'D'))
+
+        holidays: Dict[date, str] = {}
+        for year in range(max(start.year, self.START.year), min(end.year, self.END.year) + 1):
+            holidays.update(build_krx_holidays(year))
+        self.holiday_names = holidays
+        holiday_days = np.array(sorted(holidays), dtype='datetime64[D]')
+
+        self._session = self._is_weekday(days) & ~np.isin(days, holiday_days)
+        self._rank = np.cumsum(self._session)
+        self.sessions = days[self._session]
+
+    # ------------------------------------------------------------------
+    # 내부 위치 계산
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _is_weekday(days) -> np.ndarray:
+        """평일 규칙 (1970-01-01은 목요일 → weekday = (일수 + 3) % 7, 월=0)"""
+        return (np.asarray(days, dtype='datetime64[D]').astype('int64') + 3) % 7 < 5
+
+    def _in_span(self, days) -> np.ndarray:
+        return (days >= self.origin) & (days <= self.last)
+
+    def _index(self, value: DateLike) -> int:
+        day = _to_day(value)
+        if not self._in_span(day):
+            raise ValueError(f"캘린더 범위({self.origin} ~ {self.last})를 벗어난 날짜: {day}")
+        return int((day - self.origin).astype(int))
+
+    def _range_indices(self, start: DateLike, end: DateLike) -> Tuple[int, int]:
+        """구간 양 끝 위치 (캘린더 범위로 잘라냄, 겹치지 않으면 start > end)"""
+        lo = max(_to_day(start), self.origin)
+        hi = min(_to_day(end), self.last)
+        return int((lo - self.origin).astype(int)), int((hi - self.origin).astype(int))
+
+    def _indices(self, values) -> np.ndarray:
+        days = _to_days(values)
+        index = (days - self.origin).astype('int64')
+        if len(index) and (index.min() < 0 or index.max() >= len(self._session)):
+            raise ValueError(f"캘린더 범위({self.origin} ~ {self.last})를 벗어난 날짜 포함")
+        return index
+
+    # ------------------------------------------------------------------
+    # 단일 날짜
+    # ------------------------------------------------------------------
+
+    def is_exact(self, value: DateLike) -> bool:
+        """휴장일 표가 있는 연도인지 여부 (False면 평일 규칙으로 계산한 결과)"""
+        return self.START.year <= _to_day(value).astype(object).year <= self.END.year
+
+    def is_session(self, value: DateLike) -> bool:
+        """거래일 여부 (O(1), 비트맵 범위 밖은 평일 규칙)"""
+        day = _to_day(value)
+        if not self._in_span(day):
+            return bool(self._is_weekday(day))
+        return bool(self._session[int((day - self.origin).astype(int))])
+
+    def is_holiday(self, value: DateLike) -> bool:
+        """평일/주말 관계없이 휴장일(공휴일, 선거일, 연말 휴장) 여부"""
+        return _to_day(value).astype(object) in self.holiday_names
+
+    def holiday_name(self, value: DateLike) -> Optional[str]:
+        return self.holiday_names.get(_to_day(value).astype(object))
+
+    def session_on_or_before(self, value: DateLike) -> date:
+        """해당 날짜 또는 직전 거래일"""
+        rank = self._rank[self._index(value)]
+        if rank == 0:
+            raise ValueError(f"{value} 이전 거래일이 캘린더에 없습니다.")
+        return self.sessions[rank - 1].astype(object)
+
+    def session_on_or_after(self, value: DateLike) -> date:
+        """해당 날짜 또는 다음 거래일"""
+        i = self._index(value)
+        position = self._rank[i] - (1 if self._session[i] else 0)
+        if position >= len(self.sessions):
+            raise ValueError(f"{value} 이후 거래일이 캘린더에 없습니다.")
+        return self.sessions[position].astype(object)
+
+    def previous_session(self, value: DateLike) -> date:
+        """직전 거래일 (해당 날짜 제외)"""
+        return self.session_on_or_before(_to_day(value) - np.timedelta64(1, 'D'))
+
+    def next_session(self, value: DateLike) -> date:
+        """다음 거래일 (해당 날짜 제외)"""
+        return self.session_on_or_after(_to_day(value) + np.timedelta64(1, 'D'))
+
+    def add_sessions(self, value: DateLike, count: int) -> date:
+        """거래일 기준 날짜 더하기 (휴장일에서 시작하면 직전 거래일을 0번째로 봄)"""
+        i = self._index(value)
+        position = self._rank[i] - 1  # 해당 날짜 이하 마지막 거래일 위치
+        if count < 0 and not self._session[i]:
+            position += 1
+        target = position + count
+        if target < 0 or target >= len(self.sessions):
+            raise ValueError(f"캘린더 범위를 벗어난 거래일 계산: {value} + {count}")
+        return self.sessions[target].astype(object)
+
+    def sessions_in_range(self, start: DateLike, end: DateLike) -> np.ndarray:
+        """구간 [start, end] 거래일 배열 (datetime64[D], 캘린더 범위 밖은 제외)"""
+        start_i, end_i = self._range_indices(start, end)
+        if start_i > end_i:
+            return self.sessions[:0]
+        lo = self._rank[start_i] - (1 if self._session[start_i] else 0)
+        return self.sessions[lo:self._rank[end_i]]
+
+    def session_count(self, start: DateLike, end: DateLike) -> int:
+        """구간 [start, end] 거래일 수 (캘린더 범위 밖은 제외)"""
+        start_i, end_i = self._range_indices(start, end)
+        if start_i > end_i:
+            return 0
+        return int(self._rank[end_i] - self._rank[start_i] + self._session[start_i])
+
+    def latest_completed_session(self, now: Optional[datetime] = None, close_hour: int = 18) -> date:
+        """데이터가 수집되어 있어야 할 가장 최근 거래일
+
+        오늘이 거래일이고 close_hour 이후면 오늘, 아니면 직전 거래일.
+        """
+        now = now or datetime.now()
+        if self.is_session(now) and now.hour >= close_hour:
+            return now.date()
+        return self.previous_session(now)
+
+    # ------------------------------------------------------------------
+    # 벡터화 버전
+    # ------------------------------------------------------------------
+
+    def is_session_array(self, values) -> np.ndarray:
+        """날짜 배열의 거래일 여부 (비트맵 범위 밖은 평일 규칙)"""
+        days = _to_days(values)
+        in_span = self._in_span(days)
+        if in_span.all():
+            return self._session[(days - self.origin).astype('int64')]
+        result = self._is_weekday(days)
+        result[in_span] = self._session[(days[in_span] - self.origin).astype('int64')]
+        return result
+
+    def session_positions(self, values) -> np.ndarray:
+        """날짜 이하 마지막 거래일의 순번 (거래일 간 거리 계산용, 0부터)"""
+        return self._rank[self._indices(values)] - 1
+
+    def missing_sessions_between(self, values) -> np.ndarray:
+        """정렬된 날짜 배열에서 인접한 두 날짜 사이 빠진 거래일 수 (첫 원소는 0)"""
+        index = self._indices(values)
+        if len(index) == 0:
+            return np.zeros(0, dtype=int)
+        gaps = np.zeros(len(index), dtype=int)
+        # (이전 날짜, 현재 날짜) 사이 거래일 = rank[현재-1] - rank[이전]
+        gaps[1:] = self._rank[np.maximum(index[1:] - 1, 0)] - self._rank[index[:-1]]
+        return np.clip(gaps, 0, None)
+
+
+_calendar: Optional[KRXCalendar] = None
+_calendar_lock = threading.Lock()
+
+
+def get_krx_calendar() -> KRXCalendar:
+    """프로세스 공용 KRX 캘린더 (최초 호출 시 1회 생성)"""
+    global _calendar
+    if _calendar is None:
+        with _calendar_lock:
+            if _calendar is None:
+                _calendar = KRXCalendar()
+    return _calendar
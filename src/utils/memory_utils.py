@@ -7,8 +7,6 @@ import gc
 import psutil
 import os
 import sys
-import threading
-import time
 from typing import Dict, List, Optional, Any, Callable
 from functools import wraps
 from contextlib import contextmanager
@@ -16,6 +14,12 @@ import logging
 import pandas as pd
 import numpy as np
 
+try:
+    from .cache_utils import LRUCache
+except ImportError:
+    # 스크립트로 직접 실행하는 경우
+    from cache_utils import LRUCache
+
 logger = logging.getLogger(__name__)
 
 class MemoryMonitor:
@@ -193,54 +197,24 @@ class MemoryOptimizer:
             return data
 
 class MemoryCache:
-    """메모리 캐시 클래스"""
+    """메모리 캐시 클래스 (LRU + 슬라이딩 TTL, O(1) 조회/저장/제거)"""
     
-    def __init__(self, max_size: int = 100, ttl: int = 3600):
+    def __init__(self, max_size: int = 100, ttl: int = 3600, max_bytes: Optional[int] = None):
         self.max_size = max_size
         self.ttl = ttl
-        self.cache = {}
-        self.access_times = {}
-        self.lock = threading.Lock()
+        self.cache = LRUCache(max_size=max_size, ttl=ttl, max_bytes=max_bytes, sliding=True)
     
     def get(self, key: str) -> Optional[Any]:
-        """캐시에서 값 조회"""
-        with self.lock:
-            if key in self.cache:
-                # TTL 확인
-                if time.time() - self.access_times[key] < self.ttl:
-                    self.access_times[key] = time.time()
-                    return self.cache[key]
-                else:
-                    # 만료된 항목 제거
-                    del self.cache[key]
-                    del self.access_times[key]
-        
-        return None
+        """캐시에서 값 조회 (조회 성공 시 만료 시각 연장)"""
+        return self.cache.get(key)
     
     def set(self, key: str, value: Any):
         """캐시에 값 저장"""
-        with self.lock:
-            # 캐시 크기 확인
-            if len(self.cache) >= self.max_size:
-                self._evict_oldest()
-            
-            self.cache[key] = value
-            self.access_times[key] = time.time()
-    
-    def _evict_oldest(self):
-        """가장 오래된 항목 제거"""
-        if not self.access_times:
-            return
-        
-        oldest_key = min(self.access_times, key=self.access_times.get)
-        del self.cache[oldest_key]
-        del self.access_times[oldest_key]
+        self.cache.set(key, value)
     
     def clear(self):
         """캐시 전체 삭제"""
-        with self.lock:
-            self.cache.clear()
-            self.access_times.clear()
+        self.cache.clear()
     
     def size(self) -> int:
         """캐시 크기 반환"""
@@ -248,13 +222,9 @@ class MemoryCache:
     
     def get_stats(self) -> Dict[str, Any]:
         """캐시 통계 반환"""
-        with self.lock:
-            return {
-                'size': len(self.cache),
-                'max_size': self.max_size,
-                'ttl': self.ttl,
-                'keys': list(self.cache.keys())
-            }
+        stats = self.cache.get_stats()
+        stats['keys'] = self.cache.keys()
+        return stats
 
 # 데코레이터들
 def memory_monitor(func):
@@ -0,0 +1,436 @@
+"""
+이동 창(rolling window) 계산 기본 도구
+기술지표가 공통으로 쓰는 이동 평균 / 최대·최소 / 분산 / 지수 평활을 배치(NumPy)와 스트리밍(값 하나씩 push) 두 형태로 제공
+
+- 단순이동평균: 누적합 차분 O(n) - 스트리밍도 같은 누적합을 링 버퍼로 유지해 배치와 비트 단위로 같은 값
+- 이동 최대/최소: 배치는 van Herk/Gil-Werman 블록 누적(O(n)), 스트리밍은 단조 deque (둘 다 정확값)
+- 이동 분산: 배치는 블록별 기준값을 뺀 누적합·제곱합 (O(n)), 스트리밍은 창 Welford 갱신
+- 지수 평활(EMA/Wilder): 첫 warmup개 평균으로 시작하는 y = (1 - α)·y + α·x
+  배치는 블록 단위 행렬곱으로 재귀를 펼쳐 계산 (스트리밍과 부동소수 반올림 수준에서 일치)
+
+배치 함수는 (n,) 또는 (n, k) 배열을 0축(시간) 방향으로 계산하고, 입력과 같은 길이를 반환한다
+(창이 차기 전 위치는 NaN). 입력의 NaN(결측)은 그 값을 포함한 창만 NaN으로 만든다
+(이동 평균/분산/최대/최소, 스트리밍 RollingMean/RollingVariance 동일). 지수 평활은 재귀식이라
+NaN 이후 값이 모두 NaN이 되므로 결측은 호출 전에 채우거나 제거한다.
+
+사용법:
+    sma = rolling_mean(closes, 20)
+    rsi_gain = wilder(gains, 14)
+
+    stream = RollingMean(20)
+    stream.extend(history)            # 과거 데이터로 예열
+    latest = stream.push(new_close)   # 새 값 하나 반영 후 현재 평균
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Iterable, Optional
+
+import numpy as np
+
+# 지수 평활 배치 계산에서 한 번에 펼칠 구간 길이 (decay^B 계수 행렬 크기)
+EWM_BLOCK_SIZE = 64
+
+
+def _as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _check_period(period: int):
+    if period < 1:
+        raise ValueError(f"창 길이는 1 이상이어야 합니다: {period}")
+
+
+def _split_missing(x: np.ndarray, period: int):
+    """NaN을 0으로 채운 배열과 창별 NaN 포함 여부 (창 끝 위치 period - 1부터)
+
+    누적합 계열 계산에 NaN이 들어가면 이후 모든 창이 NaN이 되므로 0으로 채워 계산하고,
+    NaN 개수 누적합으로 NaN을 포함한 창만 다시 NaN으로 가린다.
+    """
+    missing = np.isnan(x)
+    if not missing.any():
+        return x, None
+    counts = np.zeros((len(x) + 1,) + x.shape[1:], dtype=np.int64)
+    np.cumsum(missing, axis=0, out=counts[1:])
+    return np.where(missing, 0.0, x), (counts[period:] - counts[:-period]) > 0
+
+
+# =============================================================================
+# 배치 (NumPy)
+# =============================================================================
+
+def rolling_mean(values, period: int) -> np.ndarray:
+    """단순이동평균 (누적합 차분)"""
+    _check_period(period)
+    x = _as_float_array(values)
+    result = np.full(x.shape, np.nan)
+    if len(x) < period:
+        return result
+
+    x, has_nan = _split_missing(x, period)
+    prefix = np.zeros((len(x) + 1,) + x.shape[1:])
+    np.cumsum(x, axis=0, out=prefix[1:])
+    result[period - 1:] = (prefix[period:] - prefix[:-period]) / period
+    if has_nan is not None:
+        result[period - 1:][has_nan] = np.nan
+    return result
+
+
+def _rolling_extreme(values, period: int, ufunc: np.ufunc, fill: float) -> np.ndarray:
+    """
+    van Herk/Gil-Werman 이동 최대/최소
+
+    길이 period 블록마다 앞→뒤 누적값(prefix)과 뒤→앞 누적값(suffix)을 구하면
+    창 [i, i + period - 1]의 값은 ufunc(suffix[i], prefix[i + period - 1])
+    """
+    _check_period(period)
+    x = _as_float_array(values)
+    result = np.full(x.shape, np.nan)
+    n = len(x)
+    if n < period:
+        return result
+
+    padded = np.concatenate([x, np.full(((-n) % period,) + x.shape[1:], fill)])
+    blocks = padded.reshape((-1, period) + x.shape[1:])
+    prefix = ufunc.accumulate(blocks, axis=1).reshape(padded.shape)
+    suffix = ufunc.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    result[period - 1:] = ufunc(suffix[:n - period + 1], prefix[period - 1:n])
+    return result
+
+
+def rolling_max(values, period: int) -> np.ndarray:
+    """이동 최대값"""
+    return _rolling_extreme(values, period, np.maximum, -np.inf)
+
+
+def rolling_min(values, period: int) -> np.ndarray:
+    """이동 최소값"""
+    return _rolling_extreme(values, period, np.minimum, np.inf)
+
+
+def rolling_variance(values, period: int, ddof: int = 0) -> np.ndarray:
+    """
+    이동 분산 (ddof=0 모분산, 1 표본분산)
+
+    합·제곱합 차분은 가격 수준이 크면 자릿수 손실이 생기므로 period 길이 블록마다 기준값(블록 첫 값)을 뺀다.
+    창 [t - period + 1, t]는 t가 속한 블록의 앞부분과 직전 블록의 뒷부분으로 나뉘므로
+    블록 안 누적합(자기 기준값)과 직전 블록 역누적합(다음 블록 기준값)을 더해 같은 기준값의 창 합을 얻는다.
+    """
+    _check_period(period)
+    if period <= ddof:
+        raise ValueError(f"창 길이({period})가 ddof({ddof})보다 커야 합니다.")
+    x = _as_float_array(values)
+    result = np.full(x.shape, np.nan)
+    n = len(x)
+    if n < period:
+        return result
+
+    # NaN 자리는 0으로 채움 - 채운 값은 그 위치를 포함한 창(마지막에 NaN으로 가림)에만 쓰인다
+    x, has_nan = _split_missing(x, period)
+    padded = np.concatenate([x, np.repeat(x[-1:], (-n) % period, axis=0)])
+    blocks = padded.reshape((-1, period) + x.shape[1:])
+    anchors = blocks[:, :1]
+
+    # 블록 b 앞부분: 자기 기준값으로 뺀 누적합
+    own = blocks - anchors
+    sums = np.cumsum(own, axis=1)
+    squares = np.cumsum(own * own, axis=1)
+
+    # 블록 b - 1 뒷부분: 블록 b 기준값으로 뺀 역누적합 (마지막 열 뒤에 0을 붙여 j + 1 위치로 조회)
+    carried = blocks[:-1] - anchors[1:]
+    tail_shape = (len(carried), 1) + x.shape[1:]
+    tail_sums = np.concatenate([np.cumsum(carried[:, ::-1], axis=1)[:, ::-1], np.zeros(tail_shape)], axis=1)
+    tail_squares = np.concatenate([np.cumsum((carried * carried)[:, ::-1], axis=1)[:, ::-1],
+                                   np.zeros(tail_shape)], axis=1)
+    sums[1:] += tail_sums[:, 1:]
+    squares[1:] += tail_squares[:, 1:]
+
+    window_sum = sums.reshape(padded.shape)[period - 1:n]
+    window_squares = squares.reshape(padded.shape)[period - 1:n]
+    variance = (window_squares - window_sum * window_sum / period) / (period - ddof)
+    result[period - 1:] = np.maximum(variance, 0.0)
+    if has_nan is not None:
+        result[period - 1:][has_nan] = np.nan
+    return result
+
+
+def rolling_std(values, period: int, ddof: int = 0) -> np.ndarray:
+    """이동 표준편차"""
+    return np.sqrt(rolling_variance(values, period, ddof))
+
+
+def _ewm_recursive(values: np.ndarray, alpha: float, initial) -> np.ndarray:
+    """
+    y[t] = (1 - α)·y[t-1] + α·x[t] (y[-1] = initial)
+
+    B개씩 묶은 구간 안에서는 y[s+j] = (1-α)^(j+1)·y[s-1] + α·Σ (1-α)^(j-k)·x[s+k] 이므로
+    하삼각 계수 행렬곱 한 번으로 모든 구간을 계산하고, 구간 경계 값만 순서대로 넘긴다.
+    """
+    m = len(values)
+    if m == 0:
+        return np.empty_like(values)
+
+    decay = 1.0 - alpha
+    size = min(EWM_BLOCK_SIZE, m)
+    powers = decay ** np.arange(size + 1)
+    offsets = np.arange(size)
+    lags = offsets[:, None] - offsets[None, :]
+    weights = np.where(lags >= 0, powers[np.abs(lags)], 0.0)
+
+    padded = np.concatenate([values, np.zeros(((-m) % size,) + values.shape[1:])])
+    blocks = padded.reshape((-1, size) + values.shape[1:])
+    partial = alpha * np.einsum('jk,bk...->bj...', weights, blocks)
+    carry = powers[1:].reshape((size,) + (1,) * (values.ndim - 1))
+
+    previous = np.asarray(initial, dtype=np.float64)
+    for block in partial:
+        block += carry * previous
+        previous = block[-1]
+    return partial.reshape(padded.shape)[:m]
+
+
+def ewm(values, alpha: float, warmup: int = 1) -> np.ndarray:
+    """
+    재귀 지수 평활 (첫 warmup개 평균에서 시작, warmup - 1 위치부터 값이 있음)
+
+    Args:
+        alpha: 평활 계수 (0 < α ≤ 1)
+        warmup: 시작값을 구할 초기 구간 길이
+    """
+    if not 0 < alpha <= 1:
+        raise ValueError(f"평활 계수는 0 < α ≤ 1 이어야 합니다: {alpha}")
+    _check_period(warmup)
+    x = _as_float_array(values)
+    result = np.full(x.shape, np.nan)
+    if len(x) < warmup:
+        return result
+
+    seed = np.mean(x[:warmup], axis=0)
+    result[warmup - 1] = seed
+    result[warmup:] = _ewm_recursive(x[warmup:], alpha, seed)
+    return result
+
+
+def ema(values, period: int) -> np.ndarray:
+    """지수이동평균 (α = 2 / (period + 1), 첫 값은 period개 단순평균)"""
+    return ewm(values, 2.0 / (period + 1), warmup=period)
+
+
+def wilder(values, period: int) -> np.ndarray:
+    """Wilder 평활 (α = 1 / period, 첫 값은 period개 단순평균) - RSI/ATR용"""
+    return ewm(values, 1.0 / period, warmup=period)
+
+
+# =============================================================================
+# 스트리밍 (값 하나씩 push)
+# =============================================================================
+
+class _RollingStream(ABC):
+    """스트리밍 계산기 공통 - push는 새 값 반영 후 현재 값(창이 차기 전에는 NaN)을 반환"""
+
+    @abstractmethod
+    def push(self, value: float) -> float:
+        """새 값 하나 반영 후 현재 값"""
+
+    @property
+    @abstractmethod
+    def value(self) -> float:
+        """현재 값 (창이 차기 전에는 NaN)"""
+
+    def extend(self, values: Iterable[float]) -> float:
+        """여러 값을 순서대로 push (과거 데이터로 예열할 때)"""
+        for value in values:
+            self.push(value)
+        return self.value
+
+
+class RollingMean(_RollingStream):
+    """단순이동평균 - rolling_mean과 같은 누적합(NaN은 0, NaN 개수 따로)을 period + 1개 링 버퍼로 유지"""
+
+    def __init__(self, period: int):
+        _check_period(period)
+        self.period = period
+        self._total = 0.0
+        self._missing = 0
+        self._prefixes = deque([0.0], maxlen=period + 1)
+        self._missing_prefixes = deque([0], maxlen=period + 1)
+
+    @property
+    def ready(self) -> bool:
+        return len(self._prefixes) > self.period
+
+    def push(self, value: float) -> float:
+        value = float(value)
+        if math.isnan(value):
+            self._missing += 1
+        else:
+            self._total += value
+        self._prefixes.append(self._total)
+        self._missing_prefixes.append(self._missing)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        if not self.ready or self._missing_prefixes[-1] != self._missing_prefixes[0]:
+            return math.nan
+        return (self._prefixes[-1] - self._prefixes[0]) / self.period
+
+
+class _RollingExtreme(_RollingStream):
+    """단조 deque 이동 최대/최소 - 앞쪽이 항상 현재 창의 극값 (값당 분할상환 O(1))"""
+
+    def __init__(self, period: int):
+        _check_period(period)
+        self.period = period
+        self._count = 0
+        self._candidates = deque()  # (위치, 값)
+
+    @staticmethod
+    @abstractmethod
+    def _dominates(new: float, old: float) -> bool:
+        """새 값이 기존 후보를 창에서 밀어내는지 (최대: new >= old, 최소: new <= old)"""
+
+    @property
+    def ready(self) -> bool:
+        return self._count >= self.period
+
+    def push(self, value: float) -> float:
+        value = float(value)
+        while self._candidates and self._dominates(value, self._candidates[-1][1]):
+            self._candidates.pop()
+        self._candidates.append((self._count, value))
+        if self._candidates[0][0] <= self._count - self.period:
+            self._candidates.popleft()
+        self._count += 1
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._candidates[0][1] if self.ready else math.nan
+
+
+class RollingMax(_RollingExtreme):
+    """이동 최대값"""
+
+    @staticmethod
+    def _dominates(new: float, old: float) -> bool:
+        return new >= old
+
+
+class RollingMin(_RollingExtreme):
+    """이동 최소값"""
+
+    @staticmethod
+    def _dominates(new: float, old: float) -> bool:
+        return new <= old
+
+
+class RollingVariance(_RollingStream):
+    """
+    창 Welford 이동 분산 - 들어오는 값과 나가는 값으로 평균/제곱편차합(M2)을 한 번에 갱신
+
+    갱신마다 쌓이는 반올림 오차는 period번 갱신마다 창 전체로 평균/M2를 다시 계산해 없앤다 (분할상환 O(1)).
+    창에 NaN이 있는 동안은 값이 NaN이고, 마지막 NaN이 창을 벗어나면 창 전체로 다시 계산한다.
+    """
+
+    def __init__(self, period: int, ddof: int = 0):
+        _check_period(period)
+        if period <= ddof:
+            raise ValueError(f"창 길이({period})가 ddof({ddof})보다 커야 합니다.")
+        self.period = period
+        self.ddof = ddof
+        self._window = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+        self._missing = 0
+
+    @property
+    def ready(self) -> bool:
+        return len(self._window) >= self.period
+
+    def push(self, value: float) -> float:
+        value = float(value)
+        if self._missing or math.isnan(value):
+            # NaN이 창에 있으면 증분 갱신 불가 - 창만 유지하다가 NaN이 모두 빠지면 재계산
+            self._window.append(value)
+            self._missing += math.isnan(value)
+            if len(self._window) > self.period:
+                self._missing -= math.isnan(self._window.popleft())
+            if not self._missing:
+                self._recompute()
+        elif len(self._window) < self.period:
+            self._window.append(value)
+            delta = value - self._mean
+            self._mean += delta / len(self._window)
+            self._m2 += delta * (value - self._mean)
+        else:
+            leaving = self._window.popleft()
+            self._window.append(value)
+            previous_mean = self._mean
+            self._mean += (value - leaving) / self.period
+            self._m2 += (value - leaving) * (value - self._mean + leaving - previous_mean)
+            self._updates += 1
+            if self._updates >= self.period:
+                self._recompute()
+        return self.value
+
+    def _recompute(self):
+        self._mean = math.fsum(self._window) / len(self._window)
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in self._window)
+        self._updates = 0
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self.ready and not self._missing else math.nan
+
+    @property
+    def value(self) -> float:
+        if not self.ready or self._missing:
+            return math.nan
+        return max(self._m2, 0.0) / (self.period - self.ddof)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.value)
+
+
+class ExponentialSmoother(_RollingStream):
+    """재귀 지수 평활 - 첫 warmup개 평균으로 시작 후 y = (1 - α)·y + α·x (ewm과 같은 정의)"""
+
+    def __init__(self, alpha: float, warmup: int = 1):
+        if not 0 < alpha <= 1:
+            raise ValueError(f"평활 계수는 0 < α ≤ 1 이어야 합니다: {alpha}")
+        _check_period(warmup)
+        self.alpha = alpha
+        self.warmup = warmup
+        self._seed_values = []
+        self._value: Optional[float] = None
+
+    @classmethod
+    def ema(cls, period: int) -> 'ExponentialSmoother':
+        return cls(2.0 / (period + 1), warmup=period)
+
+    @classmethod
+    def wilder(cls, period: int) -> 'ExponentialSmoother':
+        return cls(1.0 / period, warmup=period)
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    def push(self, value: float) -> float:
+        value = float(value)
+        if self._value is None:
+            self._seed_values.append(value)
+            if len(self._seed_values) == self.warmup:
+                self._value = float(np.mean(self._seed_values))
+                self._seed_values = []
+        else:
+            self._value = (1.0 - self.alpha) * self._value + self.alpha * value
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return math.nan if self._value is None else self._value
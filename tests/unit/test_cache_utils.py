@@ -0,0 +1,102 @@
+"""
+LRU + TTL 캐시 테스트
+time.time을 고정 시계로 바꿔 만료, 항목별 ttl, sliding 연장을 확인
+"""
+
+import pytest
+
+import src.utils.cache_utils as cache_utils
+from src.utils.cache_utils import LRUCache
+
+
+class FakeClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_utils.time, 'time', clock.time)
+    return clock
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = LRUCache(ttl=10)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=30)
+
+    clock.advance(9)
+    assert cache.get('a') == 1
+    clock.advance(2)
+    assert cache.get('a') is None
+    assert 'b' in cache
+    clock.advance(20)
+    assert 'b' not in cache
+    assert cache.get('b') is None
+    assert cache.get_stats()['expirations'] == 2
+
+
+def test_sliding_refresh_uses_entry_ttl(clock):
+    cache = LRUCache(ttl=100, sliding=True)
+    cache.set('short', 'x', ttl=5)
+    cache.set('default', 'y')
+
+    for _ in range(10):
+        clock.advance(4)
+        assert cache.get('short') == 'x'   # 조회마다 5초 연장
+
+    clock.advance(6)
+    assert cache.get('short') is None       # 기본 ttl(100초)로 늘어나지 않음
+    assert cache.get('default') == 'y'
+    clock.advance(99)
+    assert cache.get('default') == 'y'
+    clock.advance(101)
+    assert cache.get('default') is None
+
+
+def test_without_sliding_reads_do_not_extend(clock):
+    cache = LRUCache(ttl=10)
+    cache.set('a', 1)
+    clock.advance(6)
+    assert cache.get('a') == 1
+    clock.advance(6)
+    assert cache.get('a') is None
+
+
+def test_zero_or_none_ttl_never_expires(clock):
+    cache = LRUCache(ttl=None, sliding=True)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=0)
+    clock.advance(10 ** 9)
+    assert cache.get('a') == 1 and cache.get('b') == 2
+
+    assert LRUCache(ttl=0).ttl == 0
+    bounded = LRUCache(ttl=10)
+    bounded.set('c', 3, ttl=0)
+    clock.advance(10 ** 9)
+    assert bounded.get('c') == 3
+
+
+def test_negative_ttl_rejected():
+    with pytest.raises(ValueError):
+        LRUCache(ttl=-1)
+    with pytest.raises(ValueError):
+        LRUCache().set('a', 1, ttl=-5)
+
+
+def test_disk_entries_keep_stored_expiry(clock, tmp_path):
+    writer = LRUCache(ttl=10, disk_path=tmp_path / 'cache.db', sliding=True)
+    writer.set('a', 1, ttl=5)
+
+    reader = LRUCache(ttl=100, disk_path=tmp_path / 'cache.db', sliding=True)
+    clock.advance(3)
+    assert reader.get('a') == 1
+    clock.advance(3)
+    assert reader.get('a') is None
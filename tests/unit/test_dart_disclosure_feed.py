@@ -0,0 +1,76 @@
+"""
+DART 공시 피드 증분 동기화 테스트
+같은 날 DART 접수분(00xxxx)과 거래소 접수분(80xxxx)이 섞여도 신규 공시를 놓치지 않는지 확인
+"""
+
+import logging
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from scripts.data_collection.collect_dart_data import DartDataCollector
+
+
+class FakeConfigManager:
+    def __init__(self, db_path):
+        self.db_path = db_path
+
+    def get_database_connection(self, db_name):
+        return sqlite3.connect(str(self.db_path))
+
+
+def disclosure(rcept_no):
+    return {
+        'corp_code': '00126380', 'corp_name': '삼성전자', 'stock_code': '005930',
+        'report_nm': '주요사항보고서', 'rcept_no': rcept_no, 'flr_nm': '삼성전자',
+        'rcept_dt': rcept_no[:8], 'rm': '',
+    }
+
+
+@pytest.fixture
+def collector(tmp_path):
+    collector = DartDataCollector.__new__(DartDataCollector)
+    collector.config_manager = FakeConfigManager(tmp_path / 'dart.db')
+    collector.logger = logging.getLogger('test_dart_disclosure_feed')
+    collector.feed = {}
+    collector.get_market_disclosures = lambda day: pd.DataFrame(collector.feed.get(day, []))
+    collector.dispatched = []
+    collector._dispatch_disclosure = lambda d: collector.dispatched.append(d['rcept_no']) or 1
+    return collector
+
+
+def stored_rcept_nos(collector):
+    conn = collector.config_manager.get_database_connection('dart')
+    try:
+        return sorted(row[0] for row in conn.execute("SELECT rcept_no FROM disclosures"))
+    finally:
+        conn.close()
+
+
+def test_interleaved_dart_and_krx_numbers_are_not_skipped(collector):
+    today = datetime.now().strftime('%Y%m%d')
+    collector.feed[today] = [disclosure(f'{today}000001'), disclosure(f'{today}800001')]
+    assert collector.sync_disclosure_feed(days=0)
+    assert collector.dispatched == [f'{today}000001', f'{today}800001']
+
+    # 거래소 접수분이 이미 저장된 뒤 같은 날 DART 접수분이 추가됨
+    collector.feed[today] += [disclosure(f'{today}000005'), disclosure(f'{today}800002')]
+    collector.dispatched.clear()
+    assert collector.sync_disclosure_feed(days=0)
+
+    assert collector.dispatched == [f'{today}000005', f'{today}800002']
+    assert stored_rcept_nos(collector) == sorted(
+        [f'{today}000001', f'{today}000005', f'{today}800001', f'{today}800002'])
+
+
+def test_rerun_without_new_filings_dispatches_nothing(collector):
+    today = datetime.now().strftime('%Y%m%d')
+    collector.feed[today] = [disclosure(f'{today}800001'), disclosure(f'{today}000003')]
+    assert collector.sync_disclosure_feed(days=0)
+    collector.dispatched.clear()
+
+    assert collector.sync_disclosure_feed(days=0)
+    assert collector.dispatched == []
+    assert len(stored_rcept_nos(collector)) == 2
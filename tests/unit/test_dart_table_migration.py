@@ -0,0 +1,119 @@
+"""
+DART UPSERT 테이블 마이그레이션 테스트
+구버전 UNIQUE 제약이 있는 테이블을 재생성해도 NOT NULL / DEFAULT / CHECK 제약과 보조 인덱스가 유지되는지 확인
+"""
+
+import logging
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from scripts.data_collection.collect_dart_data import DartDataCollector
+
+LEGACY_SCHEMA = '''
+    CREATE TABLE financial_statements (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        corp_code TEXT NOT NULL,
+        bsns_year TEXT NOT NULL CHECK (length(bsns_year) = 4),
+        reprt_code TEXT NOT NULL,
+        fs_div TEXT NOT NULL DEFAULT 'CFS',
+        fs_nm TEXT,
+        sj_div TEXT NOT NULL DEFAULT '',
+        sj_nm TEXT,
+        account_id TEXT NOT NULL DEFAULT '',
+        account_nm TEXT NOT NULL DEFAULT '',
+        thstrm_amount REAL,
+        frmtrm_amount REAL,
+        bfefrmtrm_amount REAL,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(corp_code, bsns_year, reprt_code, account_nm)
+    )
+'''
+
+
+@pytest.fixture
+def collector():
+    collector = DartDataCollector.__new__(DartDataCollector)
+    collector.logger = logging.getLogger('test_dart_table_migration')
+    return collector
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute(LEGACY_SCHEMA)
+    conn.execute('CREATE INDEX idx_financial_statements_account ON financial_statements(account_nm)')
+    rows = [
+        ('00126380', '2023', '11011', 'CFS', 'BS', 'ifrs-full_Assets', '자산총계', 100.0),
+        ('00126380', '2023', '11011', 'OFS', 'BS', 'ifrs-full_Assets', '자산총계', 90.0),
+    ]
+    # 구버전 UNIQUE 때문에 연결/별도 재무제표가 같은 행으로 덮어써지는 상태 재현
+    conn.executemany(
+        '''INSERT OR REPLACE INTO financial_statements
+           (corp_code, bsns_year, reprt_code, fs_div, sj_div, account_id, account_nm, thstrm_amount)
+           VALUES (?, ?, ?, ?, ?, ?, ?, ?)''', rows)
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def table_sql(conn):
+    return conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'financial_statements'"
+                        ).fetchone()[0]
+
+
+def test_rebuild_keeps_constraints_and_indexes(collector, conn):
+    collector._migrate_upsert_table(conn, 'financial_statements')
+
+    sql = table_sql(conn)
+    assert 'UNIQUE(corp_code, bsns_year, reprt_code, account_nm)' not in sql
+    assert "fs_div TEXT NOT NULL DEFAULT 'CFS'" in sql
+    assert 'CHECK (length(bsns_year) = 4)' in sql
+    assert 'AUTOINCREMENT' in sql
+    assert conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' "
+                        "AND name = 'idx_financial_statements_account'").fetchone()
+    assert collector._has_natural_key_index(conn, 'financial_statements')
+    assert conn.execute('SELECT COUNT(*) FROM financial_statements').fetchone()[0] == 1
+
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO financial_statements (corp_code, bsns_year, reprt_code) "
+                     "VALUES ('00126380', '23', '11011')")
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO financial_statements (corp_code, bsns_year, reprt_code) "
+                     "VALUES (NULL, '2023', '11011')")
+    conn.execute("INSERT INTO financial_statements (corp_code, bsns_year, reprt_code) "
+                 "VALUES ('00126380', '2022', '11011')")
+    assert conn.execute("SELECT fs_div FROM financial_statements WHERE bsns_year = '2022'").fetchone()[0] == 'CFS'
+
+
+def test_upsert_after_rebuild_keeps_both_statement_kinds(collector, conn):
+    collector._migrate_upsert_table(conn, 'financial_statements')
+    frame = pd.DataFrame({
+        'corp_code': ['00126380'] * 2, 'bsns_year': ['2023'] * 2, 'reprt_code': ['11011'] * 2,
+        'fs_div': ['CFS', 'OFS'], 'sj_div': ['BS'] * 2, 'account_id': ['ifrs-full_Assets'] * 2,
+        'account_nm': ['자산총계'] * 2, 'thstrm_amount': [100.0, 90.0],
+    })
+    collector._upsert_dataframe(conn, 'financial_statements', frame)
+    collector._upsert_dataframe(conn, 'financial_statements', frame)
+
+    amounts = dict(conn.execute('SELECT fs_div, thstrm_amount FROM financial_statements'))
+    assert amounts == {'CFS': 100.0, 'OFS': 90.0}
+    # 자연키 UNIQUE 제약이 DDL에 있으므로 별도 자연키 인덱스는 만들지 않음
+    assert not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'uq_financial_statements_natural_key'"
+                            ).fetchone()
+
+
+def test_created_unique_index_is_dropped_without_rebuild(collector):
+    conn = sqlite3.connect(':memory:')
+    conn.execute(DartDataCollector.DART_UPSERT_TABLES['disclosures']['schema'])
+    conn.execute('CREATE UNIQUE INDEX uq_old ON disclosures(corp_code, rcept_dt)')
+    conn.execute('CREATE INDEX idx_disclosures_report ON disclosures(report_nm)')
+
+    collector._ensure_upsert_table(conn, 'disclosures')
+
+    names = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert 'uq_old' not in names
+    assert {'idx_disclosures_report', 'uq_disclosures_natural_key'} <= names
+    conn.close()
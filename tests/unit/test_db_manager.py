@@ -0,0 +1,68 @@
+"""
+통합 데이터 접근 계층 테스트
+임시 DB에서 get_ohlcv 필드 부분 조회와 메서드별 계측(stats)을 확인
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.database_config import DatabaseConfig
+from src.database.db_manager import DatabaseManager
+from src.database.models import OHLCVBlock
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setenv('DB_PATH', str(tmp_path))
+    config = DatabaseConfig()
+    assert config.create_database('stock')
+    manager = DatabaseManager(config)
+    manager.save_prices(pd.DataFrame({
+        'stock_code': ['005930', '005930', '000660'],
+        'date': ['2024-01-02', '2024-01-03', '2024-01-03'],
+        'open_price': [78_000.0, 78_500.0, 140_000.0],
+        'high_price': [79_000.0, 79_000.0, 142_000.0],
+        'low_price': [77_500.0, 78_000.0, 139_000.0],
+        'close_price': [78_500.0, 78_800.0, 141_000.0],
+        'volume': [1_000, 1_200, None],
+    }))
+    manager.reset_stats()
+    return manager
+
+
+def test_get_ohlcv_field_subset_without_close(db):
+    block = db.get_ohlcv(['005930', '000660'], fields=('volume',))
+    assert block.fields == ('volume',)
+    assert list(block.codes) == ['000660', '005930']
+    np.testing.assert_array_equal(block.present, [[False, False], [True, True]])
+    assert len(block.series('005930')) == 2
+    assert len(block.to_frame()) == 2
+
+
+def test_get_ohlcv_full_fields(db):
+    block = db.get_ohlcv(['005930', '000660'])
+    np.testing.assert_array_equal(block.present, [[False, True], [True, True]])
+    assert block.field('close_price')[1, 1] == 78_800.0
+
+
+def test_present_on_empty_block():
+    assert OHLCVBlock.empty(('volume',)).present.shape == (0, 0)
+
+
+def test_instrumentation_counters(db):
+    db.get_ohlcv(['005930'], fields=('volume',))
+    db.get_ohlcv(['005930', '000660'])
+    db.get_prices(['000660'])
+    written = db.save_prices(pd.DataFrame({'stock_code': ['000660'], 'date': ['2024-01-04'],
+                                           'close_price': [143_000.0]}))
+
+    assert db.stats['get_ohlcv']['calls'] == 2
+    assert db.stats['get_ohlcv']['rows'] == 2 + 3
+    assert (db.stats['get_prices']['calls'], db.stats['get_prices']['rows']) == (1, 1)
+    assert db.stats['get_ohlcv']['seconds'] > 0
+    assert db.stats['upsert_frame']['rows'] == written == 1
+    assert set(db.stats_frame().index) == {'get_ohlcv', 'get_prices', 'upsert_frame'}
+
+    db.reset_stats()
+    assert db.stats == {}
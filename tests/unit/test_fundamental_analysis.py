@@ -0,0 +1,38 @@
+"""
+기본적 분석 테스트
+내재가치 계산기 입력 준비(prepare_inputs)가 선택 컬럼 없이도 동작하는지 확인
+"""
+
+import math
+
+import pandas as pd
+
+from src.analysis.fundamental.intrinsic_value import IntrinsicValueCalculator
+
+FINANCIALS = {
+    'net_income': 1.0e12, 'eps': 5_000, 'bps': 40_000, 'per': 12.0, 'pbr': 1.2,
+    'free_cash_flow': 8.0e11, 'shares_outstanding': 2.0e8, 'dividend_paid': -2.0e11,
+}
+
+
+def test_intrinsic_value_from_dict_without_sector():
+    values = IntrinsicValueCalculator().calculate_intrinsic_value(dict(FINANCIALS))
+    assert math.isfinite(values['intrinsic_value'])
+    # 업종 정보가 없으면 시장 중앙값(=자기 자신) 배수 사용
+    assert values['per_pbr'] > 0
+
+
+def test_prepare_inputs_sector_default_matches_blank_sector():
+    frame = pd.DataFrame([FINANCIALS, dict(FINANCIALS, per=8.0, pbr=0.8)])
+    without = IntrinsicValueCalculator.prepare_inputs(frame)
+    blank = IntrinsicValueCalculator.prepare_inputs(frame.assign(sector=None))
+    pd.testing.assert_series_equal(without['sector_per'], blank['sector_per'])
+    pd.testing.assert_series_equal(without['sector_pbr'], blank['sector_pbr'])
+
+
+def test_prepare_inputs_uses_sector_medians():
+    frame = pd.DataFrame([dict(FINANCIALS, sector='반도체', per=10.0),
+                          dict(FINANCIALS, sector='반도체', per=14.0),
+                          dict(FINANCIALS, sector='은행', per=5.0)])
+    prepared = IntrinsicValueCalculator.prepare_inputs(frame)
+    assert prepared['sector_per'].tolist()[:2] == [12.0, 12.0]
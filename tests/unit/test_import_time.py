@@ -0,0 +1,76 @@
+"""
+import 시간 예산 테스트
+`python -X importtime`으로 CLI 엔트리포인트가 공통으로 거치는 패키지의 import 비용을 측정
+(새 프로세스에서 측정하므로 테스트 순서/캐시의 영향을 받지 않음)
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# 모듈별 누적 import 시간 예산 (마이크로초) - pandas 단독 import(수백 ms)보다 충분히 작게
+IMPORT_BUDGET_US = {
+    'src.utils': 50_000,
+    'config': 150_000,
+    'config.database_config': 200_000,
+    'src.database.latest_snapshot': 250_000,
+}
+
+# 패키지 import만으로 로드되면 안 되는 무거운 의존성
+HEAVY_MODULES = ['pandas', 'numpy', 'scipy', 'plotly', 'FinanceDataReader', 'talib', 'bs4', 'requests']
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    return subprocess.run(
+        [sys.executable, *args], cwd=PROJECT_ROOT, env=env,
+        capture_output=True, text=True, timeout=120,
+    )
+
+
+def _cumulative_import_us(module: str) -> int:
+    """-X importtime 출력에서 모듈의 누적 import 시간 (마이크로초)"""
+    result = _run_python('-X', 'importtime', '-c', f'import {module}')
+    assert result.returncode == 0, result.stderr
+
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if name.strip() == module:
+            return int(cumulative)
+    raise AssertionError(f"importtime 출력에 {module} 없음")
+
+
+@pytest.mark.parametrize('module, budget_us', sorted(IMPORT_BUDGET_US.items()))
+def test_import_time_budget(module, budget_us):
+    # 첫 측정은 .pyc 생성/디스크 캐시 영향이 있으므로 두 번 중 빠른 값 사용
+    elapsed_us = min(_cumulative_import_us(module) for _ in range(2))
+    assert elapsed_us <= budget_us, f"{module} import {elapsed_us / 1000:.1f}ms > 예산 {budget_us / 1000:.0f}ms"
+
+
+def test_packages_do_not_load_heavy_dependencies():
+    code = (
+        'import sys, src.utils, config, config.database_config, src.database.latest_snapshot; '
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))'
+    )
+    result = _run_python('-c', code)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
+
+
+def test_utils_lazy_export_resolves_on_access():
+    code = (
+        'import sys, src.utils; '
+        'assert "src.utils.formatting_utils" not in sys.modules; '
+        'from src.utils import format_currency; '
+        'assert "src.utils.formatting_utils" in sys.modules; '
+        'assert "format_currency" in dir(src.utils)'
+    )
+    result = _run_python('-c', code)
+    assert result.returncode == 0, result.stderr
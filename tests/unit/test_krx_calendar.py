@@ -0,0 +1,67 @@
+"""
+KRX 거래일 캘린더 테스트
+휴장일 표 범위(2000~2030) 밖 날짜가 예외 없이 평일 규칙으로 처리되는지 확인
+"""
+
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.utils.date_utils import DateUtils
+from src.utils.krx_calendar import KRXCalendar, get_krx_calendar
+
+
+def test_holiday_table_years_are_exact():
+    calendar = get_krx_calendar()
+    assert calendar.is_exact('2024-02-09')
+    assert not calendar.is_session('2024-02-09')  # 설날 연휴
+    assert calendar.is_holiday('2024-02-09')
+
+
+def test_1999_dates_fall_back_to_weekday_rule():
+    calendar = get_krx_calendar()
+    assert not calendar.is_exact('1999-06-01')
+    assert calendar.is_session('1999-06-01')        # 화요일
+    assert not calendar.is_session('19990605')      # 토요일
+    assert not calendar.is_holiday('1999-01-01')
+    assert calendar.add_sessions('1999-12-30', 1) == date(1999, 12, 31)
+    assert calendar.session_count('1999-12-27', '1999-12-31') == 5
+    np.testing.assert_array_equal(
+        calendar.is_session_array(['1999-12-24', '1999-12-25', '2024-02-09', '2024-02-13']),
+        [True, False, False, True])
+
+
+def test_dates_outside_bitmap_span_use_weekday_rule():
+    calendar = get_krx_calendar()
+    assert calendar.is_session('1965-03-01')        # 월요일
+    assert not calendar.is_session('2100-01-02')    # 토요일
+    np.testing.assert_array_equal(
+        calendar.is_session_array(['1965-03-01', '1965-03-06', '2024-02-13']), [True, False, True])
+
+
+def test_date_utils_accept_1999_dates():
+    assert DateUtils.is_business_day('1999-06-01')
+    assert DateUtils.add_business_days('1999-12-30', 2) == pd.Timestamp('2000-01-03').to_pydatetime()
+
+
+def test_holidays_only_built_for_table_years():
+    calendar = KRXCalendar()
+    years = {day.year for day in calendar.holiday_names}
+    assert min(years) == KRXCalendar.START.year
+    assert max(years) == KRXCalendar.END.year
+
+
+def test_ohlcv_validator_accepts_pre_2000_bars():
+    from scripts.validation.data_quality_check import OHLCVValidator
+
+    chunk = pd.DataFrame({
+        'stock_code': ['005930'] * 3,
+        'date': ['1999-12-29', '1999-12-30', '2000-01-04'],
+        'open_price': [100.0, 101.0, 102.0], 'high_price': [105.0, 106.0, 107.0],
+        'low_price': [95.0, 96.0, 97.0], 'close_price': [100.0, 101.0, 102.0],
+        'volume': [10, 10, 10],
+    })
+    table = OHLCVValidator().evaluate_chunk(chunk)
+    assert table.loc[0, 'bars'] == 3
+    assert table.loc[0, 'off_calendar'] == 0
@@ -0,0 +1,73 @@
+"""
+최신값 스냅샷 테스트
+대량 적재(bulk_load) 구간에서 트리거를 끄고 종료 후 재구성한 결과가 행 단위 트리거 결과와 같은지 확인
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.database_config import DatabaseConfig
+from src.database.db_manager import DatabaseManager
+from src.database.latest_snapshot import LatestSnapshot
+
+TRIGGER_SQL = "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_latest_snapshot_%'"
+COLUMNS = ['stock_code', 'price_date', 'close_price', 'prev_close', 'volume', 'market_cap']
+
+
+def make_db(path, monkeypatch):
+    monkeypatch.setenv('DB_PATH', str(path))
+    config = DatabaseConfig()
+    assert config.create_database('stock')
+    with config.get_connection('stock') as conn:
+        LatestSnapshot(config).ensure(conn)
+        conn.executemany('INSERT INTO company_info (stock_code, company_name, shares_outstanding) VALUES (?, ?, ?)',
+                         [('005930', '삼성전자', 5_969_782_550), ('000660', 'SK하이닉스', 728_002_365)])
+    return DatabaseManager(config)
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2024-01-02', periods=30).strftime('%Y-%m-%d')
+    frame = pd.DataFrame([(code, day, float(price), 1_000)
+                          for code, base in (('005930', 78_000), ('000660', 140_000))
+                          for day, price in zip(dates, base + rng.integers(-2_000, 2_000, len(dates)))],
+                         columns=['stock_code', 'date', 'close_price', 'volume'])
+    # 과거 행이 나중에 적재되는 순서
+    return frame.sample(frac=1, random_state=1)
+
+
+def snapshot_frame(db):
+    return LatestSnapshot(db.db_config).load(COLUMNS, order_by='stock_code')
+
+
+def test_bulk_load_matches_row_triggers(tmp_path, monkeypatch, prices):
+    row_db = make_db(tmp_path / 'row', monkeypatch)
+    row_db.save_prices(prices)
+
+    bulk_db = make_db(tmp_path / 'bulk', monkeypatch)
+    with bulk_db.db_config.get_connection('stock') as conn:
+        triggers = {row[0] for row in conn.execute(TRIGGER_SQL)}
+    with bulk_db.bulk_load(stock_codes=prices['stock_code'].unique()):
+        with bulk_db.db_config.get_connection('stock') as conn:
+            remaining = {row[0] for row in conn.execute(TRIGGER_SQL)}
+        assert not any('stock_prices' in name for name in remaining)
+        bulk_db.save_prices(prices)
+
+    with bulk_db.db_config.get_connection('stock') as conn:
+        assert {row[0] for row in conn.execute(TRIGGER_SQL)} == triggers
+    pd.testing.assert_frame_equal(snapshot_frame(bulk_db), snapshot_frame(row_db))
+    assert snapshot_frame(bulk_db)['prev_close'].notna().all()
+
+
+def test_bulk_load_rebuilds_after_failure(tmp_path, monkeypatch, prices):
+    db = make_db(tmp_path, monkeypatch)
+    with pytest.raises(RuntimeError):
+        with db.bulk_load():
+            db.save_prices(prices)
+            raise RuntimeError('적재 중단')
+
+    assert len(snapshot_frame(db)) == 2
+    with db.db_config.get_connection('stock') as conn:
+        assert conn.execute(TRIGGER_SQL).fetchall()
@@ -0,0 +1,52 @@
+"""
+OHLCV 검증기 테스트
+단일 일자 검증에서 직전 봉을 기준으로 가격 급변/결측 거래일을 평가하는지 확인
+"""
+
+import sqlite3
+
+import pytest
+
+from scripts.validation.data_quality_check import OHLCVValidator
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('''CREATE TABLE stock_prices (stock_code TEXT, date TEXT, open_price REAL, high_price REAL,
+                    low_price REAL, close_price REAL, volume INTEGER, UNIQUE(stock_code, date))''')
+    bars = [
+        # 005930: 01-04 결측, 01-05 +50%
+        ('005930', '2024-01-02', 100.0), ('005930', '2024-01-03', 100.0), ('005930', '2024-01-05', 150.0),
+        # 000660: 정상
+        ('000660', '2024-01-03', 200.0), ('000660', '2024-01-04', 202.0), ('000660', '2024-01-05', 204.0),
+        # 035420: 해당 일자 봉 없음
+        ('035420', '2024-01-03', 300.0),
+    ]
+    conn.executemany('INSERT INTO stock_prices VALUES (?, ?, ?, ?, ?, ?, ?)',
+                     [(code, day, close, close, close, close, 1_000) for code, day, close in bars])
+    yield conn
+    conn.close()
+
+
+def test_single_date_uses_previous_bar(conn):
+    result = OHLCVValidator().validate(conn, start_date='2024-01-05', end_date='2024-01-05')
+
+    assert result['total_records'] == 2
+    assert result['total_stocks'] == 2
+    assert result['dates'] == {'2024-01-05'}
+    assert result['totals']['price_jump'] == 1
+    assert result['totals']['missing_days'] == 1
+    assert result['totals']['max_abs_change_pct'] == 50.0
+
+    anomalies = result['anomalies'].set_index('stock_code')
+    assert list(anomalies.index) == ['005930']
+    assert anomalies.loc['005930', 'bars'] == 1
+    assert anomalies.loc['005930', 'first_date'] == anomalies.loc['005930', 'last_date'] == '2024-01-05'
+
+
+def test_full_history_totals(conn):
+    full = OHLCVValidator().validate(conn)
+    assert full['total_records'] == 7
+    assert full['totals']['price_jump'] == 1
+    assert full['totals']['missing_days'] == 1
@@ -0,0 +1,45 @@
+"""
+투자 추천 엔진 테스트
+추천/위험도 라벨이 investment_scores 스키마와 같은지, 시장 감정지수 대체가 신뢰도에서 빠지는지 확인
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from config.database_config import DatabaseConfig
+from src.analysis.integration import recommendation_engine as engine
+
+
+def schema_values(column):
+    schema = DatabaseConfig().table_schemas['investment_scores']
+    comment = re.search(rf'^\s*{column} TEXT,\s*--(.*)$', schema, re.MULTILINE).group(1)
+    return re.findall(r"'([^']+)'", comment)
+
+
+def test_labels_match_schema():
+    assert schema_values('recommendation') == engine.RECOMMENDATION_ORDER
+    assert schema_values('risk_level') == engine.RISK_LEVELS
+
+    total = pd.Series([95.0, 72.0, 50.0, 10.0, np.nan])
+    assert set(engine.recommendations(total).dropna()) <= set(engine.RECOMMENDATION_ORDER)
+
+
+def test_market_sentiment_fallback_not_counted_in_confidence():
+    df = pd.DataFrame({
+        'score_percentage': [80.0, 80.0, 80.0],
+        'technical_score': [60.0, 60.0, 60.0],
+        'sentiment_final_score': [70.0, np.nan, np.nan],
+        'market_sentiment_index': [0.2, 0.2, np.nan],
+    })
+    components = pd.DataFrame({
+        'fundamental_score': engine.fundamental_scores(df),
+        'technical_score': engine.technical_scores(df),
+        'sentiment_score': engine.sentiment_scores(df),
+    })
+    combined = engine.combine_scores(components, fallbacks={'sentiment': engine.sentiment_is_fallback(df)})
+
+    assert combined['confidence_level'].tolist() == [1.0, 0.75, 0.75]
+    # 대체값은 총점에는 반영
+    assert combined['total_investment_score'][1] != combined['total_investment_score'][2]
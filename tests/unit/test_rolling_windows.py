@@ -0,0 +1,260 @@
+"""
+이동 창 기본 도구 테스트
+배치 함수(rolling_windows)를 창마다 다시 계산하는 단순 루프 및 스트리밍 클래스와 비교하고,
+이를 사용하는 TechnicalCalculator 결과를 기존 루프 구현과 비교
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.utils.rolling_windows import (
+    ExponentialSmoother,
+    RollingMax,
+    RollingMean,
+    RollingMin,
+    RollingVariance,
+    _RollingExtreme,
+    _RollingStream,
+    ema,
+    ewm,
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_std,
+    rolling_variance,
+    wilder,
+)
+
+RTOL = 1e-9
+PERIODS = [1, 2, 5, 14, 20, 60]
+
+
+@pytest.fixture(scope='module')
+def prices():
+    """주가 수준(수만 원)의 랜덤 워크 1,000일"""
+    rng = np.random.default_rng(20240101)
+    return 50_000 * np.exp(np.cumsum(rng.normal(0, 0.02, 1000)))
+
+
+# =============================================================================
+# 단순 루프 기준값 (창마다 처음부터 다시 계산)
+# =============================================================================
+
+def naive_rolling(values, period, func):
+    result = np.full(len(values), np.nan)
+    for i in range(period - 1, len(values)):
+        result[i] = func(values[i - period + 1:i + 1])
+    return result
+
+
+def naive_ewm(values, alpha, warmup):
+    result = np.full(len(values), np.nan)
+    if len(values) < warmup:
+        return result
+    smoothed = math.fsum(values[:warmup]) / warmup
+    result[warmup - 1] = smoothed
+    for i in range(warmup, len(values)):
+        smoothed = (1 - alpha) * smoothed + alpha * values[i]
+        result[i] = smoothed
+    return result
+
+
+def streamed(stream, values):
+    return np.array([stream.push(value) for value in values])
+
+
+def assert_close(actual, expected, scale=1.0):
+    np.testing.assert_allclose(actual, expected, rtol=RTOL, atol=RTOL * scale, equal_nan=True)
+
+
+# =============================================================================
+# 배치 vs 단순 루프 vs 스트리밍
+# =============================================================================
+
+@pytest.mark.parametrize('period', PERIODS)
+def test_rolling_mean(prices, period):
+    expected = naive_rolling(prices, period, np.mean)
+    assert_close(rolling_mean(prices, period), expected)
+    assert_close(streamed(RollingMean(period), prices), expected)
+
+
+@pytest.mark.parametrize('period', PERIODS)
+def test_rolling_max_min(prices, period):
+    # 극값은 비교만 하므로 정확히 같아야 함
+    np.testing.assert_array_equal(rolling_max(prices, period), naive_rolling(prices, period, np.max))
+    np.testing.assert_array_equal(rolling_min(prices, period), naive_rolling(prices, period, np.min))
+    np.testing.assert_array_equal(streamed(RollingMax(period), prices), naive_rolling(prices, period, np.max))
+    np.testing.assert_array_equal(streamed(RollingMin(period), prices), naive_rolling(prices, period, np.min))
+
+
+def test_rolling_extreme_with_ties():
+    values = np.array([3, 3, 1, 3, 2, 2, 2, 5, 5, 0], dtype=float)
+    for period in (1, 2, 3, 4):
+        np.testing.assert_array_equal(rolling_max(values, period), naive_rolling(values, period, np.max))
+        np.testing.assert_array_equal(streamed(RollingMin(period), values), naive_rolling(values, period, np.min))
+
+
+@pytest.mark.parametrize('period', [p for p in PERIODS if p > 1])
+@pytest.mark.parametrize('ddof', [0, 1])
+def test_rolling_variance(prices, period, ddof):
+    expected = naive_rolling(prices, period, lambda w: np.var(w, ddof=ddof))
+    scale = np.nanmax(expected)
+    assert_close(rolling_variance(prices, period, ddof=ddof), expected, scale)
+    assert_close(streamed(RollingVariance(period, ddof=ddof), prices), expected, scale)
+    assert_close(rolling_std(prices, period, ddof=ddof), np.sqrt(expected), np.sqrt(scale))
+
+
+def test_rolling_variance_constant_window_is_zero():
+    values = np.r_[np.full(30, 12_345.6), np.arange(10.0)]
+    assert np.all(rolling_variance(values, 10)[9:30] == 0)
+    stream = RollingVariance(10)
+    assert all(stream.push(value) == 0 for value in values[:30] if stream.ready)
+
+
+@pytest.fixture(scope='module')
+def prices_with_gaps(prices):
+    """결측(NaN)이 단독/연속/맨 앞/맨 끝에 섞인 주가"""
+    values = prices.copy()
+    values[[0, 150, 151, 152, 400, 999]] = np.nan
+    return values
+
+
+@pytest.mark.parametrize('period', PERIODS)
+def test_rolling_mean_with_nan(prices_with_gaps, period):
+    # NaN을 포함한 창만 NaN이고 이후 창은 정상값으로 돌아와야 함
+    expected = naive_rolling(prices_with_gaps, period, np.mean)
+    assert np.isfinite(expected[-2])
+    assert_close(rolling_mean(prices_with_gaps, period), expected)
+    assert_close(streamed(RollingMean(period), prices_with_gaps), expected)
+    panel = np.column_stack([prices_with_gaps, np.arange(1000.0)])
+    assert_close(rolling_mean(panel, period)[:, 1], naive_rolling(np.arange(1000.0), period, np.mean))
+
+
+@pytest.mark.parametrize('period', [p for p in PERIODS if p > 1])
+@pytest.mark.parametrize('ddof', [0, 1])
+def test_rolling_variance_with_nan(prices_with_gaps, period, ddof):
+    expected = naive_rolling(prices_with_gaps, period, lambda w: np.var(w, ddof=ddof))
+    scale = np.nanmax(expected)
+    assert_close(rolling_variance(prices_with_gaps, period, ddof=ddof), expected, scale)
+    assert_close(streamed(RollingVariance(period, ddof=ddof), prices_with_gaps), expected, scale)
+
+
+@pytest.mark.parametrize('alpha, warmup', [(0.5, 1), (2 / 13, 12), (1 / 14, 14), (2 / 27, 26), (1.0, 3)])
+def test_ewm(prices, alpha, warmup):
+    expected = naive_ewm(prices, alpha, warmup)
+    assert_close(ewm(prices, alpha, warmup), expected, prices.max())
+    assert_close(streamed(ExponentialSmoother(alpha, warmup), prices), expected, prices.max())
+
+
+@pytest.mark.parametrize('period', [5, 12, 14, 26])
+def test_ema_and_wilder_match_streaming(prices, period):
+    assert_close(ema(prices, period), streamed(ExponentialSmoother.ema(period), prices), prices.max())
+    assert_close(wilder(prices, period), streamed(ExponentialSmoother.wilder(period), prices), prices.max())
+
+
+def test_two_dimensional_input_matches_columns(prices):
+    panel = np.column_stack([prices, prices[::-1], np.sqrt(prices)])
+    for func in (rolling_mean, rolling_max, rolling_min, rolling_variance, ema, wilder):
+        batch = func(panel, 20)
+        for column in range(panel.shape[1]):
+            assert_close(batch[:, column], func(panel[:, column], 20), prices.max() ** 2)
+
+
+def test_shorter_than_period_is_all_nan(prices):
+    for func in (rolling_mean, rolling_max, rolling_min, rolling_variance, ema, wilder):
+        assert np.isnan(func(prices[:5], 20)).all()
+    assert math.isnan(RollingMean(20).extend(prices[:5]))
+
+
+def test_invalid_period():
+    with pytest.raises(ValueError):
+        rolling_mean([1.0, 2.0], 0)
+    with pytest.raises(ValueError):
+        RollingVariance(1, ddof=1)
+    with pytest.raises(ValueError):
+        ExponentialSmoother(0.0)
+
+
+def test_stream_base_classes_are_abstract():
+    with pytest.raises(TypeError):
+        _RollingStream()
+    with pytest.raises(TypeError):
+        _RollingExtreme(3)
+
+
+# =============================================================================
+# TechnicalCalculator (기존 루프 구현과 비교)
+# =============================================================================
+
+@pytest.fixture(scope='module')
+def calculator():
+    pytest.importorskip('scipy')
+    from src.utils.calculation_utils import TechnicalCalculator
+    return TechnicalCalculator
+
+
+def loop_rsi(prices, period):
+    changes = np.diff(prices)
+    gains, losses = np.maximum(changes, 0), np.maximum(-changes, 0)
+    avg_gain, avg_loss = np.mean(gains[:period]), np.mean(losses[:period])
+    values = []
+    for i in range(period, len(changes) + 1):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        values.append(100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss))
+    return np.array(values)
+
+
+def test_technical_calculator_sma_ema(calculator, prices):
+    values = prices.tolist()
+    for period in (5, 20, 60):
+        assert_close(calculator.calculate_sma(values, period),
+                     naive_rolling(prices, period, np.mean)[period - 1:], prices.max())
+        assert_close(calculator.calculate_ema(values, period),
+                     naive_ewm(prices, 2 / (period + 1), period)[period - 1:], prices.max())
+
+
+def test_technical_calculator_rsi(calculator, prices):
+    for period in (6, 14):
+        assert_close(calculator.calculate_rsi(prices.tolist(), period), loop_rsi(prices, period), 100)
+
+
+def test_technical_calculator_rsi_without_losses(calculator):
+    assert calculator.calculate_rsi(list(range(1, 31)), 14) == [100.0] * 16
+
+
+def test_technical_calculator_bollinger(calculator, prices):
+    bands = calculator.calculate_bollinger_bands(prices.tolist(), 20, 2.0)
+    middle = naive_rolling(prices, 20, np.mean)[19:]
+    std = naive_rolling(prices, 20, np.std)[19:]
+    assert_close(bands['middle'], middle, prices.max())
+    assert_close(bands['upper'], middle + 2 * std, prices.max())
+    assert_close(bands['lower'], middle - 2 * std, prices.max())
+
+
+def test_technical_calculator_stochastic(calculator, prices):
+    prices = prices.copy()
+    highs, lows = prices * 1.02, prices * 0.98
+    highs[100:120] = lows[100:120] = prices[100:120] = 50_000.0  # 고가 = 저가 구간은 50
+    result = calculator.calculate_stochastic(highs.tolist(), lows.tolist(), prices.tolist(), 14, 3)
+
+    highest = naive_rolling(highs, 14, np.max)[13:]
+    lowest = naive_rolling(lows, 14, np.min)[13:]
+    expected_k = [50.0 if h == l else (c - l) / (h - l) * 100 for h, l, c in zip(highest, lowest, prices[13:])]
+    assert_close(result['k'], expected_k, 100)
+    assert_close(result['d'], naive_rolling(np.array(expected_k), 3, np.mean)[2:], 100)
+
+
+def test_technical_calculator_macd(calculator, prices):
+    result = calculator.calculate_macd(prices.tolist(), 12, 26, 9)
+    fast = naive_ewm(prices, 2 / 13, 12)
+    slow = naive_ewm(prices, 2 / 27, 26)
+    macd = (fast - slow)[25:]
+    signal = naive_ewm(macd, 2 / 10, 9)[8:]
+    assert_close(result['macd'], macd, prices.max())
+    assert_close(result['signal'], signal, prices.max())
+    # 히스토그램은 기존 구현과 같은 정렬 (macd 앞에서부터 signal 길이만큼)
+    assert_close(result['histogram'], macd[:len(signal)] - signal, prices.max())
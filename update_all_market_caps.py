@@ -1,34 +1,48 @@
 #!/usr/bin/env python3
 """
 전체 종목 시가총액 업데이트 스크립트
-company_info 테이블의 모든 종목에 대해 시가총액을 실시간으로 업데이트
+company_info 테이블의 모든 종목에 대해 시가총액을 한 번에 업데이트
+
+- 시장 전체 상장종목 목록(fdr.StockListing) 1회 호출로 종가 확보
+- 상장주식수는 SharesResolver로 조회 (받아 둔 목록 재사용 → KRX → 누락 종목만 스크래핑, 결과 캐시)
+- 목록에 없는 종목은 로컬 stock_prices 최신 종가, 조회 실패 종목은 company_info 상장주식수 사용
+- 시가총액(억원) = 종가 × 상장주식수 벡터 계산 후 UPDATE 1회로 반영
 
 실행 방법:
 python update_all_market_caps.py
-python update_all_market_caps.py --batch_size=100 --delay=0.05
+python update_all_market_caps.py --source=local     # API 호출 없이 로컬 데이터(상장주식수 캐시 포함)만 사용
+python update_all_market_caps.py --force_update
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
-import time
 import argparse
 from datetime import datetime
 from pathlib import Path
 import logging
 import sys
 
-# FinanceDataReader 설치 확인
+from src.data_collection.shares_resolver import SharesResolver
+
+# FinanceDataReader 설치 확인 (없으면 로컬 데이터만 사용)
 try:
     import FinanceDataReader as fdr
 except ImportError:
-    print("❌ FinanceDataReader가 설치되지 않았습니다.")
-    print("설치 명령어: pip install finance-datareader")
-    sys.exit(1)
+    fdr = None
+
+# 시가총액 저장 단위: 억원
+MARKET_CAP_UNIT = 100000000
+
+LISTING_COLUMNS = ['stock_code', 'listing_price', 'listing_shares', 'listing_market_cap']
+
+# StockListing 컬럼명 (버전에 따라 상장주식수가 Stocks 또는 Shares)
+LISTING_SHARES_COLUMNS = ['Stocks', 'Shares']
 
 class CompleteMarketCapUpdater:
     """전체 종목 시가총액 업데이트 클래스"""
     
-    def __init__(self, batch_size=50, delay=0.05):
+    def __init__(self, source='auto'):
         # 로깅 설정
         logging.basicConfig(
             level=logging.INFO,
@@ -41,8 +55,7 @@ class CompleteMarketCapUpdater:
         self.logger = logging.getLogger(__name__)
         
         self.db_path = Path('data/databases/stock_data.db')
-        self.batch_size = batch_size
-        self.delay = delay
+        self.source = source
         
         # 통계
         self.stats = {
@@ -51,13 +64,11 @@ class CompleteMarketCapUpdater:
             'updated': 0,
             'failed': 0,
             'skipped': 0,
-            'start_time': None,
-            'estimated_time': None
+            'from_listing': 0,
+            'from_local': 0,
+            'start_time': None
         }
         
-        # 종목별 상장주식수 캐시 (API 호출 최소화)
-        self.shares_cache = {}
-        
         self.logger.info("🚀 전체 종목 시가총액 업데이트 시작")
     
     def check_database_status(self):
@@ -124,209 +135,194 @@ class CompleteMarketCapUpdater:
             self.logger.error(f"종목 리스트 조회 실패: {e}")
             return pd.DataFrame()
     
-    def load_shares_data_bulk(self):
-        """상장주식수 데이터를 대량으로 미리 로드"""
+    def load_listing_snapshot(self):
+        """
+        시장 전체 상장종목 목록에서 종가/상장주식수 조회 (API 1회)
+
+        Returns:
+            stock_code, listing_price, listing_shares, listing_market_cap(원) DataFrame
+            (조회 실패 시 빈 DataFrame)
+        """
+        if fdr is None:
+            self.logger.warning("⚠️  FinanceDataReader 미설치 - 로컬 데이터만 사용")
+            return self.empty_listing()
+        
         try:
-            self.logger.info("📊 상장주식수 데이터 로딩 중...")
-            
-            # KOSPI 종목 리스트
-            kospi_list = fdr.StockListing('KOSPI')
-            kosdaq_list = fdr.StockListing('KOSDAQ')
-            
-            # 통합
-            all_stocks = pd.concat([kospi_list, kosdaq_list], ignore_index=True)
-            
-            # 캐시에 저장
-            for _, row in all_stocks.iterrows():
-                stock_code = row['Code']
-                shares = row.get('Shares', None)
-                if pd.notna(shares) and shares > 0:
-                    self.shares_cache[stock_code] = int(shares)
-            
-            self.logger.info(f"✅ 상장주식수 데이터 로딩 완료: {len(self.shares_cache):,}개 종목")
-            return True
-            
+            self.logger.info("📊 상장종목 목록 로딩 중...")
+            listing = fdr.StockListing('KRX')
         except Exception as e:
-            self.logger.warning(f"상장주식수 데이터 로딩 실패: {e}")
-            return False
+            self.logger.warning(f"상장종목 목록 로딩 실패: {e}")
+            return self.empty_listing()
+        
+        shares_column = next((col for col in LISTING_SHARES_COLUMNS if col in listing.columns), None)
+        snapshot = pd.DataFrame({
+            'stock_code': listing['Code'].astype(str).str.zfill(6),
+            'listing_price': pd.to_numeric(listing.get('Close'), errors='coerce'),
+            'listing_shares': pd.to_numeric(listing[shares_column], errors='coerce') if shares_column else np.nan,
+            'listing_market_cap': pd.to_numeric(listing.get('Marcap'), errors='coerce'),
+        })
+        snapshot = snapshot.drop_duplicates('stock_code')
+        
+        self.logger.info(f"✅ 상장종목 목록 로딩 완료: {len(snapshot):,}개 종목")
+        return snapshot[LISTING_COLUMNS]
     
-    def get_estimated_shares(self, stock_code: str):
-        """주요 종목의 상장주식수 추정값 (2024년 기준)"""
-        shares_data = {
-            # 대형주 (시가총액 10조원 이상)
-            '005930': 5969782550,   # 삼성전자
-            '000660': 728002365,    # SK하이닉스
-            '207940': 1356637170,   # 삼성바이오로직스
-            '373220': 1090000000,   # LG에너지솔루션
-            '005380': 1358000000,   # 현대차
-            '051910': 206000000,    # LG화학
-            '068270': 4347000000,   # 셀트리온
-            '035420': 688000000,    # NAVER
-            '000270': 2432000000,   # 기아
-            '105560': 1000000000,   # KB금융
-            
-            # 중형주
-            '055550': 1234567890,   # 신한지주
-            '323410': 123456789,    # 카카오뱅크
-            '096770': 234567890,    # SK이노베이션
-            '003550': 345678901,    # LG
-            '028260': 456789012,    # 삼성물산
-            '009150': 567890123,    # 삼성전기
-            '034730': 678901234,    # SK
-            '012330': 789012345,    # 현대모비스
-            '032830': 890123456,    # 삼성생명
-            '066570': 901234567,    # LG전자
-            
-            # 추가 주요 종목들...
-            '017670': 1000000000,   # SK텔레콤
-            '030200': 1500000000,   # KT
-            '086790': 800000000,    # 하나금융지주
-            '316140': 600000000,    # 우리금융지주
-            '024110': 700000000,    # 기업은행
-            '138040': 900000000,    # 메리츠금융지주
-            '251270': 1100000000,   # 넷마블
-            '035720': 1300000000,   # 카카오
-            '018260': 400000000,    # 삼성에스디에스
-            '042700': 500000000,    # 한미반도체
-        }
-        return shares_data.get(stock_code)
+    @staticmethod
+    def empty_listing():
+        """빈 상장종목 스냅샷 (로컬 데이터만 사용할 때)"""
+        return pd.DataFrame({col: pd.Series(dtype=object if col == 'stock_code' else float)
+                             for col in LISTING_COLUMNS})
     
-    def get_current_price_and_shares(self, stock_code: str):
-        """현재가와 상장주식수 조회"""
-        try:
-            # 1. 현재가 조회 (최근 5일 데이터)
-            end_date = datetime.now().strftime('%Y-%m-%d')
-            start_date = (datetime.now() - pd.Timedelta(days=5)).strftime('%Y-%m-%d')
-            
-            stock_data = fdr.DataReader(stock_code, start=start_date, end=end_date)
-            
-            if stock_data.empty:
-                return None, None
-            
-            current_price = float(stock_data['Close'].iloc[-1])
-            
-            # 2. 상장주식수 조회 (캐시 우선)
-            shares = None
-            
-            # 캐시에서 먼저 찾기
-            if stock_code in self.shares_cache:
-                shares = self.shares_cache[stock_code]
-            
-            # 추정값 사용
-            if not shares:
-                shares = self.get_estimated_shares(stock_code)
-            
-            return current_price, shares
-            
-        except Exception as e:
-            self.logger.warning(f"가격/주식수 조회 실패 ({stock_code}): {e}")
-            return None, None
+    def load_local_snapshot(self, conn):
+        """company_info 종목별 로컬 최신 종가와 저장된 상장주식수"""
+        query = """
+            WITH last_price AS (
+                SELECT stock_code, MAX(date) AS date
+                FROM stock_prices
+                GROUP BY stock_code
+            )
+            SELECT c.stock_code, c.company_name, c.market_cap, c.shares_outstanding,
+                   sp.close_price AS local_price, sp.date AS price_date
+            FROM company_info c
+            LEFT JOIN last_price lp ON lp.stock_code = c.stock_code
+            LEFT JOIN stock_prices sp ON sp.stock_code = lp.stock_code AND sp.date = lp.date
+        """
+        return pd.read_sql_query(query, conn)
     
-    def update_single_stock_market_cap(self, stock_code: str, company_name: str):
-        """단일 종목 시가총액 업데이트"""
-        try:
-            # 현재가와 상장주식수 조회
-            current_price, shares = self.get_current_price_and_shares(stock_code)
-            
-            if not current_price:
-                self.logger.warning(f"⚠️  현재가 조회 실패: {company_name}({stock_code})")
-                return False
-            
-            if not shares:
-                self.logger.warning(f"⚠️  상장주식수 정보 없음: {company_name}({stock_code})")
-                return False
-            
-            # 시가총액 계산 (억원 단위)
-            market_cap = int(current_price * shares / 100000000)  # 억원
-            
-            # 데이터베이스 업데이트
-            with sqlite3.connect(self.db_path) as conn:
-                conn.execute('''
-                    UPDATE company_info 
-                    SET market_cap = ?, 
-                        shares_outstanding = ?,
-                        updated_at = ?
-                    WHERE stock_code = ?
-                ''', (market_cap, shares, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), stock_code))
-                
-                affected_rows = conn.total_changes
-                
-                if affected_rows > 0:
-                    self.logger.info(f"✅ {company_name}({stock_code}): {current_price:,.0f}원, {market_cap:,}억원")
-                    return True
-                else:
-                    self.logger.warning(f"⚠️  업데이트 실패: {company_name}({stock_code})")
-                    return False
-                    
-        except Exception as e:
-            self.logger.error(f"❌ 업데이트 실패 ({stock_code}): {e}")
-            return False
+    def resolve_shares(self, stock_codes, listing_df):
+        """
+        SharesResolver로 종목별 상장주식수 조회
+
+        상장종목 목록은 시세 조회 때 받은 것을 일괄 소스로 재사용한다 (API 중복 호출 방지).
+        --source=local이면 외부 조회 없이 캐시된 값만 사용한다.
+
+        Returns:
+            stock_code, resolved_shares DataFrame (조회 실패는 NaN)
+        """
+        resolver = SharesResolver()
+        if self.source == 'local':
+            resolver.bulk_sources, resolver.scrapers = [], []
+        else:
+            listing_shares = listing_df[['stock_code', 'listing_shares']].rename(
+                columns={'listing_shares': 'shares_outstanding'})
+            resolver.bulk_sources = [('FDR_LISTING', lambda: listing_shares)] + [
+                source for source in resolver.bulk_sources if source[0] != 'FDR_LISTING']
+        
+        resolved = resolver.resolve(stock_codes)
+        return pd.DataFrame({
+            'stock_code': resolved['stock_code'],
+            'resolved_shares': pd.to_numeric(resolved['shares_outstanding'], errors='coerce').astype(float),
+        })
+    
+    def build_market_cap_snapshot(self, local_df, listing_df, shares_df):
+        """
+        종목별 종가/상장주식수/시가총액(억원) 계산 (벡터 연산)
+
+        종가: 상장종목 목록 → 로컬 최신 종가.
+        상장주식수: SharesResolver 조회값 → company_info에 저장된 값.
+        주식수를 알 수 없으면 목록의 시가총액(원)을 그대로 환산한다.
+        """
+        df = local_df.merge(listing_df, on='stock_code', how='left')
+        df = df.merge(shares_df, on='stock_code', how='left')
+        
+        shares_local = pd.to_numeric(df['shares_outstanding'], errors='coerce')
+        price_local = pd.to_numeric(df['local_price'], errors='coerce')
+        listing_price = df['listing_price'].where(df['listing_price'] > 0)
+        resolved_shares = df['resolved_shares'].where(df['resolved_shares'] > 0)
+        
+        df['price'] = listing_price.fillna(price_local.where(price_local > 0))
+        df['shares'] = resolved_shares.fillna(shares_local.where(shares_local > 0))
+        
+        market_cap = df['price'] * df['shares']
+        market_cap = market_cap.fillna(df['listing_market_cap'].where(df['listing_market_cap'] > 0))
+        df['new_market_cap'] = np.floor(market_cap / MARKET_CAP_UNIT)
+        df['source'] = np.where(listing_price.notna(), 'listing', 'local')
+        return df
+    
+    def write_market_caps(self, conn, snapshot):
+        """계산된 시가총액을 임시 테이블에 적재 후 UPDATE 1회로 company_info 반영"""
+        rows = [
+            (code, int(cap), None if pd.isna(shares) else int(shares))
+            for code, cap, shares in snapshot[['stock_code', 'new_market_cap', 'shares']]
+                .itertuples(index=False, name=None)
+        ]
+        if not rows:
+            return 0
+        
+        updated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS temp.market_cap_snapshot")
+            conn.execute("""
+                CREATE TEMP TABLE market_cap_snapshot (
+                    stock_code TEXT PRIMARY KEY,
+                    market_cap INTEGER,
+                    shares_outstanding INTEGER
+                )
+            """)
+            conn.executemany("INSERT INTO temp.market_cap_snapshot VALUES (?, ?, ?)", rows)
+            # UPDATE ... FROM은 SQLite 3.33+ 전용이라 상관 서브쿼리 사용 (임시 테이블 PK로 종목당 1회 조회)
+            cursor = conn.execute("""
+                UPDATE company_info
+                SET market_cap = (
+                        SELECT s.market_cap FROM temp.market_cap_snapshot AS s
+                        WHERE s.stock_code = company_info.stock_code
+                    ),
+                    shares_outstanding = COALESCE((
+                        SELECT s.shares_outstanding FROM temp.market_cap_snapshot AS s
+                        WHERE s.stock_code = company_info.stock_code
+                    ), shares_outstanding),
+                    updated_at = ?
+                WHERE stock_code IN (SELECT stock_code FROM temp.market_cap_snapshot)
+            """, (updated_at,))
+            updated = cursor.rowcount
+            conn.execute("DROP TABLE temp.market_cap_snapshot")
+        return updated
     
     def update_all_market_caps(self, force_update=False):
-        """모든 종목의 시가총액 업데이트"""
+        """모든 종목의 시가총액 업데이트 (목록 1회 조회 + 일괄 UPDATE)"""
         try:
             # 데이터베이스 상태 확인
             if not self.check_database_status():
                 return False
             
-            # 상장주식수 데이터 미리 로딩
-            self.load_shares_data_bulk()
-            
-            # 모든 종목 조회
-            stocks_df = self.get_all_stocks()
-            if stocks_df.empty:
-                self.logger.error("❌ 종목 데이터를 찾을 수 없습니다.")
-                return False
-            
-            self.stats['total_stocks'] = len(stocks_df)
             self.stats['start_time'] = datetime.now()
             
-            # 진행률 계산을 위한 변수
-            batch_count = 0
-            
-            self.logger.info(f"🎯 업데이트 시작: {len(stocks_df):,}개 종목")
-            self.logger.info(f"⚙️  배치 크기: {self.batch_size}, 지연시간: {self.delay}초")
-            
-            # 모든 종목 처리
-            for idx, row in stocks_df.iterrows():
-                stock_code = row['stock_code']
-                company_name = row['company_name']
-                current_market_cap = row['market_cap']
+            with sqlite3.connect(self.db_path) as conn:
+                local_df = self.load_local_snapshot(conn)
+                if local_df.empty:
+                    self.logger.error("❌ 종목 데이터를 찾을 수 없습니다.")
+                    return False
+                
+                listing_df = self.load_listing_snapshot() if self.source != 'local' else self.empty_listing()
+                if self.source == 'listing' and listing_df.empty:
+                    self.logger.error("❌ 상장종목 목록을 가져오지 못했습니다.")
+                    return False
                 
-                self.stats['processed'] += 1
+                shares_df = self.resolve_shares(local_df['stock_code'].tolist(), listing_df)
+                snapshot = self.build_market_cap_snapshot(local_df, listing_df, shares_df)
                 
-                # 강제 업데이트가 아니고 이미 시가총액이 있는 경우 스킵
-                if not force_update and current_market_cap and current_market_cap > 0:
-                    self.stats['skipped'] += 1
-                    continue
+                self.stats['total_stocks'] = len(snapshot)
+                self.stats['processed'] = len(snapshot)
                 
-                # 진행률 표시
-                progress = (self.stats['processed'] / self.stats['total_stocks']) * 100
+                # 강제 업데이트가 아니면 시가총액이 이미 있는 종목은 스킵
+                current_cap = pd.to_numeric(snapshot['market_cap'], errors='coerce')
+                skip = (current_cap > 0) if not force_update else pd.Series(False, index=snapshot.index)
+                computable = snapshot['new_market_cap'] > 0
+                targets = snapshot[~skip & computable]
                 
-                if self.stats['processed'] % 10 == 0 or self.stats['processed'] <= 10:
-                    elapsed_time = (datetime.now() - self.stats['start_time']).total_seconds()
-                    if self.stats['processed'] > 0:
-                        avg_time_per_stock = elapsed_time / self.stats['processed']
-                        remaining_stocks = self.stats['total_stocks'] - self.stats['processed']
-                        estimated_remaining = remaining_stocks * avg_time_per_stock
-                        
-                        self.logger.info(f"📊 진행률: {self.stats['processed']}/{self.stats['total_stocks']} "
-                                       f"({progress:.1f}%) - 예상 남은 시간: {estimated_remaining/60:.1f}분")
+                self.stats['skipped'] = int(skip.sum())
+                self.stats['failed'] = int((~skip & ~computable).sum())
+                self.stats['from_listing'] = int((targets['source'] == 'listing').sum())
+                self.stats['from_local'] = int((targets['source'] == 'local').sum())
                 
-                # 시가총액 업데이트
-                if self.update_single_stock_market_cap(stock_code, company_name):
-                    self.stats['updated'] += 1
-                else:
-                    self.stats['failed'] += 1
+                self.logger.info(f"🎯 업데이트 대상: {len(targets):,}개 종목 "
+                                 f"(목록 {self.stats['from_listing']:,} / 로컬 {self.stats['from_local']:,})")
                 
-                # 배치 처리 및 지연
-                batch_count += 1
-                if batch_count >= self.batch_size:
-                    self.logger.info(f"⏸️  배치 완료: {batch_count}개 처리, {self.delay * batch_count:.1f}초 대기")
-                    time.sleep(self.delay * batch_count)
-                    batch_count = 0
-                else:
-                    time.sleep(self.delay)
+                self.stats['updated'] = self.write_market_caps(conn, targets)
+            
+            if self.stats['failed']:
+                missing = snapshot[~skip & ~computable]
+                self.logger.warning(f"⚠️  종가/상장주식수 정보 없음: {self.stats['failed']:,}개 "
+                                    f"(예: {', '.join(missing['stock_code'].head(5))})")
             
             # 최종 결과
             total_time = (datetime.now() - self.stats['start_time']).total_seconds()
@@ -336,7 +332,6 @@ class CompleteMarketCapUpdater:
             
         except KeyboardInterrupt:
             self.logger.info("⏹️  사용자에 의해 중단됨")
-            self.log_final_results((datetime.now() - self.stats['start_time']).total_seconds())
             return False
         except Exception as e:
             self.logger.error(f"전체 업데이트 실패: {e}")
@@ -352,14 +347,12 @@ class CompleteMarketCapUpdater:
         self.logger.info(f"   업데이트 성공: {self.stats['updated']:,}개")
         self.logger.info(f"   업데이트 실패: {self.stats['failed']:,}개")
         self.logger.info(f"   스킵됨: {self.stats['skipped']:,}개")
-        self.logger.info(f"⏱️  총 소요시간: {total_time/60:.1f}분")
+        self.logger.info(f"   데이터 출처: 목록 {self.stats['from_listing']:,}개 / 로컬 {self.stats['from_local']:,}개")
+        self.logger.info(f"⏱️  총 소요시간: {total_time:.1f}초")
         
         success_rate = (self.stats['updated'] / max(self.stats['processed'] - self.stats['skipped'], 1)) * 100
         self.logger.info(f"📈 성공률: {success_rate:.1f}%")
-        
-        if self.stats['updated'] > 0:
-            avg_time = total_time / self.stats['updated']
-            self.logger.info(f"⚡ 평균 처리시간: {avg_time:.2f}초/종목")
+
     
     def verify_results(self):
         """업데이트 결과 검증"""
@@ -411,10 +404,8 @@ class CompleteMarketCapUpdater:
 def main():
     """메인 실행 함수"""
     parser = argparse.ArgumentParser(description='전체 종목 시가총액 업데이트')
-    parser.add_argument('--batch_size', type=int, default=50, 
-                       help='배치 크기 (기본값: 50)')
-    parser.add_argument('--delay', type=float, default=0.05, 
-                       help='종목간 지연시간 (초, 기본값: 0.05)')
+    parser.add_argument('--source', choices=['auto', 'listing', 'local'], default='auto',
+                       help='데이터 출처 (auto: 상장종목 목록 + 로컬 보완, listing: 목록 필수, local: 로컬만)')
     parser.add_argument('--force_update', action='store_true',
                        help='이미 시가총액이 있는 종목도 강제 업데이트')
     parser.add_argument('--verify_only', action='store_true',
@@ -423,10 +414,7 @@ def main():
     args = parser.parse_args()
     
     # 업데이터 초기화
-    updater = CompleteMarketCapUpdater(
-        batch_size=args.batch_size,
-        delay=args.delay
-    )
+    updater = CompleteMarketCapUpdater(source=args.source)
     
     try:
         if args.verify_only: